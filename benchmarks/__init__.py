@@ -0,0 +1,12 @@
+"""Benchmarks of the mhm_tools hot paths on synthetic data.
+
+The cases in :mod:`benchmarks.cases` follow the `asv` conventions
+(``setup``, ``time_*``, ``peakmem_*``, ``params``) and are run without any
+extra dependency by::
+
+    python -m benchmarks run --size S
+    python -m benchmarks compare main HEAD --size M
+
+All inputs are generated deterministically by :mod:`benchmarks.synthetic`
+at the sizes ``S``, ``M`` and ``L``, so the suite runs offline.
+"""
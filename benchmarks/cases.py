@@ -0,0 +1,172 @@
+"""Benchmark cases of the mhm_tools hot paths.
+
+The classes follow the `asv` conventions: ``setup`` runs untimed for every
+parameter in the current working directory, ``time_*`` methods are timed and
+``peakmem_*`` methods are measured for their peak memory.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import scipy.stats
+
+from mhm_tools.common.utils import Resolution
+from mhm_tools.post.gridded_data_evaluation import (
+    get_stats_one_pass_subset,
+    spearman_spatial_joblib,
+)
+from mhm_tools.post.hydrograph import Hydrograph
+from mhm_tools.pre.catchment import Catchment
+from mhm_tools.pre.create_mhm_restart_from_setup import merge_restart_files
+from mhm_tools.pre.fill_nearest import fill_dataarray_with_nearest
+from mhm_tools.pre.pet_calc import calculate_pet
+
+from . import synthetic
+
+
+class FillNearest:
+    """Nearest-neighbour filling of a forcing with 10 % empty cells."""
+
+    params = synthetic.SIZES
+    param_names = ("size",)
+
+    def setup(self, size):
+        """Create the forcing with missing cells."""
+        self.array = synthetic.forcing(size, missing_fraction=0.1)["tavg"]
+
+    def time_fill_nearest(self, size):  # noqa: ARG002
+        """Fill a copy of the forcing (the function works in place)."""
+        fill_dataarray_with_nearest(self.array.copy(deep=True), along_time=True)
+
+    peakmem_fill_nearest = time_fill_nearest
+
+
+class SpearmanSpatial:
+    """Pixel-wise Spearman correlation of two forcings."""
+
+    params = synthetic.SIZES
+    param_names = ("size",)
+
+    def setup(self, size):
+        """Create two correlated forcings."""
+        self.data1 = synthetic.forcing(size, seed=0)["tavg"].values
+        self.data2 = synthetic.forcing(size, seed=1)["tavg"].values
+
+    def time_spearman_spatial_joblib(self, size):  # noqa: ARG002
+        """Correlate all pixels in this process."""
+        spearman_spatial_joblib(self.data1, self.data2, scipy.stats.spearmanr, n_jobs=1)
+
+    peakmem_spearman_spatial_joblib = time_spearman_spatial_joblib
+
+
+class StatsOnePass:
+    """Running statistics over monthly forcing files."""
+
+    params = synthetic.SIZES
+    param_names = ("size",)
+
+    def setup(self, size):
+        """Write the forcing as monthly files."""
+        self.files = synthetic.write_monthly_forcing_files(
+            synthetic.forcing(size), Path("monthly")
+        )
+
+    def time_get_stats_one_pass_subset(self, size):  # noqa: ARG002
+        """Accumulate mean, variance and monthly climatology."""
+        get_stats_one_pass_subset(self.files, "tavg")
+
+    peakmem_get_stats_one_pass_subset = time_get_stats_one_pass_subset
+
+
+class CatchmentUpscale:
+    """Upscaling of Level-0 flow directions by a factor of 8."""
+
+    params = synthetic.SIZES
+    param_names = ("size",)
+
+    def setup(self, size):
+        """Create the catchment from synthetic flow directions."""
+        self.catchment = Catchment(
+            synthetic.flow_direction(size),
+            "fdir",
+            var="fdir",
+            ftype="d8",
+            transform=synthetic.transform(size),
+            resolutions=Resolution(
+                l0=synthetic.L0_RESOLUTION, l1=8 * synthetic.L0_RESOLUTION
+            ),
+            latlon=True,
+        )
+        self.fdir = self.catchment._fdir
+
+    def time_upscale(self, size):  # noqa: ARG002
+        """Upscale the Level-0 flow directions to Level-1."""
+        # upscale replaces the flow directions of the catchment
+        self.catchment._fdir = self.fdir
+        self.catchment.upscale("fdir")
+
+    peakmem_upscale = time_upscale
+
+
+class PetCalc:
+    """Oudin PET from a daily temperature file."""
+
+    params = synthetic.SIZES
+    param_names = ("size",)
+
+    def setup(self, size):
+        """Write the temperature file."""
+        self.tavg_file = Path("tavg.nc")
+        synthetic.forcing(size).to_netcdf(self.tavg_file)
+
+    def time_calculate_pet_streaming(self, size):  # noqa: ARG002
+        """Calculate PET block-wise and write it to NetCDF."""
+        calculate_pet(
+            "pet.nc", tavg_file=self.tavg_file, method="oudin", streaming=True
+        )
+
+    peakmem_calculate_pet_streaming = time_calculate_pet_streaming
+
+
+class MergeRestart:
+    """Merging of tiled mHM restart files into one CF restart file."""
+
+    params = synthetic.SIZES
+    param_names = ("size",)
+
+    def setup(self, size):
+        """Write the tile restart files."""
+        self.files, self.bounds = synthetic.restart_files(size, Path("tiles"))
+
+    def time_merge_restart_files(self, size):  # noqa: ARG002
+        """Merge all tiles and write the result."""
+        lon_min, lon_max, lat_min, lat_max, resolution = self.bounds
+        merge_restart_files(
+            self.files,
+            lon_min=lon_min,
+            lon_max=lon_max,
+            lat_min=lat_min,
+            lat_max=lat_max,
+            l1_resolution=resolution,
+            output_file="merged_restart.nc",
+        )
+
+    peakmem_merge_restart_files = time_merge_restart_files
+
+
+class HydrographObjectives:
+    """Objective functions of a discharge time series."""
+
+    params = synthetic.SIZES
+    param_names = ("size",)
+
+    def setup(self, size):
+        """Create the discharge table."""
+        table = synthetic.discharge_table(size)
+        self.obs, self.sim = (np.asarray(table[var]) for var in table.data_vars)
+
+    def time_calc_objectives(self, size):  # noqa: ARG002
+        """Calculate all objectives of observed and simulated discharge."""
+        Hydrograph().calc_objectives(self.obs, self.sim)
+
+    peakmem_calc_objectives = time_calc_objectives
@@ -0,0 +1,347 @@
+"""Run the benchmark cases and compare results between commits.
+
+``run`` executes the cases of :mod:`benchmarks.cases` in this process and
+writes a JSON result file. ``compare`` takes two result files or two git
+revisions; revisions are checked out to temporary worktrees and benchmarked
+in a subprocess with the *current* benchmark cases, so old commits without
+benchmarks can be compared as well. Cases failing on a revision, e.g. since
+they use options added later, are reported as ``missing``.
+"""
+
+import argparse
+import gc
+import inspect
+import json
+import logging
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+
+from . import cases
+
+BENCH_KINDS = ("time", "peakmem")
+"""Method prefixes of benchmarks and their measured quantity."""
+DEFAULT_THRESHOLD = 1.2
+"""Ratio of head to base above which a benchmark counts as regression."""
+DEFAULT_REPEAT = 3
+"""Number of timed calls per time benchmark."""
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def discover(pattern=None):
+    """Return ``(class, method name, kind)`` of all benchmarks.
+
+    Parameters
+    ----------
+    pattern : str, optional
+        Regular expression matched against ``"<class>.<method>"``.
+    """
+    found = []
+    for cls_name, cls in inspect.getmembers(cases, inspect.isclass):
+        if cls.__module__ != cases.__name__:
+            continue
+        for name in sorted(vars(cls)):
+            kind = name.split("_", 1)[0]
+            if kind not in BENCH_KINDS or not callable(getattr(cls, name)):
+                continue
+            if pattern is not None and not re.search(pattern, f"{cls_name}.{name}"):
+                continue
+            found.append((cls, name, kind))
+    return found
+
+
+@contextmanager
+def _working_dir(path):
+    cwd = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def _measure(func, param, kind, repeat):
+    """Return the samples of one benchmark (seconds or bytes).
+
+    Peak memory is the peak of the Python and NumPy allocations traced by
+    :mod:`tracemalloc` during one call, so it does not depend on the memory
+    held before the call.
+    """
+    if kind == "peakmem":
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func(param)
+            return [tracemalloc.get_traced_memory()[1]]
+        finally:
+            tracemalloc.stop()
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func(param)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _source_commit():
+    """Return the git commit of the imported mhm_tools sources if available."""
+    import mhm_tools
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(mhm_tools.__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes=("S",), pattern=None, repeat=DEFAULT_REPEAT):
+    """Run the benchmarks and return the results.
+
+    Parameters
+    ----------
+    sizes : sequence of str, optional
+        Size classes to run, by default ("S",)
+    pattern : str, optional
+        Regular expression selecting ``"<class>.<method>"`` benchmarks.
+    repeat : int, optional
+        Number of timed calls, the minimum is reported, by default 3
+
+    Returns
+    -------
+    dict
+        ``meta`` information, ``results`` keyed by
+        ``"<class>.<method>[<size>]"`` with the ``kind``, reported ``value``
+        (minimal seconds or peak bytes) and all ``samples``, and ``errors``
+        with the ``kind`` and ``error`` of the failed benchmarks.
+    """
+    benchmarks = discover(pattern)
+    results = {}
+    errors = {}
+
+    def _failed(key, kind, exc):
+        errors[key] = {"kind": kind, "error": f"{type(exc).__name__}: {exc}"}
+        print(f"{key:60s} failed: {errors[key]['error']}")  # noqa: T201
+
+    for cls in dict.fromkeys(cls for cls, _, _ in benchmarks):
+        methods = [(name, kind) for c, name, kind in benchmarks if c is cls]
+        for size in sizes:
+            if size not in cls.params:
+                continue
+            with tempfile.TemporaryDirectory() as tmp, _working_dir(tmp):
+                instance = cls()
+                try:
+                    instance.setup(size)
+                except Exception as exc:
+                    for name, kind in methods:
+                        _failed(f"{cls.__name__}.{name}[{size}]", kind, exc)
+                    continue
+                for name, kind in methods:
+                    key = f"{cls.__name__}.{name}[{size}]"
+                    try:
+                        samples = _measure(getattr(instance, name), size, kind, repeat)
+                    except Exception as exc:
+                        _failed(key, kind, exc)
+                        continue
+                    value = min(samples)
+                    results[key] = {"kind": kind, "value": value, "samples": samples}
+                    print(f"{key:60s} {_format(kind, value)}")  # noqa: T201
+                if hasattr(instance, "teardown"):
+                    instance.teardown(size)
+    meta = {
+        "commit": _source_commit(),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sizes": list(sizes),
+        "repeat": repeat,
+    }
+    return {"meta": meta, "results": results, "errors": errors}
+
+
+def _format(kind, value):
+    if value is None:
+        return "-"
+    if kind == "peakmem":
+        return f"{value / 1024**2:10.1f} MiB"
+    return f"{value:10.4f} s  "
+
+
+def compare_results(base, head, threshold=DEFAULT_THRESHOLD):
+    """Compare two result dictionaries.
+
+    Parameters
+    ----------
+    base, head : dict
+        Results as returned by :func:`run_benchmarks`.
+    threshold : float, optional
+        Ratio head/base above which a benchmark is a regression (and below
+        its inverse an improvement), by default 1.2
+
+    Returns
+    -------
+    list of dict
+        One row per benchmark with ``name``, ``kind``, ``base``, ``head``,
+        ``ratio`` and ``status`` ("regression", "improvement", "unchanged"
+        or "missing", also for benchmarks failing on one side).
+    """
+    rows = []
+    base_results, head_results = base["results"], head["results"]
+    errors = {**base.get("errors", {}), **head.get("errors", {})}
+    for name in sorted(set(base_results) | set(head_results) | set(errors)):
+        old, new = base_results.get(name), head_results.get(name)
+        kind = (old or new or errors[name])["kind"]
+        row = {
+            "name": name,
+            "kind": kind,
+            "base": old and old["value"],
+            "head": new and new["value"],
+            "ratio": None,
+            "status": "missing",
+        }
+        if old is not None and new is not None and old["value"] > 0:
+            ratio = new["value"] / old["value"]
+            row["ratio"] = ratio
+            if ratio > threshold:
+                row["status"] = "regression"
+            elif ratio < 1 / threshold:
+                row["status"] = "improvement"
+            else:
+                row["status"] = "unchanged"
+        rows.append(row)
+    return rows
+
+
+def format_comparison(rows):
+    """Return the comparison as text table."""
+    lines = [f"{'benchmark':60s} {'base':>14s} {'head':>14s} {'ratio':>7s}"]
+    for row in rows:
+        ratio = "-" if row["ratio"] is None else f"{row['ratio']:.2f}"
+        flag = {"regression": "  !!", "improvement": "  ++"}.get(row["status"], "")
+        lines.append(
+            f"{row['name']:60s} {_format(row['kind'], row['base']):>14s} "
+            f"{_format(row['kind'], row['head']):>14s} {ratio:>7s}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def _run_revision(rev, workdir, label, args):
+    """Benchmark the git revision ``rev`` and return its results."""
+    tree = workdir / label
+    subprocess.run(
+        ["git", "worktree", "add", "--detach", str(tree), rev],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+    )
+    output = workdir / f"{tree.name}.json"
+    env = dict(os.environ)
+    # sources of the revision, benchmarks of this checkout
+    env["PYTHONPATH"] = os.pathsep.join([str(tree / "src"), str(REPO_ROOT)])
+    command = [sys.executable, "-m", "benchmarks", "run", "-o", str(output)]
+    command += ["--size", *args.size, "--repeat", str(args.repeat)]
+    if args.filter:
+        command += ["--filter", args.filter]
+    try:
+        print(f"Benchmarking {rev}")  # noqa: T201
+        subprocess.run(command, cwd=workdir, env=env, check=True)
+    finally:
+        subprocess.run(
+            ["git", "worktree", "remove", "--force", str(tree)],
+            cwd=REPO_ROOT,
+            check=False,
+            capture_output=True,
+        )
+    return json.loads(output.read_text())
+
+
+def _load_or_run(target, workdir, label, args):
+    path = Path(target)
+    if path.suffix == ".json" and path.is_file():
+        return json.loads(path.read_text())
+    return _run_revision(target, workdir, label, args)
+
+
+def _cmd_run(args):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = run_benchmarks(args.size, args.filter, args.repeat)
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=1))
+    return 0
+
+
+def _cmd_compare(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        base = _load_or_run(args.base, Path(tmp), "base", args)
+        head = _load_or_run(args.head, Path(tmp), "head", args)
+    rows = compare_results(base, head, args.threshold)
+    print(format_comparison(rows))  # noqa: T201
+    if args.output:
+        Path(args.output).write_text(json.dumps(rows, indent=1))
+    regressions = [row["name"] for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold}x")  # noqa: T201
+        return 1
+    return 0
+
+
+def _add_common_args(parser):
+    parser.add_argument(
+        "--size",
+        nargs="+",
+        default=["S"],
+        choices=cases.synthetic.SIZES,
+        help="Size classes to run (default: S).",
+    )
+    parser.add_argument(
+        "--filter",
+        default=None,
+        help="Regular expression selecting '<class>.<method>' benchmarks.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Timed calls per benchmark (default: {DEFAULT_REPEAT}).",
+    )
+    parser.add_argument("-o", "--output", default=None, help="JSON output file.")
+
+
+def main(argv=None):
+    """Command line entry point of ``python -m benchmarks``."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks.")
+    _add_common_args(run_parser)
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare two result files or git revisions."
+    )
+    compare_parser.add_argument("base", help="Result file or git revision.")
+    compare_parser.add_argument("head", help="Result file or git revision.")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Ratio flagged as regression (default: {DEFAULT_THRESHOLD}).",
+    )
+    _add_common_args(compare_parser)
+    args = parser.parse_args(argv)
+    # keep the output readable, the cases log a lot on INFO
+    logging.getLogger("mhm_tools").setLevel(logging.ERROR)
+    if args.command == "run":
+        return _cmd_run(args)
+    return _cmd_compare(args)
@@ -0,0 +1,279 @@
+"""Deterministic synthetic inputs for the benchmarks.
+
+Every generator takes a size class (``"S"``, ``"M"`` or ``"L"``) and a seed
+and always returns the same data for them. Generated arrays are cached in
+memory, so the setup of several cases can share them.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+SIZES = ("S", "M", "L")
+"""Available size classes."""
+GRID_SIZES = {"S": 128, "M": 512, "L": 2048}
+"""Number of rows and columns of the square Level-0 grids (DEM, fdir)."""
+L0_RESOLUTION = 1 / 128
+"""Cell size of the Level-0 grids in degree."""
+FORCING_SIZES = {"S": (365, 32, 32), "M": (1461, 128, 128), "L": (3653, 256, 256)}
+"""Shape ``(time, lat, lon)`` of the daily forcings."""
+RESTART_TILES = {"S": (2, 16), "M": (4, 32), "L": (8, 64)}
+"""Number of tiles per side and Level-1 cells per tile side of restart files."""
+DISCHARGE_SIZES = {"S": ("D", 3653), "M": ("D", 14610), "L": ("h", 350640)}
+"""Frequency and number of time steps of the discharge tables."""
+RESTART_LAI_STEPS = 12
+"""Number of LAI time steps in the synthetic restart files."""
+
+
+def _check_size(size):
+    if size not in SIZES:
+        msg = f"Unknown benchmark size '{size}', use one of {SIZES}."
+        raise ValueError(msg)
+
+
+def _axes(n_lat, n_lon, resolution, lat_max=54.0, lon_min=6.0):
+    """Return descending cell-center latitudes and ascending longitudes."""
+    lat = lat_max - (np.arange(n_lat) + 0.5) * resolution
+    lon = lon_min + (np.arange(n_lon) + 0.5) * resolution
+    return lat, lon
+
+
+@lru_cache(maxsize=None)
+def _dem_values(size, seed):
+    n = GRID_SIZES[size]
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0 : 1 : n * 1j, 0 : 1 : n * 1j]
+    # tilted valley with some hills and rough noise
+    elev = 800.0 * y + 200.0 * np.abs(x - 0.5)
+    for cy, cx, height, width in rng.uniform(0, 1, (12, 4)):
+        elev += (
+            300.0
+            * height
+            * np.exp(-((y - cy) ** 2 + (x - cx) ** 2) / (0.02 + 0.05 * width))
+        )
+    elev += rng.normal(0.0, 2.0, elev.shape)
+    elev = elev.astype("f4")
+    elev.setflags(write=False)
+    return elev
+
+
+def dem(size, seed=0):
+    """Return a Level-0 DEM as dataset with the variable ``dem``.
+
+    Parameters
+    ----------
+    size : str
+        Size class, see :data:`GRID_SIZES`.
+    seed : int, optional
+        Seed of the random terrain, by default 0
+
+    Returns
+    -------
+    xarray.Dataset
+        DEM in meters on a regular lat-lon grid with descending latitudes.
+    """
+    _check_size(size)
+    values = _dem_values(size, seed)
+    lat, lon = _axes(*values.shape, L0_RESOLUTION)
+    return xr.Dataset(
+        {"dem": (("lat", "lon"), values.copy(), {"units": "m"})},
+        coords={"lat": lat, "lon": lon},
+    )
+
+
+@lru_cache(maxsize=None)
+def _fdir_values(size, seed):
+    import pyflwdir
+
+    values = _dem_values(size, seed)
+    flwdir = pyflwdir.from_dem(
+        values.astype("f8"), transform=transform(size), latlon=True
+    )
+    fdir = flwdir.to_array(ftype="d8")
+    fdir.setflags(write=False)
+    return fdir
+
+
+def transform(size):
+    """Return the affine transform tuple of the Level-0 grids."""
+    _check_size(size)
+    lat, lon = _axes(GRID_SIZES[size], GRID_SIZES[size], L0_RESOLUTION)
+    half = L0_RESOLUTION / 2
+    return (L0_RESOLUTION, 0.0, lon[0] - half, 0.0, -L0_RESOLUTION, lat[0] + half)
+
+
+def flow_direction(size, seed=0):
+    """Return D8 flow directions derived from :func:`dem`.
+
+    Parameters
+    ----------
+    size : str
+        Size class, see :data:`GRID_SIZES`.
+    seed : int, optional
+        Seed of the DEM, by default 0
+
+    Returns
+    -------
+    xarray.Dataset
+        D8 flow directions in the variable ``fdir``.
+    """
+    _check_size(size)
+    values = _fdir_values(size, seed)
+    lat, lon = _axes(*values.shape, L0_RESOLUTION)
+    return xr.Dataset(
+        {"fdir": (("lat", "lon"), values.copy(), {"_FillValue": 247})},
+        coords={"lat": lat, "lon": lon},
+    )
+
+
+@lru_cache(maxsize=None)
+def _forcing_values(size, seed, missing_fraction):
+    n_time, n_lat, n_lon = FORCING_SIZES[size]
+    rng = np.random.default_rng(seed)
+    day = np.arange(n_time)
+    season = 10.0 * np.sin(2 * np.pi * (day - 110) / 365.25)
+    gradient = np.linspace(4.0, -4.0, n_lat)[:, np.newaxis] + np.zeros(n_lon)
+    values = (
+        8.0
+        + season[:, np.newaxis, np.newaxis]
+        + gradient
+        + rng.normal(0.0, 2.0, (n_time, n_lat, n_lon))
+    ).astype("f4")
+    if missing_fraction > 0:
+        # whole cells without data, as around coasts or outside of the domain
+        missing = rng.random((n_lat, n_lon)) < missing_fraction
+        values[:, missing] = np.nan
+    values.setflags(write=False)
+    return values
+
+
+def forcing(size, var="tavg", seed=0, missing_fraction=0.0):
+    """Return a daily meteorological forcing.
+
+    Parameters
+    ----------
+    size : str
+        Size class, see :data:`FORCING_SIZES`.
+    var : str, optional
+        Variable name, by default "tavg"
+    seed : int, optional
+        Seed of the noise, by default 0
+    missing_fraction : float, optional
+        Fraction of grid cells without any data (NaN), by default 0.0
+
+    Returns
+    -------
+    xarray.Dataset
+        Temperature-like float32 forcing with a seasonal cycle.
+    """
+    _check_size(size)
+    values = _forcing_values(size, seed, float(missing_fraction))
+    n_time, n_lat, n_lon = values.shape
+    lat, lon = _axes(n_lat, n_lon, 0.0625)
+    time = pd.date_range("1990-01-01", periods=n_time, freq="D")
+    return xr.Dataset(
+        {var: (("time", "lat", "lon"), values.copy(), {"units": "degC"})},
+        coords={"time": time, "lat": lat, "lon": lon},
+    )
+
+
+def write_monthly_forcing_files(ds, folder):
+    """Write ``ds`` to one NetCDF file per month and return the paths."""
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for month, month_ds in ds.resample(time="MS"):
+        path = folder / f"{pd.Timestamp(month):%Y_%m}.nc"
+        month_ds.to_netcdf(path)
+        paths.append(path)
+    return paths
+
+
+def restart_files(size, folder, seed=0):
+    """Write mHM tile restart files in the native (ncols1, nrows1) layout.
+
+    Parameters
+    ----------
+    size : str
+        Size class, see :data:`RESTART_TILES`.
+    folder : pathlib.Path
+        Folder receiving one ``slice_<i>_<j>/output/mHM_restart_001.nc`` per
+        tile.
+    seed : int, optional
+        Seed of the states, by default 0
+
+    Returns
+    -------
+    tuple
+        List of restart files and the domain bounds ``lon_min``, ``lon_max``,
+        ``lat_min``, ``lat_max`` and the Level-1 resolution.
+    """
+    _check_size(size)
+    n_tiles, n_cells = RESTART_TILES[size]
+    resolution = 1 / 16
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(n_tiles):
+        for j in range(n_tiles):
+            shape = (n_cells, n_cells)
+            tile = xr.Dataset(
+                data_vars={
+                    "L1_fAsp": (("ncols1", "nrows1"), rng.random(shape)),
+                    "L1_Inter": (("ncols1", "nrows1"), rng.random(shape)),
+                    "L1_snowPack": (("ncols1", "nrows1"), rng.random(shape)),
+                    "L1_Max_Canopy_Intercept": (
+                        ("L1_LAITimesteps", "ncols1", "nrows1"),
+                        rng.random((RESTART_LAI_STEPS, *shape)),
+                    ),
+                },
+                attrs={
+                    "xllcorner_L1": i * n_cells * resolution,
+                    "yllcorner_L1": j * n_cells * resolution,
+                    "cellsize_L1": resolution,
+                    "ncols_L1": n_cells,
+                    "nrows_L1": n_cells,
+                },
+            )
+            path = folder / f"slice_{i}_{j}" / "output" / "mHM_restart_001.nc"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tile.to_netcdf(path)
+            paths.append(path)
+    extent = n_tiles * n_cells * resolution
+    return paths, (0.0, extent, 0.0, extent, resolution)
+
+
+def discharge_table(size, seed=0, gauge_id="0006342210"):
+    """Return observed and simulated discharge like mHM's ``discharge.nc``.
+
+    Parameters
+    ----------
+    size : str
+        Size class, see :data:`DISCHARGE_SIZES`.
+    seed : int, optional
+        Seed of the noise, by default 0
+    gauge_id : str, optional
+        Gauge ID used in the variable names, by default "0006342210"
+
+    Returns
+    -------
+    xarray.Dataset
+        Variables ``Qobs_<gauge_id>`` and ``Qsim_<gauge_id>`` with about 1 %
+        missing observations.
+    """
+    _check_size(size)
+    freq, n_time = DISCHARGE_SIZES[size]
+    rng = np.random.default_rng(seed)
+    time = pd.date_range("1980-01-01", periods=n_time, freq=freq)
+    doy = time.dayofyear.to_numpy()
+    base = 50.0 + 30.0 * np.sin(2 * np.pi * (doy - 80) / 365.25)
+    obs = base * rng.lognormal(0.0, 0.3, n_time)
+    sim = 0.9 * obs + rng.normal(0.0, 5.0, n_time)
+    obs[rng.random(n_time) < 0.01] = np.nan
+    return xr.Dataset(
+        {
+            f"Qobs_{gauge_id}": ("time", obs, {"units": "m3 s-1"}),
+            f"Qsim_{gauge_id}": ("time", np.maximum(sim, 0.0), {"units": "m3 s-1"}),
+        },
+        coords={"time": time},
+    )
@@ -25,7 +25,23 @@ except ModuleNotFoundError:  # pragma: no cover
     # package is not installed
     __version__ = "not_available"
 
-from . import common, post, pre
+import importlib
 
 __all__ = ["__version__"]
 __all__ += ["common", "post", "pre"]
+
+# subpackages are imported on first access to keep the CLI startup fast
+_SUBPACKAGES = {"common", "post", "pre"}
+
+
+def __getattr__(name):
+    if name in _SUBPACKAGES:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    error_msg = f"module '{__name__}' has no attribute '{name}'"
+    raise AttributeError(error_msg)
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(__all__))
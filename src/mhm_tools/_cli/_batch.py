@@ -0,0 +1,137 @@
+"""Run many mhm-tools commands from a JSON or YAML manifest in one process.
+
+All jobs share the interpreter, the imported modules and the opened NetCDF
+files, which are cached by path and modification time. Independent jobs run
+concurrently in a small thread pool within the memory budget, jobs with
+``depends_on`` wait for their dependencies. Plotting commands share the
+global ``matplotlib.pyplot`` state and run one at a time, next to the other
+jobs. Failures are reported per job; jobs depending on a failed job are
+skipped.
+
+Example manifest::
+
+    max_workers: 2
+    jobs:
+      - name: latlon
+        command: latlon
+        args: ["-D", "dem.asc", "-H", "0.25", "-o", "latlon.nc"]
+      - name: fill
+        command: fill-nearest
+        args: {input-dir: meteo, output-dir: meteo_filled}
+        mem_gib: 4
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def add_args(parser):
+    """Add cli arguments for the batch subcommand.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+        the main argument parser
+
+    """
+    required = parser.add_argument_group("required arguments")
+    required.add_argument(
+        "-i",
+        "--manifest",
+        required=True,
+        help="JSON or YAML file listing the jobs.",
+    )
+    optional = parser.add_argument_group("optional arguments")
+    optional.add_argument(
+        "--ncpus",
+        type=int,
+        default=None,
+        help="Number of jobs running at once (default: manifest or 1).",
+    )
+    optional.add_argument(
+        "--available-mem",
+        default=None,
+        help=(
+            "Memory budget of all running jobs in Gb or Mb (default Gb); "
+            "defaults to the manifest entry or no limit."
+        ),
+    )
+    optional.add_argument(
+        "--report",
+        default=None,
+        help="Write the per-job results to this JSON file.",
+    )
+    flags = parser.add_argument_group("flags")
+    flags.add_argument(
+        "--stop-on-error",
+        action="store_true",
+        default=False,
+        help="Skip all remaining jobs after the first failure.",
+    )
+    flags.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="Do not share opened NetCDF files between the jobs.",
+    )
+
+
+def _run_cli_job(job):
+    """Run one batch job through the mhm-tools command line interface."""
+    import click
+
+    from mhm_tools._cli._main import cli
+
+    ctx = click.Context(cli, info_name="mhm-tools")
+    command, words, path = cli, [*job.command, *job.args], ["mhm-tools"]
+    while isinstance(command, click.Group):
+        if not words:
+            msg = f"'{' '.join(path)}' needs a sub-command."
+            raise click.UsageError(msg, ctx=ctx)
+        name, command, words = command.resolve_command(ctx, words)
+        path.append(name)
+        ctx = click.Context(command, parent=ctx, info_name=name)
+    if command.name == "batch":
+        msg = "Batch jobs cannot run the batch command."
+        raise click.UsageError(msg, ctx=ctx)
+    return command.main(args=words, prog_name=" ".join(path), standalone_mode=False)
+
+
+def run(args):
+    """Run the jobs of a batch manifest.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        parsed command line arguments
+    """
+    from mhm_tools.common.batch import (
+        format_batch_results,
+        load_batch_manifest,
+        mem_in_gib,
+        run_batch,
+        write_batch_report,
+    )
+    from mhm_tools.common.logger import ErrorLogger
+
+    jobs, settings = load_batch_manifest(args.manifest)
+    max_workers = args.ncpus or settings.get("max_workers", 1)
+    available_mem = args.available_mem or settings.get("available_mem")
+    available_mem_gib = None if available_mem is None else mem_in_gib(available_mem)
+    results = run_batch(
+        jobs,
+        _run_cli_job,
+        max_workers=max_workers,
+        available_mem_gib=available_mem_gib,
+        cache=not args.no_cache,
+        stop_on_error=args.stop_on_error,
+    )
+    logger.info(f"Batch results:\n{format_batch_results(results)}")
+    if args.report is not None:
+        write_batch_report(results, args.report)
+    failed = [result.name for result in results if result.status != "ok"]
+    if failed:
+        msg = f"{len(failed)} of {len(results)} batch jobs did not succeed: {failed}"
+        with ErrorLogger(logger):
+            raise RuntimeError(msg)
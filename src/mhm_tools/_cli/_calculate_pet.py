@@ -71,6 +71,25 @@ def add_args(parser):
         type=int,
         help=("Number of cores used for parallelisation."),
     )
+    optional.add_argument(
+        "--available-mem",
+        required=False,
+        default=None,
+        help=(
+            "Memory budget of one time block in streaming mode in Gb or Mb "
+            "(default Gb)."
+        ),
+    )
+    flags = parser.add_argument_group("flags")
+    flags.add_argument(
+        "--streaming",
+        action="store_true",
+        default=False,
+        help=(
+            "Process the inputs in memory-bounded time blocks and append each "
+            "block to the output file instead of using worker processes."
+        ),
+    )
 
 
 def run(args):
@@ -81,6 +100,7 @@ def run(args):
     args : argparse.Namespace
         parsed command line arguments
     """
+    from mhm_tools.common.cli_utils import get_available_mem_in_unit
     from mhm_tools.pre.pet_calc import calculate_pet
 
     calculate_pet(
@@ -91,4 +111,6 @@ def run(args):
         out_file=args.output_file,
         max_workers=args.ncpus,
         method=args.method,
+        streaming=args.streaming,
+        available_mem_gib=get_available_mem_in_unit(args.available_mem),
     )
@@ -173,6 +173,15 @@ def add_args(parser):
             """Apply the mask to all cropped files (not only DEM). Useful with tool will automaitcally select the mask aligning with the file resolution or upscale a higher resolution mask."""
         ),
     )
+    flags.add_argument(
+        "--cache-ascii-index",
+        required=False,
+        default=False,
+        action="store_true",
+        help=(
+            """Keep the row offsets of ASCII grids in hidden .rows.npy files next to the inputs, so cropping the same setup again does not scan every grid."""
+        ),
+    )
     optional.add_argument(
         "--output-var",
         required=False,
@@ -260,4 +269,5 @@ def run(args):
         lat_order=args.lat_order,
         output_suffix=args.output_suffix,
         mask_all=args.mask_all,
+        cache_ascii_index=args.cache_ascii_index,
     )
@@ -259,6 +259,17 @@ def add_args(parser):
         default="SPAEF",
         help="Result metric written to results.csv. Accepted values: TSM, SPAEF, ESP, WASPAEF, MSPAEF, all.",
     )
+    optional.add_argument(
+        "--regrid-method",
+        required=False,
+        default="nearest",
+        choices=["nearest", "conservative"],
+        help=(
+            "How input and ref are brought to a common grid: nearest regrids the "
+            "coarser dataset to the finer grid, conservative remaps the finer "
+            "dataset onto the coarser grid with area-weighted means."
+        ),
+    )
 
 
 def run(args):
@@ -355,4 +366,5 @@ def run(args):
         target_time_freq=target_freq,
         mask_var=args.mask_var,
         result_metric=args.metric,
+        regrid_method=args.regrid_method,
     )
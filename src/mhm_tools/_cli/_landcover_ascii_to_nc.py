@@ -71,6 +71,20 @@ def add_args(parser: ArgumentParser) -> None:
         action="store_true",
         help="Normalize coordinate names/ordering to lat/lon.",
     )
+    flags.add_argument(
+        "--streaming",
+        action="store_true",
+        help=(
+            "Create the output with its final time length and write every "
+            "landcover period into it as soon as it is parsed."
+        ),
+    )
+    optional.add_argument(
+        "--ncpus",
+        type=int,
+        default=1,
+        help="Number of landcover periods parsed in parallel with --streaming.",
+    )
 
 
 def _resolve_var_name(
@@ -116,4 +130,6 @@ def run(args: Namespace) -> None:
         output=output,
         var_name=var_name,
         normalize_latlon=args.normalize_latlon,
+        streaming=args.streaming,
+        n_jobs=args.ncpus,
     )
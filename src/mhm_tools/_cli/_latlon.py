@@ -127,6 +127,12 @@ def add_args(parser):
         default=None,
         help="Write the level-2 header to a given file path.",
     )
+    optional.add_argument(
+        "--ncpus",
+        type=int,
+        default=1,
+        help="Number of threads used to transform projected grids to lat-lon.",
+    )
     optional.add_argument(
         "-o",
         "--out-file",
@@ -159,6 +165,7 @@ def run(args):
         dtype=args.dtype,
         compression=args.compression,
         add_bounds=args.add_bounds,
+        n_jobs=args.ncpus,
     )
 
 
@@ -48,10 +48,10 @@ def add_args(parser):
     )
     optional.add_argument(
         "--long-term-mean-type",
-        choices=["hourly", "daily", "monthly", "yearly"],
+        choices=["hourly", "daily", "monthly", "seasonal", "yearly"],
         default="monthly",
         help=(
-            "Period over which to compute long-term means: hourly, daily, monthly, or yearly. "
+            "Period over which to compute long-term means: hourly, daily, monthly, seasonal, or yearly. "
             "Default is 'monthly'."
         ),
     )
@@ -112,6 +112,22 @@ def add_args(parser):
         default=None,
         help="If given, calculates the long-term mean for values equal or above lower-threshold.",
     )
+    optional.add_argument(
+        "--engine",
+        choices=["cdo", "streaming"],
+        default="cdo",
+        help=(
+            "Processing engine. 'cdo' writes cropped, aggregated and merged "
+            "intermediate files, 'streaming' reads every input once without "
+            "intermediate files or CDO."
+        ),
+    )
+    optional.add_argument(
+        "--ncpus",
+        type=int,
+        default=1,
+        help="Number of parallel workers for cropping and aggregation (cdo engine).",
+    )
     parser.set_defaults(aggregate=False)
 
 
@@ -144,4 +160,6 @@ def run(args: argparse.Namespace):
         lat_max=args.lat_max,
         aggregate=args.aggregate,
         lower_threshold=args.lower_threshold,
+        engine=args.engine,
+        n_jobs=args.ncpus,
     )
@@ -1,6 +1,11 @@
 """
 Click-based command line interface for mhm-tools.
 
+Command modules are only imported when their command is run. Help texts and
+option specs of all commands are read from a JSON manifest cached in the user
+cache directory, which is rebuilt when the package version or a command
+module changes.
+
 Authors
 - Simon Lüdke
 """
@@ -8,12 +13,20 @@ Authors
 import argparse
 import difflib
 import importlib
+import json
+import logging
+import os
+from pathlib import Path
 from types import SimpleNamespace
 from typing import Callable, List, Optional, Tuple
 
 import click
 
-from mhm_tools.common.logger import configure_mhm_tools_logger
+from mhm_tools.common.logger import (
+    configure_mhm_tools_logger,
+    enable_profiling,
+    profile_span,
+)
 
 from .. import __version__
 
@@ -102,6 +115,7 @@ _COMMAND_GROUPS: List[Tuple[str, str, List[Tuple[str, object]]]] = [
         "General helper commands.",
         [
             ("link-folder-tree", "mhm_tools._cli._link_folder_tree"),
+            ("batch", "mhm_tools._cli._batch"),
         ],
     ),
     (
@@ -138,8 +152,21 @@ _COMMAND_MODULES: List[Tuple[str, object]] = [
     command for _, _, commands in _COMMAND_GROUPS for command in commands
 ]
 _LOG_LEVEL_CHOICES = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_MANIFEST_NAME = "cli_manifest.json"
+_CACHE_DIR_ENV = "MHM_TOOLS_CACHE_DIR"
+_HELP_OPTIONS = ("-h", "--help")
+_CLICK_TYPES = {
+    "integer": click.INT,
+    "float": click.FLOAT,
+    "text": click.STRING,
+    "boolean": click.BOOL,
+}
+
+logger = logging.getLogger(__name__)
 _GROUP_ORDER = ("required arguments", "optional arguments", "flags", "options")
 _ROOT_OPTION_ALIASES = {
+    "--profile_report": "--profile-report",
+    "--compute_dtype": "--compute-dtype",
     "--log_level": "--log-level",
     "--log_file": "--log-file",
     "--log_file_level": "--log-file-level",
@@ -550,6 +577,169 @@ def _build_click_command(command_name: str, module, prog_path: Optional[str] = N
     )
 
 
+class LazyCommand(GroupedCommand):
+    """Command built from the manifest that imports its module when run.
+
+    Help is rendered from the manifest options, any other invocation swaps
+    in the command built from the imported module.
+    """
+
+    def __init__(self, *args, module_path: str, prog_path: str, **kwargs):
+        self.module_path = module_path
+        self.prog_path = prog_path
+        super().__init__(*args, **kwargs)
+
+    def load(self) -> click.Command:
+        """Import the command module and build the full command."""
+        module = importlib.import_module(self.module_path)
+        return _build_click_command(self.name, module, prog_path=self.prog_path)
+
+    def parse_args(self, ctx, args):
+        """Parse with the manifest options for help, else with the full command."""
+        if ctx.resilient_parsing or any(arg in _HELP_OPTIONS for arg in args):
+            return super().parse_args(ctx, args)
+        command = self.load()
+        ctx.command = command
+        return command.parse_args(ctx, args)
+
+    def invoke(self, ctx):
+        """Run the full command that parsed the arguments."""
+        if ctx.command is not self:
+            return ctx.command.invoke(ctx)
+        return super().invoke(ctx)
+
+
+def _manifest_path() -> Path:
+    """Return the location of the cached CLI manifest."""
+    cache_dir = os.environ.get(_CACHE_DIR_ENV)
+    if not cache_dir:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        cache_dir = Path(base) / "mhm_tools"
+    return Path(cache_dir) / _MANIFEST_NAME
+
+
+def _manifest_key() -> str:
+    """Identify the package version and state of the command modules."""
+    stamp = max(path.stat().st_mtime_ns for path in Path(__file__).parent.glob("*.py"))
+    return f"{__version__}:{stamp}"
+
+
+def _option_spec(option: click.Option) -> dict:
+    """Serialize a command option for the manifest."""
+    if isinstance(option.type, click.Choice):
+        type_spec = {"choice": [str(choice) for choice in option.type.choices]}
+    elif isinstance(option.type, click.IntRange):
+        type_spec = {"int_range": [option.type.min, option.type.max]}
+    else:
+        type_spec = option.type.name
+    default = option.default
+    try:
+        json.dumps(default)
+    except TypeError:
+        default = str(default)
+    return {
+        "decls": [*option.opts, *option.secondary_opts],
+        "name": option.name,
+        "required": option.required,
+        "default": default,
+        "help": option.help,
+        "show_default": option.show_default,
+        "is_flag": option.is_flag and not option.count,
+        "flag_value": option.flag_value if option.is_flag else None,
+        "count": option.count,
+        "multiple": option.multiple,
+        "nargs": option.nargs,
+        "type": type_spec,
+        "option_group": getattr(option, "option_group", "options"),
+    }
+
+
+def _option_from_spec(spec: dict) -> GroupedOption:
+    """Create a command option from its manifest entry."""
+    kwargs = {
+        "required": spec["required"],
+        "help": spec["help"],
+        "show_default": spec["show_default"],
+    }
+    if not spec["required"]:
+        kwargs["default"] = spec["default"]
+    if spec["count"]:
+        kwargs["count"] = True
+    elif spec["is_flag"]:
+        kwargs["is_flag"] = True
+        kwargs["flag_value"] = spec["flag_value"]
+    else:
+        type_spec = spec["type"]
+        if isinstance(type_spec, dict) and "choice" in type_spec:
+            kwargs["type"] = click.Choice(type_spec["choice"])
+        elif isinstance(type_spec, dict):
+            kwargs["type"] = click.IntRange(*type_spec["int_range"])
+        else:
+            kwargs["type"] = _CLICK_TYPES.get(type_spec, click.STRING)
+        if spec["multiple"]:
+            kwargs["multiple"] = True
+        if spec["nargs"] != 1:
+            kwargs["nargs"] = spec["nargs"]
+    return GroupedOption(
+        param_decls=[*spec["decls"], spec["name"]],
+        option_group=spec["option_group"],
+        **kwargs,
+    )
+
+
+def build_cli_manifest() -> dict:
+    """Import all command modules and collect their help and option specs."""
+    commands = {}
+    for group_name, _, group_commands in _COMMAND_GROUPS:
+        for command_name, module_path in group_commands:
+            if not isinstance(module_path, str):
+                continue
+            command = _build_click_command(
+                command_name, importlib.import_module(module_path)
+            )
+            commands[f"{group_name}/{command_name}"] = {
+                "module": module_path,
+                "help": command.help,
+                "option_aliases": command.option_aliases,
+                "params": [_option_spec(param) for param in command.params],
+            }
+    return {"key": _manifest_key(), "commands": commands}
+
+
+def load_cli_manifest(path: Optional[Path] = None) -> dict:
+    """Load the cached CLI manifest, rebuilding it if it is outdated."""
+    path = _manifest_path() if path is None else Path(path)
+    key = _manifest_key()
+    try:
+        manifest = json.loads(path.read_text())
+        if manifest.get("key") == key:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    manifest = build_cli_manifest()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(manifest))
+        tmp_path.replace(path)
+    except OSError as exc:
+        logger.debug(f"Could not cache the CLI manifest at {path}: {exc}")
+    return manifest
+
+
+def _build_lazy_command(command_name: str, prog_path: str, entry: dict):
+    """Build a command from its manifest entry without importing its module."""
+    return LazyCommand(
+        name=command_name,
+        params=[_option_from_spec(spec) for spec in entry["params"]],
+        help=entry["help"],
+        option_aliases=entry["option_aliases"],
+        context_settings={"help_option_names": list(_HELP_OPTIONS)},
+        module_path=entry["module"],
+        prog_path=prog_path,
+    )
+
+
 def _add_dash_underscore_alias(group: AliasGroup, command_name: str) -> None:
     """Add dash/underscore command aliases when applicable."""
     aliases = []
@@ -634,13 +824,36 @@ def _hide_tui_launcher(group: click.Group) -> None:
     default=False,
     help="Prohibit console output.",
 )
+@click.option(
+    "--profile-report",
+    type=str,
+    default=None,
+    help=(
+        "Write wall/CPU time, peak memory and I/O of the processing stages "
+        "(including worker processes) to this JSON file (Chrome trace format)."
+    ),
+)
+@click.option(
+    "--compute-dtype",
+    type=click.Choice(["float32", "float64"]),
+    default=None,
+    help=(
+        "Floating point precision of the computations. With float32, float32 "
+        "inputs stay float32 end to end (reading, processing, writing); "
+        "precision critical accumulations stay float64. Defaults to float64."
+    ),
+)
+@click.pass_context
 def cli(
+    ctx,
     log_level,
     verbose,
     quiet,
     log_file,
     log_file_level,
     no_console_output,
+    profile_report,
+    compute_dtype,
 ):
     """All tools are provided as sub-commands."""
     configure_mhm_tools_logger(
@@ -651,9 +864,19 @@ def cli(
         log_file_level=log_file_level,
         no_colsole_logging=no_console_output,
     )
+    if compute_dtype:
+        from mhm_tools.common.precision import set_compute_dtype
+
+        set_compute_dtype(compute_dtype)
+    if profile_report:
+        enable_profiling(profile_report)
+        span = profile_span("mhm-tools")
+        span.__enter__()
+        ctx.call_on_close(lambda: span.__exit__(None, None, None))
 
 
 _LEGACY_COMMAND_PATHS = []
+_MANIFEST = load_cli_manifest()
 for _group_name, _group_help, _group_commands in _COMMAND_GROUPS:
     _group = AliasGroup(
         name=_group_name,
@@ -661,16 +884,16 @@ for _group_name, _group_help, _group_commands in _COMMAND_GROUPS:
         context_settings={"help_option_names": ["-h", "--help"]},
     )
     for _command_name, _module in _group_commands:
-        # If the module is a string, import it lazily here.
+        _prog_path = f"mhm-tools {_group_name} {_command_name}"
+        # modules given by path are only imported when the command is run
         if isinstance(_module, str):
-            _module_obj = importlib.import_module(_module)
+            _cmd = _build_lazy_command(
+                _command_name,
+                _prog_path,
+                _MANIFEST["commands"][f"{_group_name}/{_command_name}"],
+            )
         else:
-            _module_obj = _module
-        _cmd = _build_click_command(
-            _command_name,
-            _module_obj,
-            prog_path=f"mhm-tools {_group_name} {_command_name}",
-        )
+            _cmd = _build_click_command(_command_name, _module, prog_path=_prog_path)
         _add_command_with_aliases(_group, _cmd, _command_name)
         _LEGACY_COMMAND_PATHS.append((_command_name, (_group_name, _command_name)))
     _add_command_with_aliases(cli, _group, _group_name)
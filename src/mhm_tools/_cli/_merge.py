@@ -48,6 +48,16 @@ def add_args(parser):
         help="Preserve the top level folder structure. Recusive merge inside.",
     )
     optional.add_argument("--ncpus", required=False, default=1, help="Number of CPUs.")
+    optional.add_argument(
+        "--engine",
+        required=False,
+        default="cdo",
+        choices=["cdo", "native"],
+        help=(
+            "Merge engine. 'cdo' merges chunks with CDO, 'native' copies all files "
+            "into a preallocated output in a single pass without CDO."
+        ),
+    )
 
 
 def run(args):
@@ -68,4 +78,5 @@ def run(args):
         output=output,
         n_cpus=int(args.ncpus),
         preserve_folders=args.preserve_folders,
+        engine=args.engine,
     )
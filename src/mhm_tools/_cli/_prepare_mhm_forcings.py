@@ -122,6 +122,29 @@ def add_args(parser):
         default=None,
         help="Resample the dataset to this target frequency (hourly, daily).",
     )
+    flags.add_argument(
+        "--pipelined",
+        action="store_true",
+        help=(
+            "Crop first, keep the data lazy through resampling and unit "
+            "conversion, and write it chunk by chunk."
+        ),
+    )
+    optional.add_argument(
+        "--ncpus",
+        type=int,
+        default=1,
+        help="Number of files processed in parallel in pipelined mode.",
+    )
+    optional.add_argument(
+        "--available-mem",
+        required=False,
+        default=None,
+        help=(
+            "Memory budget per file in pipelined mode in Gb or Mb (default Gb). "
+            "Sets the dask chunk size."
+        ),
+    )
 
 
 def run(args):
@@ -132,6 +155,7 @@ def run(args):
     args : argparse.Namespace
         parsed command line arguments
     """
+    from mhm_tools.common.cli_utils import get_available_mem_in_unit
     from mhm_tools.pre.prepare_mhm_forcings import prepare_forcings
 
     prepare_forcings(
@@ -148,4 +172,7 @@ def run(args):
         use_mfdataset=args.use_mfdataset,
         target_frequency=args.target_frequency,
         out_var=args.out_var,
+        pipelined=args.pipelined,
+        n_jobs=args.ncpus,
+        available_mem_gib=get_available_mem_in_unit(args.available_mem),
     )
@@ -39,8 +39,43 @@ def add_args(parser):
     optional.add_argument(
         "--method",
         default="nearest",
-        choices=["nearest", "linear"],
-        help="Regridding method",
+        choices=["nearest", "linear", "conservative"],
+        help=(
+            "Regridding method; conservative computes area-weighted means of "
+            "the overlapping source cells."
+        ),
+    )
+    optional.add_argument(
+        "--ncpus",
+        type=int,
+        default=1,
+        help="Number of files regridded in parallel when the input is a folder.",
+    )
+    optional.add_argument(
+        "--weights-cache",
+        default=None,
+        help=(
+            "Folder to cache interpolation weights in, keyed by the source and "
+            "target grids and the method."
+        ),
+    )
+    optional.add_argument(
+        "--nc-access",
+        default=None,
+        choices=["time-series", "map", "full-scan"],
+        help=(
+            "Downstream access pattern the NetCDF chunk shapes are planned for, "
+            "e.g. time-series for per-pixel evaluations."
+        ),
+    )
+    optional.add_argument(
+        "--nc-codec",
+        default="default",
+        choices=["default", "fast", "auto"],
+        help=(
+            "Compression profile: default (zlib 4), fast (zlib 1) or auto, "
+            "which picks one by compressing a sample block."
+        ),
     )
 
 
@@ -62,4 +97,14 @@ def run(args):
         if not file.is_file():
             msg += f"{input!s} is not a file; "
     l2 = float(args.l2)
-    regrid(input=input, output=output, mask=mask, l2=l2, method=args.method)
+    regrid(
+        input=input,
+        output=output,
+        mask=mask,
+        l2=l2,
+        method=args.method,
+        n_jobs=args.ncpus,
+        cache_dir=args.weights_cache,
+        nc_access=args.nc_access,
+        nc_codec=args.nc_codec,
+    )
@@ -14,6 +14,7 @@ Files
 .. autosummary::
    :toctree:
 
+   ~mhm_tools.common.batch
    ~mhm_tools.common.cli_utils
    ~mhm_tools.common.constants
    ~mhm_tools.common.esri_grid
@@ -21,6 +22,7 @@ Files
    ~mhm_tools.common.logger
    ~mhm_tools.common.netcdf
    ~mhm_tools.common.plotter
+   ~mhm_tools.common.precision
    ~mhm_tools.common.provenance
    ~mhm_tools.common.resolution_handler
    ~mhm_tools.common.time_utils
@@ -28,30 +30,62 @@ Files
    ~mhm_tools.common.xarray_utils
 """
 
-from . import constants, netcdf
+import importlib
+
+from . import constants
 from .constants import ESRI_REQ, ESRI_TYPES, NC_ENCODE_DEFAULTS, NO_DATA
-from .esri_grid import (
-    check_grid_compatibility,
-    check_resolutions,
-    read_grid,
-    read_header,
-    rescale_grid,
-    standardize_header,
-    write_grid,
-    write_header,
-)
-from .netcdf import generate_bounds, set_netcdf_encoding
+
+# submodules and functions depending on numpy/xarray are imported on access
+_MODULE_EXPORTS = {"netcdf": "netcdf"}
+
+_ATTR_EXPORTS = {
+    "check_grid_compatibility": ("esri_grid", "check_grid_compatibility"),
+    "check_resolutions": ("esri_grid", "check_resolutions"),
+    "index_grid_rows": ("esri_grid", "index_grid_rows"),
+    "read_grid": ("esri_grid", "read_grid"),
+    "read_grid_rows": ("esri_grid", "read_grid_rows"),
+    "read_header": ("esri_grid", "read_header"),
+    "read_raw_header": ("esri_grid", "read_raw_header"),
+    "rescale_grid": ("esri_grid", "rescale_grid"),
+    "standardize_header": ("esri_grid", "standardize_header"),
+    "write_grid": ("esri_grid", "write_grid"),
+    "write_header": ("esri_grid", "write_header"),
+    "generate_bounds": ("netcdf", "generate_bounds"),
+    "set_netcdf_encoding": ("netcdf", "set_netcdf_encoding"),
+}
 
 __all__ = ["constants", "netcdf"]
 __all__ += ["ESRI_REQ", "ESRI_TYPES", "NC_ENCODE_DEFAULTS", "NO_DATA"]
 __all__ += [
     "check_grid_compatibility",
     "check_resolutions",
+    "index_grid_rows",
     "read_grid",
+    "read_grid_rows",
     "read_header",
+    "read_raw_header",
     "rescale_grid",
     "standardize_header",
     "write_grid",
     "write_header",
 ]
 __all__ += ["generate_bounds", "set_netcdf_encoding"]
+
+
+def __getattr__(name):
+    if name in _MODULE_EXPORTS:
+        module = importlib.import_module(f".{_MODULE_EXPORTS[name]}", __name__)
+        globals()[name] = module
+        return module
+    if name in _ATTR_EXPORTS:
+        module_name, attr_name = _ATTR_EXPORTS[name]
+        module = importlib.import_module(f".{module_name}", __name__)
+        attr = getattr(module, attr_name)
+        globals()[name] = attr
+        return attr
+    error_msg = f"module '{__name__}' has no attribute '{name}'"
+    raise AttributeError(error_msg)
+
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(__all__))
@@ -0,0 +1,344 @@
+"""Run many tool invocations from one manifest in a single process.
+
+A batch manifest (JSON or YAML) lists jobs, each one invocation of an
+``mhm-tools`` command::
+
+    max_workers: 2        # optional, jobs running at once
+    available_mem: 8      # optional, memory budget in GiB
+    jobs:
+      - name: crop
+        command: crop-mhm-setup
+        args: ["-i", "setup", "-o", "cropped", "-m", "mask.nc"]
+      - name: latlon
+        command: setup-creation latlon
+        args: {level0: cropped/dem.asc, level1: 0.25}
+        depends_on: [crop]
+        mem_gib: 2
+
+``args`` is either a list of command line arguments or a mapping of option
+names to values (``True`` adds a flag, lists repeat the option). A job only
+starts after its ``depends_on`` jobs succeeded and is skipped if one of them
+failed.
+
+Jobs run as threads of one process. Plotting commands
+(:data:`PYPLOT_COMMANDS`) use the global state of ``matplotlib.pyplot`` and
+are therefore ``serial``: they never run at the same time as another serial
+job, only next to other jobs. ``serial: true`` in a manifest entry
+serializes further jobs, ``serial: false`` lifts it at the user's risk.
+"""
+
+import json
+import logging
+import shlex
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from mhm_tools.common.logger import ErrorLogger
+from mhm_tools.common.netcdf import dataset_cache
+
+logger = logging.getLogger(__name__)
+
+BATCH_JOB_MEM_GIB = 1.0
+"""Memory estimate of a job without ``mem_gib`` or ``--available-mem``."""
+PYPLOT_COMMANDS = (
+    "discharge-evaluation",
+    "hydrograph",
+    "gridded-data-evaluation",
+    "difference",
+    "relative-difference",
+    "ratio",
+    "2d-map",
+    "metric-plots",
+    "taylor-diagram",
+)
+"""Commands drawing with ``matplotlib.pyplot``, which run serially in a batch."""
+
+
+@dataclass
+class BatchJob:
+    """One command invocation of a batch."""
+
+    name: str
+    command: List[str]
+    args: List[str] = field(default_factory=list)
+    depends_on: List[str] = field(default_factory=list)
+    mem_gib: float = BATCH_JOB_MEM_GIB
+    serial: bool = False
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch job."""
+
+    name: str
+    status: str
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def _option_args(options):
+    """Convert an option mapping to command line arguments."""
+    args = []
+    for key, value in options.items():
+        option = key if key.startswith("-") else "--" + key.replace("_", "-")
+        if value is None or value is False:
+            continue
+        if value is True:
+            args.append(option)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                args += [option, str(item)]
+        else:
+            args += [option, str(value)]
+    return args
+
+
+def mem_in_gib(value):
+    """Convert a memory string like ``"8"``, ``"8gb"`` or ``"500mb"`` to GiB.
+
+    Numbers without a unit are interpreted as GiB.
+    """
+    text = str(value).lower().strip()
+    for unit, factor in (("kb", 1e-6), ("mb", 1e-3), ("gb", 1.0)):
+        if text.endswith(unit):
+            return float(text[: -len(unit)]) * factor
+    return float(text)
+
+
+def _job_mem_gib(entry, args):
+    """Memory estimate of a job from ``mem_gib`` or its ``--available-mem``."""
+    if entry.get("mem_gib") is not None:
+        return mem_in_gib(entry["mem_gib"])
+    for i, arg in enumerate(args):
+        option, _, value = arg.partition("=")
+        if option in ("--available-mem", "--available_mem"):
+            value = value or (args[i + 1] if i + 1 < len(args) else None)
+            if value:
+                return mem_in_gib(value)
+    return BATCH_JOB_MEM_GIB
+
+
+def _parse_job(entry, index):
+    """Create a :class:`BatchJob` from one manifest entry."""
+    if not isinstance(entry, dict) or "command" not in entry:
+        msg = f"Batch job {index} needs to be a mapping with a 'command'."
+        with ErrorLogger(logger):
+            raise ValueError(msg)
+    command = entry["command"]
+    command = shlex.split(command) if isinstance(command, str) else list(command)
+    args = entry.get("args", [])
+    if isinstance(args, dict):
+        args = _option_args(args)
+    elif isinstance(args, str):
+        args = shlex.split(args)
+    else:
+        args = [str(arg) for arg in args]
+    depends_on = entry.get("depends_on", [])
+    if isinstance(depends_on, str):
+        depends_on = [depends_on]
+    return BatchJob(
+        name=str(entry.get("name", f"{index}-{command[-1]}")),
+        command=command,
+        args=args,
+        depends_on=[str(dep) for dep in depends_on],
+        mem_gib=_job_mem_gib(entry, args),
+        serial=bool(entry.get("serial", command[-1] in PYPLOT_COMMANDS)),
+    )
+
+
+def load_batch_manifest(path):
+    """Read a batch manifest.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        JSON file or, with PyYAML installed, YAML file (``.yml``/``.yaml``).
+
+    Returns
+    -------
+    jobs : list of BatchJob
+        Jobs in manifest order.
+    settings : dict
+        Other top-level entries, e.g. ``max_workers`` and ``available_mem``.
+    """
+    path = Path(path)
+    text = path.read_text()
+    if path.suffix.lower() in (".yml", ".yaml"):
+        try:
+            import yaml
+        except ImportError as exc:
+            msg = "YAML batch manifests require PyYAML (pip install pyyaml)."
+            with ErrorLogger(logger):
+                raise ImportError(msg) from exc
+        content = yaml.safe_load(text)
+    else:
+        content = json.loads(text)
+    if isinstance(content, list):
+        content = {"jobs": content}
+    if not isinstance(content, dict) or not isinstance(content.get("jobs"), list):
+        msg = f"Batch manifest {path} needs a list of jobs."
+        with ErrorLogger(logger):
+            raise ValueError(msg)
+    settings = {key: value for key, value in content.items() if key != "jobs"}
+    jobs = [_parse_job(entry, i) for i, entry in enumerate(content["jobs"])]
+    _check_jobs(jobs)
+    return jobs, settings
+
+
+def _check_jobs(jobs):
+    """Check for duplicate names, unknown dependencies and cycles."""
+    names = [job.name for job in jobs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    msg = None
+    if duplicates:
+        msg = f"Batch job names are not unique: {duplicates}"
+    for job in jobs:
+        unknown = [dep for dep in job.depends_on if dep not in names]
+        if msg is None and unknown:
+            msg = f"Batch job '{job.name}' depends on unknown jobs {unknown}."
+    if msg is None:
+        done = set()
+        remaining = list(jobs)
+        while remaining:
+            ready = [job for job in remaining if set(job.depends_on) <= done]
+            if not ready:
+                cycle = sorted(job.name for job in remaining)
+                msg = f"Batch jobs have cyclic dependencies: {cycle}"
+                break
+            done.update(job.name for job in ready)
+            remaining = [job for job in remaining if job not in ready]
+    if msg is not None:
+        with ErrorLogger(logger):
+            raise ValueError(msg)
+
+
+def _run_job(job, run_job):
+    """Run one job and catch its failure."""
+    start = time.perf_counter()
+    logger.info(f"Batch job '{job.name}' started: {shlex.join(job.command)}")
+    try:
+        run_job(job)
+    except SystemExit as exc:
+        if exc.code not in (None, 0):
+            return BatchResult(
+                job.name, "failed", time.perf_counter() - start, f"exit {exc.code}"
+            )
+    except Exception as exc:
+        logger.debug(traceback.format_exc())
+        error = f"{type(exc).__name__}: {exc}"
+        return BatchResult(job.name, "failed", time.perf_counter() - start, error)
+    return BatchResult(job.name, "ok", time.perf_counter() - start)
+
+
+def run_batch(
+    jobs: List[BatchJob],
+    run_job: Callable[[BatchJob], object],
+    max_workers: int = 1,
+    available_mem_gib: Optional[float] = None,
+    cache: bool = True,
+    stop_on_error: bool = False,
+) -> List[BatchResult]:
+    """Run batch jobs in a thread pool of this process.
+
+    Jobs start in manifest order as soon as their dependencies succeeded,
+    at most ``max_workers`` at once and only while the summed ``mem_gib`` of
+    the running jobs stays within ``available_mem_gib`` (a job larger than
+    the budget runs alone). Jobs marked ``serial`` never run at the same time
+    as another serial job, since threads share process-global state like the
+    current ``matplotlib.pyplot`` figure. NetCDF files are shared between the
+    jobs by :func:`~mhm_tools.common.netcdf.dataset_cache`.
+
+    Parameters
+    ----------
+    jobs : list of BatchJob
+        Jobs to run.
+    run_job : callable
+        Function running one job; exceptions and non-zero ``SystemExit``
+        mark the job as failed.
+    max_workers : int, optional
+        Number of jobs running at once, by default 1
+    available_mem_gib : float, optional
+        Memory budget of all running jobs in GiB, by default unlimited
+    cache : bool, optional
+        Share opened NetCDF files between the jobs, by default True
+    stop_on_error : bool, optional
+        Skip all jobs not yet started after the first failure, by default False
+
+    Returns
+    -------
+    list of BatchResult
+        Result of every job in manifest order.
+    """
+    _check_jobs(jobs)
+    max_workers = max(1, int(max_workers))
+    budget = float("inf") if available_mem_gib is None else available_mem_gib
+    results: Dict[str, BatchResult] = {}
+    pending = list(jobs)
+    running = {}
+    with dataset_cache() if cache else nullcontext(), ThreadPoolExecutor(
+        max_workers
+    ) as pool:
+        while pending or running:
+            failed = any(result.status != "ok" for result in results.values())
+            for job in list(pending):
+                blocked = [
+                    dep
+                    for dep in job.depends_on
+                    if dep in results and results[dep].status != "ok"
+                ]
+                if blocked or (stop_on_error and failed):
+                    reason = f"dependency {blocked[0]} " if blocked else "an earlier "
+                    results[job.name] = BatchResult(
+                        job.name, "skipped", error=f"{reason}failed"
+                    )
+                    pending.remove(job)
+                    continue
+                if not all(dep in results for dep in job.depends_on):
+                    continue
+                used = sum(running_job.mem_gib for running_job in running.values())
+                if len(running) >= max_workers or (
+                    running and used + job.mem_gib > budget
+                ):
+                    continue
+                if job.serial and any(other.serial for other in running.values()):
+                    continue
+                running[pool.submit(_run_job, job, run_job)] = job
+                pending.remove(job)
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                results[result.name] = result
+                del running[future]
+                if result.status == "ok":
+                    logger.info(
+                        f"Batch job '{result.name}' done in {result.seconds:.1f}s"
+                    )
+                else:
+                    logger.error(f"Batch job '{result.name}' failed: {result.error}")
+    return [results[job.name] for job in jobs]
+
+
+def format_batch_results(results):
+    """Return a text table of the batch results."""
+    width = max([len(result.name) for result in results] + [3])
+    lines = [f"{'job':{width}s}  status   seconds  error"]
+    for result in results:
+        lines.append(
+            f"{result.name:{width}s}  {result.status:7s}  {result.seconds:7.1f}  "
+            f"{result.error or ''}"
+        )
+    return "\n".join(lines)
+
+
+def write_batch_report(results, path):
+    """Write the batch results to a JSON file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps([asdict(result) for result in results], indent=1))
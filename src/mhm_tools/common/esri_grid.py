@@ -1,7 +1,7 @@
 """Common ESRI ASCII grid routines."""
 
+import io
 import logging
-import warnings
 from pathlib import Path
 from textwrap import dedent
 
@@ -13,6 +13,9 @@ from .constants import ESRI_REQ, ESRI_TYPES, NO_DATA
 
 logger = logging.getLogger(__name__)
 
+ASCII_BLOCK_BYTES = 64 * 1024**2
+"""Size of the text blocks parsed or formatted at once for ASCII grid bodies."""
+
 
 def _is_number(string):
     try:
@@ -22,12 +25,35 @@ def _is_number(string):
         return False
 
 
-def _extract_header(file):
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        return np.genfromtxt(
-            file, dtype=str, max_rows=6, usecols=(0, 1), invalid_raise=False
-        )
+def read_raw_header(file):
+    """Read the raw header of an ASCII grid without touching the data.
+
+    Only the header lines are read; reading stops at the first line starting
+    with a number.
+
+    Parameters
+    ----------
+    file : :class:`~os.PathLike`
+        File containing the ASCII grid.
+
+    Returns
+    -------
+    header : dict
+        Header values as strings with lower case keys.
+    offset : int
+        Byte offset of the first data line.
+    """
+    header = {}
+    with Path(file).open("rb") as f:
+        offset = 0
+        for line in iter(f.readline, b""):
+            tokens = line.split()
+            if tokens and _is_number(tokens[0]):
+                break
+            offset += len(line)
+            if len(tokens) >= 2:
+                header[tokens[0].decode().lower()] = tokens[1].decode()
+    return header, offset
 
 
 def standardize_header(header):
@@ -90,13 +116,79 @@ def read_header(file):
     "xllcenter" and "yllcenter" will be converted to
     "xllcorner" and "yllcorner" resepectively.
     """
-    header_lines = _extract_header(file)
-    return standardize_header(dict(header_lines))
+    header, _ = read_raw_header(file)
+    return standardize_header(header)
+
+
+def _sidecar_file(file, tag):
+    """Return the hidden ``.npy`` sidecar path of ``file`` for its current mtime."""
+    stat = file.stat()
+    return file.with_name(f".{file.name}.{stat.st_mtime_ns}-{stat.st_size}.{tag}.npy")
+
+
+def _write_sidecar(file, sidecar, data, tag):
+    """Store ``data`` as sidecar of ``file`` and remove outdated ones of ``tag``."""
+    try:
+        for old in file.parent.glob(f".{file.name}.*.{tag}.npy"):
+            if old != sidecar:
+                old.unlink(missing_ok=True)
+        # write to a temporary name so concurrent readers never see partial files
+        tmp_file = sidecar.with_name(f"{sidecar.stem}.tmp.npy")
+        np.save(tmp_file, data)
+        tmp_file.replace(sidecar)
+    except OSError as err:
+        logger.warning(f"Could not write ASCII grid sidecar {sidecar}: {err}")
+
+
+def _parse_block(text, dtype):
+    """Parse lines of whitespace separated values to a 2D array.
+
+    Integer grids may contain values like "1.0".
+    """
+    try:
+        return np.loadtxt(io.BytesIO(text), dtype=dtype, ndmin=2)
+    except ValueError:
+        if not np.issubdtype(dtype, np.integer):
+            raise
+        return np.loadtxt(io.BytesIO(text), ndmin=2).astype(dtype)
 
 
-def read_grid(file, dtype=None):
+def _read_grid_body(file, offset, nrows, ncols, dtype):
+    """Parse the data lines after byte ``offset`` block by block.
+
+    Returns the data and the shape of the body found in the file, which only
+    fills the data if it matches ``(nrows, ncols)``.
+    """
+    data = np.empty((nrows, ncols), dtype=dtype)
+    filled, found_cols = 0, ncols
+    with Path(file).open("rb") as f:
+        f.seek(offset)
+        rest = b""
+        while True:
+            block = f.read(ASCII_BLOCK_BYTES)
+            text = rest + block
+            if block:
+                cut = text.rfind(b"\n") + 1
+                text, rest = text[:cut], text[cut:]
+            if text.strip():
+                values = _parse_block(text, dtype)
+                rows, found_cols = values.shape
+                if found_cols != ncols or filled + rows > nrows:
+                    filled += rows
+                    break
+                data[filled : filled + rows] = values
+                filled += rows
+            if not block:
+                break
+    return data, (filled, found_cols)
+
+
+def read_grid(file, dtype=None, cache=False):
     """Read an ASCII grid from file.
 
+    Only the header lines are parsed as text; the body is parsed in blocks
+    of :any:`ASCII_BLOCK_BYTES` directly into the output array.
+
     Parameters
     ----------
     file : :class:`~os.PathLike`
@@ -105,6 +197,11 @@ def read_grid(file, dtype=None):
         Data type.
         Needs to be integer or float and compatible with np.dtype
         (i.e. "i4", "f4", "f8"), by default None
+    cache : bool, optional
+        Keep the parsed data in a hidden ``.npy`` sidecar next to the file,
+        keyed by the file's modification time, size and the data type.
+        Later reads memory-map the sidecar instead of parsing the text.
+        By default False
 
     Returns
     -------
@@ -118,23 +215,126 @@ def read_grid(file, dtype=None):
     ValueError
         If data shape is not matching the given header.
     """
-    header_lines = _extract_header(file)
-    header = standardize_header(dict(header_lines))
-    # last line could already be data if "nodata_value" is missing
-    numeric_last = _is_number(header_lines[-1][0])
-    header_size = len(header_lines) - int(numeric_last)
-    data = np.loadtxt(file, dtype=dtype, skiprows=header_size, ndmin=2)
+    file = Path(file)
+    raw_header, offset = read_raw_header(file)
+    header = standardize_header(raw_header)
     nrows, ncols = header["nrows"], header["ncols"]
-    if data.shape[0] != nrows or data.shape[1] != ncols:
+    dtype = np.dtype(float if dtype is None else dtype)
+    cache_file = _sidecar_file(file, dtype.str[1:]) if cache else None
+    if cache_file is not None and cache_file.is_file():
+        data = np.load(cache_file, mmap_mode="c")
+        if data.shape == (nrows, ncols):
+            logger.debug(f"read_grid: using cached data {cache_file}")
+            return header, data
+    data, shape = _read_grid_body(file, offset, nrows, ncols, dtype)
+    if shape != (nrows, ncols):
         msg = (
-            f"read_grid: data shape {data.shape} "
+            f"read_grid: data shape {shape} "
             f"not matching given header ({nrows=}, {ncols=})."
         )
         with ErrorLogger(logger):
             raise ValueError(msg)
+    if cache_file is not None:
+        _write_sidecar(file, cache_file, data, dtype.str[1:])
     return header, data
 
 
+def index_grid_rows(file, cache=False):
+    """Return the byte offsets of the data rows of an ASCII grid.
+
+    The grid rows need to be stored on separate lines, as written by
+    :func:`write_grid`. The file is scanned once in blocks of
+    :any:`ASCII_BLOCK_BYTES`; with ``cache=True`` the offsets are kept in a
+    hidden ``.rows.npy`` sidecar keyed by the file's mtime and size.
+
+    Parameters
+    ----------
+    file : :class:`~os.PathLike`
+        File containing the ASCII grid.
+    cache : bool, optional
+        Read and write the offsets sidecar, by default False
+
+    Returns
+    -------
+    header : dict
+        Header describing the grid.
+    offsets : numpy.ndarray
+        ``nrows + 1`` byte offsets; row ``i`` spans
+        ``offsets[i]:offsets[i + 1]``.
+
+    Raises
+    ------
+    ValueError
+        If the number of data lines does not match the header.
+    """
+    file = Path(file)
+    raw_header, offset = read_raw_header(file)
+    header = standardize_header(raw_header)
+    nrows = header["nrows"]
+    sidecar = _sidecar_file(file, "rows") if cache else None
+    if sidecar is not None and sidecar.is_file():
+        offsets = np.load(sidecar)
+        if offsets.size == nrows + 1:
+            return header, offsets
+    starts = [np.array([offset], dtype=np.int64)]
+    with file.open("rb") as f:
+        f.seek(offset)
+        position = offset
+        while block := f.read(ASCII_BLOCK_BYTES):
+            newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+            starts.append(newlines.astype(np.int64) + position + 1)
+            position += len(block)
+        starts = np.concatenate(starts)
+        end = position
+        starts = starts[starts < end]
+        # drop trailing blank lines
+        while starts.size:
+            f.seek(starts[-1])
+            if f.read(end - starts[-1]).strip():
+                break
+            end = starts[-1]
+            starts = starts[:-1]
+    if starts.size != nrows:
+        msg = (
+            f"index_grid_rows: found {starts.size} data lines "
+            f"but the header has {nrows=} in {file}."
+        )
+        with ErrorLogger(logger):
+            raise ValueError(msg)
+    offsets = np.append(starts, end)
+    if sidecar is not None:
+        _write_sidecar(file, sidecar, offsets, "rows")
+    return header, offsets
+
+
+def read_grid_rows(file, offsets, start, stop, dtype=None):
+    """Read the data rows ``start:stop`` of an ASCII grid.
+
+    Parameters
+    ----------
+    file : :class:`~os.PathLike`
+        File containing the ASCII grid.
+    offsets : numpy.ndarray
+        Row offsets from :func:`index_grid_rows`.
+    start, stop : int
+        Range of rows to read.
+    dtype : str/type, optional
+        Data type, by default None (float)
+
+    Returns
+    -------
+    numpy.ndarray
+        Data of the rows with shape ``(stop - start, ncols)``.
+    """
+    dtype = np.dtype(float if dtype is None else dtype)
+    if stop <= start:
+        return np.empty((0, 0), dtype=dtype)
+    with Path(file).open("rb") as f:
+        f.seek(offsets[start])
+        text = f.read(offsets[stop] - offsets[start])
+    return _parse_block(text, dtype).reshape(stop - start, -1)
+
+
 def write_header(file, header, dtype="f4"):
     """Write an ascii header to file.
 
@@ -187,7 +387,7 @@ def write_grid(file, header, data=None, dtype="f4"):
             raise ValueError(msg)
     is_int = issubclass(np.dtype(dtype).type, (np.integer, np.unsignedinteger))
     if data is not None:
-        data = np.array(data, dtype=dtype, copy=False, ndmin=2)
+        data = np.atleast_2d(np.asarray(data, dtype=dtype))
         if data.ndim != 2:
             msg = f"write_grid: data needs to be 2D. Got: {data.ndim}D"
             with ErrorLogger(logger):
@@ -215,10 +415,21 @@ def write_grid(file, header, data=None, dtype="f4"):
     with header_path.open("w") as f:
         f.write(header_str)
         if data is not None:
-            np.savetxt(f, data, fmt="%i" if is_int else "%f")
+            _write_grid_body(f, data, fmt="%i" if is_int else "%f")
     return header_str
 
 
+def _write_grid_body(f, data, fmt):
+    """Write ``data`` row-wise like ``np.savetxt``, formatting blocks of rows at once."""
+    nrows, ncols = data.shape
+    row_fmt = " ".join([fmt] * ncols) + "\n"
+    # roughly 12 characters per formatted value
+    block_rows = max(1, ASCII_BLOCK_BYTES // (12 * max(ncols, 1)))
+    for start in range(0, nrows, block_rows):
+        block = data[start : start + block_rows]
+        f.write((row_fmt * block.shape[0]) % tuple(block.ravel().tolist()))
+
+
 def check_resolutions(
     cellsize_1, cellsize_2, first_finer=False, name_1="LA", name_2="LB", tol=1e-7
 ):
@@ -18,18 +18,32 @@ from typing import Dict, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import xarray as xr
-
-from mhm_tools.common.constants import NC_ENCODE_DEFAULTS, NO_DATA
-from mhm_tools.common.esri_grid import standardize_header, write_grid, write_header
-from mhm_tools.common.logger import ErrorLogger, log_arguments
+from xarray.backends import BackendArray
+from xarray.core import indexing
+
+from mhm_tools.common.constants import NO_DATA
+from mhm_tools.common.esri_grid import (
+    index_grid_rows,
+    read_grid,
+    read_grid_rows,
+    read_raw_header,
+    standardize_header,
+    write_grid,
+    write_header,
+)
+from mhm_tools.common.logger import ErrorLogger, LazySummary, log_arguments
 from mhm_tools.common.netcdf import (
+    QUANTIZE_KEYS,
     apply_cf_baseline_metadata,
     generate_bounds_for_all_coords,
     get_netcdf_metadata_data_vars,
+    plan_nc_encoding,
     prepare_dataset_for_netcdf_write,
     prepare_time_bounds_encoding,
     read_dataset,
+    release_cached_dataset,
 )
+from mhm_tools.common.precision import cast_to_compute_dtype, compute_dtype_of
 from mhm_tools.common.provenance import apply_output_provenance
 from mhm_tools.common.xarray_utils import (
     get_coord_key,
@@ -296,28 +310,192 @@ def chunk_dataset_space_and_time(
 
 
 class ChunkType(Enum):
-    """Define Types of chunking.
-
-    SPACE: Only chunking in space. Time dimension is conserved.
-    TIME: Chunking predominately in time. If necessary also in space.
+    """Define Types of chunking, i.e. the expected access pattern.
+
+    SPACE: Only chunking in space. Time dimension is conserved
+        (time-series access, e.g. per-cell statistics).
+    TIME: Chunking predominately in time. If necessary also in space
+        (map access, e.g. per-time-step processing).
+    FULL_SCAN: Balanced blocks along all dimensions for reductions that
+        touch every value once.
     """
 
     SPACE = 1
     TIME = 2
+    FULL_SCAN = 3
+
+
+CHUNK_ACCESS_HINTS = {
+    "time-series": ChunkType.SPACE,
+    "map": ChunkType.TIME,
+    "full-scan": ChunkType.FULL_SCAN,
+}
+"""Access hints accepted by :func:`plan_chunks` besides :class:`ChunkType`."""
+CHUNK_MEMORY_FRACTION = 0.5
+"""Fraction of the available memory shared by the chunks processed at once."""
+_MIN_BYTES_PER_CHUNK = 4 * 1024**2
+
+
+def get_disk_chunks(ds, var_name=None) -> Dict[str, int]:
+    """Get the on-disk chunk shape per dimension from the variable encodings.
+
+    Parameters
+    ----------
+    ds : xarray.Dataset
+        Dataset as opened from file.
+    var_name : str, optional
+        Variable whose chunking takes precedence, by default None
+
+    Returns
+    -------
+    dict
+        Chunk size per dimension, dimensions without chunked storage are
+        missing.
+    """
+    names = [var_name] if var_name in ds.data_vars else []
+    names += [name for name in ds.data_vars if name != var_name]
+    disk = {}
+    for name in names:
+        var = ds[name]
+        sizes = var.encoding.get("chunksizes") or var.encoding.get("chunks")
+        if sizes is None and var.encoding.get("preferred_chunks"):
+            preferred = var.encoding["preferred_chunks"]
+            sizes = [preferred.get(dim, var.sizes[dim]) for dim in var.dims]
+        if sizes is None or len(sizes) != var.ndim:
+            continue
+        for dim, size in zip(var.dims, sizes):
+            disk.setdefault(dim, max(1, min(int(size), ds.sizes[dim])))
+    return disk
+
+
+def _multiple(base, size, limit):
+    """Largest multiple of ``base`` up to ``limit`` (at least ``base``), clipped to ``size``."""
+    count = max(1, int(limit) // base)
+    return int(min(size, count * base))
+
+
+def _plan_space(cells, ny, nx, by, bx):
+    """Square-ish spatial block of about ``cells`` cells in multiples of (by, bx)."""
+    y_chunk = _multiple(by, ny, np.sqrt(cells))
+    x_chunk = _multiple(bx, nx, cells // y_chunk)
+    # regrow rows if columns were clipped to the grid width
+    y_chunk = _multiple(by, ny, cells // x_chunk)
+    return y_chunk, x_chunk
+
+
+def plan_chunks(
+    ds,
+    available_mem_gib,
+    access=ChunkType.SPACE,
+    var_name=None,
+    n_workers=1,
+    memory_fraction=CHUNK_MEMORY_FRACTION,
+) -> Dict[str, int]:
+    """Plan dask chunks aligned to the on-disk chunking of a dataset.
+
+    The memory budget of ``memory_fraction * available_mem_gib`` is shared by
+    ``n_workers`` chunks processed at once and by all data variables on the
+    spatial grid. Chunk sizes are integer multiples of the on-disk chunks
+    (see :func:`get_disk_chunks`) or span the whole dimension, so no on-disk
+    chunk is decompressed by more than one dask chunk. Floating point values
+    are budgeted with the size of the compute dtype (see
+    :mod:`mhm_tools.common.precision`).
+
+    Parameters
+    ----------
+    ds : xarray.Dataset
+        Dataset to plan chunks for.
+    available_mem_gib : float
+        Available memory in GiB.
+    access : ChunkType or str, optional
+        Access pattern, one of :class:`ChunkType` or ``"time-series"``,
+        ``"map"``, ``"full-scan"``, by default ChunkType.SPACE
+    var_name : str, optional
+        Variable whose on-disk chunking takes precedence, by default None
+    n_workers : int, optional
+        Number of chunks processed concurrently, by default 1
+    memory_fraction : float, optional
+        Fraction of the available memory used for chunks,
+        by default CHUNK_MEMORY_FRACTION
+
+    Returns
+    -------
+    dict
+        Chunk sizes for the time (if present), lat, and lon dimensions.
+    """
+    if isinstance(access, str):
+        if access not in CHUNK_ACCESS_HINTS:
+            msg = (
+                f"Unknown access hint {access!r}, use one of {list(CHUNK_ACCESS_HINTS)}"
+            )
+            with ErrorLogger(logger):
+                raise ValueError(msg)
+        access = CHUNK_ACCESS_HINTS[access]
+    lat_key = get_coord_key(ds, lat=True)
+    lon_key = get_coord_key(ds, lon=True)
+    time_key = get_coord_key(ds, time=True, raise_exception=False)
+    if time_key not in ds.dims:
+        time_key = None
+    ny, nx = ds.sizes[lat_key], ds.sizes[lon_key]
+    nt = ds.sizes[time_key] if time_key else 1
+
+    disk = get_disk_chunks(ds, var_name)
+    by, bx = disk.get(lat_key, 1), disk.get(lon_key, 1)
+    bt = disk.get(time_key, 1) if time_key else 1
+
+    # bytes of one grid cell (and time step) summed over the loaded variables
+    cell_bytes = sum(
+        compute_dtype_of(var.dtype).itemsize
+        for var in ds.data_vars.values()
+        if lat_key in var.dims and lon_key in var.dims
+    )
+    cell_bytes = max(cell_bytes, 1)
+    work_bytes = max(
+        int(memory_fraction * available_mem_gib * 1024**3 / max(1, n_workers)),
+        _MIN_BYTES_PER_CHUNK,
+    )
+    max_cells = max(1, work_bytes // cell_bytes)
+
+    if access == ChunkType.SPACE:
+        t_chunk = nt
+        if max_cells // nt < by * bx:
+            # the full time axis does not fit for a single on-disk block
+            t_chunk = _multiple(bt, nt, max_cells // (by * bx))
+        y_chunk, x_chunk = _plan_space(max_cells // t_chunk, ny, nx, by, bx)
+    elif access == ChunkType.TIME:
+        y_chunk, x_chunk = _plan_space(max_cells // bt, ny, nx, by, bx)
+        t_chunk = _multiple(bt, nt, max_cells // (y_chunk * x_chunk))
+    else:
+        # grow the on-disk block evenly along all dimensions
+        factor = (max_cells / (bt * by * bx)) ** (1 / (3 if time_key else 2))
+        t_chunk = _multiple(bt, nt, bt * factor)
+        y_chunk, x_chunk = _plan_space(max_cells // t_chunk, ny, nx, by, bx)
+        t_chunk = _multiple(bt, nt, max_cells // (y_chunk * x_chunk))
+
+    chunks = {lat_key: y_chunk, lon_key: x_chunk}
+    if time_key:
+        chunks[time_key] = t_chunk
+    logger.debug(
+        f"Planned chunks {chunks} for {access.name} access "
+        f"(on-disk chunks {disk}, {n_workers} worker(s))"
+    )
+    return chunks
 
 
 @log_arguments()
-def chunk_dataset(ds, chunk_type, available_mem_gib, var_name=None):
-    """Chunk xarray.DataSet depending on chunk_type and available memory."""
-    if chunk_type == ChunkType.TIME:
-        chunks = chunk_dataset_space_and_time(ds, available_mem_gib, var_name)
-    if chunk_type == ChunkType.SPACE:
-        chunks = chunk_dataset_space_only(ds, available_mem_gib, var_name)
+def chunk_dataset(ds, chunk_type, available_mem_gib, var_name=None, n_workers=1):
+    """Chunk xarray.DataSet depending on chunk_type and available memory.
+
+    Chunks are planned with :func:`plan_chunks`.
+    """
+    chunks = plan_chunks(
+        ds, available_mem_gib, chunk_type, var_name=var_name, n_workers=n_workers
+    )
     try:
         return ds.chunk(chunks)
     except Exception as e:
         logger.error(chunks)
-        logger.error(ds)
+        logger.error("%s", LazySummary(ds))
         with ErrorLogger(logger):
             raise e
 
@@ -328,9 +506,15 @@ def write_xarray_to_netcdf(
     var_name=None,
     encoding=None,
     engine="netcdf4",
+    access=None,
+    codec="default",
+    significant_digits=None,
 ):
     """Write an xarray Dataset or DataArray to a NetCDF file.
 
+    Floating point data variables are written in the compute dtype (see
+    :mod:`mhm_tools.common.precision`).
+
     Parameters
     ----------
     ds : xr.Dataset or xr.DataArray
@@ -342,29 +526,41 @@ def write_xarray_to_netcdf(
     encoding : dict, optional
         Per-variable NetCDF encoding.
     engine : str, default "netcdf4"
-        Xarray NetCDF backend engine.
+        Xarray NetCDF backend engine, ``"zarr"`` writes a Zarr store with
+        :func:`write_xarray_to_zarr` instead.
+    access : str, optional
+        Downstream access pattern ("time-series", "map", "full-scan") the
+        chunk shapes are planned for, only used without ``encoding``.
+    codec : str, default "default"
+        Codec profile ("default", "fast", "auto"), only used without
+        ``encoding``.
+    significant_digits : int, optional
+        Quantize floating point data to this many significant digits, only
+        used without ``encoding``.
 
     Returns
     -------
     None
     """
     ds, data_vars = _get_netcdf_write_dataset_and_data_vars(ds, var_name)
-    ds = apply_output_provenance(ds)
+    ds = apply_output_provenance(cast_to_compute_dtype(ds))
     apply_cf_baseline_metadata(ds, data_vars)
     if encoding is None:
-        encoding = {
-            var: {
-                "zlib": True,
-                "complevel": 4,
-                "shuffle": True,
-                **NC_ENCODE_DEFAULTS,
-            }
-            for var in data_vars
-        }
+        encoding = plan_nc_encoding(
+            ds, data_vars, access, codec, significant_digits=significant_digits
+        )
     else:
         encoding = {key: value for key, value in encoding.items() if key in data_vars}
+    if engine == "zarr":
+        write_xarray_to_zarr(ds, file_path, var_name, encoding)
+        return
+    if engine != "netcdf4":
+        for enc in encoding.values():
+            if any(enc.pop(key, None) is not None for key in QUANTIZE_KEYS):
+                logger.warning(f"Quantization is not supported by engine {engine}.")
 
     ds = prepare_time_bounds_encoding(ds)
+    release_cached_dataset(file_path)
     try:
         ds_clean, safe_encoding = prepare_dataset_for_netcdf_write(
             ds, data_vars, encoding
@@ -374,7 +570,7 @@ def write_xarray_to_netcdf(
         )
     except ValueError:
         logger.error(f"Error while writing to {file_path}")
-        logger.error(ds)
+        logger.error("%s", LazySummary(ds))
         logger.info(f"Trying to write without encoding {encoding}")
         ds = prepare_time_bounds_encoding(ds, strip_time_attrs=True)
         ds.to_netcdf(file_path, engine=engine, format="NETCDF4")
@@ -383,6 +579,161 @@ def write_xarray_to_netcdf(
             raise e
 
 
+ZARR_ENCODING_KEYS = {
+    "_FillValue",
+    "dtype",
+    "chunks",
+    "compressor",
+    "filters",
+    "scale_factor",
+    "add_offset",
+    "units",
+    "calendar",
+}
+"""Encoding keys kept when writing Zarr stores, NetCDF codec keys are dropped."""
+
+
+def _require_zarr():
+    """Import zarr or raise an informative error."""
+    try:
+        import zarr
+    except ImportError as exc:
+        msg = (
+            "zarr is required to read and write Zarr stores. "
+            "Install with `pip install mhm_tools[zarr]`."
+        )
+        with ErrorLogger(logger):
+            raise ImportError(msg) from exc
+    return zarr
+
+
+def _zarr_encoding(ds, encoding):
+    """Keep the Zarr compatible part of a (NetCDF) encoding."""
+    return {
+        name: {k: v for k, v in enc.items() if k in ZARR_ENCODING_KEYS}
+        for name, enc in (encoding or {}).items()
+        if name in ds.variables
+    }
+
+
+def write_xarray_to_zarr(ds, store, var_name=None, encoding=None, chunks=None):
+    """Write an xarray Dataset or DataArray to a Zarr store.
+
+    The store is overwritten and written with consolidated metadata, so
+    reopening it only reads a single metadata object.
+
+    Parameters
+    ----------
+    ds : xr.Dataset or xr.DataArray
+        Dataset or data array to write.
+    store : str or pathlib.Path
+        Target Zarr store (directory ending with ``.zarr``).
+    var_name : str, optional
+        Data variable to write or DataArray name override.
+    encoding : dict, optional
+        Per-variable encoding, NetCDF specific keys are dropped.
+    chunks : dict, optional
+        Dask chunks of the data, which become the Zarr chunks.
+
+    Returns
+    -------
+    None
+    """
+    _require_zarr()
+    ds, data_vars = _get_netcdf_write_dataset_and_data_vars(ds, var_name)
+    ds = apply_output_provenance(ds[data_vars])
+    if chunks is not None:
+        ds = ds.chunk(chunks)
+    for name in ds.variables:
+        # stale NetCDF chunking would override the dask chunks
+        for key in ("chunks", "chunksizes", "preferred_chunks"):
+            ds[name].encoding.pop(key, None)
+    ds.to_zarr(
+        store, mode="w", encoding=_zarr_encoding(ds, encoding), consolidated=True
+    )
+
+
+def init_zarr_store(template, store, chunks, encoding=None):
+    """Create a Zarr store for concurrent region writes.
+
+    Only metadata and the coordinates of ``template`` are written, the data
+    variables are filled later by :func:`write_zarr_region`.
+
+    Parameters
+    ----------
+    template : xr.Dataset
+        Dataset with the full output layout (data is not written).
+    store : str or pathlib.Path
+        Target Zarr store.
+    chunks : dict
+        Chunk sizes per dimension of the store. Regions written concurrently
+        must be aligned to them.
+    encoding : dict, optional
+        Per-variable encoding, NetCDF specific keys are dropped.
+
+    Returns
+    -------
+    None
+    """
+    _require_zarr()
+    template = apply_output_provenance(template.chunk(chunks))
+    for name in template.variables:
+        for key in ("chunks", "chunksizes", "preferred_chunks"):
+            template[name].encoding.pop(key, None)
+    template.to_zarr(
+        store,
+        mode="w",
+        compute=False,
+        encoding=_zarr_encoding(template, encoding),
+        consolidated=True,
+    )
+
+
+def write_zarr_region(ds, store, region):
+    """Write a block of data into a store created by :func:`init_zarr_store`.
+
+    Workers may call this concurrently for disjoint regions aligned to the
+    store chunks, since every Zarr chunk is then written by a single worker.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        Block of data with the layout of the store's template.
+    store : str or pathlib.Path
+        Zarr store.
+    region : dict
+        Slice per dimension locating ``ds`` in the store.
+
+    Returns
+    -------
+    None
+    """
+    _require_zarr()
+    with xr.open_zarr(store, consolidated=True) as target:
+        for name in ds.data_vars:
+            chunks = target[name].encoding.get("chunks", ())
+            for dim, size in zip(target[name].dims, chunks):
+                if dim not in region:
+                    continue
+                start, stop, _ = region[dim].indices(target.sizes[dim])
+                if start % size or (stop % size and stop != target.sizes[dim]):
+                    msg = (
+                        f"Region {region[dim]} of {name!r} along {dim!r} is not "
+                        f"aligned to the Zarr chunks of size {size}."
+                    )
+                    with ErrorLogger(logger):
+                        raise ValueError(msg)
+    # variables without region dimensions were written by init_zarr_store
+    drop = [name for name in ds.variables if not set(ds[name].dims) & set(region)]
+    ds.drop_vars(drop).to_zarr(store, mode="r+", region=region, consolidated=False)
+
+
+def read_zarr(store):
+    """Open a Zarr store lazily, using consolidated metadata if present."""
+    _require_zarr()
+    return xr.open_zarr(store, consolidated=None)
+
+
 def _get_netcdf_write_dataset_and_data_vars(ds, var_name=None):
     """Return a Dataset and payload variable names for NetCDF writing.
 
@@ -440,16 +791,30 @@ def get_xarray_ds_from_file(  # noqa: PLR0912
     landcover=False,
     landcover_year_start=None,
     create_bounds=False,
+    lazy_ascii=False,
+    ascii_cache=False,
+    n_workers=1,
 ):
-    """Read file and return xarray dataset."""
+    """Read file and return xarray dataset.
+
+    With ``lazy_ascii``, ASCII grids are opened lazily (see
+    :func:`read_ascii_to_xarray`), so cropping windows only reads their rows.
+    Lazily opened grids are read-only; the default reads them eagerly so the
+    data can be modified in place. ``ascii_cache`` keeps the parsed data or
+    the row offsets of ASCII grids in a sidecar next to the file.
+    With ``chunking``, dask chunks are planned by :func:`plan_chunks` for the
+    access pattern ``chunk_type`` and ``n_workers`` concurrent chunks.
+    Floating point data variables are cast to the compute dtype (see
+    :mod:`mhm_tools.common.precision`).
+    """
     file_path = Path(file_path)
     logger.debug(f"Reading {file_path} to xarray with chunking = {chunking}")
     ds_out = None
-    if not file_path.is_file():
+    suffix = file_path.suffix.lower()
+    if not (file_path.is_file() or (suffix == ".zarr" and file_path.is_dir())):
         msg = f"File path does not point to an existing file: {file_path}"
         with ErrorLogger(logger):
             raise ValueError(msg)
-    suffix = file_path.suffix.lower()
     if suffix == ".asc":
         if landcover:
             logger.info("Reading ascii landcover file.")
@@ -458,11 +823,15 @@ def get_xarray_ds_from_file(  # noqa: PLR0912
                 var_name=var_name,
                 landcover=landcover,
                 landcover_year_start=landcover_year_start,
+                cache=ascii_cache,
+                lazy=lazy_ascii,
             )
         else:
             ds_out = read_ascii_to_xarray(
                 filepath=file_path,
                 var_name=var_name,
+                cache=ascii_cache,
+                lazy=lazy_ascii,
             )
         chunk_type = ChunkType.SPACE
     elif suffix == ".nc":
@@ -471,6 +840,8 @@ def get_xarray_ds_from_file(  # noqa: PLR0912
             use_mfdataset=use_mfdataset,
             engine=engine,
         )
+    elif suffix == ".zarr":
+        ds_out = read_zarr(file_path)
     elif suffix in {".tif", ".tiff"}:
         import rioxarray as rxr
 
@@ -496,7 +867,7 @@ def get_xarray_ds_from_file(  # noqa: PLR0912
             ds_out = ds_out.drop_vars("spatial_ref")
     else:
         msg = (
-            "Reading file types other than asci, netcdf, and geotiff is not "
+            "Reading file types other than asci, netcdf, zarr, and geotiff is not "
             f"implemented. The suffix of the file was: {file_path.suffix}"
         )
         with ErrorLogger(logger):
@@ -509,7 +880,7 @@ def get_xarray_ds_from_file(  # noqa: PLR0912
         or (force_ascending_y and ds_out[lat_key].data[0] > ds_out[lat_key].data[-1])
     ):
         ds_out = ds_out.sel({lat_key: slice(None, None, -1)})
-    logger.debug(ds_out)
+    logger.debug("%s", LazySummary(ds_out))
     logger.debug(lat_key)
     logger.debug(lon_key)
     if normalize_latlon_coords:
@@ -519,13 +890,16 @@ def get_xarray_ds_from_file(  # noqa: PLR0912
         )
     if create_bounds:
         ds_out = generate_bounds_for_all_coords(ds_out)
+    ds_out = cast_to_compute_dtype(ds_out)
     if lon_key is None and lat_key is None:
         logger.warning("Dataset does not have lon and lat key.")
     elif lon_key is None or lat_key is None:
         logger.error("Dataset has only one of lon at lat keys.")
 
     if chunking and available_mem_gib is not None:
-        ds_out = chunk_dataset(ds_out, chunk_type, available_mem_gib, var_name)
+        ds_out = chunk_dataset(
+            ds_out, chunk_type, available_mem_gib, var_name, n_workers
+        )
     else:
         # if no chunking remove chunking encoding because this might cause errors while writing
         for name in list(ds_out.variables):
@@ -538,7 +912,7 @@ def get_xarray_ds_from_file(  # noqa: PLR0912
         msg = f"The dataset read from {file_path} is empty."
         with ErrorLogger(logger):
             raise NotImplementedError()
-    logger.debug(f"ds_out: {ds_out}")
+    logger.debug("ds_out: %s", LazySummary(ds_out))
     return ds_out
 
 
@@ -550,12 +924,19 @@ def write_xarray_to_file(
     encoding=None,
     engine="netcdf4",
     resolution=None,
+    **netcdf_kwargs,
 ):
-    """Write xarray Datasets to file with file type depending on the file suffix."""
+    """Write xarray Datasets to file with file type depending on the file suffix.
+
+    ``netcdf_kwargs`` (``access``, ``codec``, ``significant_digits``) are
+    passed to :func:`write_xarray_to_netcdf`. Paths ending with ``.zarr``
+    are written as Zarr stores (see :func:`write_xarray_to_zarr`).
+    """
     file_path = Path(file_path)
-    if file_path.suffix not in {".asc", ".nc"}:
+    if file_path.suffix not in {".asc", ".nc", ".zarr"}:
         msg = (
-            "Writing to file types other than asci and netcdf is not implemented. "
+            "Writing to file types other than asci, netcdf and zarr is not "
+            "implemented. "
             f"The suffix of the file was: {file_path.suffix}"
         )
         with ErrorLogger(logger):
@@ -570,7 +951,11 @@ def write_xarray_to_file(
     if file_path.suffix == ".asc":
         write_xarray_to_ascii(ds, file_path, var_name, resolution=resolution)
     elif file_path.suffix == ".nc":
-        write_xarray_to_netcdf(ds, file_path, var_name, encoding, engine)
+        write_xarray_to_netcdf(
+            ds, file_path, var_name, encoding, engine, **netcdf_kwargs
+        )
+    elif file_path.suffix == ".zarr":
+        write_xarray_to_zarr(ds, file_path, var_name, encoding)
 
 
 def write_xarray_to_ascii(
@@ -613,38 +998,113 @@ def write_xarray_to_ascii(
     logger.debug(f"Header written:\n{out_header_str}")
 
 
+class AsciiGridArray(BackendArray):
+    """Lazily indexed ESRI ASCII grid data reading only the requested rows.
+
+    Parameters
+    ----------
+    filepath : Path
+        ASCII grid file.
+    offsets : numpy.ndarray
+        Row byte offsets from :func:`~mhm_tools.common.esri_grid.index_grid_rows`.
+    shape : tuple of int
+        ``(nrows, ncols)`` of the grid.
+    dtype : numpy.dtype
+        Data type of the values.
+    n_lead : int, optional
+        Number of leading length-1 dimensions (e.g. time), by default 0.
+    """
+
+    def __init__(self, filepath, offsets, shape, dtype, n_lead=0):
+        self.filepath = Path(filepath)
+        self.offsets = offsets
+        self.shape = (1,) * n_lead + tuple(shape)
+        self.dtype = np.dtype(dtype)
+
+    def __getitem__(self, key):
+        """Return the data of an explicit xarray indexer."""
+        return indexing.explicit_indexing_adapter(
+            key, self.shape, indexing.IndexingSupport.BASIC, self._getitem
+        )
+
+    def _getitem(self, key):
+        nrows, ncols = self.shape[-2:]
+        rows = np.arange(nrows)[key[-2]]
+        if rows.size == 0:
+            data = np.empty((0, ncols), dtype=self.dtype)
+        else:
+            first = int(rows.min())
+            data = read_grid_rows(
+                self.filepath, self.offsets, first, int(rows.max()) + 1, self.dtype
+            )
+            if data.shape[1] != ncols:
+                msg = (
+                    f"{self.filepath}: found {data.shape[1]} values in a row, "
+                    f"expected {ncols=}."
+                )
+                with ErrorLogger(logger):
+                    raise ValueError(msg)
+            data = data[rows - first]
+        data = data[..., key[-1]]
+        lead_shape = np.empty(self.shape[:-2], dtype=bool)[key[:-2]].shape
+        if int(np.prod(lead_shape)) == 0:
+            return np.empty(lead_shape + data.shape, dtype=self.dtype)
+        return data.reshape(lead_shape + data.shape)
+
+
 def read_ascii_to_xarray(
     filepath,
     var_name=None,
     landcover=False,
     landcover_year_start=None,
+    cache=False,
+    lazy=False,
 ):
-    """Read an mHM readable asci file to an xarray dataset."""
+    """Read an mHM readable asci file to an xarray dataset.
+
+    Only the header lines are read as text, the data is parsed with
+    :func:`~mhm_tools.common.esri_grid.read_grid`. With ``lazy=True`` the
+    data is not read at all; it is exposed as a lazily indexed array
+    (:class:`AsciiGridArray`) and windows selected with ``isel``/``sel`` only
+    read their rows, located with a row offset index built by one scan of the
+    file. Grids with rows spanning several lines fall back to eager reading.
+    With ``cache=True`` the parsed data (eager) or the row offsets (lazy) are
+    kept in a hidden ``.npy`` sidecar next to the file, keyed by its mtime;
+    no sidecar is written by default.
+    """
+    filepath = Path(filepath)
     # Read the header from the file
-    with filepath.open("r") as f:
-        header = {}
-
-        for i, line in enumerate(f.readlines()):
-            line_striped = line.strip()
-            if not line_striped:
-                continue
-            logger.debug(f"File {filepath.name} {i}: {line_striped}")
-            key, value = line_striped.split()
-            header[key.lower()] = float(value) if "." in value else int(value)
-            if len(header) == 6:
-                break
-        # Extract header information
-        ncols = header["ncols"]
-        nrows = header["nrows"]
-        xllcorner = header["xllcorner"]
-        yllcorner = header["yllcorner"]
-        cellsize = header["cellsize"]
-        nodata_value = header["nodata_value"]
+    raw_header, _ = read_raw_header(filepath)
+    logger.debug(f"File {filepath.name} header: {raw_header}")
+    header = {
+        key: float(value) if "." in value else int(value)
+        for key, value in raw_header.items()
+    }
+    # Extract header information
+    ncols = header["ncols"]
+    nrows = header["nrows"]
+    xllcorner = header["xllcorner"]
+    yllcorner = header["yllcorner"]
+    cellsize = header["cellsize"]
+    nodata_value = header["nodata_value"]
 
     # Load the data values
-    data_values = np.loadtxt(filepath, skiprows=i + 1)
-    if isinstance(nodata_value, int):
-        data_values = data_values.astype(np.int32)
+    dtype = np.int32 if isinstance(nodata_value, int) else None
+    n_lead = int(landcover and landcover_year_start is not None)
+    data_values = None
+    if lazy:
+        try:
+            _, offsets = index_grid_rows(filepath, cache=cache)
+        except ValueError:
+            logger.debug(f"{filepath} can not be indexed by rows, reading eagerly.")
+        else:
+            data_values = indexing.LazilyIndexedArray(
+                AsciiGridArray(
+                    filepath, offsets, (nrows, ncols), dtype or float, n_lead
+                )
+            )
+    if data_values is None:
+        _, data_values = read_grid(filepath, dtype=dtype, cache=cache)
 
     # Calculate latitude and longitude coordinates
     lon = np.arange(
@@ -668,18 +1128,17 @@ def read_ascii_to_xarray(
 
     # If we added a time coordinate, expand the data to have a leading time dim
     if "time" in coords:
-        data_arr = np.expand_dims(data_values, axis=0)  # shape (1, nrows, ncols)
         dims = ["time", "lat", "lon"]
+        if not isinstance(data_values, indexing.LazilyIndexedArray):
+            data_values = np.expand_dims(data_values, axis=0)  # (1, nrows, ncols)
     else:
-        data_arr = data_values
         dims = ["lat", "lon"]
 
+    attrs = {"nodata_value": nodata_value, "_FillValue": nodata_value}
     da = xr.DataArray(
-        data=data_arr,
-        dims=dims,
+        data=xr.Variable(dims, data_values, attrs=attrs),
         coords=coords,
         name=name,
-        attrs={"nodata_value": nodata_value, "_FillValue": nodata_value},
     )
 
     # Convert to Dataset
@@ -712,6 +1171,7 @@ def get_dataset_from_path(
     landcover_year_start=None,
     available_mem=None,
     file_name="*.*",
+    n_workers=1,
 ):
     """Load a dataset from a file, directory, or pattern.
 
@@ -741,7 +1201,7 @@ def get_dataset_from_path(
         ):
             ds_out = ds_out.sel({lat_key: slice(None, None, -1)})
 
-        logger.debug(ds_out)
+        logger.debug("%s", LazySummary(ds_out))
         logger.debug(lat_key)
         logger.debug(lon_key)
 
@@ -756,7 +1216,9 @@ def get_dataset_from_path(
             logger.error("Dataset has only one of lon at lat keys.")
 
         if chunking and available_mem_gib is not None:
-            ds_out = chunk_dataset(ds_out, chunk_type, available_mem_gib, var_name)
+            ds_out = chunk_dataset(
+                ds_out, chunk_type, available_mem_gib, var_name, n_workers
+            )
         else:
             for name in list(ds_out.variables):
                 enc = ds_out.variables[name].encoding
@@ -772,7 +1234,8 @@ def get_dataset_from_path(
             return True
         if isinstance(p, str):
             p = Path(p)
-        return p.is_dir()
+        # zarr stores are directories but hold a single dataset
+        return p.is_dir() and p.suffix.lower() != ".zarr"
 
     if _is_dir_or_list(path):
         file_list = []
@@ -804,6 +1267,7 @@ def get_dataset_from_path(
                 force_ascending_y=force_ascending_y,
                 landcover=landcover,
                 landcover_year_start=landcover_year_start,
+                n_workers=n_workers,
             )
         non_nc = [p for p in file_list if Path(p).suffix != ".nc"]
         if non_nc:
@@ -816,7 +1280,7 @@ def get_dataset_from_path(
     path_in = path
     path = Path(path_in)
 
-    if path.is_file():
+    if path.is_file() or (path.suffix.lower() == ".zarr" and path.is_dir()):
         return get_xarray_ds_from_file(
             path,
             var_name=var_name,
@@ -830,6 +1294,7 @@ def get_dataset_from_path(
             force_ascending_y=force_ascending_y,
             landcover=landcover,
             landcover_year_start=landcover_year_start,
+            n_workers=n_workers,
         )
 
     path_str = str(path_in)
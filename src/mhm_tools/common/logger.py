@@ -1,8 +1,16 @@
 """Provide logger functionality."""
 
+import atexit
 import inspect
+import json
 import logging
-from contextlib import AbstractContextManager
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from contextlib import AbstractContextManager, ContextDecorator
 from functools import wraps
 from pathlib import Path
 
@@ -113,30 +121,117 @@ def get_log_level(level=None, count_verbose=0, count_quiet=0):
     return level, error_msg
 
 
+SUMMARY_MAX_CHARS = 200
+"""Maximal length of summaries of objects without array structure."""
+SUMMARY_MAX_VARS = 10
+"""Maximal number of variables listed in dataset summaries."""
+
+
+def _dims_str(dims, shape):
+    return ", ".join(f"{dim}: {size}" for dim, size in zip(dims, shape))
+
+
+def _chunks_str(chunks):
+    """First chunk size per dimension of dask chunks."""
+    if not chunks:
+        return ""
+    if isinstance(chunks, dict):
+        chunks = chunks.values()
+    return " chunks=(" + ", ".join(str(c[0]) if c else "0" for c in chunks) + ")"
+
+
+def summarize(value, max_chars=SUMMARY_MAX_CHARS):
+    """Return a short summary of ``value`` for log messages.
+
+    Datasets and arrays are described by their dimensions, data types and
+    chunking only, so no data is touched. Other objects are represented by
+    their truncated ``str``.
+
+    Parameters
+    ----------
+    value : object
+        Object to summarize.
+    max_chars : int, optional
+        Maximal length of the summary of other objects,
+        by default SUMMARY_MAX_CHARS
+
+    Returns
+    -------
+    str
+        The summary.
+    """
+    if hasattr(value, "data_vars") and hasattr(value, "sizes"):
+        variables = list(value.data_vars.items())
+        parts = [
+            f"{name}: {var.dtype} ({', '.join(map(str, var.dims))})"
+            f"{_chunks_str(var.chunks)}"
+            for name, var in variables[:SUMMARY_MAX_VARS]
+        ]
+        if len(variables) > SUMMARY_MAX_VARS:
+            parts.append(f"... {len(variables) - SUMMARY_MAX_VARS} more")
+        dims = _dims_str(value.sizes.keys(), value.sizes.values())
+        return f"<{type(value).__name__} ({dims}) [{'; '.join(parts)}]>"
+    if hasattr(value, "dims") and hasattr(value, "dtype"):
+        name = f" {value.name!r}" if getattr(value, "name", None) is not None else ""
+        return (
+            f"<{type(value).__name__}{name} {value.dtype} "
+            f"({_dims_str(value.dims, value.shape)}){_chunks_str(value.chunks)}>"
+        )
+    if hasattr(value, "shape") and hasattr(value, "dtype"):
+        return f"<{type(value).__name__} {value.dtype} {tuple(value.shape)}>"
+    text = str(value)
+    if len(text) > max_chars:
+        text = text[: max_chars - 3] + "..."
+    return text
+
+
+class LazySummary:
+    """Defer :func:`summarize` until a log record is actually emitted.
+
+    Use as a logging argument, e.g. ``logger.debug("read %s", LazySummary(ds))``.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        """Summarize the wrapped object."""
+        return summarize(self.value)
+
+
+def _format_arguments(signature, args, kwargs):
+    """Format all non-None arguments of a call with bounded summaries."""
+    try:
+        bound_args = signature.bind(*args, **kwargs)
+    except TypeError:
+        return f"  args: {summarize(args)} \n  kwargs: {summarize(kwargs)} \n"
+    bound_args.apply_defaults()
+    return "".join(
+        f"  {arg}: {summarize(value)} \n"
+        for arg, value in bound_args.arguments.items()
+        if value is not None
+    )
+
+
 def log_arguments(log_level="Debug"):
-    """Log all non-None arguments passed to a function."""
+    """Log all non-None arguments passed to a function.
+
+    The signature and logger are resolved once per function and the
+    arguments are only formatted if the log level is enabled.
+    """
+    level = logging.INFO if log_level.upper() == "INFO" else logging.DEBUG
 
     def decorator(func):
+        signature = inspect.signature(func)
+        logger = logging.getLogger(func.__module__)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Get the signature of the function
-            signature = inspect.signature(func)
-            bound_args = signature.bind(*args, **kwargs)
-            bound_args.apply_defaults()
-            # Extract arguments and filter out None values
-            non_none_args = {
-                k: v for k, v in bound_args.arguments.items() if v is not None
-            }
-
-            # Log the arguments
-            logger = logging.getLogger(inspect.getmodule(func).__name__)
-            msg = f"Function '{func.__name__}' called with the following arguments: \n"
-            for arg, value in non_none_args.items():
-                msg += f"  {arg}: {value} \n"
-            if log_level.upper() == "INFO":
-                logger.info(msg)
-            else:
-                logger.debug(msg)
+            if logger.isEnabledFor(level):
+                msg = f"Function '{func.__name__}' called with the following arguments: \n"
+                logger.log(level, msg + _format_arguments(signature, args, kwargs))
             # Call the original function
             try:
                 return func(*args, **kwargs)
@@ -157,28 +252,18 @@ def log_errors(raise_exceptions=True):
     """
 
     def decorator(func):
+        signature = inspect.signature(func)
+        logger = logging.getLogger(func.__module__)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Get the signature of the function
-            signature = inspect.signature(func)
-            bound_args = signature.bind(*args, **kwargs)
-            bound_args.apply_defaults()
-            # Extract arguments and filter out None values
-            non_none_args = {
-                k: v for k, v in bound_args.arguments.items() if v is not None
-            }
-
-            # Log the arguments
-            logger = logging.getLogger(inspect.getmodule(func).__name__)
-            msg = f"Error in function '{func.__name__}' called with the following arguments: \n"
-            for arg, value in non_none_args.items():
-                msg += f"  {arg}: {value} \n"
             # Call the function
             try:
                 return func(*args, **kwargs)
             except Exception as e:
                 # log function context
-                logger.error(msg)
+                msg = f"Error in function '{func.__name__}' called with the following arguments: \n"
+                logger.error(msg + _format_arguments(signature, args, kwargs))
                 if raise_exceptions:
                     with ErrorLogger(logger):
                         raise e
@@ -214,3 +299,232 @@ class ErrorLogger(AbstractContextManager):
     def __enter__(self):
         """Enter function needed."""
         return self
+
+
+PROFILE_DIR_ENV = "MHM_TOOLS_PROFILE_DIR"
+"""Environment variable passing the span spool directory to worker processes."""
+_PROFILE_STATE = {"dir": None, "main_pid": None, "report": None}
+_SPAN_METRICS = (
+    "wall",
+    "cpu",
+    "rss_delta",
+    "process_peak_rss",
+    "read_bytes",
+    "write_bytes",
+)
+
+
+def _read_io_bytes():
+    """Return bytes read and written by this process (Linux only, else zeros)."""
+    try:
+        with open("/proc/self/io") as io_file:  # noqa: PTH123
+            counters = dict(line.split(": ") for line in io_file.read().splitlines())
+        return int(counters["rchar"]), int(counters["wchar"])
+    except (OSError, KeyError, ValueError):
+        return 0, 0
+
+
+def _read_rss_bytes():
+    """Return the current and the peak resident set size of this process.
+
+    Both are read from ``/proc/self/status`` (VmRSS and VmHWM); elsewhere the
+    current size is 0 and the peak comes from ``getrusage``.
+    """
+    try:
+        with open("/proc/self/status") as status_file:  # noqa: PTH123
+            status = dict(
+                line.split(":", 1) for line in status_file.read().splitlines()
+            )
+        # values are given in kB
+        return (
+            int(status["VmRSS"].split()[0]) * 1024,
+            int(status["VmHWM"].split()[0]) * 1024,
+        )
+    except (OSError, KeyError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - not available on Windows
+        return 0, 0
+    # ru_maxrss is given in KiB on Linux, in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return 0, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def shutdown_loky_workers():
+    """Shut down the reusable loky workers if they were started.
+
+    Workers inherit the environment when they are spawned, so workers started
+    afterwards see environment variables changed in the meantime.
+    """
+    from joblib.externals.loky import reusable_executor
+
+    executor = getattr(reusable_executor, "_executor", None)
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def _profile_dir():
+    """Return the span spool directory if profiling is enabled in this process."""
+    if _PROFILE_STATE["dir"] is None and os.environ.get(PROFILE_DIR_ENV):
+        # worker processes inherit the spool directory from the environment
+        _PROFILE_STATE["dir"] = Path(os.environ[PROFILE_DIR_ENV])
+    return _PROFILE_STATE["dir"]
+
+
+class profile_span(ContextDecorator):
+    """Record wall time, CPU time, memory and I/O of a processing stage.
+
+    The memory is recorded as the change of the resident set size during the
+    span (``rss_delta``) and the peak resident set size of the process up to
+    the end of the span (``process_peak_rss``), which includes earlier
+    stages.
+
+    Usable as context manager (``with profile_span("read forcings"):``) or
+    decorator (``@profile_span()``, named after the function). Spans are only
+    recorded after :func:`enable_profiling`, including spans of worker
+    processes started afterwards, otherwise they do nothing.
+
+    Parameters
+    ----------
+    name : str, optional
+        Name of the stage, by default the qualified name of the decorated
+        function.
+    """
+
+    def __init__(self, name=None):
+        self.name = name
+        self._start = None
+
+    def __call__(self, func):
+        """Decorate ``func``, naming the span after it if no name was given."""
+        if self.name is None:
+            self.name = f"{func.__module__}.{func.__qualname__}"
+        return super().__call__(func)
+
+    def _recreate_cm(self):
+        # decorated functions may run nested or in several threads
+        return type(self)(self.name)
+
+    def __enter__(self):
+        """Start the span."""
+        if _profile_dir() is not None:
+            self._start = (
+                time.time(),
+                time.perf_counter(),
+                time.process_time(),
+                _read_io_bytes(),
+                _read_rss_bytes()[0],
+            )
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Finish the span and append it to the spool of this process."""
+        spool = _profile_dir()
+        if self._start is None or spool is None:
+            return False
+        wall, perf, cpu, (read, written), rss = self._start
+        read_end, written_end = _read_io_bytes()
+        rss_end, peak_rss = _read_rss_bytes()
+        span = {
+            "name": self.name,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "start": wall,
+            "wall": time.perf_counter() - perf,
+            "cpu": time.process_time() - cpu,
+            "rss_delta": rss_end - rss,
+            "process_peak_rss": peak_rss,
+            "read_bytes": read_end - read,
+            "write_bytes": written_end - written,
+            "failed": exc_type is not None,
+        }
+        with (spool / f"spans-{os.getpid()}.jsonl").open("a") as spool_file:
+            spool_file.write(json.dumps(span) + "\n")
+        return False
+
+
+def enable_profiling(report_path):
+    """Record profiling spans and write a report at interpreter exit.
+
+    Parameters
+    ----------
+    report_path : str or pathlib.Path
+        JSON report to write, see :func:`write_profile_report`.
+    """
+    if _PROFILE_STATE["report"] is None:
+        atexit.register(_write_profile_report_at_exit)
+    spool = Path(tempfile.mkdtemp(prefix="mhm_tools_profile_"))
+    os.environ[PROFILE_DIR_ENV] = str(spool)
+    _PROFILE_STATE.update(dir=spool, main_pid=os.getpid(), report=Path(report_path))
+    # idle loky workers started before would not know the spool directory
+    shutdown_loky_workers()
+
+
+def collect_profile_spans():
+    """Return all spans recorded by this process and its workers."""
+    spool = _profile_dir()
+    if spool is None or not spool.is_dir():
+        return []
+    spans = []
+    for spool_file in sorted(spool.glob("spans-*.jsonl")):
+        spans.extend(json.loads(line) for line in spool_file.read_text().splitlines())
+    return sorted(spans, key=lambda span: span["start"])
+
+
+def write_profile_report(report_path, spans=None):
+    """Write spans as Chrome trace with a per-stage summary.
+
+    The file can be loaded in ``chrome://tracing`` or Perfetto. The
+    ``stages`` entry sums wall/CPU time, RSS changes and I/O per stage name
+    and keeps the maximal process peak RSS.
+
+    Parameters
+    ----------
+    report_path : str or pathlib.Path
+        Target JSON file.
+    spans : list of dict, optional
+        Spans to write, by default :func:`collect_profile_spans`
+    """
+    spans = collect_profile_spans() if spans is None else spans
+    events = []
+    stages = {}
+    for span in spans:
+        metrics = {key: span[key] for key in _SPAN_METRICS}
+        events.append(
+            {
+                "name": span["name"],
+                "ph": "X",
+                "ts": span["start"] * 1e6,
+                "dur": span["wall"] * 1e6,
+                "pid": span["pid"],
+                "tid": span["tid"],
+                "args": {**metrics, "failed": span["failed"]},
+            }
+        )
+        stage = stages.setdefault(
+            span["name"], {"calls": 0, **dict.fromkeys(_SPAN_METRICS, 0)}
+        )
+        stage["calls"] += 1
+        for key in _SPAN_METRICS:
+            if key == "process_peak_rss":
+                stage[key] = max(stage[key], span[key])
+            else:
+                stage[key] += span[key]
+    report_path = Path(report_path)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(
+        json.dumps({"traceEvents": events, "stages": stages}, indent=1)
+    )
+
+
+def _write_profile_report_at_exit():
+    """Write the report of the main process and remove the spool directory."""
+    if _PROFILE_STATE["main_pid"] != os.getpid():
+        return
+    report = _PROFILE_STATE["report"]
+    try:
+        write_profile_report(report)
+        logging.getLogger(__name__).info(f"Wrote profile report to {report}")
+    finally:
+        shutil.rmtree(_PROFILE_STATE["dir"], ignore_errors=True)
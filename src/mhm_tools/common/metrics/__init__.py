@@ -2,8 +2,9 @@
 
 This package groups reusable metric routines for comparing model outputs with
 reference data. Metric implementations live in dedicated modules such as
-``tsm``, ``spaef``, ``esp``, ``waspaef``, and ``mspaef``; ``metrics_handler``
-dispatches metric calls and writes CSV outputs.
+``tsm``, ``spaef``, ``esp``, ``waspaef``, and ``mspaef``; ``kernels`` holds
+the vectorized statistics evaluating them on whole time blocks and
+``metrics_handler`` dispatches metric calls and writes CSV outputs.
 
 Files
 =====
@@ -12,6 +13,7 @@ Files
    :toctree:
 
    ~mhm_tools.common.metrics.esp
+   ~mhm_tools.common.metrics.kernels
    ~mhm_tools.common.metrics.metrics_handler
    ~mhm_tools.common.metrics.mspaef
    ~mhm_tools.common.metrics.spaef
@@ -17,6 +17,7 @@ Authors
 import numpy as np
 from scipy.stats import spearmanr, variation, zscore
 
+from mhm_tools.common.metrics.kernels import TimestepStats
 from mhm_tools.common.metrics.spaef import filter_nan
 
 
@@ -33,3 +34,19 @@ def ESP(s, o):
     esp = 1 - np.sqrt((rs - 1) ** 2 + (gamma - 1) ** 2 + (alpha - 1) ** 2)
 
     return esp, rs, gamma, alpha
+
+
+def esp_kernel(stats: TimestepStats):
+    """Calculate :func:`ESP` for every timestep of a block at once.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(time, 4)`` array of esp, rs, gamma and alpha.
+    """
+    rs = stats.spearman
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = stats.cv_s / stats.cv_o
+    alpha = 1 - np.sqrt(stats.masked_mean((stats.zscore_s - stats.zscore_o) ** 2))
+    esp = 1 - np.sqrt((rs - 1) ** 2 + (gamma - 1) ** 2 + (alpha - 1) ** 2)
+    return np.stack([esp, rs, gamma, alpha], axis=1)
@@ -0,0 +1,349 @@
+"""
+Vectorized building blocks of the spatial metrics over ``(time, y, x)`` cubes.
+
+The spatial metrics (:func:`~mhm_tools.common.metrics.spaef.SPAEF`,
+:func:`~mhm_tools.common.metrics.esp.ESP`, ...) compare two 2D maps after
+removing the cells missing in either map. :class:`TimestepStats` computes
+the same statistics for many timesteps at once on ``(time, cells)`` blocks,
+where the cells missing in a timestep are masked in its row. The metric
+kernels (e.g. :func:`~mhm_tools.common.metrics.spaef.spaef_kernel`) combine
+them to the metric values of every timestep.
+"""
+
+import functools
+import math
+import warnings
+
+import numpy as np
+from scipy.stats import rankdata, variation, zscore
+
+from mhm_tools.common.precision import ACCUMULATOR_DTYPE
+
+TIME_BLOCK_BYTES = 2**27
+"""Approximate memory of the statistics of one time block in bytes."""
+_BLOCK_ARRAYS = 12
+"""Number of ``(time, cells)`` arrays alive while evaluating a block."""
+
+
+def _row_sum(x, valid):
+    """Sum over the valid cells of every row."""
+    return np.where(valid, x, 0.0).sum(axis=1)
+
+
+def _row_correlation(a_dev, b_dev, n):
+    """Pearson correlation per row from masked deviations, as np.corrcoef."""
+    fact = n - 1
+    cov = (a_dev * b_dev).sum(axis=1) / fact
+    a_std = np.sqrt((a_dev**2).sum(axis=1) / fact)
+    b_std = np.sqrt((b_dev**2).sum(axis=1) / fact)
+    return np.clip(cov / a_std / b_std, -1, 1)
+
+
+def row_percentile(sorted_values, n, q):
+    """Linearly interpolated percentile per row, as np.percentile.
+
+    Parameters
+    ----------
+    sorted_values : numpy.ndarray
+        Rows sorted ascending with the ``n`` valid values first.
+    n : numpy.ndarray
+        Number of valid values per row.
+    q : float
+        Percentile in [0, 100].
+
+    Returns
+    -------
+    numpy.ndarray
+        Percentile of every row, NaN for rows without values.
+    """
+    rows = np.arange(len(n))
+    last = np.maximum(n - 1, 0)
+    virtual = q / 100 * last
+    previous = np.floor(virtual).astype(np.intp)
+    following = np.minimum(previous + 1, last)
+    gamma = virtual - previous
+    a = sorted_values[rows, previous]
+    b = sorted_values[rows, following]
+    with np.errstate(invalid="ignore"):
+        diff = b - a
+        # numpy interpolates from the closer neighbour
+        value = np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+    return np.where(n > 0, value, np.nan)
+
+
+def _histogram_counts(values, valid, bins):
+    """Histogram of every row with ``bins[row]`` bins over its own range.
+
+    Replicates the binning of np.histogram with an integer number of bins
+    (equal bins from the row minimum to maximum, the last bin including
+    its right edge, the edges computed in the dtype of ``values``) and
+    counts all rows with one 2D bincount on ``(row, bin)`` indices. Rows
+    without finite values stay empty.
+    """
+    low = np.where(valid, values, np.inf).min(axis=1)
+    high = np.where(valid, values, -np.inf).max(axis=1)
+    finite = np.isfinite(low) & np.isfinite(high)
+    first = np.where(finite, low, 0.0)
+    last = np.where(finite, high, 1.0)
+    equal = first == last
+    first = np.where(equal, first - 0.5, first)[:, None]
+    last = np.where(equal, last + 0.5, last)[:, None]
+    n_bins = np.maximum(bins, 1)[:, None]
+    # np.histogram keeps float32 data float32
+    dtype = values.dtype
+    step = (last - first) / n_bins.astype(dtype)
+    valid = valid & finite[:, None]
+    values = np.where(valid, values, first)
+
+    def edge(index):
+        return np.where(index == n_bins, last, index.astype(dtype) * step + first)
+
+    index = ((values - first) / (last - first) * n_bins.astype(dtype)).astype(np.intp)
+    index[index == n_bins] -= 1
+    index -= values < edge(index)
+    index += (values >= edge(index + 1)) & (index != n_bins - 1)
+    width = int(n_bins.max(initial=1))
+    flat = (np.arange(len(values))[:, None] * width + index)[valid]
+    counts = np.bincount(flat, minlength=len(values) * width)
+    return counts.reshape(len(values), width)
+
+
+class TimestepStats:
+    """Masked spatial statistics of the matching timesteps of two cubes.
+
+    Cells missing (NaN) in either cube are excluded per timestep, as
+    :func:`~mhm_tools.common.metrics.spaef.filter_nan` does for one map.
+    Means, standard deviations, coefficients of variation and z-scores are
+    calculated like the per-timestep metrics do, on the compacted valid
+    values in the precision of the input, for all timesteps with the same
+    number of valid cells at once. They are therefore identical to the
+    per-timestep results, which matters for the z-score histograms where
+    values on a bin edge (e.g. of integer data) must not change their bin.
+    Other statistics are computed on the masked rows in
+    :data:`~mhm_tools.common.precision.ACCUMULATOR_DTYPE`. Derived
+    statistics are computed on first access.
+
+    Parameters
+    ----------
+    s : numpy.ndarray
+        Simulated data with shape ``(time, ...)``.
+    o : numpy.ndarray
+        Observed data with the same shape.
+
+    Attributes
+    ----------
+    valid : numpy.ndarray
+        ``(time, cells)`` mask of the cells present in both cubes.
+    n : numpy.ndarray
+        Number of valid cells per timestep.
+    s, o : numpy.ndarray
+        ``(time, cells)`` data, zero in masked cells.
+    """
+
+    def __init__(self, s, o):
+        s = np.asarray(s)
+        o = np.asarray(o)
+        if s.shape != o.shape:
+            msg = f"Cube shapes differ: {s.shape} and {o.shape}."
+            raise ValueError(msg)
+        # filter_nan compares both maps in their common dtype
+        dtype = np.result_type(s, o)
+        s = s.reshape(len(s), -1).astype(dtype, copy=False)
+        o = o.reshape(len(o), -1).astype(dtype, copy=False)
+        self.valid = ~(np.isnan(s) | np.isnan(o))
+        self.n = self.valid.sum(axis=1)
+        self._values = (s, o)
+        self.s = np.where(self.valid, s, 0).astype(ACCUMULATOR_DTYPE, copy=False)
+        self.o = np.where(self.valid, o, 0).astype(ACCUMULATOR_DTYPE, copy=False)
+
+    def __len__(self):
+        """Return the number of timesteps."""
+        return len(self.n)
+
+    @functools.cached_property
+    def _moments(self):
+        """Per-timestep moments and z-scores from the compacted valid values."""
+        n_time, n_cells = self.valid.shape
+        moments = {}
+        for name in ("s", "o"):
+            for stat in ("mean", "std", "cv"):
+                moments[f"{stat}_{name}"] = np.full(n_time, np.nan)
+            # z-scores stay float32 for float32 data, as scipy's zscore
+            dtype = np.result_type(self._values[0].dtype, 1.0)
+            moments[f"zscore_{name}"] = np.zeros((n_time, n_cells), dtype=dtype)
+        for count in np.unique(self.n[self.n > 0]):
+            rows = np.flatnonzero(self.n == count)
+            valid = self.valid[rows]
+            for name, values in zip(("s", "o"), self._values):
+                # row-major order of the valid cells, as filter_nan
+                compact = values[rows][valid].reshape(len(rows), count)
+                with warnings.catch_warnings(), np.errstate(all="ignore"):
+                    warnings.simplefilter("ignore")
+                    moments[f"mean_{name}"][rows] = np.mean(compact, axis=1)
+                    moments[f"std_{name}"][rows] = np.std(compact, axis=1)
+                    moments[f"cv_{name}"][rows] = variation(compact, axis=1)
+                    scores = np.zeros((len(rows), n_cells), dtype=dtype)
+                    scores[valid] = zscore(compact, axis=1).ravel()
+                moments[f"zscore_{name}"][rows] = scores
+        return moments
+
+    @property
+    def mean_s(self):
+        """Spatial mean per timestep."""
+        return self._moments["mean_s"]
+
+    @property
+    def mean_o(self):
+        """Spatial mean per timestep."""
+        return self._moments["mean_o"]
+
+    @property
+    def std_s(self):
+        """Spatial standard deviation (ddof=0) per timestep."""
+        return self._moments["std_s"]
+
+    @property
+    def std_o(self):
+        """Spatial standard deviation (ddof=0) per timestep."""
+        return self._moments["std_o"]
+
+    @property
+    def cv_s(self):
+        """Coefficient of variation per timestep, as scipy's variation."""
+        return self._moments["cv_s"]
+
+    @property
+    def cv_o(self):
+        """Coefficient of variation per timestep, as scipy's variation."""
+        return self._moments["cv_o"]
+
+    @property
+    def zscore_s(self):
+        """Z-scores as scipy's zscore, zero in masked cells."""
+        return self._moments["zscore_s"]
+
+    @property
+    def zscore_o(self):
+        """Z-scores as scipy's zscore, zero in masked cells."""
+        return self._moments["zscore_o"]
+
+    @functools.cached_property
+    def dev_s(self):
+        """Deviations from the spatial mean, zero in masked cells."""
+        return np.where(self.valid, self.s - self.mean_s[:, None], 0.0)
+
+    @functools.cached_property
+    def dev_o(self):
+        """Deviations from the spatial mean, zero in masked cells."""
+        return np.where(self.valid, self.o - self.mean_o[:, None], 0.0)
+
+    @functools.cached_property
+    def rho(self):
+        """Pearson correlation per timestep."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return _row_correlation(self.dev_s, self.dev_o, self.n)
+
+    @functools.cached_property
+    def spearman(self):
+        """Spearman rank correlation per timestep (ties get average ranks)."""
+        ranks = []
+        for values in (self.s, self.o):
+            # masked cells rank behind all valid cells of their row
+            rank = rankdata(np.where(self.valid, values, np.inf), axis=1)
+            mean = _row_sum(rank, self.valid) / np.maximum(self.n, 1)
+            ranks.append(np.where(self.valid, rank - mean[:, None], 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return _row_correlation(*ranks, self.n)
+
+    @functools.cached_property
+    def sorted_s(self):
+        """Values sorted per timestep, the ``n`` valid values first."""
+        return np.sort(np.where(self.valid, self.s, np.inf), axis=1)
+
+    @functools.cached_property
+    def sorted_o(self):
+        """Values sorted per timestep, the ``n`` valid values first."""
+        return np.sort(np.where(self.valid, self.o, np.inf), axis=1)
+
+    @functools.cached_property
+    def sorted_valid(self):
+        """Mask of the valid entries of the sorted rows."""
+        return np.arange(self.valid.shape[1]) < self.n[:, None]
+
+    def masked_mean(self, values):
+        """Mean of ``(time, cells)`` values over the valid cells per timestep."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return _row_sum(values, self.valid) / self.n
+
+    def histogram_intersection(self):
+        """Fraction of the observed z-score histogram matched by the simulated.
+
+        Both histograms have ``round(sqrt(n))`` bins over the range of their
+        own z-scores, as the SPAEF gamma component. NaN for timesteps without
+        finite z-scores.
+        """
+        bins = np.rint(np.sqrt(self.n)).astype(np.intp)
+        hist_s = _histogram_counts(self.zscore_s, self.valid, bins)
+        hist_o = _histogram_counts(self.zscore_o, self.valid, bins)
+        total = hist_o.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            intersection = np.minimum(hist_s, hist_o).sum(axis=1) / total
+        empty = (hist_s.sum(axis=1) == 0) | (total == 0)
+        return np.where(empty, np.nan, intersection)
+
+    def wasserstein(self):
+        """2-Wasserstein distance of the value distributions per timestep.
+
+        With equal sample sizes this is the RMS difference of the sorted
+        values, as the WASPAEF distance component.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            diff = np.where(self.sorted_valid, self.sorted_o - self.sorted_s, 0.0)
+            return np.sqrt((diff**2).sum(axis=1) / self.n)
+
+
+def time_block_size(shape, block_bytes=None):
+    """Return the number of timesteps of a cube with ``shape`` evaluated at once."""
+    if block_bytes is None:
+        block_bytes = TIME_BLOCK_BYTES
+    cells = math.prod(shape[1:])
+    item = np.dtype(ACCUMULATOR_DTYPE).itemsize
+    return max(1, int(block_bytes // max(1, cells * item * _BLOCK_ARRAYS)))
+
+
+def iter_time_blocks(map1, map2, block_bytes=None):
+    """Yield consecutive time blocks of two cubes as numpy arrays.
+
+    Parameters
+    ----------
+    map1 : array-like
+        Simulated data with shape ``(time, y, x)``; numpy, xarray or dask
+        arrays, lazy data is computed one block at a time.
+    map2 : array-like
+        Observed data with the same shape.
+    block_bytes : int, optional
+        Memory budget of one block, by default :data:`TIME_BLOCK_BYTES`
+
+    Yields
+    ------
+    tuple of numpy.ndarray
+        The next block of timesteps of both cubes.
+    """
+    block = time_block_size(np.shape(map1), block_bytes)
+    for start in range(0, len(map1), block):
+        blocks = (map1[start : start + block], map2[start : start + block])
+        if any(getattr(data, "chunks", None) is not None for data in blocks):
+            import dask
+
+            # compute both together, they often share their source
+            blocks = dask.compute(*blocks)
+        yield tuple(np.asarray(data) for data in blocks)
+
+
+def iter_timestep_stats(map1, map2, block_bytes=None):
+    """Yield :class:`TimestepStats` of consecutive time blocks of two cubes.
+
+    See :func:`iter_time_blocks` for the parameters.
+    """
+    for block1, block2 in iter_time_blocks(map1, map2, block_bytes):
+        yield TimestepStats(block1, block2)
@@ -12,11 +12,16 @@ import logging
 import numpy as np
 import pandas as pd
 
-from mhm_tools.common.metrics.esp import ESP
-from mhm_tools.common.metrics.mspaef import MSPAEF
-from mhm_tools.common.metrics.spaef import SPAEF
-from mhm_tools.common.metrics.tsm import calculate_tsm_for_gridded_data
-from mhm_tools.common.metrics.waspaef import WASPAEF
+from mhm_tools.common.metrics.esp import ESP, esp_kernel
+from mhm_tools.common.metrics.kernels import (
+    TimestepStats,
+    iter_time_blocks,
+    iter_timestep_stats,
+)
+from mhm_tools.common.metrics.mspaef import MSPAEF, mspaef_kernel
+from mhm_tools.common.metrics.spaef import SPAEF, spaef_kernel
+from mhm_tools.common.metrics.tsm import TSMAccumulator, calculate_tsm_for_gridded_data
+from mhm_tools.common.metrics.waspaef import WASPAEF, waspaef_kernel
 from mhm_tools.common.utils import pretty_print_df
 
 logger = logging.getLogger(__name__)
@@ -32,6 +37,23 @@ ACCEPTED_RESULT_METRICS = (
     RESULT_METRIC_WASPAEF,
     RESULT_METRIC_MSPAEF,
 )
+METRIC_KERNELS = {
+    SPAEF: spaef_kernel,
+    ESP: esp_kernel,
+    WASPAEF: waspaef_kernel,
+    MSPAEF: mspaef_kernel,
+}
+"""Vectorized kernels evaluating a per-timestep metric on whole time blocks."""
+RESULT_METRIC_COMPONENTS = {
+    RESULT_METRIC_SPAEF: (SPAEF, ("spaef", "alpha", "beta", "gamma")),
+    RESULT_METRIC_ESP: (ESP, ("esp", "rs", "gamma", "alpha")),
+    RESULT_METRIC_WASPAEF: (WASPAEF, ("waspaef", "rho", "sigma", "wd")),
+    RESULT_METRIC_MSPAEF: (
+        MSPAEF,
+        ("mspaef", "nrmse", "sigma", "sigma_error", "mean_bias", "rho"),
+    ),
+}
+"""Per-timestep function and component names of the spatial result metrics."""
 
 
 def normalize_results_metric(metric):
@@ -51,6 +73,10 @@ def normalize_results_metric(metric):
 def calculate_metric_per_timestep_and_average(map1, map2, func, *args, **kwargs):
     """Apply `func` to matching 2D timesteps of two 3D arrays,then average the per-timestep results.
 
+    Metrics with a kernel in :data:`METRIC_KERNELS` are evaluated on blocks of
+    timesteps at once (see :mod:`~mhm_tools.common.metrics.kernels`), other
+    functions per timestep.
+
     Parameters
     ----------
     func: callable
@@ -69,70 +95,65 @@ def calculate_metric_per_timestep_and_average(map1, map2, func, *args, **kwargs)
     numpy.ndarray
         Mean metric values over all timesteps.
     """
-    results_per_timestep = np.asarray(
-        [
-            func(simulated, observed, *args, **kwargs)
-            for simulated, observed in zip(map1, map2)
-        ]
-    )
+    kernel = METRIC_KERNELS.get(func)
+    if kernel is not None and not args and not kwargs and len(map1) > 0:
+        results_per_timestep = np.concatenate(
+            [kernel(stats) for stats in iter_timestep_stats(map1, map2)]
+        )
+    else:
+        results_per_timestep = np.asarray(
+            [
+                func(simulated, observed, *args, **kwargs)
+                for simulated, observed in zip(map1, map2)
+            ]
+        )
 
     return np.nanmean(results_per_timestep, axis=0)
 
 
+def _components_dict(metric, values, ds1_name, ds2_name):
+    """Name the averaged components of a spatial result metric."""
+    _, components = RESULT_METRIC_COMPONENTS[metric]
+    results = {"name": ds1_name + "-" + ds2_name}
+    results.update(
+        {f"avg_{component}": value for component, value in zip(components, values)}
+    )
+    return results
+
+
+def _spatial_metric_for_gridded_data(metric, map1, map2, ds1_name, ds2_name):
+    """Calculate the averaged components of a spatial result metric."""
+    func, _ = RESULT_METRIC_COMPONENTS[metric]
+    values = calculate_metric_per_timestep_and_average(map1, map2, func)
+    return _components_dict(metric, values, ds1_name, ds2_name)
+
+
 def calculate_spaef_for_gridded_data(map1, map2, ds1_name, ds2_name):
     """Calculate SPAEF metrics for two gridded datasets."""
-    spaef, alpha, beta, gamma = calculate_metric_per_timestep_and_average(
-        map1, map2, SPAEF
+    return _spatial_metric_for_gridded_data(
+        RESULT_METRIC_SPAEF, map1, map2, ds1_name, ds2_name
     )
-    return {
-        "name": ds1_name + "-" + ds2_name,
-        "avg_spaef": spaef,
-        "avg_alpha": alpha,
-        "avg_beta": beta,
-        "avg_gamma": gamma,
-    }
 
 
 def calculate_esp_for_gridded_data(map1, map2, ds1_name, ds2_name):
     """Calculate ESP metrics for two gridded datasets."""
-    esp, rs, gamma, alpha = calculate_metric_per_timestep_and_average(map1, map2, ESP)
-    return {
-        "name": ds1_name + "-" + ds2_name,
-        "avg_esp": esp,
-        "avg_rs": rs,
-        "avg_gamma": gamma,
-        "avg_alpha": alpha,
-    }
+    return _spatial_metric_for_gridded_data(
+        RESULT_METRIC_ESP, map1, map2, ds1_name, ds2_name
+    )
 
 
 def calculate_waspaef_for_gridded_data(map1, map2, ds1_name, ds2_name):
     """Calculate WASPAEF metrics for two gridded datasets."""
-    waspaef, rho, sigma, wd = calculate_metric_per_timestep_and_average(
-        map1, map2, WASPAEF
+    return _spatial_metric_for_gridded_data(
+        RESULT_METRIC_WASPAEF, map1, map2, ds1_name, ds2_name
     )
-    return {
-        "name": ds1_name + "-" + ds2_name,
-        "avg_waspaef": waspaef,
-        "avg_rho": rho,
-        "avg_sigma": sigma,
-        "avg_wd": wd,
-    }
 
 
 def calculate_mspaef_for_gridded_data(map1, map2, ds1_name, ds2_name):
     """Calculate MSPAEF metrics for two gridded datasets."""
-    mspaef, nrmse, sigma, sigma_error, mean_bias, rho = (
-        calculate_metric_per_timestep_and_average(map1, map2, MSPAEF)
+    return _spatial_metric_for_gridded_data(
+        RESULT_METRIC_MSPAEF, map1, map2, ds1_name, ds2_name
     )
-    return {
-        "name": ds1_name + "-" + ds2_name,
-        "avg_mspaef": mspaef,
-        "avg_nrmse": nrmse,
-        "avg_sigma": sigma,
-        "avg_sigma_error": sigma_error,
-        "avg_mean_bias": mean_bias,
-        "avg_rho": rho,
-    }
 
 
 def calculate_results_metric(map1, map2, ds1_name, ds2_name, metric=RESULT_METRIC_TSM):
@@ -162,6 +183,65 @@ def calculate_results_metric(map1, map2, ds1_name, ds2_name, metric=RESULT_METRI
     raise ValueError(msg)
 
 
+def evaluate_results_metrics(
+    map1, map2, ds1_name, ds2_name, metrics=ACCEPTED_RESULT_METRICS
+):
+    """Calculate several result metrics in one pass over the time blocks.
+
+    Every time block of both cubes is read once; its masked per-timestep
+    statistics (:class:`~mhm_tools.common.metrics.kernels.TimestepStats`:
+    NaN mask, means, standard deviations, z-scores, correlations) are
+    computed once and shared by all requested metrics.
+
+    Parameters
+    ----------
+    map1 : array-like
+        Simulated data with shape ``(time, y, x)``; numpy, xarray or dask
+        arrays, lazy data is computed one time block at a time.
+    map2 : array-like
+        Observed data with the same shape.
+    ds1_name : str
+        Name of the first dataset.
+    ds2_name : str
+        Name of the second dataset.
+    metrics : str or sequence of str, optional
+        Metric name, "all" or several of :data:`ACCEPTED_RESULT_METRICS`,
+        by default all
+
+    Returns
+    -------
+    dict
+        Results dictionary of every metric, keyed by the metric name.
+    """
+    if metrics is None or isinstance(metrics, str):
+        metrics = normalize_results_metric(metrics)
+    else:
+        metrics = [normalize_results_metric(metric) for metric in metrics]
+    metrics = (metrics,) if isinstance(metrics, str) else tuple(dict.fromkeys(metrics))
+    if len(map1) == 0:
+        msg = "Cannot calculate result metrics without timesteps."
+        raise ValueError(msg)
+    tsm = TSMAccumulator() if RESULT_METRIC_TSM in metrics else None
+    spatial = [metric for metric in metrics if metric != RESULT_METRIC_TSM]
+    per_timestep = {metric: [] for metric in spatial}
+    for block1, block2 in iter_time_blocks(map1, map2):
+        stats = TimestepStats(block1, block2)
+        if tsm is not None:
+            tsm.update(block1, block2, stats)
+        for metric in spatial:
+            func, _ = RESULT_METRIC_COMPONENTS[metric]
+            per_timestep[metric].append(METRIC_KERNELS[func](stats))
+
+    results = {}
+    for metric in metrics:
+        if metric == RESULT_METRIC_TSM:
+            results[metric] = tsm.result(ds1_name, ds2_name)
+        else:
+            values = np.nanmean(np.concatenate(per_timestep[metric]), axis=0)
+            results[metric] = _components_dict(metric, values, ds1_name, ds2_name)
+    return results
+
+
 def create_csv_from_dict(results_dict: dict, out_path):
     """Create a CSV file from the provided dictionary."""
     df = pd.DataFrame(results_dict, index=[0])
@@ -178,32 +258,29 @@ def create_results_csv(
     out_name="",
     metric="all",
 ):
-    """Calculate the selected metric and create a CSV file."""
+    """Calculate the selected metrics and create a CSV file for each.
+
+    All metrics ("all" or a sequence of names) are calculated in one pass
+    over the data by :func:`evaluate_results_metrics`.
+    """
     norm_metric = normalize_results_metric(metric)
     if isinstance(norm_metric, tuple):
         logger.info("Create csv for all metrics")
-        for nm in norm_metric:
-            create_results_csv(
-                map1=map1,
-                map2=map2,
-                ds1_name=ds1_name,
-                ds2_name=ds2_name,
-                out_dir=out_dir,
-                out_name=out_name,
-                metric=nm,
-            )
-        return
-    logger.info(f"Calculating metrics for {metric}")
-    results_dict = calculate_results_metric(
+    else:
+        logger.info(f"Calculating metrics for {metric}")
+    results = evaluate_results_metrics(
         map1=map1,
         map2=map2,
         ds1_name=ds1_name,
         ds2_name=ds2_name,
-        metric=norm_metric,
+        metrics=norm_metric,
     )
-    logger.info(f"Spatial metrics: {results_dict}")
-    metric_name = norm_metric.lower()
-    file_name = f"{out_name}_{metric_name}.csv" if out_name else f"{metric_name}.csv"
-    create_csv_from_dict(results_dict=results_dict, out_path=out_dir / file_name)
-    df = pd.DataFrame(results_dict, index=[0])
-    pretty_print_df(df, title=norm_metric)
+    for norm_metric, results_dict in results.items():
+        logger.info(f"Spatial metrics: {results_dict}")
+        metric_name = norm_metric.lower()
+        file_name = (
+            f"{out_name}_{metric_name}.csv" if out_name else f"{metric_name}.csv"
+        )
+        create_csv_from_dict(results_dict=results_dict, out_path=out_dir / file_name)
+        df = pd.DataFrame(results_dict, index=[0])
+        pretty_print_df(df, title=norm_metric)
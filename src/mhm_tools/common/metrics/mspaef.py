@@ -16,6 +16,7 @@ Authors
 
 import numpy as np
 
+from mhm_tools.common.metrics.kernels import TimestepStats, row_percentile
 from mhm_tools.common.metrics.spaef import filter_nan
 
 
@@ -38,3 +39,30 @@ def MSPAEF(s, o):
     mspaef = 1 - mspaef_error
 
     return mspaef, nrmse, sigma, sigma_error, mean_bias, rho
+
+
+def mspaef_kernel(stats: TimestepStats):
+    """Calculate :func:`MSPAEF` for every timestep of a block at once.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(time, 6)`` array of mspaef, nrmse, sigma, sigma_error, mean_bias
+        and rho.
+    """
+    q75 = row_percentile(stats.sorted_o, stats.n, 75)
+    q25 = row_percentile(stats.sorted_o, stats.n, 25)
+    iqr = q75 - q25
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        nrmse = np.sqrt(stats.masked_mean((stats.s - stats.o) ** 2)) / iqr
+        sigma = stats.std_s / stats.std_o
+        sigma_error = np.sqrt((sigma**2 - 1) ** 2 + (1 / sigma**2 - 1) ** 2)
+        mean_bias = np.abs(stats.mean_s - stats.mean_o) / iqr
+    rho = stats.rho
+
+    mspaef_error = np.sqrt(
+        nrmse**2 + sigma_error**2 + mean_bias**2 + (1 - rho) ** 2
+    ) / np.sqrt(4)
+    mspaef = 1 - mspaef_error
+    return np.stack([mspaef, nrmse, sigma, sigma_error, mean_bias, rho], axis=1)
@@ -19,6 +19,8 @@ import math
 import numpy as np
 from scipy.stats import variation, zscore
 
+from mhm_tools.common.metrics.kernels import TimestepStats
+
 
 def filter_nan(s, o):
     """Remove paired NaN values before calculating SPAEF."""
@@ -49,3 +51,19 @@ def SPAEF(s, o):
     spaef = 1 - np.sqrt((alpha - 1) ** 2 + (beta - 1) ** 2 + (gamma - 1) ** 2)
 
     return spaef, alpha, beta, gamma
+
+
+def spaef_kernel(stats: TimestepStats):
+    """Calculate :func:`SPAEF` for every timestep of a block at once.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(time, 4)`` array of spaef, alpha, beta and gamma.
+    """
+    alpha = stats.rho
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = stats.cv_s / stats.cv_o
+    gamma = stats.histogram_intersection()
+    spaef = 1 - np.sqrt((alpha - 1) ** 2 + (beta - 1) ** 2 + (gamma - 1) ** 2)
+    return np.stack([spaef, alpha, beta, gamma], axis=1)
@@ -6,10 +6,15 @@ Authors
 - Simon Lüdke
 """
 
+import functools
+
 import numpy as np
 import pandas as pd
 from scipy.stats import spearmanr
 
+from mhm_tools.common.metrics.kernels import TimestepStats
+from mhm_tools.common.precision import ACCUMULATOR_DTYPE
+
 
 def filter_nan(s, o):
     """Remove rows containing NaNs from paired arrays."""
@@ -55,6 +60,44 @@ def nan_area_mean(data):
     return np.nanmean(data, axis=(1, 2))
 
 
+_LEAP_YEAR_MONTH_START = np.cumsum([0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30])
+"""First day (0-based) of every month in a leap year."""
+_FEB_28, _FEB_29, _MAR_01 = 58, 59, 60
+
+
+def calendar_day_codes(time_index):
+    """Return the calendar day of every time stamp as integer code.
+
+    Codes count the days of a leap year from 0 (Jan 1) to 365 (Dec 31),
+    missing time stamps get -1. The codes of a time index are cached, as
+    several evaluations usually share the same time axis.
+
+    Parameters
+    ----------
+    time_index : array-like
+        Time stamps.
+
+    Returns
+    -------
+    numpy.ndarray
+        Read-only integer codes with the length of ``time_index``.
+    """
+    stamps = np.asarray(pd.to_datetime(time_index).values)
+    return _calendar_day_codes(stamps.dtype.str, stamps.tobytes())
+
+
+@functools.lru_cache(maxsize=8)
+def _calendar_day_codes(dtype, buffer):
+    """Calculate the calendar day codes of serialized datetime64 stamps."""
+    stamps = np.frombuffer(buffer, dtype=dtype)
+    months = stamps.astype("datetime64[M]")
+    days = (stamps.astype("datetime64[D]") - months).astype(np.int64)
+    codes = _LEAP_YEAR_MONTH_START[months.astype(np.int64) % 12] + days
+    codes[np.isnat(stamps)] = -1
+    codes.flags.writeable = False
+    return codes
+
+
 def desesonalized_nan_area_mean(data, time_index=None):
     """Create a one-year daily climatology from a multi-year gridded time series.
 
@@ -70,28 +113,20 @@ def desesonalized_nan_area_mean(data, time_index=None):
     area_mean = nan_area_mean(data)
 
     if time_index is not None:
-        time_index = pd.to_datetime(time_index)
-        if len(time_index) != len(area_mean):
+        codes = calendar_day_codes(time_index)
+        if len(codes) != len(area_mean):
             msg = (
                 "Length mismatch between time_index and data time dimension: "
-                f"{len(time_index)} != {len(area_mean)}"
+                f"{len(codes)} != {len(area_mean)}"
             )
             raise ValueError(msg)
-        df = pd.DataFrame(
-            {"value": area_mean, "month_day": pd.Index(time_index).strftime("%m-%d")}
-        )
-        climatology = df.groupby("month_day")["value"].mean()
-
-        feb_28 = climatology.get("02-28", np.nan)
-        mar_01 = climatology.get("03-01", np.nan)
-        climatology.loc["02-29"] = np.nanmean([feb_28, mar_01])
-
-        clim_dates = pd.date_range("2000-01-01", "2000-12-31", freq="D")
-        clim_month_day = clim_dates.strftime("%m-%d")
-        return np.array(
-            [climatology.get(month_day, np.nan) for month_day in clim_month_day],
-            dtype=float,
-        )
+        valid = (codes >= 0) & ~np.isnan(area_mean)
+        counts = np.bincount(codes[valid], minlength=366)
+        sums = np.bincount(codes[valid], weights=area_mean[valid], minlength=366)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            climatology = sums / counts
+        climatology[_FEB_29] = np.nanmean([climatology[_FEB_28], climatology[_MAR_01]])
+        return climatology
 
     if len(area_mean) % 365 == 0:
         days_per_year = 365
@@ -143,13 +178,19 @@ def calculate_tsm_for_gridded_data(map1, map2, ds1_name, ds2_name, eval_params=N
                 param=eval_param,
             )
         )
+    evaluation_results_dict["comb"] = tsm_combined_score(evaluation_results_dict)
+    return evaluation_results_dict
+
+
+def tsm_combined_score(evaluation_results_dict):
+    """Combine the general, temporal and spatial TSM components to ``comb``."""
     m1s_beta = (1 - evaluation_results_dict["general-beta"]) ** 2
     m1s_spatial_alpha = (1 - evaluation_results_dict["spatial-alpha"]) ** 2
     m1s_spatial_gamma = (1 - evaluation_results_dict["spatial-gamma"]) ** 2
     m1s_temporal_alpha = (1 - evaluation_results_dict["temporal-alpha"]) ** 2
     m1s_temporal_gamma = (1 - evaluation_results_dict["temporal-gamma"]) ** 2
 
-    evaluation_results_dict["comb"] = 1 - np.sqrt(
+    return 1 - np.sqrt(
         (
             m1s_beta
             + m1s_spatial_alpha
@@ -160,7 +201,69 @@ def calculate_tsm_for_gridded_data(map1, map2, ds1_name, ds2_name, eval_params=N
         * 3
         / 5
     )
-    return evaluation_results_dict
+
+
+class TSMAccumulator:
+    """Calculate the default TSM components from consecutive time blocks.
+
+    Gives the results of :func:`calculate_tsm_for_gridded_data` with its
+    default evaluation parameters without holding the cubes: the general
+    bias is accumulated from sums over the paired cells, the temporal
+    components use the area means of every timestep and the spatial
+    components the paired normalized deviations, which are kept for their
+    rank correlation.
+    """
+
+    def __init__(self):
+        self.sums = np.zeros(2, dtype=ACCUMULATOR_DTYPE)
+        self.count = 0
+        self.area_means = ([], [])
+        self.deviations = ([], [])
+
+    def update(self, block1, block2, stats=None):
+        """Add a time block of both cubes.
+
+        Parameters
+        ----------
+        block1 : numpy.ndarray
+            Block of the first cube with shape ``(time, y, x)``.
+        block2 : numpy.ndarray
+            Matching block of the second cube.
+        stats : TimestepStats, optional
+            Statistics of the block if already calculated.
+        """
+        if stats is None:
+            stats = TimestepStats(block1, block2)
+        self.sums += stats.s.sum(), stats.o.sum()
+        self.count += int(stats.n.sum())
+        for means, block in zip(self.area_means, (block1, block2)):
+            means.append(nan_area_mean(block))
+        pairs = filter_nan(norm_deviation(block1), norm_deviation(block2))
+        for deviations, values in zip(self.deviations, pairs):
+            deviations.append(values)
+
+    def result(self, ds1_name, ds2_name):
+        """Return the TSM results of all blocks added so far."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_s, mean_o = self.sums / self.count
+        evaluation_results_dict = {
+            "name": ds1_name + "-" + ds2_name,
+            "general-beta": mean_s / mean_o,
+        }
+        for param, (values1, values2) in (
+            ("temporal", self.area_means),
+            ("spatial", self.deviations),
+        ):
+            evaluation_results_dict.update(
+                objective_functions(
+                    np.concatenate(values1),
+                    np.concatenate(values2),
+                    metrics=["spearman", "variance"],
+                    param=param,
+                )
+            )
+        evaluation_results_dict["comb"] = tsm_combined_score(evaluation_results_dict)
+        return evaluation_results_dict
 
 
 calculate_objectives_for_gridded_data = calculate_tsm_for_gridded_data
@@ -14,6 +14,7 @@ Karpasitis, A.: Code for the MSPAEF metric, Zenodo [code], https://doi.org/10.52
 
 import numpy as np
 
+from mhm_tools.common.metrics.kernels import TimestepStats
 from mhm_tools.common.metrics.spaef import filter_nan
 
 
@@ -49,3 +50,19 @@ def WASPAEF(s, o):
     waspaef = np.sqrt((rho - 1) ** 2 + (sigma - 1) ** 2 + wd**2)
 
     return waspaef, rho, sigma, wd
+
+
+def waspaef_kernel(stats: TimestepStats):
+    """Calculate :func:`WASPAEF` for every timestep of a block at once.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(time, 4)`` array of waspaef, rho, sigma and wd.
+    """
+    rho = stats.rho
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma = stats.std_s / stats.std_o
+    wd = stats.wasserstein()
+    waspaef = np.sqrt((rho - 1) ** 2 + (sigma - 1) ** 2 + wd**2)
+    return np.stack([waspaef, rho, sigma, wd], axis=1)
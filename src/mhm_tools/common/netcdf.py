@@ -1,13 +1,21 @@
 """Common NetCDF/xarray routines and utilities for reading, encoding, and bounds generation."""
 
+import json
 import logging
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, List, Optional, Sequence, Set, Union
 
 import numpy as np
 import xarray as xr
 
-from mhm_tools.common.logger import ErrorLogger
+from mhm_tools.common.logger import ErrorLogger, LazySummary
 
 from .constants import (
     LAT_KEYS,
@@ -18,6 +26,17 @@ from .constants import (
     WILDCARDS,
 )
 
+try:  # public backend API to wrap lazily indexed arrays
+    from xarray.backends import BackendArray
+    from xarray.core.indexing import (
+        IndexingSupport,
+        LazilyIndexedArray,
+        explicit_indexing_adapter,
+    )
+except ImportError:  # pragma: no cover - xarray without the backend API
+    BackendArray = object
+    LazilyIndexedArray = None
+
 logger = logging.getLogger(__name__)
 
 CF_DEFAULT_CONVENTIONS = "CF-1.12"
@@ -56,6 +75,29 @@ STALE_COORD_ENCODING_KEYS = {
     "chunking",
 }
 
+NC_CODEC_PROFILES = {
+    "default": {"zlib": True, "complevel": 4, "shuffle": True},
+    "fast": {"zlib": True, "complevel": 1, "shuffle": True},
+}
+"""Compression settings of the codec profiles used by :func:`plan_nc_encoding`."""
+NC_ACCESS_PATTERNS = ("time-series", "map", "full-scan")
+"""Downstream access patterns the HDF5 chunk shapes can be planned for."""
+NC_CHUNK_TARGET_BYTES = 4 * 1024**2
+"""Uncompressed size targeted for one HDF5 chunk."""
+CODEC_SAMPLE_BYTES = 4 * 1024**2
+"""Size of the sample block compressed to select the codec profile."""
+CODEC_MIN_GAIN = 0.1
+"""Relative size reduction of the default profile needed to prefer it."""
+QUANTIZE_KEYS = ("significant_digits", "quantize_mode", "least_significant_digit")
+DATASET_CACHE_SIZE = 32
+"""Default number of open files kept by :func:`dataset_cache`."""
+_DATASET_CACHE = {"depth": 0, "size": DATASET_CACHE_SIZE, "entries": OrderedDict()}
+_DATASET_CACHE_LOCK = threading.RLock()
+NC_HEADER_THREADS = 8
+"""Number of threads opening the files of a multi-file :func:`read_dataset`."""
+NC_INDEX_NAME = ".mhm_tools_nc_index.json"
+"""Name of the per-directory file index written by :func:`read_dataset`."""
+
 # Preserve original dataset attributes throughout processing
 xr.set_options(keep_attrs=True)
 
@@ -102,10 +144,436 @@ def _fallback_open(
         raise exc
 
 
+@contextmanager
+def dataset_cache(size=DATASET_CACHE_SIZE):
+    """Share opened NetCDF files between all single-file reads in this block.
+
+    Inside the block :func:`read_dataset` keeps up to ``size`` files open,
+    keyed by path, modification time, size and engine, and returns a deep
+    copy of the cached dataset. Copies are cheap while the data is not
+    loaded, closing a copy does not close the cached file, and in-place
+    changes of loaded values are not shared. A rewritten file has a new
+    modification time and is opened again; writers close the cached file
+    first with :func:`release_cached_dataset`. Blocks can be nested and used
+    from several threads; the files are closed when the outermost block
+    exits.
+
+    Parameters
+    ----------
+    size : int, optional
+        Maximal number of cached open files, by default DATASET_CACHE_SIZE
+    """
+    with _DATASET_CACHE_LOCK:
+        _DATASET_CACHE["depth"] += 1
+        if _DATASET_CACHE["depth"] == 1:
+            _DATASET_CACHE["size"] = size
+    try:
+        yield
+    finally:
+        with _DATASET_CACHE_LOCK:
+            _DATASET_CACHE["depth"] -= 1
+            if _DATASET_CACHE["depth"] == 0:
+                for _, ds in _DATASET_CACHE["entries"].values():
+                    ds.close()
+                _DATASET_CACHE["entries"].clear()
+
+
+def _open_cached_dataset(path: str, engine: str) -> xr.Dataset:
+    """Open ``path`` through the :func:`dataset_cache` if it is active."""
+    if _DATASET_CACHE["depth"] == 0:
+        return _fallback_open(xr.open_dataset, filename_or_obj=path, engine=engine)
+    key = (str(Path(path).resolve()), engine)
+    stat = Path(path).stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _DATASET_CACHE_LOCK:
+        entries = _DATASET_CACHE["entries"]
+        cached = entries.get(key)
+        if cached is not None and cached[0] == stamp:
+            entries.move_to_end(key)
+            logger.debug(f"Reusing cached dataset {path}")
+            return cached[1].copy(deep=True)
+        if cached is not None:
+            # the file was rewritten
+            entries.pop(key)[1].close()
+        ds = _fallback_open(xr.open_dataset, filename_or_obj=path, engine=engine)
+        entries[key] = (stamp, ds)
+        while len(entries) > _DATASET_CACHE["size"]:
+            entries.popitem(last=False)[1][1].close()
+        return ds.copy(deep=True)
+
+
+def release_cached_dataset(path: Union[str, Path]) -> None:
+    """Close the :func:`dataset_cache` entries of ``path`` before rewriting it.
+
+    NetCDF files cannot be overwritten while they are open in this process.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        File that is about to be written.
+    """
+    if _DATASET_CACHE["depth"] == 0:
+        return
+    path = str(Path(path).resolve())
+    with _DATASET_CACHE_LOCK:
+        entries = _DATASET_CACHE["entries"]
+        for key in [key for key in entries if key[0] == path]:
+            entries.pop(key)[1].close()
+
+
+def _time_range(ds: xr.Dataset, time_dim: str) -> Optional[list]:
+    """Return the first and last time of ``ds``, None if it cannot be ordered.
+
+    Datetimes are given in nanoseconds since the epoch, so the range can be
+    stored as JSON.
+    """
+    index = ds.indexes.get(time_dim)
+    if (
+        index is None
+        or len(index) == 0
+        or not index.is_monotonic_increasing
+        or not index.is_unique
+    ):
+        return None
+    values = np.asarray(index[[0, -1]])
+    if values.dtype.kind == "M":
+        return values.astype("datetime64[ns]").astype(np.int64).tolist()
+    if values.dtype.kind in "iuf":
+        return values.astype(np.float64).tolist()
+    return None
+
+
+def _grid_signature(ds: xr.Dataset, time_dim: str) -> str:
+    """Return a checksum of everything of ``ds`` except the time axis.
+
+    Covers the time dtype, the sizes of the other dimensions, the values of
+    the coordinates without the time dimension and the names, dimensions and
+    dtypes of all variables.
+    """
+    sizes = sorted((str(dim), size) for dim, size in ds.sizes.items())
+    sizes = [item for item in sizes if item[0] != time_dim]
+    checksum = zlib.crc32(f"{ds[time_dim].dtype}{sizes}".encode())
+    for name in sorted(ds.variables, key=str):
+        var = ds.variables[name]
+        checksum = zlib.crc32(f"{name}{var.dims}{var.dtype}".encode(), checksum)
+        if name in ds.coords and time_dim not in var.dims:
+            values = np.asarray(var.values)
+            data = (
+                repr(values.tolist()).encode()
+                if values.dtype.kind == "O"
+                else np.ascontiguousarray(values).tobytes()
+            )
+            checksum = zlib.crc32(data, checksum)
+    return f"{checksum:08x}"
+
+
+def _to_json(value: Any) -> Any:
+    """Convert attributes, encodings and coordinate values to JSON types.
+
+    Raises TypeError for values that cannot be restored by :func:`_from_json`.
+    """
+    if isinstance(value, np.dtype):
+        return {"__dtype__": value.str}
+    if isinstance(value, (np.ndarray, np.generic)):
+        array = np.asarray(value)
+        if array.dtype.kind not in "biufcmMU":
+            msg = f"Cannot store values of dtype {array.dtype} in the index."
+            raise TypeError(msg)
+        data = array.astype(np.int64) if array.dtype.kind in "mM" else array
+        return {
+            "__array__": array.dtype.str,
+            "scalar": isinstance(value, np.generic),
+            "data": data.tolist(),
+        }
+    if isinstance(value, dict):
+        return {str(key): _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    msg = f"Cannot store {type(value).__name__} values in the index."
+    raise TypeError(msg)
+
+
+def _from_json(value: Any) -> Any:
+    """Restore values converted by :func:`_to_json`."""
+    if isinstance(value, dict) and "__dtype__" in value:
+        return np.dtype(value["__dtype__"])
+    if isinstance(value, dict) and "__array__" in value:
+        dtype = np.dtype(value["__array__"])
+        if dtype.kind in "mM":
+            array = np.asarray(value["data"], dtype=np.int64).astype(dtype)
+        else:
+            array = np.asarray(value["data"], dtype=dtype)
+        return array[()] if value["scalar"] else array
+    if isinstance(value, dict):
+        return {key: _from_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return tuple(_from_json(item) for item in value)
+    return value
+
+
+def _describe_variables(ds: xr.Dataset, time_dim: str) -> tuple:
+    """Return the variable layout and the values needed to rebuild ``ds``.
+
+    The layout holds dimensions, shape, dtype, attributes and encoding of
+    every variable; values are kept for the time coordinate and for the
+    coordinates without the time dimension, all other data is read lazily.
+    """
+    variables = {}
+    values = {}
+    for name, var in ds.variables.items():
+        variables[str(name)] = {
+            "dims": list(var.dims),
+            "shape": list(var.shape),
+            "dtype": _to_json(var.dtype),
+            "attrs": _to_json(var.attrs),
+            "encoding": _to_json(var.encoding),
+            "coord": name in ds.coords,
+        }
+        if name == time_dim or (name in ds.coords and time_dim not in var.dims):
+            values[str(name)] = _to_json(var.values)
+    return {"attrs": _to_json(ds.attrs), "variables": variables}, values
+
+
+def _read_header(path: str, engine: str) -> dict:
+    """Describe ``path`` for the combine plan.
+
+    The entry holds the modification time and size, the time dimension, the
+    time range and grid signature, and, if the file can be concatenated in
+    time, the layout (``"dataset"``) and coordinate values (``"values"``)
+    to rebuild it without opening the file.
+    """
+    stat = Path(path).stat()
+    with _fallback_open(xr.open_dataset, filename_or_obj=path, engine=engine) as ds:
+        time_dim = next((dim for dim in ds.dims if dim in TIME_KEYS), None)
+        entry = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "time_dim": time_dim,
+            "time": None if time_dim is None else _time_range(ds, time_dim),
+            "grid": None if time_dim is None else _grid_signature(ds, time_dim),
+            "dataset": None,
+            "values": None,
+        }
+        if entry["time"] is not None:
+            try:
+                entry["dataset"], entry["values"] = _describe_variables(ds, time_dim)
+            except TypeError as exc:
+                logger.debug(f"Not indexing the layout of {path}: {exc}")
+    return entry
+
+
+def _load_index(directory: Path) -> dict:
+    """Return the file entries of the index in ``directory``.
+
+    The coordinate values are stored once per grid signature in the file and
+    added to the entries again.
+    """
+    try:
+        content = json.loads((directory / NC_INDEX_NAME).read_text())
+        files, grids = content["files"], content["grids"]
+        for entry in files.values():
+            if entry["dataset"] is not None:
+                entry["values"] = {**grids[entry["grid"]], **entry["values"]}
+    except (OSError, ValueError, TypeError, KeyError):
+        return {}
+    return files
+
+
+def _store_index(directory: Path, files: dict) -> None:
+    """Write the file entries of ``directory``, skipped if it is read-only."""
+    grids = {}
+    stored = {}
+    for name, entry in files.items():
+        stored[name] = dict(entry)
+        if entry["dataset"] is not None:
+            time_dim = entry["time_dim"]
+            values = entry["values"]
+            grids.setdefault(
+                entry["grid"], {k: v for k, v in values.items() if k != time_dim}
+            )
+            stored[name]["values"] = {time_dim: values[time_dim]}
+    path = directory / NC_INDEX_NAME
+    # write to a temporary name so concurrent readers never see partial files
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}")
+    try:
+        tmp_path.write_text(json.dumps({"files": stored, "grids": grids}))
+        tmp_path.replace(path)
+    except OSError as exc:
+        logger.debug(f"Could not write the NetCDF index {path}: {exc}")
+        tmp_path.unlink(missing_ok=True)
+
+
+def _is_fresh(entry: Optional[dict], path: str) -> bool:
+    """Whether the index entry still describes the file at ``path``."""
+    if not isinstance(entry, dict):
+        return False
+    stat = Path(path).stat()
+    return (entry.get("mtime_ns"), entry.get("size")) == (
+        stat.st_mtime_ns,
+        stat.st_size,
+    )
+
+
+def _combine_order(entries: List[dict]) -> Optional[List[int]]:
+    """Return the time order of the files, None if they need combine_by_coords.
+
+    The files can be concatenated in this order if they share the time
+    dimension and the grid signature and their time ranges do not overlap.
+    """
+    time_dims = {entry["time_dim"] for entry in entries}
+    grids = {entry["grid"] for entry in entries}
+    if (
+        len(time_dims) != 1
+        or None in time_dims
+        or len(grids) != 1
+        or any(entry["time"] is None for entry in entries)
+    ):
+        return None
+    order = sorted(range(len(entries)), key=lambda i: entries[i]["time"][0])
+    for prev, nxt in zip(order[:-1], order[1:]):
+        if entries[prev]["time"][1] >= entries[nxt]["time"][0]:
+            return None
+    return order
+
+
+class _FileVariableArray(BackendArray):
+    """Variable of a NetCDF file, the file is only opened when indexed.
+
+    Inside a :func:`dataset_cache` block the opened file is shared.
+    """
+
+    def __init__(self, path, engine, name, shape, dtype):
+        self.path = path
+        self.engine = engine
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+    def __getitem__(self, key):
+        return explicit_indexing_adapter(
+            key, self.shape, IndexingSupport.OUTER, self._getitem
+        )
+
+    def _getitem(self, key):
+        ds = _open_cached_dataset(self.path, self.engine)
+        try:
+            # variables index orthogonally, as the OUTER support requires
+            return np.asarray(ds.variables[self.name][key].values, dtype=self.dtype)
+        finally:
+            ds.close()
+
+
+def _lazy_dataset(path: str, entry: dict, engine: str) -> xr.Dataset:
+    """Rebuild the dataset of ``path`` from its index entry without opening it.
+
+    Coordinates are taken from the entry, all other variables are dask
+    arrays of one chunk reading the file on access.
+    """
+    layout = entry["dataset"]
+    values = entry["values"]
+    variables = {}
+    coords = {}
+    for name, spec in layout["variables"].items():
+        dtype = _from_json(spec["dtype"])
+        if name in values:
+            data = np.asarray(_from_json(values[name]), dtype=dtype)
+        else:
+            shape = tuple(spec["shape"])
+            data = LazilyIndexedArray(
+                _FileVariableArray(path, engine, name, shape, dtype)
+            )
+        var = xr.Variable(
+            spec["dims"],
+            data,
+            attrs=_from_json(spec["attrs"]),
+            encoding=_from_json(spec["encoding"]),
+        )
+        if name not in values:
+            var = var.chunk(dict(zip(var.dims, var.shape)))
+        (coords if spec["coord"] else variables)[name] = var
+    return xr.Dataset(variables, coords=coords, attrs=_from_json(layout["attrs"]))
+
+
+def _open_multi_file(paths: List[str], engine: str, cache_index: bool) -> xr.Dataset:
+    """Combine several files, concatenating them in time order if possible.
+
+    The file headers are read in a thread pool. Files sharing their grid
+    with disjoint time ranges are rebuilt from their headers as lazy dask
+    datasets, one chunk per file and variable, and joined with
+    :func:`xarray.combine_nested` in time order; the data is read when it is
+    accessed. Other files are opened and combined with
+    :func:`xarray.combine_by_coords`. With ``cache_index`` the headers are
+    stored in an index per directory (:data:`NC_INDEX_NAME`) and reused
+    while the modification time and size of a file are unchanged, so no
+    file is opened to build the dataset.
+    """
+    indexes = {}
+    entries = {}
+    if cache_index:
+        for p in paths:
+            directory = Path(p).resolve().parent
+            files = indexes.setdefault(directory, _load_index(directory))
+            if _is_fresh(files.get(Path(p).name), p):
+                entries[p] = files[Path(p).name]
+
+    def _header(p):
+        logger.debug(f"Reading header of {p}")
+        try:
+            return _read_header(p, engine)
+        except Exception as exc:
+            logger.error(f"Failed opening {p}: {exc}")
+            raise
+
+    missing = [p for p in paths if p not in entries]
+    if missing:
+        with ThreadPoolExecutor(min(NC_HEADER_THREADS, len(missing))) as pool:
+            entries.update(zip(missing, pool.map(_header, missing)))
+    if cache_index and missing:
+        for p in missing:
+            indexes[Path(p).resolve().parent][Path(p).name] = entries[p]
+        for directory, files in indexes.items():
+            _store_index(directory, files)
+
+    ordered = [entries[p] for p in paths]
+    order = _combine_order(ordered)
+    lazy = LazilyIndexedArray is not None and all(e["dataset"] for e in ordered)
+    if order is not None and lazy:
+        logger.debug(f"Concatenating {len(paths)} files in time order")
+        return xr.combine_nested(
+            [_lazy_dataset(paths[i], ordered[i], engine) for i in order],
+            concat_dim=ordered[0]["time_dim"],
+            combine_attrs="override",
+            compat="override",
+            coords="minimal",
+            join="override",
+        )
+    arrays = []
+    for p in paths:
+        logger.debug(f"Opening (single) {p}")
+        try:
+            ds_tmp = _fallback_open(xr.open_dataset, filename_or_obj=p, engine=engine)
+        except Exception as exc:
+            logger.error(f"Failed opening {p}: {exc}")
+            raise
+        arrays.append(ds_tmp)
+    try:
+        return xr.combine_by_coords(
+            arrays,
+            combine_attrs="override",
+            compat="override",
+            coords="minimal",
+        )
+    except Exception:
+        return xr.combine_by_coords(arrays)
+
+
 def read_dataset(
     file_path: Union[str, Path, List[Union[str, Path]]],
     use_mfdataset: bool = False,
     engine: str = "netcdf4",
+    cache_index: bool = False,
 ) -> xr.Dataset:
     """
     Load one or more NetCDF files into a single xarray.Dataset.
@@ -113,12 +581,15 @@ def read_dataset(
     This function accepts either a single path (possibly containing
     shell-style wildcards), or a list of paths, and handles both:
 
-    - Single-file case: opens it directly.
+    - Single-file case: opens it directly (or reuses it from an active
+      :func:`dataset_cache`).
     - Multi-file case:
         * If `use_mfdataset=True`, uses `xarray.open_mfdataset` for
           contiguous datasets.
-        * Otherwise, opens each file individually and combines them
-          via coordinates (attributes overridden).
+        * Otherwise, reads the file headers in a thread pool. Files sharing
+          their grid with disjoint time ranges are concatenated lazily in
+          time order (dask, one chunk per file), others are opened and
+          combined via coordinates (attributes overridden).
 
     Parameters
     ----------
@@ -131,6 +602,12 @@ def read_dataset(
         `xr.open_dataset` and combine.
     engine : str, default "netcdf4"
         The backend engine to use for opening NetCDF files.
+    cache_index : bool, default False
+        For multiple files without `use_mfdataset`, keep the headers (time
+        range, grid signature, layout and coordinates) of every file in an
+        index per directory (:data:`NC_INDEX_NAME`), so later reads build
+        the dataset without opening the files until one of them is
+        modified.
 
     Returns
     -------
@@ -190,32 +667,13 @@ def read_dataset(
                 logger.error(f"open_mfdataset failed on {paths!r}: {exc}")
                 raise
             return ds
-        arrays = []
-        for p in paths:
-            logger.debug(f"Opening (single) {p}")
-            try:
-                ds_tmp = _fallback_open(
-                    xr.open_dataset, filename_or_obj=p, engine=engine
-                )
-            except Exception as exc:
-                logger.error(f"Failed opening {p}: {exc}")
-                raise
-            arrays.append(ds_tmp)
-        try:
-            return xr.combine_by_coords(
-                arrays,
-                combine_attrs="override",
-                compat="override",
-                coords="minimal",
-            )
-        except Exception:
-            return xr.combine_by_coords(arrays)
+        return _open_multi_file(paths, engine, cache_index)
 
     # Single-file case
     single = paths[0]
     logger.debug(f"Reading single NetCDF file: {single}")
     try:
-        ds = _fallback_open(xr.open_dataset, filename_or_obj=single, engine=engine)
+        ds = _open_cached_dataset(single, engine)
     except Exception as exc:
         logger.error(f"Failed opening {single}: {exc}")
         raise
@@ -287,7 +745,7 @@ def _ensure_bounds_exist(ds: xr.Dataset, bounds_dim: str = "bnds") -> None:
         # Bounds missing: try to generate and attach
         try:
             if da.ndim != 1 or da.sizes[da.dims[0]] < 2:
-                logger.debug(f"da: {da}")
+                logger.debug("da: %s", LazySummary(da))
                 msg = "Cannot generate bounds for non-1D or too short data."
                 with ErrorLogger(logger):
                     raise ValueError(msg)
@@ -319,10 +777,17 @@ def sanitize_nc_encoding(ds: "xr.Dataset", encoding: dict) -> dict:  # noqa: PLR
         e = dict(encoding[name])  # shallow copy
 
         # Always keep compression settings
+        chunksizes = e.get("chunksizes")
         for k in list(e.keys()):
-            if k not in {"zlib", "complevel", "shuffle", "_FillValue"}:
+            if k not in {"zlib", "complevel", "shuffle", "_FillValue", *QUANTIZE_KEYS}:
                 # 'missing_value' and any other stray keys should not live in 'encoding'
                 e.pop(k, None)
+        # keep explicitly requested chunk shapes that fit the variable
+        if chunksizes is not None and len(chunksizes) == da.ndim and da.ndim > 0:
+            e["chunksizes"] = tuple(
+                max(1, min(int(size), length))
+                for size, length in zip(chunksizes, da.shape)
+            )
 
         # Clean any leftover attrs that might have been set earlier
         # (especially important for boolean vars) and avoid conflicts
@@ -363,6 +828,11 @@ def sanitize_nc_encoding(ds: "xr.Dataset", encoding: dict) -> dict:  # noqa: PLR
                 # drop if cannot cast
                 da.attrs.pop("missing_value", None)
 
+        if not np.issubdtype(dtype, np.floating):
+            # quantization only applies to floating point data
+            for key in QUANTIZE_KEYS:
+                e.pop(key, None)
+
         if np.issubdtype(dtype, np.bool_):
             # Booleans: do NOT set fill attributes at all
             e.pop("_FillValue", None)
@@ -402,6 +872,191 @@ def sanitize_nc_encoding(ds: "xr.Dataset", encoding: dict) -> dict:  # noqa: PLR
     return enc_out
 
 
+def _multiple_below(limit: float, size: int) -> int:
+    """Clip ``limit`` to ``[1, size]`` as an integer chunk length."""
+    return int(max(1, min(size, int(limit))))
+
+
+def plan_nc_chunksizes(
+    da: xr.DataArray,
+    access: str,
+    time_dim: Optional[str] = None,
+    target_bytes: int = NC_CHUNK_TARGET_BYTES,
+) -> tuple:
+    """Plan HDF5 chunk sizes of a variable for a downstream access pattern.
+
+    The last two non-time dimensions are treated as the spatial grid, other
+    dimensions are stored whole.
+
+    Parameters
+    ----------
+    da : xarray.DataArray
+        Variable to be written.
+    access : str
+        One of :data:`NC_ACCESS_PATTERNS`: ``"time-series"`` stores long time
+        series of small spatial blocks, ``"map"`` whole maps of single time
+        steps, and ``"full-scan"`` balanced blocks.
+    time_dim : str, optional
+        Name of the time dimension, by default None
+    target_bytes : int, optional
+        Uncompressed size of one chunk, by default NC_CHUNK_TARGET_BYTES
+
+    Returns
+    -------
+    tuple
+        Chunk size per dimension of ``da``.
+    """
+    if access not in NC_ACCESS_PATTERNS:
+        msg = f"Unknown access pattern {access!r}, use one of {NC_ACCESS_PATTERNS}"
+        with ErrorLogger(logger):
+            raise ValueError(msg)
+    sizes = dict(da.sizes)
+    if time_dim not in sizes:
+        time_dim = None
+    space = [dim for dim in da.dims if dim != time_dim][-2:]
+    chunks = dict(sizes)
+    other = [dim for dim in da.dims if dim != time_dim and dim not in space]
+    cells = max(1, target_bytes // da.dtype.itemsize)
+    for dim in other:
+        cells = max(1, cells // sizes[dim])
+    nt = sizes[time_dim] if time_dim else 1
+
+    def _square(n_cells):
+        if len(space) == 1:
+            chunks[space[0]] = _multiple_below(n_cells, sizes[space[0]])
+            return
+        if not space:
+            return
+        ny, nx = sizes[space[0]], sizes[space[1]]
+        rows = _multiple_below(np.sqrt(n_cells), ny)
+        cols = _multiple_below(n_cells // rows, nx)
+        chunks[space[0]] = _multiple_below(n_cells // cols, ny)
+        chunks[space[1]] = cols
+
+    if access == "time-series":
+        t_chunk = _multiple_below(cells, nt)
+        _square(cells // t_chunk)
+    elif access == "map":
+        _square(cells)
+        t_chunk = 1
+    else:
+        n_space = int(np.prod([sizes[dim] for dim in space])) if space else 1
+        t_chunk = _multiple_below(round(cells ** (1 / (1 + len(space)))), nt)
+        _square(min(n_space, cells // t_chunk))
+        block = int(np.prod([chunks[dim] for dim in space])) if space else 1
+        t_chunk = _multiple_below(cells // block, nt)
+    if time_dim:
+        chunks[time_dim] = t_chunk
+    return tuple(int(chunks[dim]) for dim in da.dims)
+
+
+def _sample_block(da: xr.DataArray, max_bytes: int = CODEC_SAMPLE_BYTES):
+    """Return a contiguous block of at most ``max_bytes`` from the start of ``da``."""
+    cells = max(1, max_bytes // da.dtype.itemsize)
+    window = {}
+    for dim in reversed(da.dims):
+        length = _multiple_below(cells, da.sizes[dim])
+        window[dim] = slice(0, length)
+        cells = max(1, cells // length)
+    return np.ascontiguousarray(da.isel(window).values)
+
+
+def _compress_sample(raw: bytes, level: int) -> tuple:
+    """Return the compressed size and the duration of compressing ``raw``."""
+    start = time.perf_counter()
+    size = len(zlib.compress(raw, level))
+    return size, time.perf_counter() - start
+
+
+def select_codec_profile(da: xr.DataArray, max_bytes: int = CODEC_SAMPLE_BYTES) -> str:
+    """Select the codec profile by compressing a sample block of ``da``.
+
+    The sample is byte shuffled like the HDF5 shuffle filter and compressed
+    with the zlib levels of the ``"default"`` and ``"fast"`` profiles. The
+    default profile is only kept if it is smaller by at least
+    :data:`CODEC_MIN_GAIN` than the fast one.
+
+    Parameters
+    ----------
+    da : xarray.DataArray
+        Variable to be written.
+    max_bytes : int, optional
+        Size of the sample block, by default CODEC_SAMPLE_BYTES
+
+    Returns
+    -------
+    str
+        ``"default"`` or ``"fast"``.
+    """
+    sample = _sample_block(da, max_bytes)
+    if sample.size == 0:
+        return "default"
+    itemsize = sample.dtype.itemsize
+    raw = sample.view(np.uint8).reshape(-1, itemsize).T.tobytes()
+    fast_size, fast_time = _compress_sample(raw, NC_CODEC_PROFILES["fast"]["complevel"])
+    default_size, default_time = _compress_sample(
+        raw, NC_CODEC_PROFILES["default"]["complevel"]
+    )
+    gain = (fast_size - default_size) / max(fast_size, 1)
+    profile = "default" if gain >= CODEC_MIN_GAIN else "fast"
+    logger.debug(
+        f"Codec sample of {da.name}: fast {fast_size} B in {fast_time:.3f}s, "
+        f"default {default_size} B in {default_time:.3f}s -> {profile}"
+    )
+    return profile
+
+
+def plan_nc_encoding(
+    ds: xr.Dataset,
+    data_vars: Optional[Sequence[str]] = None,
+    access: Optional[str] = None,
+    profile: str = "default",
+    significant_digits: Optional[int] = None,
+) -> dict:
+    """Plan the NetCDF encoding of data variables for writing.
+
+    Parameters
+    ----------
+    ds : xarray.Dataset
+        Dataset to be written.
+    data_vars : sequence of str, optional
+        Variables to plan, by default all data variables
+    access : str, optional
+        Downstream access pattern (see :func:`plan_nc_chunksizes`),
+        by default None, leaving the chunk shapes to the library
+    profile : str, optional
+        Codec profile, one of :data:`NC_CODEC_PROFILES` or ``"auto"`` to
+        select it per variable with :func:`select_codec_profile`,
+        by default "default"
+    significant_digits : int, optional
+        Quantize floating point variables to this number of significant
+        digits before compression (netCDF4 engine), by default None
+
+    Returns
+    -------
+    dict
+        Encoding per data variable.
+    """
+    if profile != "auto" and profile not in NC_CODEC_PROFILES:
+        msg = f"Unknown codec profile {profile!r}, use one of {[*NC_CODEC_PROFILES, 'auto']}"
+        with ErrorLogger(logger):
+            raise ValueError(msg)
+    if data_vars is None:
+        data_vars = list(ds.data_vars)
+    time_dim = _get_time_coord_key(ds)
+    encoding = {}
+    for name in data_vars:
+        da = ds[name]
+        var_profile = select_codec_profile(da) if profile == "auto" else profile
+        enc = {**NC_CODEC_PROFILES[var_profile], **NC_ENCODE_DEFAULTS}
+        if access is not None and da.ndim > 0:
+            enc["chunksizes"] = plan_nc_chunksizes(da, access, time_dim)
+        if significant_digits is not None and np.issubdtype(da.dtype, np.floating):
+            enc["significant_digits"] = int(significant_digits)
+        encoding[name] = enc
+    return encoding
+
+
 def get_netcdf_metadata_data_vars(dataset: xr.Dataset) -> Set[str]:
     """Return data variables that describe metadata rather than payload data.
 
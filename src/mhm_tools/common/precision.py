@@ -0,0 +1,185 @@
+"""Floating point precision policy of the computations.
+
+The compute dtype is either ``float64`` (default), where computations promote
+to double precision as numpy does, or ``float32``, where float32 inputs stay
+float32 end to end: the readers cast double precision data variables to
+float32, the chunk planner budgets four bytes per value and the writers store
+float32. Accumulations that need the precision (running means and variances,
+sums over long time series, upstream areas) use :data:`ACCUMULATOR_DTYPE`
+under both policies.
+
+The policy is stored in the environment variable :data:`COMPUTE_DTYPE_ENV`,
+so joblib worker processes inherit it.
+"""
+
+import logging
+import os
+
+import numpy as np
+import xarray as xr
+
+from mhm_tools.common.logger import ErrorLogger, shutdown_loky_workers
+
+try:  # public backend API to wrap lazily indexed arrays
+    from xarray.backends import BackendArray
+    from xarray.core.indexing import (
+        IndexingSupport,
+        LazilyIndexedArray,
+        explicit_indexing_adapter,
+    )
+except ImportError:  # pragma: no cover - xarray without the backend API
+    BackendArray = object
+    LazilyIndexedArray = None
+
+logger = logging.getLogger(__name__)
+
+COMPUTE_DTYPE_ENV = "MHM_TOOLS_COMPUTE_DTYPE"
+"""Environment variable holding the compute dtype."""
+COMPUTE_DTYPES = ("float32", "float64")
+"""Available compute dtypes."""
+DEFAULT_COMPUTE_DTYPE = "float64"
+"""Compute dtype if none is set."""
+ACCUMULATOR_DTYPE = np.float64
+"""Dtype of precision critical accumulations, independent of the policy."""
+
+
+def set_compute_dtype(dtype):
+    """Set the compute dtype of this process and of worker processes.
+
+    Parameters
+    ----------
+    dtype : str or None
+        One of :data:`COMPUTE_DTYPES`; None restores the default.
+    """
+    if dtype is None:
+        os.environ.pop(COMPUTE_DTYPE_ENV, None)
+    else:
+        dtype = np.dtype(dtype).name
+        if dtype not in COMPUTE_DTYPES:
+            msg = f"Unknown compute dtype '{dtype}', use one of {COMPUTE_DTYPES}."
+            with ErrorLogger(logger):
+                raise ValueError(msg)
+        os.environ[COMPUTE_DTYPE_ENV] = dtype
+    logger.debug(f"Compute dtype set to {get_compute_dtype()}")
+    # idle loky workers started before would keep the old policy
+    shutdown_loky_workers()
+
+
+def get_compute_dtype() -> np.dtype:
+    """Return the compute dtype, ``float32`` or ``float64``."""
+    dtype = os.environ.get(COMPUTE_DTYPE_ENV) or DEFAULT_COMPUTE_DTYPE
+    if dtype not in COMPUTE_DTYPES:
+        logger.warning(
+            f"Ignoring unknown compute dtype {COMPUTE_DTYPE_ENV}={dtype}, "
+            f"using {DEFAULT_COMPUTE_DTYPE}."
+        )
+        dtype = DEFAULT_COMPUTE_DTYPE
+    return np.dtype(dtype)
+
+
+def compute_dtype_of(dtype) -> np.dtype:
+    """Return the dtype data of ``dtype`` has under the compute dtype policy.
+
+    Floating point data is reduced to float32 under the ``float32`` policy,
+    any other data keeps its dtype.
+    """
+    dtype = np.dtype(dtype)
+    compute = get_compute_dtype()
+    if np.issubdtype(dtype, np.floating) and dtype.itemsize > compute.itemsize:
+        return compute
+    return dtype
+
+
+def _needs_cast(var: xr.Variable) -> bool:
+    """Whether the data or the encoded dtype of ``var`` exceeds the policy."""
+    encoded = np.dtype(var.encoding.get("dtype", var.dtype))
+    return compute_dtype_of(var.dtype) != var.dtype or (
+        compute_dtype_of(encoded) != encoded
+    )
+
+
+class _CastArray(BackendArray):
+    """Lazily indexed array casting the indexed values of a variable.
+
+    Parameters
+    ----------
+    variable : xarray.Variable
+        Variable to cast, lazily opened file data is only read when indexed.
+    dtype : numpy.dtype
+        Target dtype.
+    """
+
+    def __init__(self, variable, dtype):
+        self.variable = variable
+        self.shape = variable.shape
+        self.dtype = np.dtype(dtype)
+
+    def __getitem__(self, key):
+        return explicit_indexing_adapter(
+            key, self.shape, IndexingSupport.OUTER, self._getitem
+        )
+
+    def _getitem(self, key):
+        # variables index orthogonally, as the OUTER support requires
+        return np.asarray(self.variable[key].values, dtype=self.dtype)
+
+
+def _cast_variable(var: xr.Variable, dtype: np.dtype) -> xr.Variable:
+    """Cast a variable without loading lazily opened file data."""
+    if var.dtype == dtype:
+        cast = var.copy(deep=False)
+    elif var.chunks is not None or LazilyIndexedArray is None:
+        cast = var.astype(dtype)
+        cast.encoding = dict(var.encoding)
+    else:
+        cast = xr.Variable(
+            var.dims,
+            LazilyIndexedArray(_CastArray(var, dtype)),
+            attrs=var.attrs,
+            encoding=var.encoding,
+        )
+    if "dtype" in cast.encoding:
+        cast.encoding["dtype"] = compute_dtype_of(cast.encoding["dtype"])
+    return cast
+
+
+def cast_to_compute_dtype(data):
+    """Cast floating point data to the compute dtype.
+
+    Only reduces the precision (under the ``float32`` policy), float32 data
+    is not promoted under the ``float64`` policy. Wider encoded dtypes of
+    dataset variables are reduced as well. Coordinates keep their dtype.
+    Dask backed data is cast by dask, other data is cast when it is indexed
+    or loaded, so lazily opened file data is not read here.
+
+    Parameters
+    ----------
+    data : numpy.ndarray, xarray.DataArray or xarray.Dataset
+        Data to cast.
+
+    Returns
+    -------
+    numpy.ndarray, xarray.DataArray or xarray.Dataset
+        The data, cast where needed.
+    """
+    if isinstance(data, xr.Dataset):
+        cast = {
+            name: _cast_variable(var.variable, compute_dtype_of(var.dtype))
+            for name, var in data.data_vars.items()
+            if _needs_cast(var.variable)
+        }
+        if not cast:
+            return data
+        cast_data = data.assign(cast)
+        # closing the cast dataset closes the opened file
+        cast_data.set_close(data.close)
+        return cast_data
+    if isinstance(data, xr.DataArray):
+        dtype = compute_dtype_of(data.dtype)
+        if dtype == data.dtype:
+            return data
+        return xr.DataArray(
+            _cast_variable(data.variable, dtype), coords=data.coords, name=data.name
+        )
+    data = np.asarray(data)
+    return data.astype(compute_dtype_of(data.dtype), copy=False)
@@ -1,12 +1,14 @@
 """Time-related helpers for resampling datasets."""
 
 import logging
-from typing import Literal, Union
+import warnings
+from typing import Literal, Optional, Union
 
+import numpy as np
 import pandas as pd
 import xarray as xr
 
-from mhm_tools.common.logger import ErrorLogger
+from mhm_tools.common.logger import ErrorLogger, LazySummary
 from mhm_tools.common.xarray_utils import timedelta_to_alias
 
 logger = logging.getLogger(__name__)
@@ -130,6 +132,9 @@ def _distribute_extensive_to_finer(
 
     Evenly distributes each coarse-step total into its child finer bins.
     """
+    fast = _resample_regular(da, alias_out, intensive=False, upsample_for_intensive="")
+    if fast is not None:
+        return fast
     # how many target bins per source step?
     dt_src = _per_step_duration_index(da["time"], alias_in)
     dt_out = _offset_for_alias(alias_out)
@@ -143,6 +148,150 @@ def _distribute_extensive_to_finer(
     return per_bin.resample(time=alias_out).ffill()
 
 
+def _regular_step(time: xr.DataArray) -> Optional[pd.Timedelta]:
+    """Return the constant step of a gap-free datetime axis, else None."""
+    if time.size < 2 or not np.issubdtype(time.dtype, np.datetime64):
+        return None
+    stamps = pd.DatetimeIndex(time.values).asi8
+    diffs = np.diff(stamps)
+    if diffs[0] <= 0 or np.any(diffs != diffs[0]):
+        return None
+    return pd.Timedelta(int(diffs[0]), unit=pd.DatetimeIndex(time.values).unit)
+
+
+def _is_dask(data) -> bool:
+    return type(data).__module__.startswith("dask")
+
+
+def _nan_block_reduce(block: np.ndarray, k: int, how: str) -> np.ndarray:
+    """Reduce consecutive blocks of ``k`` steps along axis 0, skipping NaN.
+
+    A plain sum runs at memory bandwidth; only blocks whose sum is NaN are
+    reduced again with the slower NaN-skipping functions.
+    """
+    block = block.reshape((block.shape[0] // k, k) + block.shape[1:])
+    out = block.sum(axis=1)
+    missing = np.isnan(out)
+    if how == "mean":
+        out /= k
+    if missing.any():
+        values = np.moveaxis(block, 1, -1)[missing]
+        if how == "sum":
+            out[missing] = np.nansum(values, axis=-1)
+        else:
+            with warnings.catch_warnings():
+                # all-NaN blocks give NaN like xarray's skipna mean
+                warnings.simplefilter("ignore", category=RuntimeWarning)
+                out[missing] = np.nanmean(values, axis=-1)
+    return out
+
+
+def _block_reduce(data, k: int, how: str, lead: int, trail: int):
+    """Pad ``data`` with NaN and reduce blocks of ``k`` steps along axis 0."""
+    if _is_dask(data):
+        import dask.array as dsa
+
+        pad = [(lead, trail)] + [(0, 0)] * (data.ndim - 1)
+        if lead or trail:
+            data = dsa.pad(data, pad, mode="constant", constant_values=np.nan)
+        # every chunk must hold whole blocks
+        data = data.rechunk({0: max(k, data.chunks[0][0] // k * k)})
+        return data.map_blocks(
+            _nan_block_reduce,
+            k,
+            how,
+            chunks=(tuple(c // k for c in data.chunks[0]), *data.chunks[1:]),
+            dtype=data.dtype,
+        )
+    if lead or trail:
+        pad = [(lead, trail)] + [(0, 0)] * (data.ndim - 1)
+        data = np.pad(data, pad, mode="constant", constant_values=np.nan)
+    return _nan_block_reduce(data, k, how)
+
+
+def _upsample_steps(data, k: int, how: str):
+    """Fill ``k - 1`` steps between all source steps along axis 0.
+
+    ``how`` is "ffill" (repeat the previous value) or "linear". The result
+    ends at the last source step like pandas/xarray upsampling.
+    """
+    xp = np
+    if _is_dask(data):
+        import dask.array as xp
+    n = data.shape[0]
+    if how == "ffill":
+        return xp.repeat(data, k, axis=0)[: (n - 1) * k + 1]
+    lower = data[:-1]
+    upper = data[1:]
+    # the source steps are kept as they are, even next to missing values
+    steps = [lower] + [lower * (1 - r / k) + upper * (r / k) for r in range(1, k)]
+    inner = xp.stack(steps, axis=1).reshape(((n - 1) * k,) + data.shape[1:])
+    return xp.concatenate([inner, data[-1:]], axis=0)
+
+
+def _resample_regular(  # noqa: PLR0911
+    da: xr.DataArray,
+    alias_out: str,
+    intensive: bool,
+    upsample_for_intensive: str,
+) -> Optional[xr.DataArray]:
+    """Resample a regular, gap-free time axis with reshape-based kernels.
+
+    Downsampling uses NaN-skipping block sums/means, upsampling repeats
+    (intensive ffill, extensive sum-preserving distribution) or interpolates
+    linearly between the source steps. Results equal xarray's calendar
+    resampling. Returns None if the axis or the data does not qualify, so the
+    caller can fall back to ``xarray.resample``.
+    """
+    if "time" not in da.dims or not np.issubdtype(da.dtype, np.floating):
+        return None
+    if any("time" in da[c].dims for c in da.coords if c != "time"):
+        return None
+    step = _regular_step(da["time"])
+    if step is None:
+        return None
+    try:
+        period = pd.Timedelta(alias_out if alias_out[0].isdigit() else f"1{alias_out}")
+    except ValueError:
+        return None
+    time = pd.DatetimeIndex(da["time"].values)
+    start = time[0].floor(period)
+    dims = da.dims
+    da_t = da.transpose("time", ...)
+    data = da_t.data
+    n = da.sizes["time"]
+
+    if step <= period:
+        if period % step:
+            return None
+        k = int(period // step)
+        lead = int((time[0] - start) // step)
+        n_out = -(-(lead + n) // k)
+        how = "mean" if intensive else "sum"
+        out = _block_reduce(data, k, how, lead, n_out * k - lead - n)
+    else:
+        if step % period or time[0] != start:
+            return None
+        k = int(step // period)
+        n_out = (n - 1) * k + 1
+        if intensive:
+            if upsample_for_intensive not in ("linear", "ffill"):
+                return None
+            out = _upsample_steps(data, k, upsample_for_intensive)
+        else:
+            out = _upsample_steps(data / k, k, "ffill")
+
+    out_time = pd.date_range(start, periods=n_out, freq=period).values
+    out_time = out_time.astype(time.values.dtype)
+    coords = {c: da.coords[c] for c in da.coords if c != "time"}
+    coords["time"] = xr.DataArray(out_time, dims="time", attrs=da["time"].attrs)
+    result = xr.DataArray(
+        out, dims=da_t.dims, coords=coords, name=da.name, attrs=da.attrs
+    )
+    logger.debug(f"Resampled regular time axis with step {step} to {alias_out}")
+    return result.transpose(*dims)
+
+
 # ---------------------- public function ----------------------
 
 
@@ -169,7 +318,8 @@ def resample_to_daily_or_hourly_adaptive(
     -------
     Same type as input, resampled to calendar-aware 'D' or '1h'.
     """
-    in_obj = in_obj.copy()
+    # shallow copy: the data is never modified in place, dask arrays stay lazy
+    in_obj = in_obj.copy(deep=False)
     logger.info(f"Starting adaptive resampling to {target}")
     logger.info(f"Input object: {in_obj}")
 
@@ -221,6 +371,9 @@ def resample_to_daily_or_hourly_adaptive(
 
     def _resample_da(da: xr.DataArray) -> xr.DataArray:  # noqa: PLR0911
         intensive = _is_intensive(da)
+        fast = _resample_regular(da, alias_tgt, intensive, upsample_for_intensive)
+        if fast is not None:
+            return fast
 
         if going_coarser:
             if intensive:
@@ -281,5 +434,5 @@ def resample_to_daily_or_hourly_adaptive(
         out.attrs = in_obj.attrs
     in_hours, alias_in = _alias_and_hours(in_obj)
     logger.info(f"New resolution {alias_in} meaning {in_hours} hours per timestep")
-    logger.debug(f"Resampled object: {out}")
+    logger.debug("Resampled object: %s", LazySummary(out))
     return out
@@ -1,7 +1,7 @@
 """Provides basic xarray utils."""
 
 import logging
-from typing import Optional, Union
+from typing import Dict, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -9,7 +9,7 @@ import xarray as xr
 from scipy.stats import spearmanr
 
 from mhm_tools.common.constants import LAT_KEYS, LON_KEYS, TIME_KEYS
-from mhm_tools.common.logger import ErrorLogger
+from mhm_tools.common.logger import ErrorLogger, LazySummary
 from mhm_tools.common.netcdf import generate_bounds_for_all_coords
 
 logger = logging.getLogger(__name__)
@@ -232,7 +232,7 @@ def timedelta_to_alias(ds: xr.DataArray) -> str:
     try:
         median_delta = ds.time.diff("time").median()
     except Exception as e:
-        logger.error(ds)
+        logger.error("%s", LazySummary(ds))
         with ErrorLogger(logger):
             raise e
     days = median_delta / np.timedelta64(1, "D")
@@ -376,6 +376,47 @@ def crop_ds(
     return ds.sel({lon_name: lon_slice, lat_name: lat_slice})
 
 
+def get_crop_window(
+    ds: xr.Dataset,
+    lon_bounds: Optional[Tuple[float, float]],
+    lat_bounds: Optional[Tuple[float, float]],
+) -> Dict[str, slice]:
+    """Translate lon/lat bounds into an index window of the dataset grid.
+
+    Selecting the window with ``ds.isel(window)`` crops without touching the
+    data, so it is cheap on lazily loaded or dask-backed datasets.
+
+    Parameters
+    ----------
+    ds : xr.Dataset or xr.DataArray
+        Dataset with 1D lon/lat coordinates.
+    lon_bounds, lat_bounds : tuple of float, optional
+        Bounds of the window in either order; ``None`` keeps the full axis.
+
+    Returns
+    -------
+    dict
+        Index slices per cropped coordinate name.
+    """
+    window = {}
+    for bounds, lat in ((lon_bounds, False), (lat_bounds, True)):
+        if bounds is None:
+            continue
+        key = get_coord_key(ds, lat=lat, lon=not lat)
+        values = ds[key].values
+        if values.ndim != 1:
+            msg = f"Cropping by index window requires a 1D {key} coordinate."
+            with ErrorLogger(logger):
+                raise ValueError(msg)
+        idx = np.flatnonzero((values >= min(bounds)) & (values <= max(bounds)))
+        if idx.size == 0:
+            msg = f"No {key} values within the crop bounds {bounds}."
+            with ErrorLogger(logger):
+                raise ValueError(msg)
+        window[key] = slice(int(idx[0]), int(idx[-1]) + 1)
+    return window
+
+
 def climatology(data):
     """Calculate the climatology from an xarray DataArray."""
     if "time" not in data.dims or data.sizes["time"] == 0:
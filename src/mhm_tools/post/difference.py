@@ -21,6 +21,7 @@ from mhm_tools.common.file_handler import write_xarray_to_file
 from mhm_tools.common.netcdf import read_dataset
 from mhm_tools.common.plotter import plot_map
 from mhm_tools.common.xarray_utils import get_coord_key, normalize_lat_lon
+from mhm_tools.pre.regrid import regrid_like
 
 
 @dataclass
@@ -76,8 +77,8 @@ def calc_diff(
         mod_var
     ].squeeze("time")
 
-    # Interpolate model to reference grid to avoid alignment errors
-    da_mod_interp = da_mod.interp_like(da_ref)
+    # Interpolate model to reference grid (cached weights) to avoid alignment errors
+    da_mod_interp = regrid_like(da_mod, da_ref)
 
     # Compute difference
     diff = da_ref - da_mod_interp
@@ -30,9 +30,14 @@ from mhm_tools.common.file_handler import (
     get_xarray_ds_from_file,
     write_xarray_to_file,
 )
-from mhm_tools.common.logger import ErrorLogger, log_arguments, log_errors
+from mhm_tools.common.logger import ErrorLogger, log_arguments, log_errors, profile_span
 from mhm_tools.common.metrics.metrics_handler import create_results_csv
 from mhm_tools.common.netcdf import generate_bounds_for_all_coords
+from mhm_tools.common.precision import (
+    ACCUMULATOR_DTYPE,
+    cast_to_compute_dtype,
+    get_compute_dtype,
+)
 from mhm_tools.common.resolution_handler import Resolution, get_file_res
 from mhm_tools.common.utils import cut_to_filled_area
 from mhm_tools.common.xarray_utils import (
@@ -575,12 +580,14 @@ def combine_results(results):
     return total_mean, total_M2, total_count, monthly_sums, monthly_counts
 
 
+@profile_span()
 def get_stats_one_pass_subset(files, input_var, factor=1, coordinate_slice=None):
     """Compute running statistics from a list of monthly files.
 
     Iterates through NetCDF files (each containing one month's data for
     `input_var`), optionally applies a spatial slice, multiplies by `factor`,
-    and updates running aggregates.
+    and updates running aggregates. Mean, squared deviations and monthly sums
+    are accumulated in float64, the monthly counts in the compute dtype.
 
     Returns
     -------
@@ -618,10 +625,11 @@ def get_stats_one_pass_subset(files, input_var, factor=1, coordinate_slice=None)
         else:
             da = ds[input_var]
     count = 0  # xr.DataArray(np.ones(mean.shape, dtype=int).copy(), coords=mean.coords, dims=mean.dims).expand_dims(dim='time', axis=0)
-    mean = np.zeros(da.shape[1:])
-    sum_square_diff = np.zeros(da.shape[1:])
-    monthly_sums = np.zeros((12, *da.shape[1:]))
-    monthly_counts = np.zeros((12, *da.shape[1:]))
+    mean = np.zeros(da.shape[1:], dtype=ACCUMULATOR_DTYPE)
+    sum_square_diff = np.zeros(da.shape[1:], dtype=ACCUMULATOR_DTYPE)
+    monthly_sums = np.zeros((12, *da.shape[1:]), dtype=ACCUMULATOR_DTYPE)
+    # counts are exact in float32 up to 2**24 time steps
+    monthly_counts = np.zeros((12, *da.shape[1:]), dtype=get_compute_dtype())
     for f, file in enumerate(files):
         with get_xarray_ds_from_file(
             file, engine="netcdf4", force_decending_y=True
@@ -671,6 +679,7 @@ def split_file_list(file_list, n_processes):
     return file_list
 
 
+@profile_span()
 def get_stats_one_pass(
     path,
     var,
@@ -757,7 +766,7 @@ def get_stats_one_pass(
         {"clim": clim, "std": std, "mean": mean},
         coords={"month": np.arange(1, 13, 1), "lat": lat, "lon": lon},
     )
-    output = generate_bounds_for_all_coords(output)
+    output = generate_bounds_for_all_coords(cast_to_compute_dtype(output))
     # Trigger computation if needed
     if output_path is not None:
         output_file = (
@@ -1677,6 +1686,7 @@ def create_map_from_output(
         )
 
 
+@profile_span()
 def get_stats(
     path,
     var,
@@ -1771,6 +1781,7 @@ def get_stats(
     return generate_bounds_for_all_coords(masked_ds)
 
 
+@profile_span()
 def compare_input_with_ref(  # noqa: PLR0912, PLR0913, PLR0915
     input_path,
     input_var,
@@ -1797,6 +1808,7 @@ def compare_input_with_ref(  # noqa: PLR0912, PLR0913, PLR0915
     input_file_name=None,
     ref_file_name=None,
     result_metric="all",
+    regrid_method="nearest",
 ):
     """Compare the two datasets."""
     output_path = Path(output_path)
@@ -1857,7 +1869,7 @@ def compare_input_with_ref(  # noqa: PLR0912, PLR0913, PLR0915
         logger.error("Ref dataset has empty coordinate.")
 
     input, ref = crop_datasets_to_spatial_overlap(input, ref)
-    input, ref = regridd_to_higher_spatial_resolution(input, ref)
+    input, ref = regridd_to_higher_spatial_resolution(input, ref, method=regrid_method)
     logger.debug(
         f"After spatial overlap/regrid input/ref are all nan: "
         f"input_mean={bool(input['mean'].isnull().all().compute().item())}, "
@@ -2205,8 +2217,14 @@ def evaluate_boostraping_stat_files(stat_files, input_name, ref_name):
     return results
 
 
-def regridd_to_higher_spatial_resolution(ds1, ds2):
-    """Regrid the coarser dataset to the finer dataset's resolution using nearest neighbor.
+def regridd_to_higher_spatial_resolution(ds1, ds2, method="nearest"):
+    """Bring both datasets to a common grid.
+
+    With ``method="nearest"`` the coarser dataset is regridded to the finer
+    dataset's resolution using nearest neighbor. With
+    ``method="conservative"`` the finer dataset is instead remapped onto the
+    coarser grid with area-weighted means (see
+    :class:`mhm_tools.pre.regrid.ConservativeWeights`).
 
     Parameters
     ----------
@@ -2214,13 +2232,15 @@ def regridd_to_higher_spatial_resolution(ds1, ds2):
         First dataset.
     ds2 : xarray.Dataset
         Second dataset. Both should have latitude ('lat') and longitude ('lon') as coordinates.
+    method : str, optional
+        "nearest" or "conservative", by default "nearest".
 
     Returns
     -------
     xarray.Dataset
-        Regridded version of the coarser dataset to match the finer dataset.
+        First dataset on the common grid.
     xarray.Dataset
-        The finer dataset (unchanged).
+        Second dataset on the common grid.
     """
 
     def _coord_spacing(coord):
@@ -2250,6 +2270,20 @@ def regridd_to_higher_spatial_resolution(ds1, ds2):
         coarse_ds, fine_ds = ds1, ds2
     else:
         coarse_ds, fine_ds = ds2, ds1
+    if method == "conservative":
+        from mhm_tools.pre.regrid import regrid_xarray
+
+        remapped = regrid_xarray(
+            fine_ds,
+            "lon",
+            "lat",
+            coarse_ds["lon"].values,
+            coarse_ds["lat"].values,
+            "conservative",
+        )
+        if coarse_ds is ds1:
+            return coarse_ds, remapped
+        return remapped, coarse_ds
     coarse_res = _coord_spacing(coarse_ds.get("lat")) or _coord_spacing(
         coarse_ds.get("lon")
     )
@@ -2430,6 +2464,7 @@ def infer_time_resolution_hours_from_files(files):
 
 
 @log_arguments()
+@profile_span()
 def gridded_data_evaluation(  # noqa: PLR0913
     input: EvalDataset,
     ref: EvalDataset,
@@ -2448,6 +2483,7 @@ def gridded_data_evaluation(  # noqa: PLR0913
     result_metric="all",
     avaiable_mem=None,
     n_cpus=1,
+    regrid_method="nearest",
 ):
     """Validate a spatial variable by comparing dataset climatologies."""
     output_path = Path(output_path)
@@ -2611,6 +2647,7 @@ def gridded_data_evaluation(  # noqa: PLR0913
                     mask_da=mask_da,
                     mask_var=mask_var,
                     result_metric=result_metric,
+                    regrid_method=regrid_method,
                 )
                 for bootstrap_index in range(n_bootstrap_selections)
             )
@@ -2694,4 +2731,5 @@ def gridded_data_evaluation(  # noqa: PLR0913
             mask_da=mask_da,
             mask_var=mask_var,
             result_metric=result_metric,
+            regrid_method=regrid_method,
         )
@@ -23,6 +23,7 @@ from matplotlib import gridspec
 from mhm_tools.common.file_handler import get_xarray_ds_from_file
 from mhm_tools.common.logger import ErrorLogger, log_arguments
 from mhm_tools.common.metrics.metrics_handler import create_csv_from_dict
+from mhm_tools.common.precision import ACCUMULATOR_DTYPE, cast_to_compute_dtype
 from mhm_tools.common.utils import dict_to_multiline_string
 
 logger = logging.getLogger(__name__)
@@ -250,15 +251,17 @@ class Hydrograph:
             tuple
                 A tuple containing the cleaned data arrays in the order they were given as arguments.
         """
-        arr1 = np.array(arr1)
-        arr2 = np.array(arr2)
+        arr1 = np.asarray(arr1)
+        arr2 = np.asarray(arr2)
         if len(arr1) != len(arr2):
             exeption = f"The two timeseries do not have the same length. {arr1.shape} and {arr2.shape}"
             raise ValueError(exeption)
-        data = np.transpose(np.array([arr1.flatten(), arr2.flatten()]))
+        arr1 = arr1.ravel()
+        arr2 = arr2.ravel()
         try:
-            data = data[~np.isnan(data).any(1)]
-            return data[:, 0], data[:, 1]
+            # without stacking both series into one (promoted) array
+            valid = ~(np.isnan(arr1) | np.isnan(arr2))
+            return arr1[valid], arr2[valid]
         except TypeError as te:
             if recursive:
                 return self.remove_empty_values(
@@ -282,8 +285,12 @@ class Hydrograph:
         -------
             None
         """
-        alpha = np.nanstd(simulated) / np.nanstd(observed)
-        beta = np.nanmean(simulated) / np.nanmean(observed)
+        alpha = np.nanstd(simulated, dtype=ACCUMULATOR_DTYPE) / np.nanstd(
+            observed, dtype=ACCUMULATOR_DTYPE
+        )
+        beta = np.nanmean(simulated, dtype=ACCUMULATOR_DTYPE) / np.nanmean(
+            observed, dtype=ACCUMULATOR_DTYPE
+        )
         gamma = np.corrcoef(observed, simulated)[1, 0]
         self.objectives.kge = 1 - np.sqrt(
             (gamma - 1) ** 2 + (alpha - 1) ** 2 + (beta - 1) ** 2
@@ -305,9 +312,15 @@ class Hydrograph:
         -------
             None
         """
+        observed = np.asarray(observed)
+        simulated = np.asarray(simulated)
+        # sums in float64, element-wise terms in the dtype of the data
+        mean_observed = np.nanmean(observed, dtype=ACCUMULATOR_DTYPE).astype(
+            np.result_type(observed.dtype, np.float32)
+        )
         self.objectives.nse = 1 - (
-            np.nansum((observed - simulated) ** 2)
-            / np.nansum((observed - np.nanmean(observed)) ** 2)
+            np.nansum((observed - simulated) ** 2, dtype=ACCUMULATOR_DTYPE)
+            / np.nansum((observed - mean_observed) ** 2, dtype=ACCUMULATOR_DTYPE)
         )
 
     def calc_objectives(self, observed, simulated):
@@ -330,7 +343,8 @@ class Hydrograph:
                 )
             simulated = self.sim_discharge_data_median
         self.obs_discharge_data_clean, self.sim_discharge_data_clean = (
-            self.remove_empty_values(observed, simulated)
+            cast_to_compute_dtype(data)
+            for data in self.remove_empty_values(observed, simulated)
         )
         if np.all(np.isnan(self.obs_discharge_data_clean)) or np.all(
             np.isnan(self.sim_discharge_data_clean)
@@ -348,12 +362,10 @@ class Hydrograph:
         self.logger.debug(
             f"sum simulated: {np.nansum(self.sim_discharge_data_clean)}, sum observed: {np.nansum(self.obs_discharge_data_clean)}"
         )
-        self.objectives.diff = np.nansum(self.sim_discharge_data_clean) - np.nansum(
-            self.obs_discharge_data_clean
-        )
-        self.objectives.rel_diff = self.objectives.diff / np.nansum(
-            self.obs_discharge_data_clean
-        )
+        sum_obs = np.nansum(self.obs_discharge_data_clean, dtype=ACCUMULATOR_DTYPE)
+        sum_sim = np.nansum(self.sim_discharge_data_clean, dtype=ACCUMULATOR_DTYPE)
+        self.objectives.diff = sum_sim - sum_obs
+        self.objectives.rel_diff = self.objectives.diff / sum_obs
         return True
 
     def get_row_col(self):
@@ -15,16 +15,26 @@ The workflow includes:
 
 Intermediate files can be kept or automatically removed depending on options.
 
+With the ``streaming`` engine the same steps run in a single pass over the
+inputs: every file is read once, cropped by an index window, aggregated per
+period, masked, and accumulated into float64 running sums. No intermediate
+file is written and no CDO binary is needed.
+
 Authors
 -------
 - Jeisson Leal
 """
 
 import logging
+import math
 import re
+import shutil
 import uuid
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
+
+import numpy as np
+import xarray as xr
 
 try:
     from cdo import Cdo
@@ -32,8 +42,12 @@ try:
     cdo = Cdo()
 except Exception:
     cdo = None
+from joblib import Parallel, delayed
 
+from mhm_tools.common.file_handler import write_xarray_to_netcdf
 from mhm_tools.common.logger import ErrorLogger
+from mhm_tools.common.netcdf import get_netcdf_metadata_data_vars, read_dataset
+from mhm_tools.common.xarray_utils import get_coord_key, get_crop_window
 from mhm_tools.pre.crop_mhm_setup import crop_file
 
 logger = logging.getLogger(__name__)
@@ -43,9 +57,16 @@ OP_MAP = {
     "hourly": ("hourmean", "hoursum"),
     "daily": ("daymean", "daysum"),
     "monthly": ("monmean", "monsum"),
+    "seasonal": ("seasmean", "seassum"),
     "yearly": ("yearmean", "yearsum"),
 }
 
+LONG_TERM_MEAN_ENGINES = ("cdo", "streaming")
+"""Available engines to compute the long-term mean."""
+
+# upper bound of bytes held in memory per variable while streaming
+STREAM_BLOCK_BYTES = 256 * 1024**2
+
 
 def _summarize_inputs_for_log(files: list[Path]) -> str:
     """Return a compact summary for logging a file collection."""
@@ -65,25 +86,35 @@ def _summarize_inputs_for_log(files: list[Path]) -> str:
     return f"{len(files)} files, sample: {files[0].name} ... {files[-1].name}"
 
 
-def aggregate_files(
-    input_file: Path,
-    output_path: Path,
-    aggregation_type: str = "intensive",
-    long_term_mean_type: str = "monthly",
-) -> None:
-    """Aggregate a single NetCDF file into a coarser temporal resolution using CDO."""
-    if aggregation_type not in ("intensive", "extensive"):
-        msg = (
-            f"aggregation_type must be 'intensive' or 'extensive', "
-            f"got {aggregation_type!r}"
-        )
-        raise ValueError(msg)
+def _check_aggregation_args(long_term_mean_type, aggregation_type):
+    """Raise if the aggregation period or type is not supported."""
     if long_term_mean_type not in OP_MAP:
         msg = (
             f"Unsupported long_term_mean_type {long_term_mean_type!r}; "
             f"choose from {list(OP_MAP)}"
         )
-        raise ValueError(msg)
+        with ErrorLogger(logger):
+            raise ValueError(msg)
+    if aggregation_type not in ("intensive", "extensive"):
+        msg = (
+            f"aggregation_type must be 'intensive' or 'extensive', "
+            f"got {aggregation_type!r}"
+        )
+        with ErrorLogger(logger):
+            raise ValueError(msg)
+
+
+def aggregate_files(
+    input_file: Path,
+    output_path: Path,
+    aggregation_type: str = "intensive",
+    long_term_mean_type: str = "monthly",
+) -> Path:
+    """Aggregate a single NetCDF file into a coarser temporal resolution using CDO.
+
+    Returns the path of the aggregated file.
+    """
+    _check_aggregation_args(long_term_mean_type, aggregation_type)
 
     mean_op, sum_op = OP_MAP[long_term_mean_type]
     cdo_op = mean_op if aggregation_type == "intensive" else sum_op
@@ -104,9 +135,268 @@ def aggregate_files(
         msg = f"CDO operation '{cdo_op}' failed on file '{input_file}': {e}"
         with ErrorLogger(logger):
             raise RuntimeError(msg) from e
+    return out_file
+
+
+def _prepare_file(
+    fpath: Path,
+    in_dir: Path,
+    crop_dir: Optional[Path],
+    aggregation_dir: Optional[Path],
+    lonslice: Optional[slice],
+    latslice: Optional[slice],
+    aggregation_type: Optional[str],
+    long_term_mean_type: Optional[str],
+    keep_temporal_files: bool,
+) -> Tuple[Path, Optional[str]]:
+    """Crop and/or aggregate one input file.
+
+    Returns the file to merge and an error message instead of raising, so
+    that failures of all files can be collected from the worker pool.
+    """
+    try:
+        current = fpath
+        if crop_dir is not None:
+            crop_file(
+                input_file=fpath,
+                mask_ds=None,
+                latslice=latslice,
+                lonslice=lonslice,
+                output_path=crop_dir,
+                input_path=in_dir,
+                overwrite=True,
+                available_mem_gib=None,
+            )
+            current = crop_dir / fpath.relative_to(in_dir)
+        if aggregation_dir is not None:
+            aggregated = aggregate_files(
+                input_file=current,
+                output_path=aggregation_dir,
+                aggregation_type=aggregation_type,
+                long_term_mean_type=long_term_mean_type,
+            )
+            if crop_dir is not None and not keep_temporal_files:
+                # the cropped file is consumed by its aggregate
+                current.unlink()
+            current = aggregated
+    except Exception as e:
+        return fpath, f"{type(e).__name__}: {e}"
+    return current, None
+
+
+def _prepare_files(
+    files: List[Path],
+    n_jobs: int,
+    **kwargs,
+) -> List[Path]:
+    """Run :func:`_prepare_file` for all files in a bounded worker pool.
+
+    The returned files keep the order of ``files``. Errors are collected per
+    file and raised together once all files were processed.
+    """
+    n_jobs = max(1, min(int(n_jobs), len(files)))
+    # cropping runs in python and needs processes, CDO runs in subprocesses
+    backend = "loky" if kwargs.get("crop_dir") is not None else "threading"
+    logger.info(f"Preparing {len(files)} files on {n_jobs} jobs ({backend}).")
+    results = Parallel(n_jobs=n_jobs, backend=backend)(
+        delayed(_prepare_file)(fpath, **kwargs) for fpath in files
+    )
+    errors = [(fpath, error) for fpath, error in results if error is not None]
+    for fpath, error in errors:
+        logger.error(f"Processing {fpath} failed: {error}")
+    if errors:
+        msg = (
+            f"Processing failed for {len(errors)} of {len(files)} files: "
+            + ", ".join(str(fpath) for fpath, _ in errors)
+        )
+        with ErrorLogger(logger):
+            raise RuntimeError(msg)
+    return [fpath for fpath, _ in results]
 
 
-def cal_long_term_mean(  # noqa: PLR0912, PLR0915
+def _period_labels(time: xr.DataArray, long_term_mean_type: str) -> np.ndarray:
+    """Return an integer label of the aggregation period for every time step.
+
+    Seasons follow CDO and pandas and count December to the following year
+    (DJF, MAM, JJA, SON).
+    """
+    year = time.dt.year.values.astype(np.int64)
+    if long_term_mean_type == "yearly":
+        return year
+    month = time.dt.month.values.astype(np.int64)
+    if long_term_mean_type == "monthly":
+        return year * 100 + month
+    if long_term_mean_type == "seasonal":
+        return (year + (month == 12)) * 10 + (month % 12) // 3
+    day = year * 1000 + time.dt.dayofyear.values.astype(np.int64)
+    if long_term_mean_type == "daily":
+        return day
+    return day * 100 + time.dt.hour.values.astype(np.int64)
+
+
+class _LongTermMeanReducer:
+    """Accumulate the long-term mean of one variable in float64 running sums.
+
+    Time steps are optionally aggregated per period first. A period stays open
+    until a time step with another label arrives, so periods may span blocks
+    and files.
+    """
+
+    def __init__(self, shape, aggregation_type=None, lower_threshold=None):
+        self.aggregation_type = aggregation_type
+        self.lower_threshold = lower_threshold
+        self.total = np.zeros(shape, dtype=np.float64)
+        self.count = np.zeros(shape, dtype=np.int64)
+        self._label = None
+        self._period_sum = None
+        self._period_count = None
+
+    def _accumulate(self, values):
+        """Add complete time steps or periods (first axis) to the long-term sums."""
+        valid = np.isfinite(values)
+        if self.lower_threshold is not None:
+            # same as CDO setrtomiss,-1e20,<threshold>: the threshold is masked
+            valid &= values > self.lower_threshold
+        self.total += np.where(valid, values, 0.0).sum(axis=0)
+        self.count += valid.sum(axis=0)
+
+    def _close_period(self):
+        if self._label is None:
+            return
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if self.aggregation_type == "extensive":
+                value = np.where(self._period_count > 0, self._period_sum, np.nan)
+            else:
+                value = self._period_sum / self._period_count
+        self._accumulate(value[np.newaxis])
+        self._label = None
+
+    def add(self, values, labels=None):
+        """Add a block of time steps with optional period labels."""
+        values = np.asarray(values, dtype=np.float64)
+        if labels is None:
+            self._accumulate(values)
+            return
+        starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+        stops = np.r_[starts[1:], len(labels)]
+        for start, stop in zip(starts, stops):
+            if labels[start] != self._label:
+                self._close_period()
+                self._label = labels[start]
+                self._period_sum = np.zeros(values.shape[1:], dtype=np.float64)
+                self._period_count = np.zeros(values.shape[1:], dtype=np.int64)
+            block = values[start:stop]
+            valid = np.isfinite(block)
+            self._period_sum += np.where(valid, block, 0.0).sum(axis=0)
+            self._period_count += valid.sum(axis=0)
+
+    def result(self):
+        """Return the long-term mean, NaN where no valid value was seen."""
+        self._close_period()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 0, self.total / self.count, np.nan)
+
+
+def stream_long_term_mean(
+    files: List[Path],
+    out_path: Path,
+    long_term_mean_type: Optional[str] = None,
+    aggregation_type: Optional[str] = None,
+    lon_bounds: Optional[Tuple[float, float]] = None,
+    lat_bounds: Optional[Tuple[float, float]] = None,
+    lower_threshold: Optional[float] = None,
+) -> xr.Dataset:
+    """Compute the long-term mean of NetCDF files in a single streaming pass.
+
+    Every file is read once in time blocks of at most ``STREAM_BLOCK_BYTES``
+    per variable, cropped by an index window, aggregated per period (if
+    ``long_term_mean_type`` is given), masked by ``lower_threshold``, and
+    accumulated in float64. The result equals CDO's
+    ``timmean [-setrtomiss] [-<aggregation>] mergetime`` chain.
+
+    Parameters
+    ----------
+    files : list of Path
+        Input files sharing one grid. They are processed in time order.
+    out_path : Path
+        Output NetCDF file.
+    long_term_mean_type : str, optional
+        Aggregation period (see ``OP_MAP``). No aggregation if None.
+    aggregation_type : str, optional
+        'intensive' (mean) or 'extensive' (sum) aggregation per period.
+    lon_bounds, lat_bounds : tuple of float, optional
+        Inclusive coordinate bounds to crop to.
+    lower_threshold : float, optional
+        Values smaller or equal to the threshold are ignored.
+
+    Returns
+    -------
+    xr.Dataset
+        The long-term mean that was written to ``out_path``.
+    """
+    if long_term_mean_type is not None:
+        _check_aggregation_args(long_term_mean_type, aggregation_type)
+    # order the files by their first time step like CDO mergetime
+    starts = []
+    for path in files:
+        with read_dataset(path) as ds:
+            starts.append(ds[get_coord_key(ds, time=True)].values[0])
+    files = [files[i] for i in sorted(range(len(files)), key=starts.__getitem__)]
+
+    reducers = {}
+    templates = {}
+    attrs = {}
+    time_key = window = first_time = last_time = None
+    for path in files:
+        with read_dataset(path) as ds_file:
+            time_key = get_coord_key(ds_file, time=True)
+            if window is None:
+                window = get_crop_window(ds_file, lon_bounds, lat_bounds)
+                attrs = dict(ds_file.attrs)
+            ds = ds_file.isel(window)
+            time = ds[time_key]
+            first_time = time.values[0] if first_time is None else first_time
+            last_time = time.values[-1]
+            labels = None
+            if long_term_mean_type is not None:
+                labels = _period_labels(time, long_term_mean_type)
+            metadata_vars = get_netcdf_metadata_data_vars(ds)
+            for name, var in ds.data_vars.items():
+                if time_key not in var.dims or name in metadata_vars:
+                    continue
+                da = var.transpose(time_key, ...)
+                if name not in reducers:
+                    templates[name] = da.isel({time_key: 0}, drop=True)
+                    reducers[name] = _LongTermMeanReducer(
+                        da.shape[1:], aggregation_type, lower_threshold
+                    )
+                step_bytes = 8 * max(1, math.prod(da.shape[1:]))
+                step = max(1, STREAM_BLOCK_BYTES // step_bytes)
+                for start in range(0, da.sizes[time_key], step):
+                    stop = start + step
+                    reducers[name].add(
+                        da.isel({time_key: slice(start, stop)}).values,
+                        None if labels is None else labels[start:stop],
+                    )
+        logger.debug(f"Accumulated {path.name}")
+
+    if not reducers:
+        msg = "No time dependent data variables found in the input files."
+        with ErrorLogger(logger):
+            raise ValueError(msg)
+    mid_time = first_time + (last_time - first_time) / 2
+    ds_out = xr.Dataset(attrs=attrs)
+    for name, reducer in reducers.items():
+        template = templates[name]
+        dtype = np.result_type(template.dtype, np.float32)
+        da = template.copy(data=reducer.result().astype(dtype))
+        ds_out[name] = da.expand_dims({time_key: [mid_time]})
+    logger.info(f"Writing streamed long-term mean to {out_path}")
+    write_xarray_to_netcdf(ds_out, out_path)
+    return ds_out
+
+
+def cal_long_term_mean(  # noqa: PLR0913
     in_dir: str,
     in_file: str,
     out_dir: str,
@@ -121,11 +411,18 @@ def cal_long_term_mean(  # noqa: PLR0912, PLR0915
     lat_max: Optional[float] = None,
     aggregate: bool = False,
     lower_threshold: Optional[str] = None,
+    engine: str = "cdo",
+    n_jobs: int = 1,
 ) -> None:
     """Compute long-term means for NetCDF forcing data.
 
     Optionally perform temporal aggregation and then merge, or merge raw inputs first.
     If only one file matches `in_file`, skip the CDO mergetime step.
+    With ``engine="streaming"`` all steps run in a single pass without
+    intermediate files (see :func:`stream_long_term_mean`). The streaming
+    engine is also used if CDO is not available.
+    With the CDO engine, cropping and aggregation run per file on up to
+    ``n_jobs`` workers.
     """
     p_in_dir = Path(in_dir)
     files = sorted(p_in_dir.glob(in_file))
@@ -149,69 +446,55 @@ def cal_long_term_mean(  # noqa: PLR0912, PLR0915
     p_out_dir.mkdir(parents=True, exist_ok=True)
     logger.info(f"Matched {_summarize_inputs_for_log(files)} using pattern '{in_file}'")
 
-    # If cropping, produce cropped files into a subfolder and use that as input
+    if engine not in LONG_TERM_MEAN_ENGINES:
+        msg = f"Unknown engine {engine!r}; choose from {list(LONG_TERM_MEAN_ENGINES)}"
+        with ErrorLogger(logger):
+            raise ValueError(msg)
+    if engine == "cdo" and cdo is None:
+        logger.warning("CDO is not available. Using the streaming engine.")
+        engine = "streaming"
+    if engine == "streaming":
+        stream_long_term_mean(
+            files,
+            p_out_dir / (out_file or "long_term_mean.nc"),
+            long_term_mean_type=long_term_mean_type if aggregate else None,
+            aggregation_type=aggregation_type,
+            lon_bounds=(lon_min, lon_max) if crop else None,
+            lat_bounds=(lat_min, lat_max) if crop else None,
+            lower_threshold=lower_threshold,
+        )
+        return
+
+    # Unique temp folders avoid collisions across concurrent/repeated runs.
     if crop:
-        # Unique temp folder avoids collisions across concurrent/repeated runs.
         crop_dir = p_out_dir / f"cropped_files_{uuid.uuid4().hex}"
         crop_dir.mkdir(parents=True, exist_ok=True)
-        # Note: flipping lat_min/lat_max because slice(lat_max, lat_min) often needed
-        lonslice = slice(lon_min, lon_max)
-        latslice = slice(lat_max, lat_min)
-        for fpath in files:
-            crop_file(
-                input_path=p_in_dir,
-                input_file=fpath,
-                output_path=crop_dir,
-                mask_da=False,
-                overwrite=True,
-                available_mem_gib=None,
-                latslice=latslice,
-                lonslice=lonslice,
-            )
-        # p_input_dir = crop_dir
-        # After cropping, map to flattened cropped outputs by file name.
-        files = sorted((crop_dir / fpath.name) for fpath in files)
-    # else:
-    # p_input_dir = p_in_dir
-
-    cdo = Cdo()
-
-    # If aggregation is requested, aggregate each file individually first
     if aggregate:
-        if long_term_mean_type not in OP_MAP:
-            msg = (
-                f"Unsupported long_term_mean_type {long_term_mean_type!r}; "
-                f"choose from {list(OP_MAP)}"
-            )
-            raise ValueError(msg)
-        if aggregation_type not in ("intensive", "extensive"):
-            msg = (
-                f"aggregation_type must be 'intensive' or 'extensive', "
-                f"got {aggregation_type!r}"
-            )
-            raise ValueError(msg)
-
+        _check_aggregation_args(long_term_mean_type, aggregation_type)
         mean_op, sum_op = OP_MAP[long_term_mean_type]
         cdo_op = mean_op if aggregation_type == "intensive" else sum_op
-
-        # Unique temp folder avoids collisions across concurrent/repeated runs.
         aggregation_dir = p_out_dir / f"aggregated_files_{uuid.uuid4().hex}"
         aggregation_dir.mkdir(parents=True, exist_ok=True)
         logger.info(
             f"Aggregating {_summarize_inputs_for_log(files)} with CDO operator '{cdo_op}'."
         )
 
-        # Run `aggregate_files` on each matched input
-        for fpath in files:
-            aggregate_files(
-                input_file=fpath,
-                output_path=aggregation_dir,
-                aggregation_type=aggregation_type,
-                long_term_mean_type=long_term_mean_type,
-            )
-
-        merge_candidates = sorted(aggregation_dir.glob(f"{cdo_op}_*.nc"))
-
+    if crop or aggregate:
+        # Crop and aggregate each file in one task; the cropped file is removed
+        # as soon as its aggregate was written.
+        merge_candidates = _prepare_files(
+            files,
+            n_jobs=n_jobs,
+            in_dir=p_in_dir,
+            crop_dir=crop_dir,
+            aggregation_dir=aggregation_dir,
+            # Note: flipping lat_min/lat_max because slice(lat_max, lat_min) often needed
+            lonslice=slice(lon_min, lon_max) if crop else None,
+            latslice=slice(lat_max, lat_min) if crop else None,
+            aggregation_type=aggregation_type,
+            long_term_mean_type=long_term_mean_type,
+            keep_temporal_files=keep_temporal_files,
+        )
     else:
         # No aggregation: merge (or skip merging) the already matched raw inputs
         merge_candidates = files
@@ -264,17 +547,10 @@ def cal_long_term_mean(  # noqa: PLR0912, PLR0915
 
     # Remove intermediate files if requested
     if not keep_temporal_files:
-        # Remove cropped files
-        if crop and crop_dir is not None:
-            for f in crop_dir.glob("*"):
-                f.unlink()
-            crop_dir.rmdir()
-
-        # Remove aggregated files
-        if aggregate and aggregation_dir is not None:
-            for f in aggregation_dir.glob("*"):
-                f.unlink()
-            aggregation_dir.rmdir()
+        # Remove cropped and aggregated files
+        for temp_dir in (crop_dir, aggregation_dir):
+            if temp_dir is not None:
+                shutil.rmtree(temp_dir)
 
         # If mergetime was run, remove its output
         if isinstance(tmp_merge, Path) and tmp_merge.name.startswith("mergetime"):
@@ -25,6 +25,7 @@ from mhm_tools.common.file_handler import write_xarray_to_file
 from mhm_tools.common.netcdf import read_dataset
 from mhm_tools.common.plotter import plot_map
 from mhm_tools.common.xarray_utils import get_coord_key, normalize_lat_lon
+from mhm_tools.pre.regrid import regrid_like
 
 
 def calc_rel_diff(  # noqa: PLR0913
@@ -66,8 +67,8 @@ def calc_rel_diff(  # noqa: PLR0913
         mod_var
     ].squeeze("time")
 
-    # Interpolate model to reference grid to avoid alignment errors
-    da_mod_interp = da_mod.interp_like(da_ref)
+    # Interpolate model to reference grid (cached weights) to avoid alignment errors
+    da_mod_interp = regrid_like(da_mod, da_ref)
 
     # calculating relative difference, if true prevents division by 0
     diff = xr.where(da_ref != 0, (da_ref - da_mod_interp) / da_ref, np.nan)
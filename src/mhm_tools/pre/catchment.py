@@ -27,8 +27,14 @@ from mhm_tools.common.file_handler import (
     get_xarray_ds_from_file,
     write_xarray_to_file,
 )
-from mhm_tools.common.logger import ErrorLogger, log_arguments
-from mhm_tools.common.netcdf import generate_bounds
+from mhm_tools.common.logger import (
+    ErrorLogger,
+    LazySummary,
+    log_arguments,
+    profile_span,
+)
+from mhm_tools.common.netcdf import generate_bounds, release_cached_dataset
+from mhm_tools.common.precision import ACCUMULATOR_DTYPE
 from mhm_tools.common.provenance import apply_output_provenance
 from mhm_tools.common.resolution_handler import Resolution
 from mhm_tools.common.utils import (
@@ -681,6 +687,7 @@ def write_gauges_to_nc(gauges, output_target, filename="gauges_info.nc"):
         "area": {"dtype": "float64", "_FillValue": np.nan},
     }
     ds = apply_output_provenance(ds)
+    release_cached_dataset(output_path)
     ds.to_netcdf(output_path, engine="netcdf4", format="NETCDF4", encoding=encoding)
     logger.info(
         f"Wrote gauge information for {len(station_ids)} gauges to {output_path}"
@@ -875,6 +882,7 @@ class Catchment:
             return np.roll(data, int(data.shape[1] / 2), axis=1)
         return data
 
+    @profile_span()
     def add_dem(self, latlon):
         """Init the FlwdirRaster class from dem."""
         # perform checks
@@ -891,6 +899,7 @@ class Catchment:
             )
             self.get_fdir()
 
+    @profile_span()
     def add_fdir(self, latlon):
         """Init the FlwdirRaster class from fdir."""
         # perform check
@@ -946,8 +955,12 @@ class Catchment:
         cell_areas = R**2 * dlat_2d * dlon_2d * np.cos(lat_2d)
         self.cell_area = cell_areas
 
+    @profile_span()
     def calc_upstream_area(self):
-        """Use pyflwdir to calculate the upstream area from flow direction by providing cell areas."""
+        """Use pyflwdir to calculate the upstream area from flow direction by providing cell areas.
+
+        The areas are accumulated in float64 under every compute dtype.
+        """
         if self._fdir is None:
             logger.error("Flow direction is not initialized.")
             return None
@@ -960,7 +973,9 @@ class Catchment:
             )
             with ErrorLogger(logger):
                 raise ValueError(msg)
-        return self._fdir.accuflux(self.cell_area, nodata=-9999)
+        return self._fdir.accuflux(
+            np.asarray(self.cell_area, dtype=ACCUMULATOR_DTYPE), nodata=-9999
+        )
 
     def _coord_to_index(self, lat, lon, lat_vals=None, lon_vals=None):
         """Map latitude/longitude or indices to integer grid indices."""
@@ -1723,6 +1738,7 @@ class Catchment:
                 raise e
             return True
 
+    @profile_span()
     def delineate_basin(
         self,
         gauge,
@@ -1881,6 +1897,7 @@ class Catchment:
             self.resolutions, max_resolution=max_resolution, l1=l1, l2=l2
         )
 
+    @profile_span()
     def upscale(self, var):
         """Upscale flow direction to l1_resolution if that is int multipe of data resolution."""
         factor, upscaled_resolution = get_upscaling_factor(self.resolutions, l1=True)
@@ -1996,6 +2013,7 @@ class Catchment:
         return xr.where(adjacent_missing, sink_value, da)
 
     @log_arguments()
+    @profile_span()
     def write(
         self,
         out_path,
@@ -2210,7 +2228,7 @@ class Catchment:
             }
 
         # logger.debug(f"lat_slice: {lat_slice}, lon_slice: {lon_slice}")
-        logger.debug(f"ds: {ds}")
+        logger.debug("ds: %s", LazySummary(ds))
         ds = self.create_frame(ds, frame, FDIR_SINKVALUE[self.ftype])
         # For the flow dir map fill masked cells adjecent to filled cells with sink instead of missing value
         # fdir_filled = self.fill_adjacent_missing_with_sink(
@@ -2509,6 +2527,7 @@ def _is_list_of_float_tuples(a):
 
 
 @log_arguments()
+@profile_span()
 def create_catchment(  # noqa: PLR0913, PLR0912, PLR0915
     input_file,
     output_path,
@@ -21,7 +21,8 @@ import xarray as xr
 from joblib import Parallel, delayed
 
 from mhm_tools.common.file_handler import get_xarray_ds_from_file, write_xarray_to_file
-from mhm_tools.common.logger import ErrorLogger, log_arguments
+from mhm_tools.common.logger import ErrorLogger, log_arguments, profile_span
+from mhm_tools.common.netcdf import release_cached_dataset
 from mhm_tools.common.resolution_handler import Resolution
 from mhm_tools.common.xarray_utils import get_coord_key, get_single_data_var
 from mhm_tools.pre.crop_mhm_setup import crop_mhm_setup, regrid_mask
@@ -1489,6 +1490,7 @@ def _prepare_restart_tile_batch_for_merge(restart_files, mask_var, n_jobs):
     )
 
 
+@profile_span()
 def merge_mhm_restart_files(
     restart_files,
     output_file,
@@ -1601,6 +1603,7 @@ def merge_mhm_restart_files(
     return output_file
 
 
+@profile_span()
 def _prepare_tile_setup(  # noqa: PLR0913
     tile,
     input_path,
@@ -1659,6 +1662,7 @@ def _prepare_tile_setup(  # noqa: PLR0913
     return tile
 
 
+@profile_span()
 def _run_mhm_for_tile(
     tile,
     mhm_packages,
@@ -2133,6 +2137,7 @@ def _recreate_missing_restart_results(  # noqa: PLR0913
 
 
 @log_arguments()
+@profile_span()
 def create_mhm_restart_from_setup(  # noqa: PLR0913
     input_path,
     output_path,
@@ -2862,6 +2867,7 @@ def _write_final_restart(ds, output_file):
     """Write the final restart dataset to NetCDF."""
     output_file = Path(output_file)
     output_file.parent.mkdir(parents=True, exist_ok=True)
+    release_cached_dataset(output_file)
     if output_file.is_file():
         output_file.unlink()
     _drop_fill_value_attrs(ds).to_netcdf(
@@ -2939,6 +2945,7 @@ def _convert_native_restart_to_cf(
     )
 
 
+@profile_span()
 def merge_restart_files(
     restart_file_paths,
     lon_min,
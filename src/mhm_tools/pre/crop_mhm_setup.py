@@ -24,7 +24,7 @@ from mhm_tools.common.file_handler import (
     get_xarray_ds_from_file,
     write_xarray_to_file,
 )
-from mhm_tools.common.logger import ErrorLogger, log_arguments
+from mhm_tools.common.logger import ErrorLogger, LazySummary, log_arguments
 from mhm_tools.common.resolution_handler import Resolution, get_file_res
 from mhm_tools.common.xarray_utils import (
     crop_ds,
@@ -344,7 +344,7 @@ def crop_file_with_header(ds_in, file_path, output_path, lonslice, latslice):
         # Convert to Dataset
         ds_out = data_array.to_dataset()
         ds_out.attrs.update(ds_in.attrs)
-        logger.debug(f"cropped ds {ds_out}")
+        logger.debug("cropped ds %s", LazySummary(ds_out))
         logger.info(f"Shape of cropped ds: {ds_out[data_var].shape}")
         return ds_out, header_out_path
     except IndexError as e:
@@ -415,8 +415,15 @@ def crop_file(  # noqa: PLR0912 PLR0915 PLR0913
     output_suffix=None,
     mask_all=False,
     resolutions=None,
+    cache_ascii_index=False,
 ):
-    """Crops one file by lat and lon slice and may mask it with the mask dataarray."""
+    """Crops one file by lat and lon slice and may mask it with the mask dataarray.
+
+    ASCII grids are opened lazily, so only the rows of the window are read.
+    With ``cache_ascii_index`` their row offsets are kept in a ``.rows.npy``
+    sidecar next to the input, so cropping the same setup again skips the
+    scan of the whole file.
+    """
     if resolutions is None:
         logger.debug("No resolutions provided.")
         resolutions = Resolution()
@@ -451,11 +458,15 @@ def crop_file(  # noqa: PLR0912 PLR0915 PLR0913
             ds = get_xarray_ds_from_file(
                 input_file,
                 chunking=chunking,
-                available_mem_gib=available_mem_gib // 3,
+                available_mem_gib=(
+                    None if available_mem_gib is None else available_mem_gib // 3
+                ),
                 normalize_latlon_coords=True,
                 force_decending_y=(lat_order == "decreasing" and not has_header),
                 force_ascending_y=(lat_order == "increasing" and not has_header),
                 chunk_type=ChunkType.TIME,
+                lazy_ascii=True,
+                ascii_cache=cache_ascii_index,
             )
         except ValueError as ve:
             logger.error(
@@ -474,7 +485,7 @@ def crop_file(  # noqa: PLR0912 PLR0915 PLR0913
             except Exception as e:
                 logger.error(f"Can't copy {input_file} because of {e}")
         return latlon_files
-    logger.debug(f"read in dataset: {ds}")
+    logger.debug("read in dataset: %s", LazySummary(ds))
     # Handling of special cases:
     ds_cropped = None
     if not no_cropping:
@@ -646,6 +657,18 @@ def crop_file(  # noqa: PLR0912 PLR0915 PLR0913
     return latlon_files
 
 
+def _is_setup_file(path, root):
+    """Whether ``path`` belongs to the setup, not to hidden or cache files.
+
+    Skips hidden files and directories (e.g. the ``.npy`` sidecars of cached
+    ASCII grids) and ``*.rows.npy`` row index files.
+    """
+    parts = path.relative_to(root).parts
+    return not any(part.startswith(".") for part in parts) and not (
+        path.name.endswith(".rows.npy")
+    )
+
+
 @log_arguments()
 def crop_mhm_setup(  # noqa: PLR0913
     mask_ds,
@@ -666,8 +689,13 @@ def crop_mhm_setup(  # noqa: PLR0913
     lat_order="decreasing",
     output_suffix=None,
     mask_all=False,
+    cache_ascii_index=False,
 ):
-    """Cut out an existing mhm domain setup using a mask file."""
+    """Cut out an existing mhm domain setup using a mask file.
+
+    With ``cache_ascii_index`` the row offsets of ASCII grids are cached next
+    to the inputs (see :func:`crop_file`).
+    """
     # check if the input is correct
     output_path = Path(output_path)
     input_path = Path(input_path)
@@ -680,7 +708,11 @@ def crop_mhm_setup(  # noqa: PLR0913
     )
     files = []
     if input_path.is_dir():
-        files.extend(input_path.rglob(filename))
+        files.extend(
+            path
+            for path in input_path.rglob(filename)
+            if _is_setup_file(path, input_path)
+        )
     else:
         files = [input_path]
 
@@ -703,6 +735,7 @@ def crop_mhm_setup(  # noqa: PLR0913
             output_suffix=output_suffix,
             mask_all=mask_all,
             resolutions=resolutions,
+            cache_ascii_index=cache_ascii_index,
         )
         for f in files
     )
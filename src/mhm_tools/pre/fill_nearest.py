@@ -28,7 +28,8 @@ import xarray as xr
 from joblib import Parallel, delayed
 from scipy.spatial import KDTree
 
-from mhm_tools.common.logger import ErrorLogger, log_arguments
+from mhm_tools.common.logger import ErrorLogger, log_arguments, profile_span
+from mhm_tools.common.precision import cast_to_compute_dtype, get_compute_dtype
 from mhm_tools.common.xarray_utils import get_single_data_var
 
 logger = logging.getLogger(__name__)
@@ -94,15 +95,14 @@ def _valid_mask(array, along_time, missing_value):
         Boolean mask with true values at valid source cells.
     """
     values = array[{"time": 0}].data if along_time else array.data
-    valid = ~np.isnan(values)
-    if missing_value is not None and not np.isnan(missing_value):
-        valid &= ~np.isclose(values, missing_value)
-    return valid
+    return _valid_values(values, missing_value)
 
 
 def _valid_values(values, missing_value):
     valid = ~np.isnan(values)
     if missing_value is not None and not np.isnan(missing_value):
+        # a float64 marker would promote all comparison temporaries
+        missing_value = np.asarray(missing_value, dtype=get_compute_dtype())
         valid &= ~np.isclose(values, missing_value)
     return valid
 
@@ -126,6 +126,7 @@ def _fill_diagnostics(array, along_time, missing_value, mask):
     }
 
 
+@profile_span()
 def fill_dataarray_with_nearest(  # noqa: PLR0915, PLR0912
     array,
     along_time=None,
@@ -405,6 +406,7 @@ def _output_encoding(dataset):
     }
 
 
+@profile_span()
 def fill_one_file(input_file, input_dir, fill_value, default_value, mask, output_dir):
     """Fill all data variables in one NetCDF file and write the result.
 
@@ -430,7 +432,7 @@ def fill_one_file(input_file, input_dir, fill_value, default_value, mask, output
     """
     logger.info(f"Filling {input_file.relative_to(input_dir)}.")
     with xr.open_dataset(input_file, engine="netcdf4", mask_and_scale=False) as ds:
-        dataset = ds.load()
+        dataset = cast_to_compute_dtype(ds).load()
 
     variable_diagnostics = {}
     for var_name in list(dataset.data_vars) + list(dataset.coords):
@@ -496,6 +498,7 @@ def fill_one_file(input_file, input_dir, fill_value, default_value, mask, output
 
 
 @log_arguments()
+@profile_span()
 def fill_nearest(
     input_dir,
     fname="precipitation_*.nc",
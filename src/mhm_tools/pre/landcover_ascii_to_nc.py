@@ -2,7 +2,9 @@
 
 The module reads land-cover periods from an mHM namelist, converts each ASCII
 grid to NetCDF, adds time metadata for the configured validity period, and
-writes files suitable for mHM v6 setup workflows.
+writes files suitable for mHM v6 setup workflows. The streaming mode parses
+the periods in a worker pool and writes each one into its time slot of a
+preallocated output file as soon as it is ready.
 
 Authors
 -------
@@ -14,15 +16,20 @@ import re
 from pathlib import Path
 from typing import Dict, Tuple
 
+import dask.array as dsa
+import netCDF4
 import numpy as np
 import pandas as pd
 import xarray as xr
+from joblib import Parallel, delayed
 
+from mhm_tools.common.constants import NC_ENCODE_DEFAULTS
 from mhm_tools.common.file_handler import (
     get_xarray_ds_from_file,
     write_xarray_to_file,
 )
 from mhm_tools.common.logger import ErrorLogger
+from mhm_tools.common.netcdf import plan_nc_chunksizes
 
 logger = logging.getLogger(__name__)
 
@@ -288,11 +295,126 @@ def _build_input_infos(
     return input_infos
 
 
+def _read_landcover_period(
+    path: Path,
+    var_name: str | None,
+    normalize_latlon: bool,
+    year_start: int,
+    load: bool = True,
+) -> xr.Dataset:
+    """Read one landcover ASCII grid as a dataset with a 1-element time axis."""
+    ds = get_xarray_ds_from_file(
+        path,
+        var_name=var_name,
+        normalize_latlon_coords=normalize_latlon,
+        landcover=True,
+        landcover_year_start=year_start,
+    )
+    return ds.load() if load else ds
+
+
+def _read_landcover_slot(
+    slot: int,
+    path: Path,
+    var_name: str | None,
+    normalize_latlon: bool,
+    year_start: int,
+) -> Tuple[int, xr.Dataset]:
+    """Worker: read one period and return it with its output time slot."""
+    return slot, _read_landcover_period(path, var_name, normalize_latlon, year_start)
+
+
+def _convert_streaming(
+    infos: list,
+    output: Path,
+    var_name: str | None,
+    normalize_latlon: bool,
+    input_infos: Dict[int, dict],
+    n_jobs: int,
+) -> None:
+    """Write a preallocated output file and fill it period by period.
+
+    ``infos`` are the input infos sorted by ``year_start``; their position is
+    the time slot in the output.
+    """
+    # the first grid is opened lazily, only its header and coordinates are read
+    first = _read_landcover_period(
+        infos[0]["path"], var_name, normalize_latlon, infos[0]["year_start"], False
+    )
+    (name,) = first.data_vars
+    template_da = first[name]
+    spatial_dims = template_da.dims[1:]
+    shape = tuple(first.sizes[dim] for dim in spatial_dims)
+    fill = template_da.attrs.get("nodata_value", 0)
+    times = np.array(
+        [np.datetime64(f"{info['year_start']}-01-01", "ns") for info in infos]
+    )
+    template = xr.Dataset(
+        {
+            name: (
+                template_da.dims,
+                dsa.full(
+                    (len(infos), *shape),
+                    fill,
+                    dtype=template_da.dtype,
+                    chunks=(1, *shape),
+                ),
+                template_da.attrs,
+            )
+        },
+        coords={
+            "time": times,
+            **{dim: first[dim] for dim in spatial_dims},
+        },
+    )
+    # chunks hold a single period, so every slot is written as whole chunks;
+    # map tiles keep them far below the 4 GiB limit of HDF5 chunks
+    chunksizes = plan_nc_chunksizes(template[name], "map", time_dim="time")
+    template = add_time_bounds_cf(
+        template.chunk(dict(zip(template_da.dims, chunksizes))), input_infos
+    )
+    encoding = {
+        name: {
+            "zlib": True,
+            "complevel": 4,
+            "shuffle": True,
+            "chunksizes": chunksizes,
+            **NC_ENCODE_DEFAULTS,
+        }
+    }
+    write_xarray_to_file(template, output, encoding=encoding)
+    logger.info(f"Created {output} with {len(infos)} landcover periods.")
+
+    n_jobs = max(1, min(int(n_jobs), len(infos)))
+    results = Parallel(n_jobs=n_jobs, backend="loky", return_as="generator_unordered")(
+        delayed(_read_landcover_slot)(
+            slot, info["path"], var_name, normalize_latlon, info["year_start"]
+        )
+        for slot, info in enumerate(infos)
+    )
+    with netCDF4.Dataset(output, "a") as nc:
+        nc_var = nc.variables[name]
+        for slot, ds_period in results:
+            period = ds_period[name]
+            for dim in spatial_dims:
+                if not np.allclose(period[dim].values, first[dim].values):
+                    msg = (
+                        f"Landcover grid of {infos[slot]['path']} differs from "
+                        f"{infos[0]['path']} along '{dim}'."
+                    )
+                    with ErrorLogger(logger):
+                        raise ValueError(msg)
+            nc_var[slot] = period.transpose(*template_da.dims).values[0]
+            logger.debug(f"Wrote landcover period {slot} to {output}")
+
+
 def convert_lc_ascii_to_nc(
     input_nml: str | Path,
     output: str | Path,
     var_name: str | None = "land_cover",
     normalize_latlon: bool = False,
+    streaming: bool = False,
+    n_jobs: int = 1,
 ) -> None:
     """
     Workflow for converting landcover ASCII files to NetCDF.
@@ -309,6 +431,10 @@ def convert_lc_ascii_to_nc(
     - The last time bound ends at (max(year_end)+1)-01-01.
     - By default the data variable is called 'land_cover'. You can override
       that with `var_name=...`.
+    - With `streaming=True` the output is created with its final time length
+      first and the periods are parsed by `n_jobs` worker processes and
+      written into their time slot as they finish, so only a few periods are
+      held in memory at once. All grids need to be identical.
     """
     # read & parse namelist
     nml_path = Path(input_nml)
@@ -334,6 +460,13 @@ def convert_lc_ascii_to_nc(
         n_domains=n_domains,
     )
 
+    if streaming:
+        infos = sorted(input_infos.values(), key=lambda info: info["year_start"])
+        _convert_streaming(
+            infos, Path(output), var_name, normalize_latlon, input_infos, n_jobs
+        )
+        return
+
     # load each ASCII file into an xarray Dataset
     datasets = []
     for idx in sorted(input_infos.keys()):
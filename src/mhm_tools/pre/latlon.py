@@ -2,7 +2,10 @@
 
 The module builds compatible L0, L1, L11, and L2 grid definitions from headers,
 cell sizes, or existing files, checks grid alignment, and writes the combined
-latlon NetCDF file used by mHM/mRM setups.
+latlon NetCDF file used by mHM/mRM setups. Grids in lat-lon are built from
+their 1D axes, projected grids are transformed in row chunks on a thread pool,
+and computed grids are cached so that sub-windows (e.g. crops) are sliced
+from them instead of being transformed again.
 
 Authors
 -------
@@ -11,7 +14,10 @@ Authors
 """
 
 import logging
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
@@ -23,7 +29,7 @@ from mhm_tools.common.file_handler import (
     get_xarray_ds_from_file,
     write_xarray_to_file,
 )
-from mhm_tools.common.logger import ErrorLogger, log_arguments
+from mhm_tools.common.logger import ErrorLogger, log_arguments, profile_span
 
 from ..common import (
     NC_ENCODE_DEFAULTS,
@@ -64,16 +70,137 @@ def xy_to_latlon(x, y, crs=None):
     return transform(x, y, inverse=True)
 
 
-def _create_grid(header, crs=None, dtype="f4"):
-    """Create grid from ascii header."""
+LATLON_CACHE_BYTES = 1024**3
+"""Maximal size of the lat-lon arrays kept by the grid cache."""
+TRANSFORM_CHUNK_CELLS = 1024**2
+"""Number of cells transformed per task for projected grids."""
+_GRID_CACHE: "OrderedDict[tuple, list]" = OrderedDict()
+_GRID_CACHE_LOCK = threading.Lock()
+
+
+def _grid_axes(header):
+    """Return the x (west to east) and y (north to south) cell centres."""
     c_size = header["cellsize"]
     x = header["xllcorner"] + c_size / 2 + np.arange(header["ncols"]) * c_size
     y = header["yllcorner"] + c_size / 2 + np.arange(header["nrows"]) * c_size
-    y = np.flip(y)
-    x_grid, y_grid = np.meshgrid(x, y)
-    # determine latitude and longitude of the target grid
-    lons, lats = xy_to_latlon(x_grid, y_grid, crs)
-    return x.astype(dtype), y.astype(dtype), lons.astype(dtype), lats.astype(dtype)
+    return x, np.flip(y)
+
+
+def _is_identity_transform(crs, x, y):
+    """Check whether ``crs`` maps x/y to lon/lat unchanged (lat-lon CRS)."""
+    if not crs:
+        return True
+    x_probe = np.array([x[0], x[-1], x[0], x[-1]])
+    y_probe = np.array([y[0], y[0], y[-1], y[-1]])
+    lons, lats = xy_to_latlon(x_probe, y_probe, crs)
+    return np.allclose(lons, x_probe, rtol=0, atol=1e-9) and np.allclose(
+        lats, y_probe, rtol=0, atol=1e-9
+    )
+
+
+def _transform_grid(x, y, crs, dtype, n_jobs=1):
+    """Transform the grid spanned by ``x`` and ``y`` in row chunks.
+
+    Every worker thread uses its own :class:`~pyproj.Proj` instance, the
+    results are written into preallocated arrays of ``dtype``.
+    """
+    lons = np.empty((y.size, x.size), dtype=dtype)
+    lats = np.empty((y.size, x.size), dtype=dtype)
+    rows = max(1, TRANSFORM_CHUNK_CELLS // max(x.size, 1))
+    local = threading.local()
+
+    def _work(start):
+        if not hasattr(local, "proj"):
+            local.proj = Proj(crs)
+        x_grid, y_grid = np.meshgrid(x, y[start : start + rows])
+        lon_chunk, lat_chunk = local.proj(x_grid, y_grid, inverse=True)
+        lons[start : start + rows] = lon_chunk
+        lats[start : start + rows] = lat_chunk
+
+    starts = range(0, y.size, rows)
+    if n_jobs > 1 and len(starts) > 1:
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            list(pool.map(_work, starts))
+    else:
+        for start in starts:
+            _work(start)
+    return lons, lats
+
+
+def _cached_window(header, key):
+    """Return lon/lat of ``header`` sliced from a cached grid containing it."""
+    c_size = header["cellsize"]
+    with _GRID_CACHE_LOCK:
+        entries = list(_GRID_CACHE.get(key, []))
+    for cached, lons, lats in entries:
+        col = (header["xllcorner"] - cached["xllcorner"]) / c_size
+        top = cached["yllcorner"] + cached["nrows"] * c_size
+        row = (top - (header["yllcorner"] + header["nrows"] * c_size)) / c_size
+        if not (np.isclose(col, round(col)) and np.isclose(row, round(row))):
+            continue
+        col, row = round(col), round(row)
+        if (
+            col < 0
+            or row < 0
+            or col + header["ncols"] > cached["ncols"]
+            or row + header["nrows"] > cached["nrows"]
+        ):
+            continue
+        with _GRID_CACHE_LOCK:
+            if key in _GRID_CACHE:
+                _GRID_CACHE.move_to_end(key)
+        window = (slice(row, row + header["nrows"]), slice(col, col + header["ncols"]))
+        return lons[window], lats[window]
+    return None
+
+
+def _store_in_cache(header, key, lons, lats):
+    """Keep a computed grid, evicting the oldest ones beyond the size limit."""
+    if lons.nbytes + lats.nbytes > LATLON_CACHE_BYTES:
+        return
+    # cached arrays are shared with the returned grids and must stay untouched
+    lons.setflags(write=False)
+    lats.setflags(write=False)
+
+    def _size():
+        return sum(
+            lo.nbytes + la.nbytes for v in _GRID_CACHE.values() for _, lo, la in v
+        )
+
+    # batch jobs create grids in concurrent threads
+    with _GRID_CACHE_LOCK:
+        _GRID_CACHE.setdefault(key, []).append((dict(header), lons, lats))
+        _GRID_CACHE.move_to_end(key)
+        while _size() > LATLON_CACHE_BYTES:
+            oldest = next(iter(_GRID_CACHE))
+            _GRID_CACHE[oldest].pop(0)
+            if not _GRID_CACHE[oldest]:
+                del _GRID_CACHE[oldest]
+
+
+def _create_grid(header, crs=None, dtype="f4", n_jobs=1):
+    """Create grid from ascii header.
+
+    For lat-lon grids the 2D lon/lat arrays are broadcast from the 1D axes.
+    Projected grids are transformed with :func:`_transform_grid` and cached
+    by CRS, data type and cell size, so grids lying within an already
+    computed one are sliced from it.
+    """
+    x, y = _grid_axes(header)
+    if _is_identity_transform(crs, x, y):
+        shape = (y.size, x.size)
+        lons = np.broadcast_to(x.astype(dtype)[np.newaxis, :], shape)
+        lats = np.broadcast_to(y.astype(dtype)[:, np.newaxis], shape)
+        return x.astype(dtype), y.astype(dtype), lons, lats
+    key = (str(crs), np.dtype(dtype).str, float(header["cellsize"]))
+    cached = _cached_window(header, key)
+    if cached is not None:
+        logger.debug(f"Using cached lat-lon grid for {header}")
+        lons, lats = cached
+    else:
+        lons, lats = _transform_grid(x, y, crs, dtype, n_jobs)
+        _store_in_cache(header, key, lons, lats)
+    return x.astype(dtype), y.astype(dtype), lons, lats
 
 
 def get_header_from_file(file):
@@ -99,6 +226,7 @@ def add_optional_level(
     crs,
     dtype,
     write_header_path=None,
+    n_jobs=1,
 ):
     """Add optional level to the latlon dataset."""
     if isinstance(level, (int, float)):
@@ -113,7 +241,9 @@ def add_optional_level(
     # check L1/level compatibility
     check_grid_compatibility(level_header, level1_header, level_name, "L1")
     # create grids
-    x_level, y_level, lons_level, lats_level = _create_grid(level_header, crs, dtype)
+    x_level, y_level, lons_level, lats_level = _create_grid(
+        level_header, crs, dtype, n_jobs
+    )
     coords[f"yc_{level_name}"] = y_level
     coords[f"xc_{level_name}"] = x_level
     coords[f"lat_{level_name}"] = (f"yc_{level_name}", f"xc_{level_name}"), lats_level
@@ -123,6 +253,7 @@ def add_optional_level(
 
 
 @log_arguments()
+@profile_span()
 def create_latlon(
     out_file,
     level0,
@@ -137,6 +268,7 @@ def create_latlon(
     dtype="f4",
     compression=9,
     add_bounds=False,
+    n_jobs=1,
 ):
     """Create the latlon.nc file from given ASCII headers.
 
@@ -177,6 +309,8 @@ def create_latlon(
         Compression level for the NetCDF file, by default 9
     add_bounds : bool, optional
         Add bounds to the NetCDF axis, by default False
+    n_jobs : int, optional
+        Number of threads transforming projected grids, by default 1
     """
     coords = {}
 
@@ -198,8 +332,8 @@ def create_latlon(
         write_header(write_header_l1, level1)
 
     # create grids
-    x_l0, y_l0, lons_l0, lats_l0 = _create_grid(level0, crs, dtype)
-    x_l1, y_l1, lons_l1, lats_l1 = _create_grid(level1, crs, dtype)
+    x_l0, y_l0, lons_l0, lats_l0 = _create_grid(level0, crs, dtype, n_jobs)
+    x_l1, y_l1, lons_l1, lats_l1 = _create_grid(level1, crs, dtype, n_jobs)
     coords["yc_l0"] = y_l0
     coords["xc_l0"] = x_l0
     coords["lat_l0"] = (["yc_l0", "xc_l0"], lats_l0)
@@ -220,6 +354,7 @@ def create_latlon(
             crs=crs,
             dtype=dtype,
             write_header_path=write_header_l11,
+            n_jobs=n_jobs,
         )
 
     # level2 is optional
@@ -233,6 +368,7 @@ def create_latlon(
             crs=crs,
             dtype=dtype,
             write_header_path=write_header_l2,
+            n_jobs=n_jobs,
         )
     latlon = xr.Dataset(
         coords=coords,
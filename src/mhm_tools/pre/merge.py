@@ -1,18 +1,28 @@
-"""Merge time-split NetCDF files with CDO.
+"""Merge time-split NetCDF files with CDO or an in-process engine.
 
 The module groups matching input files, merges them along time, and can repeat
 the merge within subfolders while preserving a top-level directory structure.
-Large file lists are processed in chunks before creating the final output.
+With the ``cdo`` engine, large file lists are processed in chunks before
+creating the final output. The ``native`` engine validates the inputs from
+their headers, preallocates the output time axis, and copies every file into
+its time slice in a single pass without a CDO binary.
 
 Authors
 -------
 - Simon Lüdke
 """
 
+import hashlib
 import logging
 import math
 import tempfile
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import h5py
+import netCDF4
+import numpy as np
 
 try:
     from cdo import Cdo, CDOException
@@ -22,10 +32,17 @@ except Exception:
     cdo = None
 from joblib import Parallel, delayed
 
+from mhm_tools.common.constants import TIME_KEYS
 from mhm_tools.common.logger import ErrorLogger, log_arguments
 
 logger = logging.getLogger(__name__)
 
+MERGE_ENGINES = ("cdo", "native")
+"""Available engines for merging files along time."""
+
+# upper bound of bytes held in memory per block when values have to be decoded
+_COPY_BLOCK_BYTES = 256 * 1024**2
+
 
 def _merge_chunk(files, out_path, options):
     try:
@@ -123,13 +140,329 @@ def merge_files_from_folder(
     return [str(out_file)]
 
 
+@dataclass
+class _NcHeader:
+    """Header information of a NetCDF file that is needed to merge it along time."""
+
+    path: Path
+    time_dim: str
+    times: np.ndarray
+    time_dtype: np.dtype
+    units: Optional[str]
+    calendar: str
+    grid: Tuple
+    time_vars: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    bounds_var: Optional[str] = None
+    bounds: Optional[np.ndarray] = None
+
+
+def _get_time_dim(nc):
+    """Return the time dimension: the unlimited one or a known time key."""
+    for name, dim in nc.dimensions.items():
+        if dim.isunlimited():
+            return name
+    for name in TIME_KEYS:
+        if name in nc.dimensions:
+            return name
+    return None
+
+
+def _grid_signature(nc, time_dim):
+    """Return a hashable description of all dimensions and coordinates except time."""
+    signature = []
+    for name, dim in nc.dimensions.items():
+        if name == time_dim:
+            continue
+        digest = None
+        if name in nc.variables and nc.variables[name].dimensions == (name,):
+            values = np.asarray(nc.variables[name][:])
+            if values.dtype.kind in "iuf":
+                values = np.round(values.astype(np.float64), 6)
+            digest = hashlib.sha1(np.ascontiguousarray(values).tobytes()).hexdigest()
+        signature.append((name, len(dim), digest))
+    return tuple(signature)
+
+
+def _read_nc_header(path):
+    """Read the time axis and grid description of a NetCDF file without its data."""
+    with netCDF4.Dataset(path) as nc:
+        nc.set_auto_maskandscale(False)
+        time_dim = _get_time_dim(nc)
+        if time_dim is None or time_dim not in nc.variables:
+            msg = f"No time dimension with a coordinate variable found in {path}."
+            with ErrorLogger(logger):
+                raise ValueError(msg)
+        time_var = nc.variables[time_dim]
+        bounds_var = getattr(time_var, "bounds", None)
+        if bounds_var not in nc.variables:
+            bounds_var = None
+        time_vars = {
+            name: var.dimensions
+            for name, var in nc.variables.items()
+            if time_dim in var.dimensions and name not in (time_dim, bounds_var)
+        }
+        return _NcHeader(
+            path=Path(path),
+            time_dim=time_dim,
+            times=np.asarray(time_var[:]),
+            time_dtype=np.dtype(time_var.dtype),
+            units=getattr(time_var, "units", None),
+            calendar=getattr(time_var, "calendar", "standard"),
+            grid=_grid_signature(nc, time_dim),
+            time_vars=time_vars,
+            bounds_var=bounds_var,
+            bounds=None if bounds_var is None else np.asarray(nc[bounds_var][:]),
+        )
+
+
+def _to_reference_time(values, header, ref):
+    """Convert numeric time values of ``header`` to the units of ``ref``."""
+    if values is None or (
+        header.units == ref.units and header.calendar == ref.calendar
+    ):
+        return values
+    if header.units is None or ref.units is None:
+        msg = f"Cannot compare time axes of {header.path} and {ref.path} without units."
+        with ErrorLogger(logger):
+            raise ValueError(msg)
+    dates = netCDF4.num2date(values, header.units, header.calendar)
+    return np.asarray(netCDF4.date2num(dates, ref.units, ref.calendar))
+
+
+def _validate_headers(headers: List[_NcHeader]) -> List[_NcHeader]:
+    """Check grids and time axes of all files and return them sorted by time."""
+    ref = headers[0]
+    valid = []
+    for header in headers:
+        if header.time_dim != ref.time_dim or header.grid != ref.grid:
+            msg = f"The grid of {header.path} differs from the grid of {ref.path}."
+            with ErrorLogger(logger):
+                raise ValueError(msg)
+        if header.time_vars != ref.time_vars:
+            msg = (
+                f"The time dependent variables of {header.path} "
+                f"{sorted(header.time_vars)} differ from {sorted(ref.time_vars)}."
+            )
+            with ErrorLogger(logger):
+                raise ValueError(msg)
+        if header.times.size == 0:
+            logger.warning(f"Skipping {header.path} without time steps.")
+            continue
+        header.times = _to_reference_time(header.times, header, ref)
+        header.bounds = _to_reference_time(header.bounds, header, ref)
+        if np.any(np.diff(header.times) <= 0):
+            msg = f"The time axis of {header.path} is not strictly increasing."
+            with ErrorLogger(logger):
+                raise ValueError(msg)
+        valid.append(header)
+    valid.sort(key=lambda header: header.times[0])
+    for prev, cur in zip(valid[:-1], valid[1:]):
+        if cur.times[0] <= prev.times[-1]:
+            msg = f"The time axes of {prev.path} and {cur.path} overlap."
+            with ErrorLogger(logger):
+                raise ValueError(msg)
+    return valid
+
+
+def _create_variable_like(dst, var, time_dim, n_time, dtype=None):
+    """Create a variable in ``dst`` with the storage settings of ``var``."""
+    filters = var.filters() or {}
+    kwargs = {
+        "shuffle": bool(filters.get("shuffle", False)),
+        "fletcher32": bool(filters.get("fletcher32", False)),
+    }
+    if "_FillValue" in var.ncattrs():
+        kwargs["fill_value"] = var.getncattr("_FillValue")
+    if filters.get("zlib"):
+        kwargs["zlib"] = True
+        kwargs["complevel"] = filters.get("complevel", 4)
+    chunking = var.chunking()
+    if isinstance(chunking, list):
+        kwargs["chunksizes"] = [
+            min(size, n_time if dim == time_dim else len(dst.dimensions[dim]))
+            for size, dim in zip(chunking, var.dimensions)
+        ]
+    elif not kwargs.get("zlib"):
+        kwargs["contiguous"] = True
+    dst_var = dst.createVariable(
+        var.name,
+        var.datatype if dtype is None else dtype,
+        var.dimensions,
+        endian=var.endian(),
+        **kwargs,
+    )
+    dst_var.setncatts({k: var.getncattr(k) for k in var.ncattrs() if k != "_FillValue"})
+    return dst_var
+
+
+def _raw_chunk_copy_possible(src, src_var, dst_var, time_axis, offset, is_last):
+    """Check if the stored chunks of ``src_var`` can be copied without decoding."""
+    if not src.data_model.startswith("NETCDF4"):
+        return False
+    chunks = src_var.chunking()
+    if not isinstance(chunks, list) or chunks != dst_var.chunking():
+        return False
+    if src_var.filters() != dst_var.filters():
+        return False
+    if src_var.dtype != dst_var.dtype or src_var.endian() != dst_var.endian():
+        return False
+    t_chunk = chunks[time_axis]
+    # every chunk has to land on a chunk of the output; only the final file may
+    # end in a partially filled chunk
+    return offset % t_chunk == 0 and (
+        src_var.shape[time_axis] % t_chunk == 0 or is_last
+    )
+
+
+def _copy_decoded(src_var, dst_var, time_axis, offset):
+    """Copy the stored values of ``src_var`` into its time slice in blocks."""
+    n_time = src_var.shape[time_axis]
+    step_cells = math.prod(
+        size for axis, size in enumerate(src_var.shape) if axis != time_axis
+    )
+    step_bytes = max(1, step_cells * (np.dtype(src_var.dtype).itemsize or 8))
+    block = max(1, _COPY_BLOCK_BYTES // step_bytes)
+    chunks = dst_var.chunking()
+    if isinstance(chunks, list) and block > chunks[time_axis]:
+        block -= block % chunks[time_axis]
+    for start in range(0, n_time, block):
+        stop = min(n_time, start + block)
+        src_idx = [slice(None)] * src_var.ndim
+        dst_idx = [slice(None)] * src_var.ndim
+        src_idx[time_axis] = slice(start, stop)
+        dst_idx[time_axis] = slice(offset + start, offset + stop)
+        dst_var[tuple(dst_idx)] = src_var[tuple(src_idx)]
+
+
+def _copy_raw_chunks(out_file, raw_jobs):
+    """Copy compressed chunks from the inputs into the output with HDF5."""
+    with h5py.File(out_file, "r+") as dst:
+        for path, jobs in raw_jobs.items():
+            with h5py.File(path, "r") as src:
+                for name, time_axis, offset in jobs:
+                    src_id = src[name].id
+                    dst_id = dst[name].id
+                    for i in range(src_id.get_num_chunks()):
+                        chunk_offset = src_id.get_chunk_info(i).chunk_offset
+                        filter_mask, data = src_id.read_direct_chunk(chunk_offset)
+                        out_offset = list(chunk_offset)
+                        out_offset[time_axis] += offset
+                        dst_id.write_direct_chunk(
+                            tuple(out_offset), data, filter_mask=filter_mask
+                        )
+
+
+def merge_files_native(files, out_file):
+    """Merge NetCDF files along time in a single pass without CDO.
+
+    The grids and time axes are validated from the file headers. The output
+    is created with a fixed time dimension holding all time steps and every
+    input is copied into its time slice. If the chunking and compression of a
+    variable match the output and the slice is chunk aligned, the compressed
+    chunks are copied as they are without decoding.
+
+    Parameters
+    ----------
+    files : list of str or Path
+        NetCDF files sharing the same grid without overlapping time steps.
+    out_file : str or Path
+        Path of the merged NetCDF file.
+
+    Returns
+    -------
+    list of str
+        The path to the merged file.
+    """
+    out_file = Path(out_file)
+    headers = _validate_headers([_read_nc_header(f) for f in files])
+    if not headers:
+        msg = f"None of the {len(files)} files contains time steps to merge."
+        with ErrorLogger(logger):
+            raise ValueError(msg)
+    ref = headers[0]
+    n_time = sum(header.times.size for header in headers)
+    time_dtype = ref.time_dtype
+    if time_dtype.kind in "iu" and any(
+        np.any(header.times % 1 != 0) for header in headers
+    ):
+        time_dtype = np.dtype(np.float64)
+    logger.info(
+        f"Merging {len(headers)} files with {n_time} time steps natively into {out_file}"
+    )
+
+    tmp_file = out_file.with_name(f".{out_file.name}.part")
+    try:
+        raw_jobs = {}
+        with netCDF4.Dataset(ref.path) as src, netCDF4.Dataset(
+            tmp_file, "w", format="NETCDF4"
+        ) as dst:
+            src.set_auto_maskandscale(False)
+            dst.set_auto_maskandscale(False)
+            dst.set_fill_off()
+            dst.setncatts({k: src.getncattr(k) for k in src.ncattrs()})
+            for name, dim in src.dimensions.items():
+                dst.createDimension(name, n_time if name == ref.time_dim else len(dim))
+            for name, var in src.variables.items():
+                dtype = time_dtype if name in (ref.time_dim, ref.bounds_var) else None
+                _create_variable_like(dst, var, ref.time_dim, n_time, dtype=dtype)
+                if ref.time_dim not in var.dimensions:
+                    dst[name][...] = var[...]
+
+            offset = 0
+            for i, header in enumerate(headers):
+                n_steps = header.times.size
+                dst[ref.time_dim][offset : offset + n_steps] = header.times
+                if ref.bounds_var is not None:
+                    dst[ref.bounds_var][offset : offset + n_steps] = header.bounds
+                with netCDF4.Dataset(header.path) as src_file:
+                    src_file.set_auto_maskandscale(False)
+                    for name, dims in ref.time_vars.items():
+                        time_axis = dims.index(ref.time_dim)
+                        src_var = src_file[name]
+                        if _raw_chunk_copy_possible(
+                            src_file,
+                            src_var,
+                            dst[name],
+                            time_axis,
+                            offset,
+                            is_last=i == len(headers) - 1,
+                        ):
+                            raw_jobs.setdefault(header.path, []).append(
+                                (name, time_axis, offset)
+                            )
+                        else:
+                            _copy_decoded(src_var, dst[name], time_axis, offset)
+                offset += n_steps
+
+        if raw_jobs:
+            n_raw = sum(len(jobs) for jobs in raw_jobs.values())
+            logger.debug(f"Copying {n_raw} variables as raw compressed chunks.")
+            _copy_raw_chunks(tmp_file, raw_jobs)
+        tmp_file.replace(out_file)
+    except BaseException:
+        # do not leave a partial file behind, e.g. on a full disk or Ctrl-C
+        tmp_file.unlink(missing_ok=True)
+        raise
+    return [str(out_file)]
+
+
 @log_arguments()
-def merge_files(input_path, input_file_part, output, n_cpus, preserve_folders=False):
+def merge_files(
+    input_path,
+    input_file_part,
+    output,
+    n_cpus,
+    preserve_folders=False,
+    engine="cdo",
+):
     """
-    Merge NetCDF files along time using CDO via its Python API.
+    Merge NetCDF files along time using CDO or the native engine.
 
     - Assumes files share the same grid and DO NOT overlap in time.
-    - Parallelizes by merging chunks in parallel with joblib, then merges parts.
+    - With ``engine="cdo"`` chunks are merged in parallel with joblib using
+      CDO via its Python API, then the parts are merged.
+    - With ``engine="native"`` all files are copied into a preallocated output
+      in a single pass (see :func:`merge_files_native`).
 
     Args:
         input_path (str): directory containing input files
@@ -138,12 +471,21 @@ def merge_files(input_path, input_file_part, output, n_cpus, preserve_folders=Fa
         output_file_name (str): name of output NetCDF (e.g., "merged.nc")
         n_cpus (int): number of parallel workers
         preserve_folders (bool): Decides if the top level folder structure should be preserved.
+        engine (str): Merge engine, either "cdo" or "native". Falls back to
+            "native" if CDO is not available.
 
     Returns
     -------
         str: path to the merged file
     """
     n_cpus = max(1, int(n_cpus)) if n_cpus is not None else 1
+    if engine not in MERGE_ENGINES:
+        msg = f"Unknown merge engine {engine!r}; choose from {list(MERGE_ENGINES)}"
+        with ErrorLogger(logger):
+            raise ValueError(msg)
+    if engine == "cdo" and cdo is None:
+        logger.warning("CDO is not available. Using the native merge engine.")
+        engine = "native"
     in_dir = Path(input_path)
     output = Path(output)
     if not output.suffix:
@@ -176,6 +518,8 @@ def merge_files(input_path, input_file_part, output, n_cpus, preserve_folders=Fa
                 out_file.unlink()
             out_file.symlink_to(file_list[0])
             out_files.append(out_file)
+        elif len(file_list) > 1 and engine == "native":
+            out_files.extend(merge_files_native(file_list, out_file))
         elif len(file_list) > 1:
             with tempfile.TemporaryDirectory(dir=out_file.parent) as tmpdir:
                 out_files.extend(
@@ -186,7 +530,13 @@ def merge_files(input_path, input_file_part, output, n_cpus, preserve_folders=Fa
         msg = f"No files match {in_dir}/{input_file_part}"
         with ErrorLogger(logger):
             raise FileNotFoundError(msg)
-    if not preserve_folders:
+    if not preserve_folders and engine == "native":
+        if len(out_files) == 1 and Path(out_files[0]) == output:
+            final_merge = [str(output)]
+        else:
+            final_merge = merge_files_native(out_files, output)
+        logger.info(f"Merged a total of {sum_files} to: {final_merge}")
+    elif not preserve_folders:
         with tempfile.TemporaryDirectory(dir=out_file.parent) as tmpdir:
             final_merge = merge_files_from_folder(tmpdir, out_files, output, n_cpus)
         logger.info(f"Merged a total of {sum_files} to: {final_merge}")
@@ -13,23 +13,28 @@ Authors
 
 import contextlib
 import logging
-from datetime import datetime, timezone
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+import netCDF4
 import numpy as np
 import pandas as pd
 import xarray as xr
-from joblib import Parallel, delayed
+from joblib import Parallel, delayed, effective_n_jobs
 from pyproj import CRS, Transformer
 
+from mhm_tools.common.constants import NC_ENCODE_DEFAULTS
 from mhm_tools.common.file_handler import (
+    GridDefinition,
     get_grid,
     get_xarray_ds_from_file,
     set_grid,
     write_xarray_to_file,
 )
-from mhm_tools.common.logger import ErrorLogger, log_arguments
+from mhm_tools.common.logger import ErrorLogger, log_arguments, profile_span
+from mhm_tools.common.netcdf import generate_bounds
+from mhm_tools.common.precision import get_compute_dtype
 from mhm_tools.common.xarray_utils import (
     get_coord_key,
     get_single_data_var,
@@ -56,6 +61,13 @@ METHODS_REQUIRING_TAVG = {
     "jensen_haise",
     "jensen-haise",
 }
+PET_STREAM_BLOCK_BYTES = 256 * 1024**2
+"""Default memory budget of one time block in the streaming PET mode."""
+PET_BLOCKS_PER_WORKER = 4
+"""Number of time blocks per worker in the parallel PET mode."""
+_PET_CHUNK_BYTES = 4 * 1024**2
+DOY_TABLE_MAX_BYTES = 512 * 1024**2
+"""Largest day-of-year lookup table kept in memory by :class:`DayOfYearTable`."""
 
 
 def _daylength_hours(lat_deg: np.ndarray, time: datetime) -> np.ndarray:
@@ -64,8 +76,12 @@ def _daylength_hours(lat_deg: np.ndarray, time: datetime) -> np.ndarray:
 
     Good enough for PET empirical methods (Hamon, Blaney-Criddle, Thornthwaite).
     """
+    return _daylength_hours_from_doy(lat_deg, time.timetuple().tm_yday)
+
+
+def _daylength_hours_from_doy(lat_deg: np.ndarray, doy) -> np.ndarray:
+    """Day length (hours) for the 1-based day-of-year ``doy`` (broadcastable)."""
     lat = np.deg2rad(lat_deg)
-    doy = time.timetuple().tm_yday
     # solar declination (radians); common approximation
     delta = 0.409 * np.sin(2.0 * np.pi * (doy - 81) / 365.0)
     # sunset hour angle
@@ -83,7 +99,14 @@ def _sat_vapor_pressure_kpa(t_c: np.ndarray) -> np.ndarray:
 
 def e_rad_calculator(time: datetime, lat: np.ndarray) -> np.ndarray:
     """Calculate extraterrestrial radiation (MJ/m²/day) for a given day/lat."""
-    doy = pd.Timestamp(time).day_of_year - 1
+    return _e_rad_from_doy(pd.Timestamp(time).day_of_year - 1, lat)
+
+
+def _e_rad_from_doy(doy, lat: np.ndarray) -> np.ndarray:
+    """Extraterrestrial radiation for the 0-based day-of-year ``doy``.
+
+    ``doy`` may be an array broadcastable against ``lat`` (in radians).
+    """
     dist = 1 + (0.033 * np.cos((2 * np.pi * doy) / 365))
     dec = np.radians(-23.44 * np.cos(np.radians((360 / 365) * (doy + 10))))
     ang = np.arccos(np.clip(-np.tan(lat) * np.tan(dec), -1, 1))
@@ -93,6 +116,81 @@ def e_rad_calculator(time: datetime, lat: np.ndarray) -> np.ndarray:
     return 37.5 * dist * e_rad
 
 
+class DayOfYearTable:
+    """Lookup table of the latitude-only PET terms per day-of-year.
+
+    Extraterrestrial radiation and day length only depend on the day-of-year
+    and the latitude. Both are evaluated once on a ``(366, n_unique_lat)``
+    table and gathered for every time step and grid cell, i.e. broadcast
+    along longitude on regular grids. The gathered terms have the compute
+    dtype (see :mod:`mhm_tools.common.precision`), so float32 inputs are not
+    promoted under the ``float32`` policy.
+
+    Parameters
+    ----------
+    lat_deg : np.ndarray
+        Latitude in degrees with the spatial shape of the PET fields.
+    max_bytes : int, optional
+        Largest size of both tables. Grids with more unique latitudes (e.g.
+        large projected grids) evaluate the terms per requested day-of-year
+        instead. Defaults to :data:`DOY_TABLE_MAX_BYTES`.
+    """
+
+    def __init__(self, lat_deg: np.ndarray, max_bytes: Optional[int] = None):
+        lat_deg = np.asarray(lat_deg, dtype=float)
+        self.lat_deg = lat_deg
+        unique_lat, inverse = np.unique(lat_deg, return_inverse=True)
+        self._inverse = inverse.reshape(lat_deg.shape)
+        self.dtype = get_compute_dtype()
+        max_bytes = DOY_TABLE_MAX_BYTES if max_bytes is None else max_bytes
+        self.e_rad_table = None
+        self.daylength_table = None
+        if 2 * 366 * unique_lat.size * 8 <= max_bytes:
+            doy = np.arange(366)[:, np.newaxis]
+            self.e_rad_table = _e_rad_from_doy(doy, np.radians(unique_lat)).astype(
+                self.dtype, copy=False
+            )
+            self.daylength_table = _daylength_hours_from_doy(
+                unique_lat, doy + 1
+            ).astype(self.dtype, copy=False)
+        else:
+            logger.debug(
+                f"{unique_lat.size} unique latitudes exceed the day-of-year table "
+                "budget; evaluating the terms per day-of-year."
+            )
+
+    def lookup(self, doy) -> tuple:
+        """Return extraterrestrial radiation and day length for ``doy``.
+
+        Parameters
+        ----------
+        doy : int or np.ndarray
+            1-based day-of-year, scalar or 1D array of time steps.
+
+        Returns
+        -------
+        tuple
+            ``(e_rad, day_length)`` of shape ``lat.shape`` for a scalar
+            ``doy`` and ``(len(doy), *lat.shape)`` otherwise.
+        """
+        doy = np.asarray(doy)
+        if self.e_rad_table is not None:
+            rows = doy - 1
+            return (
+                self.e_rad_table[rows][..., self._inverse],
+                self.daylength_table[rows][..., self._inverse],
+            )
+        unique_doy, inverse = np.unique(doy, return_inverse=True)
+        doy_col = unique_doy.reshape((-1,) + (1,) * self.lat_deg.ndim)
+        e_rad = _e_rad_from_doy(doy_col - 1, np.radians(self.lat_deg))
+        day_length = _daylength_hours_from_doy(self.lat_deg, doy_col)
+        shape = doy.shape + self.lat_deg.shape
+        return (
+            e_rad[inverse].reshape(shape).astype(self.dtype, copy=False),
+            day_length[inverse].reshape(shape).astype(self.dtype, copy=False),
+        )
+
+
 def validate_tmin_tmax(tmin, tmax):
     """Test that tmin smaller or equal tmax at every point and time."""
     comparison = np.where(~np.isnan(tmin + tmax), tmin <= tmax, True)
@@ -237,10 +335,15 @@ def pet_calculator(
 
     # Common radiation term from your existing pipeline
     # (You already have this function elsewhere.)
-    e_rad = e_rad_calculator(time, lat)  # treated as R_e in the figure
+    # Precomputed terms (e.g. from the streaming mode) take precedence.
+    # e_rad is treated as R_e in the figure
+    e_rad = kwargs["e_rad"] if "e_rad" in kwargs else e_rad_calculator(time, lat)
 
     # Daylength for methods that need it
-    DL = kwargs.get("DL", _daylength_hours(lat, time))  # hours
+    # lat is given in radians
+    DL = (
+        kwargs["DL"] if "DL" in kwargs else _daylength_hours(np.degrees(lat), time)
+    )  # hours
 
     # Convenience
     tavg = kwargs.get("tavg")
@@ -379,8 +482,220 @@ def get_time_and_freq(ds, stat_freq):
     return times, stat_freq
 
 
+def _pet_block_size(
+    n_cells: int,
+    n_inputs: int,
+    n_times: int,
+    available_mem_gib: Optional[float] = None,
+) -> int:
+    """Return the number of time steps processed per streamed block.
+
+    Each time step holds the input fields, the latitude terms, one
+    intermediate and the result in the compute dtype.
+    """
+    budget = (
+        PET_STREAM_BLOCK_BYTES
+        if available_mem_gib is None
+        else float(available_mem_gib) * 1024**3
+    )
+    step_bytes = max(1, n_cells) * get_compute_dtype().itemsize * (n_inputs + 4)
+    return int(max(1, min(n_times, budget // step_bytes)))
+
+
+@profile_span()
+def _pet_for_block(
+    inputs: dict,
+    table: DayOfYearTable,
+    doy: np.ndarray,
+    stat_freq: str,
+    method: str,
+) -> np.ndarray:
+    """Calculate PET for a block of time steps.
+
+    Parameters
+    ----------
+    inputs : dict
+        Input fields (``tavg``, ``tmin``, ``tmax``) of shape ``(time, ...)``.
+    table : DayOfYearTable
+        Latitude-only terms of the grid.
+    doy : np.ndarray
+        1-based day-of-year of every time step in the block.
+    stat_freq : str
+        "daily" or "hourly".
+    method : str
+        PET method passed to :func:`pet_calculator`.
+
+    Returns
+    -------
+    np.ndarray
+        PET of shape ``(time, ...)``.
+    """
+    e_rad, day_length = table.lookup(doy)
+    return pet_calculator(
+        lat=np.radians(table.lat_deg)[np.newaxis],
+        time=None,
+        stat_freq=stat_freq,
+        method=method,
+        e_rad=e_rad,
+        DL=day_length,
+        **inputs,
+    )
+
+
+def _write_block_to_netcdf(block: xr.Dataset, out_file: Path, start: int) -> None:
+    """Write the time-dependent variables of ``block`` at index ``start``.
+
+    The target file must already contain all variables of ``block`` with an
+    unlimited time dimension, e.g. written from the first block.
+    """
+    with netCDF4.Dataset(out_file, "a") as nc:
+        # bounds variables inherit units and calendar from the time variable
+        time_var = nc.variables["time"]
+        for name, var in nc.variables.items():
+            if "time" not in var.dimensions or name not in block.variables:
+                continue
+            values = block[name].transpose(*var.dimensions).values
+            if values.dtype.kind in "MO":
+                dates = values.ravel()
+                if values.dtype.kind == "M":
+                    dates = pd.to_datetime(dates).to_pydatetime()
+                units = getattr(var, "units", time_var.units)
+                calendar = getattr(
+                    var, "calendar", getattr(time_var, "calendar", "standard")
+                )
+                values = netCDF4.date2num(list(dates), units, calendar).reshape(
+                    values.shape
+                )
+            elif values.dtype.kind == "f":
+                values = np.ma.masked_invalid(values)
+            index = [slice(None)] * var.ndim
+            axis = var.dimensions.index("time")
+            index[axis] = slice(start, start + values.shape[axis])
+            var[tuple(index)] = values
+
+
+def _calculate_pet_parallel(
+    out_file: Path,
+    inputs: dict,
+    times: np.ndarray,
+    stat_freq: str,
+    method: str,
+    table: DayOfYearTable,
+    grid_definition: GridDefinition,
+    data_attrs: dict,
+    max_workers: int = 1,
+) -> None:
+    """Calculate PET in worker processes and write all time steps at once.
+
+    The time axis is split into :data:`PET_BLOCKS_PER_WORKER` blocks per
+    worker. Blocks are dispatched lazily, so only the inputs of the blocks in
+    flight are sent to the workers, and the latitude terms are looked up from
+    ``table`` in the workers instead of being sent with every time step.
+    """
+    inputs = {key: value for key, value in inputs.items() if value is not None}
+    n_times = len(times)
+    doy = pd.DatetimeIndex(times).dayofyear.to_numpy()
+    n_blocks = PET_BLOCKS_PER_WORKER * effective_n_jobs(max_workers)
+    block_size = min(
+        -(-n_times // n_blocks),
+        _pet_block_size(table.lat_deg.size, len(inputs), n_times),
+    )
+    tasks = (
+        delayed(_pet_for_block)(
+            {
+                key: value.isel(time=slice(start, start + block_size)).values
+                for key, value in inputs.items()
+            },
+            table,
+            doy[start : start + block_size],
+            stat_freq,
+            method,
+        )
+        for start in range(0, n_times, block_size)
+    )
+    logger.info(f"Calculating pet in parallel on {max_workers} cores")
+    # Compute PET in parallel
+    results = Parallel(n_jobs=max_workers, backend="loky")(tasks)
+    logger.info(f"results are merged into one array {len(results)}")
+    # Stack results into array
+    pet_data = np.concatenate(results).astype(np.float32, copy=False)
+
+    # Wrap into DataArray
+    pet_ds = set_grid(pet_data, grid_definition, "pet", data_attrs)
+    logger.info("writing output")
+    write_xarray_to_file(pet_ds, out_file)
+
+
+def _calculate_pet_streaming(
+    out_file: Path,
+    inputs: dict,
+    times: np.ndarray,
+    stat_freq: str,
+    method: str,
+    table: DayOfYearTable,
+    grid_definition: GridDefinition,
+    data_attrs: dict,
+    available_mem_gib: Optional[float] = None,
+) -> None:
+    """Calculate PET block by block and append every block to ``out_file``.
+
+    Only one block of inputs and results is held in memory at a time. The
+    first block creates the output file with an unlimited time dimension, all
+    later blocks are appended in place.
+    """
+    inputs = {key: value for key, value in inputs.items() if value is not None}
+    lat = table.lat_deg
+    n_times = len(times)
+    block_size = _pet_block_size(lat.size, len(inputs), n_times, available_mem_gib)
+    doy = pd.DatetimeIndex(times).dayofyear.to_numpy()
+    chunk_steps = int(max(1, min(block_size, _PET_CHUNK_BYTES // (4 * lat.size))))
+    encoding = {
+        "pet": {
+            "zlib": True,
+            "complevel": 4,
+            "shuffle": True,
+            "chunksizes": (chunk_steps, *lat.shape),
+            **NC_ENCODE_DEFAULTS,
+        }
+    }
+    logger.info(
+        f"Calculating pet in {-(-n_times // block_size)} blocks of up to "
+        f"{block_size} time steps"
+    )
+    # time bounds are generated once for the full axis, not per block
+    template = grid_definition.template
+    bounds_name = template["time"].attrs.get("bounds", "time_bnds")
+    if bounds_name not in template and n_times > 1:
+        template = template.copy(deep=False)
+        template.coords[bounds_name] = generate_bounds(template["time"])
+        template["time"].attrs["bounds"] = bounds_name
+    for start in range(0, n_times, block_size):
+        stop = min(start + block_size, n_times)
+        block_inputs = {
+            key: value.isel(time=slice(start, stop)).values
+            for key, value in inputs.items()
+        }
+        if method in METHODS_REQUIRING_TMAX_TMIN:
+            validate_tmin_tmax(tmin=block_inputs["tmin"], tmax=block_inputs["tmax"])
+        pet_data = _pet_for_block(
+            block_inputs, table, doy[start:stop], stat_freq, method
+        ).astype(np.float32, copy=False)
+        block_grid = GridDefinition(
+            template=template.isel(time=slice(start, stop)),
+            dims=grid_definition.dims,
+        )
+        pet_ds = set_grid(pet_data, block_grid, "pet", data_attrs)
+        if start == 0:
+            pet_ds.encoding["unlimited_dims"] = {"time"}
+            write_xarray_to_file(pet_ds, out_file, encoding=encoding)
+        else:
+            _write_block_to_netcdf(pet_ds, out_file, start)
+        logger.debug(f"Wrote pet time steps {start} to {stop}")
+
+
 @log_arguments("INFO")
-def calculate_pet(  # noqa: PLR0915
+@profile_span()
+def calculate_pet(
     out_file: str,
     tavg_file: Optional[str] = None,
     tmax_file: Optional[str] = None,
@@ -388,8 +703,31 @@ def calculate_pet(  # noqa: PLR0915
     stat_freq: Optional[str] = None,
     method: Optional[str] = "oudin",
     max_workers: int = 1,
+    streaming: bool = False,
+    available_mem_gib: Optional[float] = None,
 ) -> None:
-    """Calculate PET in parallel across time dimension and save to NetCDF."""
+    """Calculate PET in parallel across time dimension and save to NetCDF.
+
+    Parameters
+    ----------
+    out_file : str
+        Output NetCDF file.
+    tavg_file, tmax_file, tmin_file : str, optional
+        Input temperature files; the required ones depend on ``method``.
+    stat_freq : str, optional
+        "daily" or "hourly"; inferred from the input time axis if omitted.
+    method : str, default "oudin"
+        PET method, see :func:`pet_calculator`.
+    max_workers : int, default 1
+        Number of worker processes of the parallel mode.
+    streaming : bool, default False
+        Process the inputs in memory-bounded time blocks in this process and
+        append every block to ``out_file`` instead of computing all time steps
+        in worker processes and writing them at once.
+    available_mem_gib : float, optional
+        Memory budget in GiB for one block in the streaming mode. Defaults to
+        :data:`PET_STREAM_BLOCK_BYTES`.
+    """
     error_msg = []
     tavg, tmin, tmax = None, None, None
     datasets_to_close = []
@@ -431,7 +769,8 @@ def calculate_pet(  # noqa: PLR0915
             grid_dataset = ds_tmax
             grid_dataarray = tmax
 
-        if method in METHODS_REQUIRING_TMAX_TMIN:
+        if method in METHODS_REQUIRING_TMAX_TMIN and not streaming:
+            # the streaming mode validates block by block
             validate_tmin_tmax(tmin=tmin, tmax=tmax)
 
     elif method in METHODS_REQUIRING_TMAX_TMIN:
@@ -452,52 +791,39 @@ def calculate_pet(  # noqa: PLR0915
     lat_da = _get_latitude_da(grid_dataset, grid_dataarray)
     template = grid_dataarray.isel(time=0, drop=True)
     lat_broadcast = xr.broadcast(lat_da, template)[0]
-    lat3d = np.radians(lat_broadcast.data)[np.newaxis, ...]
+    table = DayOfYearTable(lat_broadcast.data)
 
     logger.info(f"Data frequency is {stat_freq}")
 
-    # Build arguments for each time slice
-    tasks = []
-    for idx, t in enumerate(times):
-        # convert timestamp to datetime
-        current_time = datetime.fromtimestamp(int(t) / 1e9, tz=timezone.utc)
-        tarr = None
-        tmaxarr = None
-        tminarr = None
-        if tavg is not None:
-            tarr = tavg.isel(time=idx).data[np.newaxis, :, :]
-        if tmax is not None:
-            tmaxarr = tmax.isel(time=idx).data[np.newaxis, :, :]
-        if tmin is not None:
-            tminarr = tmin.isel(time=idx).data[np.newaxis, :, :]
-        tasks.append(
-            {
-                "tavg": tarr,
-                "tmax": tmaxarr,
-                "tmin": tminarr,
-                "lat": lat3d,
-                "time": current_time,
-                "stat_freq": stat_freq,
-                "method": method,
-            }
-        )
-    logger.info(f"Calculating pet in parallel on {max_workers} cores")
-    # Compute PET in parallel
-    results = Parallel(n_jobs=max_workers, backend="loky")(
-        delayed(pet_calculator)(**task) for task in tasks
-    )
-    logger.info(f"results are merged into one array {len(results)}")
-    # Stack results into array
-    pet_data = np.vstack(results)
-    pet_data = pet_data.astype(np.float32)
-
-    # Wrap into DataArray
     data_attrs = {"units": "mm", "missing_value": -9999.0, "_FillValue": -9999.0}
     if "grid_mapping" in grid_dataarray.attrs:
         data_attrs["grid_mapping"] = grid_dataarray.attrs["grid_mapping"]
-    pet_ds = set_grid(pet_data, grid_definition, "pet", data_attrs)
-    logger.info("writing output")
-    write_xarray_to_file(pet_ds, Path(out_file))
+
+    inputs = {"tavg": tavg, "tmin": tmin, "tmax": tmax}
+    if streaming:
+        _calculate_pet_streaming(
+            out_file=Path(out_file),
+            inputs=inputs,
+            times=times,
+            stat_freq=stat_freq,
+            method=method,
+            table=table,
+            grid_definition=grid_definition,
+            data_attrs=data_attrs,
+            available_mem_gib=available_mem_gib,
+        )
+    else:
+        _calculate_pet_parallel(
+            out_file=Path(out_file),
+            inputs=inputs,
+            times=times,
+            stat_freq=stat_freq,
+            method=method,
+            table=table,
+            grid_definition=grid_definition,
+            data_attrs=data_attrs,
+            max_workers=max_workers,
+        )
 
     for dataset in datasets_to_close:
         with contextlib.suppress(AttributeError):
@@ -6,6 +6,10 @@ This module provides functions to:
 - Crop spatial fields to a user-defined region
 - Write the pre-processed data out as CF-compliant NetCDF
 
+In the pipelined mode every file is cropped by an index window first, kept
+lazy (dask-backed) through resampling and unit conversion, and written chunk by
+chunk, with several files processed in a bounded worker pool.
+
 Authors
 -------
 - Jeisson Leal
@@ -14,15 +18,26 @@ Authors
 
 import logging
 from pathlib import Path
-from typing import Optional, Union
+from typing import List, Optional, Tuple, Union
 
+import dask
 import pandas as pd
 import xarray as xr
+from joblib import Parallel, delayed
 
-from mhm_tools.common.file_handler import get_xarray_ds_from_file, write_xarray_to_file
-from mhm_tools.common.logger import ErrorLogger, log_arguments
+from mhm_tools.common.file_handler import (
+    ChunkType,
+    get_xarray_ds_from_file,
+    plan_chunks,
+    write_xarray_to_file,
+)
+from mhm_tools.common.logger import ErrorLogger, LazySummary, log_arguments
 from mhm_tools.common.time_utils import resample_to_daily_or_hourly_adaptive
-from mhm_tools.common.xarray_utils import crop_ds, get_single_data_var
+from mhm_tools.common.xarray_utils import (
+    crop_ds,
+    get_crop_window,
+    get_single_data_var,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +57,9 @@ TEMPERATURE_UNITS = [
 ]
 PRECIPITATION_UNITS = ["m", "kg m-2", "mm"]
 PRECIPITATION_RATE_UNITS = ["kg m-2 s-1", "mm s-1", "mm d-1"]
+PIPELINE_MEM_GIB = 1.0
+"""Default memory budget in GiB per file of the pipelined mode."""
+_NC_CHUNK_BYTES = 4 * 1024**2
 
 
 def _normalize_unit_string(units: str) -> str:
@@ -57,7 +75,7 @@ def convert_units(ds: Union[xr.Dataset, xr.DataArray], var: str) -> xr.DataArray
     and precipitation variables are converted to millimeters (mm).
     """
     logger.info(f"Converting units for variable '{var}'")
-    logger.debug(f"Original dataset: {ds}")
+    logger.debug("Original dataset: %s", LazySummary(ds))
     if isinstance(ds, xr.Dataset):
         if var not in ds:
             msg = f"Variable '{var}' not found in dataset."
@@ -122,8 +140,117 @@ def convert_units(ds: Union[xr.Dataset, xr.DataArray], var: str) -> xr.DataArray
     return da, encoding
 
 
+def _netcdf_chunksizes(da: xr.DataArray) -> Tuple[int, ...]:
+    """Return NetCDF chunk sizes aligned with the dask chunks of ``da``.
+
+    Spatial chunks follow the dask chunks, the time chunk is limited so that
+    one NetCDF chunk stays small.
+    """
+    sizes = {dim: chunks[0] for dim, chunks in zip(da.dims, da.chunks)}
+    if "time" in sizes:
+        other = 1
+        for dim, size in sizes.items():
+            if dim != "time":
+                other *= size
+        per_step = max(1, other * da.dtype.itemsize)
+        sizes["time"] = max(1, min(sizes["time"], _NC_CHUNK_BYTES // per_step))
+    return tuple(int(sizes[dim]) for dim in da.dims)
+
+
+def _prepare_forcing_file(
+    path: Path,
+    out_path: Path,
+    var: Optional[str],
+    crop_bounds: Optional[Tuple[Tuple[float, float], Tuple[float, float]]],
+    use_mfdataset: bool,
+    target_frequency: Optional[str],
+    out_var: Optional[str],
+    available_mem_gib: float,
+    synchronous: bool,
+) -> Tuple[Path, Optional[str]]:
+    """Crop, resample, convert and write one forcing file lazily.
+
+    Returns the input file and an error message instead of raising, so that
+    failures of all files can be collected from the worker pool.
+    """
+    try:
+        ds = get_xarray_ds_from_file(
+            file_path=str(path),
+            use_mfdataset=use_mfdataset,
+            normalize_latlon_coords=True,
+            force_decending_y=True,
+        )
+        if var is None:
+            var = get_single_data_var(ds)
+        # crop first so that only the region is resampled and converted
+        if crop_bounds is not None:
+            ds = ds.isel(get_crop_window(ds, *crop_bounds))
+        ds = ds.chunk(plan_chunks(ds, available_mem_gib, ChunkType.SPACE, var))
+        if target_frequency is not None:
+            ds = resample_to_daily_or_hourly_adaptive(
+                in_obj=ds, target=target_frequency, var=var
+            )
+        da, encoding = convert_units(ds, var)
+        if out_var:
+            da = da.rename(out_var)
+        name = da.name
+        encoding = {
+            name: {
+                "zlib": True,
+                "complevel": 4,
+                "shuffle": True,
+                "chunksizes": _netcdf_chunksizes(da),
+                **encoding,
+            }
+        }
+        scheduler = "synchronous" if synchronous else "threads"
+        with dask.config.set(scheduler=scheduler):
+            write_xarray_to_file(ds=da, file_path=out_path, encoding=encoding)
+        ds.close()
+    except Exception as e:
+        return path, f"{type(e).__name__}: {e}"
+    return path, None
+
+
+def _prepare_forcings_pipelined(
+    files: List[Path],
+    out_paths: List[Path],
+    n_jobs: int,
+    **kwargs,
+) -> None:
+    """Run :func:`_prepare_forcing_file` for all files in a bounded pool.
+
+    Errors are collected per file and raised together once all files were
+    processed.
+    """
+    if len(set(out_paths)) < len(out_paths):
+        msg = (
+            "Several input files map to the same output file; use out_file='*' "
+            "to keep the input file names."
+        )
+        with ErrorLogger(logger):
+            raise ValueError(msg)
+    n_jobs = max(1, min(int(n_jobs), len(files)))
+    logger.info(f"Preparing {len(files)} forcing files on {n_jobs} jobs.")
+    # with several workers each file is computed in its worker only
+    results = Parallel(n_jobs=n_jobs, backend="loky")(
+        delayed(_prepare_forcing_file)(path, out_path, synchronous=n_jobs > 1, **kwargs)
+        for path, out_path in zip(files, out_paths)
+    )
+    errors = [(path, error) for path, error in results if error is not None]
+    for path, error in errors:
+        logger.error(f"Processing {path} failed: {error}")
+    if errors:
+        msg = (
+            f"Processing failed for {len(errors)} of {len(files)} files: "
+            + ", ".join(str(path) for path, _ in errors)
+        )
+        with ErrorLogger(logger):
+            raise RuntimeError(msg)
+
+
 @log_arguments("DEBUG")
-def prepare_forcings(
+def prepare_forcings(  # noqa: PLR0913
     in_dir: str,
     in_file: str,
     out_dir: str,
@@ -137,10 +264,25 @@ def prepare_forcings(
     use_mfdataset: bool = False,
     target_frequency: Optional[str] = None,
     out_var: Optional[str] = None,
+    pipelined: bool = False,
+    n_jobs: int = 1,
+    available_mem_gib: Optional[float] = None,
 ) -> None:
     """Loop through all files matching in_file in in_dir, convert units.
 
     Optionally crop, and write to NetCDF in out_dir with naming controlled by out_file.
+
+    Parameters
+    ----------
+    pipelined : bool, default False
+        Crop every file by an index window before anything else, keep the
+        data lazy through resampling and unit conversion, and write it chunk
+        by chunk.
+    n_jobs : int, default 1
+        Number of files processed in parallel in the pipelined mode.
+    available_mem_gib : float, optional
+        Memory budget in GiB per file of the pipelined mode used to size the
+        dask chunks. Defaults to :data:`PIPELINE_MEM_GIB`.
     """
     files = sorted(Path(in_dir).glob(in_file))
     if not files:
@@ -148,7 +290,29 @@ def prepare_forcings(
             msg = f"No files match pattern {in_file!r} in directory {in_dir!r}"
             raise FileNotFoundError(msg)
 
+    if crop and None in (lon_min, lon_max, lat_min, lat_max):
+        with ErrorLogger(logger):
+            msg = "All lon/lat bounds must be provided when crop=True."
+            raise ValueError(msg)
+
     Path(out_dir).mkdir(parents=True, exist_ok=True)
+    if pipelined:
+        _prepare_forcings_pipelined(
+            files=files,
+            out_paths=[
+                Path(out_dir) / (path.name if out_file == "*" else out_file)
+                for path in files
+            ],
+            n_jobs=n_jobs,
+            var=var,
+            crop_bounds=((lon_min, lon_max), (lat_min, lat_max)) if crop else None,
+            use_mfdataset=use_mfdataset,
+            target_frequency=target_frequency,
+            out_var=out_var,
+            available_mem_gib=available_mem_gib or PIPELINE_MEM_GIB,
+        )
+        return
+
     for path in files:
         # Load dataset
         ds = get_xarray_ds_from_file(
@@ -175,17 +339,13 @@ def prepare_forcings(
 
         # Crop spatially
         if crop:
-            if None in (lon_min, lon_max, lat_min, lat_max):
-                with ErrorLogger(logger):
-                    msg = "All lon/lat bounds must be provided when crop=True."
-                    raise ValueError(msg)
             da = crop_ds(da, lon_min, lon_max, lat_min, lat_max)
 
         # Determine output name
         name = path.name if out_file == "*" else out_file
 
         # Write output
-        logger.info(da)
+        logger.info("%s", LazySummary(da))
         write_xarray_to_file(
             ds=da, file_path=Path(out_dir) / name
         )  # , encoding=encoding)
@@ -16,32 +16,58 @@ USAGE:
 
 Methods
 -------
-  nearest  -> xarray .interp(method="nearest")
-  linear   -> xarray .interp(method="linear")
+  nearest       -> same result as xarray .interp(method="nearest")
+  linear        -> same result as xarray .interp(method="linear")
+  conservative  -> area-weighted mean over overlapping source cells
 
 Notes
 -----
 - Assumes regular lon/lat grids.
 - L2 must be an integer multiple of L0 in both x and y.
+- Interpolation index/weight tables (:class:`RegridWeights`) are computed once
+  per source grid, target grid and method, optionally cached on disk, and
+  applied to every variable and time step with ``take`` operations.
+- Conservative remapping (:class:`ConservativeWeights`) sums integer blocks of
+  source cells when the grids are aligned integer multiples and uses sparse
+  per-axis overlap matrices otherwise. Time steps are processed in chunks.
+- Results have the compute dtype (see :mod:`mhm_tools.common.precision`);
+  conservative sums are accumulated in float64 per chunk.
 
 Authors
 -------
 - Simon Lüdke
 """
 
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional, Union
 
 import numpy as np
 import xarray as xr
+from joblib import Parallel, delayed
+from scipy import sparse
 
-from mhm_tools.common.constants import NC_ENCODE_DEFAULTS
 from mhm_tools.common.file_handler import get_xarray_ds_from_file, write_xarray_to_file
-from mhm_tools.common.logger import ErrorLogger
+from mhm_tools.common.logger import ErrorLogger, LazySummary
+from mhm_tools.common.precision import compute_dtype_of, get_compute_dtype
 from mhm_tools.common.xarray_utils import get_coord_key
 
 logger = logging.getLogger(__name__)
 
+INTERP_METHODS = ("nearest", "linear")
+REGRID_METHODS = (*INTERP_METHODS, "conservative")
+CONSERVATIVE_BLOCK_BYTES = 64 * 1024**2
+WEIGHTS_CACHE_SIZE = 16
+"""Number of weight tables kept in memory by :func:`get_regrid_weights`."""
+_WEIGHTS_CACHE: "OrderedDict[str, Union[RegridWeights, ConservativeWeights]]" = (
+    OrderedDict()
+)
+_WEIGHTS_CACHE_LOCK = threading.Lock()
+
 
 def _delta_from_coords(vals: np.ndarray) -> float:
     # robust median step (handles ascending or descending)
@@ -69,8 +95,545 @@ def _build_aligned_coords(vmin, vmax, step):
     return vmin + step * np.arange(n, dtype=float)
 
 
-def regrid_xarray(ds, lon_name, lat_name, lon_target, lat_target, method, var=None):
-    """Regrid an xarray Dataset using xarray interpolation."""
+def _weights_method(method: str) -> str:
+    """Map a user method name to a :data:`REGRID_METHODS` entry."""
+    return method if method in ("nearest", "conservative") else "linear"
+
+
+def grid_hash(lon: np.ndarray, lat: np.ndarray) -> str:
+    """Return a hash of 1D lon/lat coordinates rounded to 1e-9 degrees."""
+    digest = hashlib.sha1()
+    for coord in (lon, lat):
+        values = np.round(np.asarray(coord, dtype=np.float64), 9)
+        digest.update(str(values.shape).encode())
+        digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+def _axis_tables(source: np.ndarray, target: np.ndarray, method: str) -> tuple:
+    """Return index and weight tables interpolating ``source`` to ``target``.
+
+    The tables have one row per contributing source cell (1 for nearest, 2
+    for linear). Targets outside the source range get NaN weights. Interval
+    search and ties follow scipy's regular grid interpolation used by xarray.
+    """
+    source = np.asarray(source, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    order = np.argsort(source, kind="stable")
+    ordered = source[order]
+    outside = (target < ordered[0]) | (target > ordered[-1])
+    if ordered.size == 1:
+        index = np.zeros((1, target.size), dtype=np.int64)
+        weight = np.where(outside, np.nan, 1.0)[np.newaxis]
+        return index, weight
+    pos = np.clip(np.searchsorted(ordered, target, side="left") - 1, 0, None)
+    pos = np.minimum(pos, ordered.size - 2)
+    upper = (target - ordered[pos]) / (ordered[pos + 1] - ordered[pos])
+    if method == "nearest":
+        index = order[pos + (upper > 0.5)][np.newaxis]
+        weight = np.where(outside, np.nan, 1.0)[np.newaxis]
+    else:
+        index = np.stack([order[pos], order[pos + 1]])
+        weight = np.stack([1.0 - upper, upper])
+        weight[:, outside] = np.nan
+    return index.astype(np.int64), weight
+
+
+def _apply_axis_tables(data, axis: int, index: np.ndarray, weight: np.ndarray):
+    """Interpolate ``data`` along ``axis`` with precomputed tables."""
+    shape = [1] * data.ndim
+    shape[axis] = -1
+    result = None
+    for row_index, row_weight in zip(index, weight):
+        part = np.take(data, row_index, axis=axis) * row_weight.reshape(shape)
+        result = part if result is None else result + part
+    return result
+
+
+@dataclass
+class RegridWeights:
+    """Interpolation tables between two rectilinear lon/lat grids.
+
+    Bilinear and nearest-neighbour interpolation on rectilinear grids are
+    separable, so one index/weight table per axis describes the full
+    source→target mapping. The tables are computed once per source grid,
+    target grid and method and reused for every variable and time step.
+
+    Attributes
+    ----------
+    method : str
+        "nearest" or "linear".
+    source_hash : str
+        :func:`grid_hash` of the source grid.
+    lon_target, lat_target : np.ndarray
+        Target coordinates.
+    lon_index, lon_weight, lat_index, lat_weight : np.ndarray
+        Per-axis tables of shape ``(n_contributing, n_target)``.
+    """
+
+    method: str
+    source_hash: str
+    lon_target: np.ndarray
+    lat_target: np.ndarray
+    lon_index: np.ndarray
+    lon_weight: np.ndarray
+    lat_index: np.ndarray
+    lat_weight: np.ndarray
+
+    @classmethod
+    def from_coords(cls, src_lon, src_lat, lon_target, lat_target, method="linear"):
+        """Compute the tables from 1D source and target coordinates."""
+        if method not in INTERP_METHODS:
+            msg = f"Unknown regrid method {method!r}; use one of {INTERP_METHODS}."
+            with ErrorLogger(logger):
+                raise ValueError(msg)
+        lon_index, lon_weight = _axis_tables(src_lon, lon_target, method)
+        lat_index, lat_weight = _axis_tables(src_lat, lat_target, method)
+        return cls(
+            method=method,
+            source_hash=grid_hash(src_lon, src_lat),
+            lon_target=np.asarray(lon_target),
+            lat_target=np.asarray(lat_target),
+            lon_index=lon_index,
+            lon_weight=lon_weight,
+            lat_index=lat_index,
+            lat_weight=lat_weight,
+        )
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Store the tables in a ``.npz`` file."""
+        np.savez(
+            path,
+            method=self.method,
+            source_hash=self.source_hash,
+            lon_target=self.lon_target,
+            lat_target=self.lat_target,
+            lon_index=self.lon_index,
+            lon_weight=self.lon_weight,
+            lat_index=self.lat_index,
+            lat_weight=self.lat_weight,
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "RegridWeights":
+        """Load tables stored with :meth:`save`."""
+        with np.load(path) as data:
+            fields = {key: data[key] for key in data.files}
+        fields["method"] = str(fields["method"])
+        fields["source_hash"] = str(fields["source_hash"])
+        return cls(**fields)
+
+    def apply(self, da: xr.DataArray, lon_name: str, lat_name: str) -> xr.DataArray:
+        """Interpolate ``da`` to the target grid; other dims are kept.
+
+        Works on numpy and dask-backed arrays. Arrays without both lon and
+        lat dimensions are returned unchanged.
+        """
+        if lon_name not in da.dims or lat_name not in da.dims:
+            return da
+        data = da.data
+        if not np.issubdtype(data.dtype, np.floating):
+            data = data.astype(get_compute_dtype())
+        # float64 weights would promote float32 data
+        dtype = compute_dtype_of(np.result_type(data.dtype, self.lat_weight.dtype))
+        data = _apply_axis_tables(
+            data,
+            da.get_axis_num(lat_name),
+            self.lat_index,
+            self.lat_weight.astype(dtype, copy=False),
+        )
+        data = _apply_axis_tables(
+            data,
+            da.get_axis_num(lon_name),
+            self.lon_index,
+            self.lon_weight.astype(dtype, copy=False),
+        )
+        coords = {
+            name: coord
+            for name, coord in da.coords.items()
+            if lon_name not in coord.dims and lat_name not in coord.dims
+        }
+        coords[lon_name] = (lon_name, self.lon_target, da[lon_name].attrs)
+        coords[lat_name] = (lat_name, self.lat_target, da[lat_name].attrs)
+        return xr.DataArray(
+            data, dims=da.dims, coords=coords, name=da.name, attrs=da.attrs
+        )
+
+
+def _cell_edges(coord: np.ndarray) -> np.ndarray:
+    """Return the ``n + 1`` cell edges of 1D cell centres (any direction)."""
+    coord = np.asarray(coord, dtype=np.float64)
+    if coord.size < 2:
+        msg = "Conservative remapping needs at least two cells per axis."
+        with ErrorLogger(logger):
+            raise ValueError(msg)
+    mid = 0.5 * (coord[:-1] + coord[1:])
+    return np.concatenate([[2 * coord[0] - mid[0]], mid, [2 * coord[-1] - mid[-1]]])
+
+
+def _overlap_matrix(source: np.ndarray, target: np.ndarray) -> sparse.csr_matrix:
+    """Return the fraction of each source cell covered by each target cell.
+
+    The result has shape ``(n_target, n_source)``; entry ``(i, j)`` is the
+    length of the overlap of target cell ``i`` and source cell ``j`` divided
+    by the width of source cell ``j``.
+    """
+    src_edges = _cell_edges(source)
+    tgt_edges = _cell_edges(target)
+    src_lo = np.minimum(src_edges[:-1], src_edges[1:])
+    src_hi = np.maximum(src_edges[:-1], src_edges[1:])
+    tgt_lo = np.minimum(tgt_edges[:-1], tgt_edges[1:])
+    tgt_hi = np.maximum(tgt_edges[:-1], tgt_edges[1:])
+    order = np.argsort(src_lo, kind="stable")
+    lo_sorted = src_lo[order]
+    hi_sorted = src_hi[order]
+    first = np.searchsorted(hi_sorted, tgt_lo, side="right")
+    stop = np.searchsorted(lo_sorted, tgt_hi, side="left")
+    counts = np.maximum(stop - first, 0)
+    rows = np.repeat(np.arange(target.size), counts)
+    offsets = np.arange(rows.size) - np.repeat(np.cumsum(counts) - counts, counts)
+    cols = order[np.repeat(first, counts) + offsets]
+    overlap = np.minimum(tgt_hi[rows], src_hi[cols]) - np.maximum(
+        tgt_lo[rows], src_lo[cols]
+    )
+    width = src_hi - src_lo
+    keep = overlap > 1e-9 * width[cols]
+    matrix = sparse.csr_matrix(
+        (overlap[keep] / width[cols[keep]], (rows[keep], cols[keep])),
+        shape=(target.size, source.size),
+    )
+    matrix.sort_indices()
+    return matrix
+
+
+def _block_layout(matrix: sparse.csr_matrix, source, target) -> np.ndarray:
+    """Return ``[start, factor]`` if ``matrix`` sums aligned source blocks.
+
+    Target cells then cover exactly ``factor`` consecutive source cells,
+    starting at ``start`` and in the source order. ``[-1, -1]`` is returned
+    otherwise.
+    """
+    no_block = np.array([-1, -1], dtype=np.int64)
+    if source.size < 2 or target.size < 2:
+        return no_block
+    ok, factor = _check_integer_multiple(
+        _delta_from_coords(target), _delta_from_coords(source), tol=1e-6
+    )
+    n_target = target.size
+    if not ok or factor < 1 or matrix.nnz != n_target * factor:
+        return no_block
+    if not np.allclose(matrix.data, 1.0, rtol=0, atol=1e-9):
+        return no_block
+    expected = matrix.indices[0] + np.arange(n_target * factor)
+    if not np.array_equal(matrix.indices, expected):
+        return no_block
+    return np.array([matrix.indices[0], factor], dtype=np.int64)
+
+
+def _reduce_axis(data: np.ndarray, axis: int, matrix, block) -> np.ndarray:
+    """Apply an overlap matrix (or block sum) along ``axis`` (1 or 2) of 3D data."""
+    start, factor = (int(v) for v in block)
+    n_target = matrix.shape[0]
+    if factor > 0:
+        window = [slice(None)] * 3
+        window[axis] = slice(start, start + n_target * factor)
+        shape = list(data.shape)
+        shape[axis : axis + 1] = [n_target, factor]
+        return data[tuple(window)].reshape(shape).sum(axis=axis + 1)
+    moved = np.moveaxis(data, axis, 0)
+    result = matrix @ moved.reshape(moved.shape[0], -1)
+    return np.moveaxis(result.reshape(n_target, *moved.shape[1:]), 0, axis)
+
+
+@dataclass
+class ConservativeWeights:
+    """First-order conservative remapping between rectilinear lon/lat grids.
+
+    Every target cell gets the cell-area-weighted mean of the valid source
+    cells it overlaps (or, for extensive fields, the overlap-weighted sum).
+    Overlaps are separable into per-axis fraction matrices; when the target
+    cells are aligned integer multiples of the source cells (see
+    :func:`_check_integer_multiple`) the matrices are replaced by exact
+    block sums. Source cell areas come from
+    :func:`mhm_tools.pre.catchment.create_cell_area`.
+
+    Attributes
+    ----------
+    method : str
+        Always "conservative".
+    source_hash : str
+        :func:`grid_hash` of the source grid.
+    lon_target, lat_target : np.ndarray
+        Target coordinates.
+    lon_matrix, lat_matrix : scipy.sparse.csr_matrix
+        Per-axis overlap fractions of shape ``(n_target, n_source)``.
+    lon_block, lat_block : np.ndarray
+        ``[start, factor]`` of the block layout per axis, or ``[-1, -1]``.
+    cell_area : np.ndarray
+        Source cell areas in km2 with shape ``(n_lat, n_lon)``.
+    """
+
+    method: str
+    source_hash: str
+    lon_target: np.ndarray
+    lat_target: np.ndarray
+    lon_matrix: sparse.csr_matrix
+    lat_matrix: sparse.csr_matrix
+    lon_block: np.ndarray
+    lat_block: np.ndarray
+    cell_area: np.ndarray
+
+    @classmethod
+    def from_coords(cls, src_lon, src_lat, lon_target, lat_target):
+        """Compute overlap matrices and cell areas from 1D coordinates."""
+        from mhm_tools.pre.catchment import create_cell_area
+
+        src_lon = np.asarray(src_lon, dtype=np.float64)
+        src_lat = np.asarray(src_lat, dtype=np.float64)
+        lon_target = np.asarray(lon_target)
+        lat_target = np.asarray(lat_target)
+        lon_matrix = _overlap_matrix(src_lon, lon_target)
+        lat_matrix = _overlap_matrix(src_lat, lat_target)
+        grid = xr.Dataset(coords={"lat": src_lat, "lon": src_lon})
+        return cls(
+            method="conservative",
+            source_hash=grid_hash(src_lon, src_lat),
+            lon_target=lon_target,
+            lat_target=lat_target,
+            lon_matrix=lon_matrix,
+            lat_matrix=lat_matrix,
+            lon_block=_block_layout(lon_matrix, src_lon, lon_target),
+            lat_block=_block_layout(lat_matrix, src_lat, lat_target),
+            cell_area=create_cell_area(grid).values,
+        )
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Store the matrices in a ``.npz`` file."""
+        arrays = {}
+        for axis in ("lon", "lat"):
+            matrix = getattr(self, f"{axis}_matrix")
+            arrays[f"{axis}_data"] = matrix.data
+            arrays[f"{axis}_indices"] = matrix.indices
+            arrays[f"{axis}_indptr"] = matrix.indptr
+            arrays[f"{axis}_shape"] = np.asarray(matrix.shape)
+        np.savez(
+            path,
+            method=self.method,
+            source_hash=self.source_hash,
+            lon_target=self.lon_target,
+            lat_target=self.lat_target,
+            lon_block=self.lon_block,
+            lat_block=self.lat_block,
+            cell_area=self.cell_area,
+            **arrays,
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ConservativeWeights":
+        """Load matrices stored with :meth:`save`."""
+        with np.load(path) as data:
+            fields = {key: data[key] for key in data.files}
+        for axis in ("lon", "lat"):
+            fields[f"{axis}_matrix"] = sparse.csr_matrix(
+                (
+                    fields.pop(f"{axis}_data"),
+                    fields.pop(f"{axis}_indices"),
+                    fields.pop(f"{axis}_indptr"),
+                ),
+                shape=tuple(fields.pop(f"{axis}_shape")),
+            )
+        fields["method"] = str(fields["method"])
+        fields["source_hash"] = str(fields["source_hash"])
+        return cls(**fields)
+
+    def _remap_stack(self, data: np.ndarray, extensive: bool) -> np.ndarray:
+        """Remap ``(n, n_lat, n_lon)`` data in memory-bounded chunks of ``n``.
+
+        Each chunk is reduced in float64, the result has the compute dtype.
+        """
+
+        def _reduce(values):
+            values = _reduce_axis(values, 1, self.lat_matrix, self.lat_block)
+            return _reduce_axis(values, 2, self.lon_matrix, self.lon_block)
+
+        weight = np.ones_like(self.cell_area) if extensive else self.cell_area
+        full_cover = _reduce(weight[np.newaxis])
+        n_cells = self.cell_area.size
+        chunk = max(1, CONSERVATIVE_BLOCK_BYTES // (4 * 8 * n_cells))
+        out = np.empty(
+            (data.shape[0], self.lat_target.size, self.lon_target.size),
+            dtype=get_compute_dtype(),
+        )
+        for start in range(0, data.shape[0], chunk):
+            block = data[start : start + chunk]
+            valid = np.isfinite(block)
+            if valid.all():
+                total = _reduce(block * weight)
+                cover = full_cover
+            else:
+                total = _reduce(np.where(valid, block, 0.0) * weight)
+                cover = _reduce(valid * weight)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                if extensive:
+                    result = np.where(cover > 0, total, np.nan)
+                else:
+                    result = np.where(cover > 0, total / cover, np.nan)
+            out[start : start + chunk] = result
+        return out
+
+    def _remap_core(self, data: np.ndarray, extensive: bool) -> np.ndarray:
+        lead = data.shape[:-2]
+        stack = data.reshape(-1, *data.shape[-2:])
+        out = self._remap_stack(stack, extensive)
+        return out.reshape(*lead, *out.shape[-2:])
+
+    def apply(
+        self,
+        da: xr.DataArray,
+        lon_name: str,
+        lat_name: str,
+        extensive: bool = False,
+    ) -> xr.DataArray:
+        """Remap ``da`` to the target grid; other dims are kept.
+
+        Parameters
+        ----------
+        da : xarray.DataArray
+            Data on the source grid, numpy or dask-backed. Dask arrays are
+            remapped lazily, chunk by chunk along the non-spatial dims.
+        lon_name, lat_name : str
+            Names of the spatial dimensions.
+        extensive : bool, optional
+            Sum overlapping source contributions instead of averaging them,
+            for quantities given per cell rather than per area.
+            By default False.
+
+        Returns
+        -------
+        xarray.DataArray
+            The remapped data; target cells without valid source cells are NaN.
+        """
+        if lon_name not in da.dims or lat_name not in da.dims:
+            return da
+        spatial = (lat_name, lon_name)
+        if da.chunks is not None:
+            da = da.chunk({lat_name: -1, lon_name: -1})
+        out = xr.apply_ufunc(
+            self._remap_core,
+            da,
+            kwargs={"extensive": extensive},
+            input_core_dims=[list(spatial)],
+            output_core_dims=[list(spatial)],
+            exclude_dims=set(spatial),
+            dask="parallelized",
+            output_dtypes=[get_compute_dtype()],
+            dask_gufunc_kwargs={
+                "output_sizes": {
+                    lat_name: self.lat_target.size,
+                    lon_name: self.lon_target.size,
+                }
+            },
+            keep_attrs=True,
+        ).transpose(*da.dims)
+        return out.assign_coords(
+            {
+                lon_name: (lon_name, self.lon_target, da[lon_name].attrs),
+                lat_name: (lat_name, self.lat_target, da[lat_name].attrs),
+            }
+        )
+
+
+def get_regrid_weights(
+    src_lon,
+    src_lat,
+    lon_target,
+    lat_target,
+    method: str = "linear",
+    cache_dir: Optional[Union[str, Path]] = None,
+) -> Union[RegridWeights, ConservativeWeights]:
+    """Return regridding weights, reusing cached ones where possible.
+
+    The :data:`WEIGHTS_CACHE_SIZE` most recently used tables are cached in
+    memory for the running process and, if ``cache_dir`` is given, all tables
+    are cached as ``.npz`` files keyed by the hashes of both grids and the
+    method.
+    """
+    key = hashlib.sha1(
+        f"{method}:{grid_hash(src_lon, src_lat)}:"
+        f"{grid_hash(lon_target, lat_target)}".encode()
+    ).hexdigest()
+    with _WEIGHTS_CACHE_LOCK:
+        if key in _WEIGHTS_CACHE:
+            _WEIGHTS_CACHE.move_to_end(key)
+            return _WEIGHTS_CACHE[key]
+    weights_cls = ConservativeWeights if method == "conservative" else RegridWeights
+    cache_file = None
+    if cache_dir is not None:
+        cache_file = Path(cache_dir) / f"regrid_weights_{key}.npz"
+    if cache_file is not None and cache_file.is_file():
+        logger.debug(f"Loading regrid weights from {cache_file}")
+        weights = weights_cls.load(cache_file)
+    else:
+        if weights_cls is ConservativeWeights:
+            weights = ConservativeWeights.from_coords(
+                src_lon, src_lat, lon_target, lat_target
+            )
+        else:
+            weights = RegridWeights.from_coords(
+                src_lon, src_lat, lon_target, lat_target, method
+            )
+        if cache_file is not None:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # write to a temporary name so parallel workers never read partial files
+            tmp_file = cache_file.with_name(f".{cache_file.stem}.{id(weights)}.npz")
+            weights.save(tmp_file)
+            tmp_file.replace(cache_file)
+    with _WEIGHTS_CACHE_LOCK:
+        _WEIGHTS_CACHE[key] = weights
+        _WEIGHTS_CACHE.move_to_end(key)
+        while len(_WEIGHTS_CACHE) > WEIGHTS_CACHE_SIZE:
+            _WEIGHTS_CACHE.popitem(last=False)
+    return weights
+
+
+def regrid_like(
+    da: xr.DataArray,
+    like: xr.DataArray,
+    method: str = "linear",
+    lon_name: str = "lon",
+    lat_name: str = "lat",
+) -> xr.DataArray:
+    """Interpolate ``da`` onto the lon/lat grid of ``like`` with cached weights.
+
+    Equivalent to ``da.interp_like(like)`` for rectilinear lon/lat grids and
+    the "nearest" and "linear" methods.
+    """
+    weights = get_regrid_weights(
+        da[lon_name].values,
+        da[lat_name].values,
+        like[lon_name].values,
+        like[lat_name].values,
+        method,
+    )
+    return weights.apply(da, lon_name, lat_name)
+
+
+def regrid_xarray(
+    ds,
+    lon_name,
+    lat_name,
+    lon_target,
+    lat_target,
+    method,
+    var=None,
+    weights: Optional[Union[RegridWeights, ConservativeWeights]] = None,
+    cache_dir: Optional[Union[str, Path]] = None,
+):
+    """Regrid an xarray Dataset with precomputed interpolation tables.
+
+    ``weights`` are used if they were computed for the grid of ``ds``,
+    otherwise they are looked up with :func:`get_regrid_weights`.
+    """
     # Select variables to regrid
     if var:
         dvs = [var]
@@ -78,34 +641,42 @@ def regrid_xarray(ds, lon_name, lat_name, lon_target, lat_target, method, var=No
         dvs = [
             v for v in ds.data_vars if lon_name in ds[v].dims and lat_name in ds[v].dims
         ]
-    # Build target as dict for .interp
-    target = {
-        lon_name: xr.DataArray(lon_target, dims=(lon_name,)),
-        lat_name: xr.DataArray(lat_target, dims=(lat_name,)),
-    }
+    interp_method = _weights_method(method)
+    src_lon = ds[lon_name].values
+    src_lat = ds[lat_name].values
+    if (
+        weights is None
+        or weights.method != interp_method
+        or weights.source_hash != grid_hash(src_lon, src_lat)
+    ):
+        weights = get_regrid_weights(
+            src_lon, src_lat, lon_target, lat_target, interp_method, cache_dir
+        )
 
     # Create a DataArray for every variable, regridding those selected
     das = []
-    interp_method = "nearest" if method == "nearest" else "linear"
     for v in ds.data_vars:
-        da = ds[v].interp(target, method=interp_method) if v in dvs else ds[v]
+        da = weights.apply(ds[v], lon_name, lat_name) if v in dvs else ds[v]
         # ensure name consistency
         if da.name != v:
             da = da.rename(v)
         das.append(da)
         # Merge all DataArrays into a single Dataset and set target coords
     out = xr.merge(das)
-    out = out.assign_coords({lon_name: target[lon_name], lat_name: target[lat_name]})
+    out = out.assign_coords(
+        {
+            lon_name: xr.DataArray(lon_target, dims=(lon_name,)),
+            lat_name: xr.DataArray(lat_target, dims=(lat_name,)),
+        }
+    )
 
     # Copy attrs
     out.attrs.update(ds.attrs)
     return out
 
 
-def regrid_file(input, mask, output, l2, method="nearest", var=None):
-    """Regrid a single file to L2 grid using xarray."""
-    # p.add_argument("--var", default=None, help="Single variable to regrid (default: all 2D/3D lon-lat vars)")
-
+def _l2_target_coords(mask, l2):
+    """Return lon/lat names and L2 coordinates derived from ``mask``."""
     # Load mask to infer L0 grid
     dsm = get_xarray_ds_from_file(mask)
     if "mask_l2" in dsm.data_vars:
@@ -146,33 +717,83 @@ def regrid_file(input, mask, output, l2, method="nearest", var=None):
         latL2 = _build_aligned_coords(lat0.min(), lat0.max(), l2)
     logger.info(f"{lon_name} {lonL2}")
     logger.info(f"{lat_name} {latL2}")
+    return lon_name, lat_name, lonL2, latL2
+
+
+def regrid_file(
+    input,
+    mask,
+    output,
+    l2,
+    method="nearest",
+    var=None,
+    target=None,
+    weights=None,
+    cache_dir=None,
+    nc_access=None,
+    nc_codec="default",
+):
+    """Regrid a single file to L2 grid.
+
+    ``target`` (the result of the mask analysis) and ``weights`` may be
+    passed in to share them between files. ``nc_access`` and ``nc_codec``
+    select the output chunk shapes and compression (see
+    :func:`~mhm_tools.common.netcdf.plan_nc_encoding`).
+    """
+    if target is None:
+        target = _l2_target_coords(mask, l2)
+    lon_name, lat_name, lonL2, latL2 = target
     # Load input
     dsi = get_xarray_ds_from_file(input)
 
-    # xarray path (nearest/linear; bilinear falls back to linear)
-    method = method if method != "bilinear" else "linear"
+    # nearest/linear/conservative; bilinear falls back to linear
+    method = _weights_method(method)
     # Align input lon/lat names for xarray
     try:
         in_lon = get_coord_key(dsi, lon=True)
         in_lat = get_coord_key(dsi, lat=True)
     except Exception:
         in_lon, in_lat = lon_name, lat_name
-    logger.info(f"regrid with xarray {method} interpolation")
-    out = regrid_xarray(dsi, in_lon, in_lat, lonL2, latL2, method, var=var)
-    encoding = {
-        v: {"zlib": True, "complevel": 4, **NC_ENCODE_DEFAULTS} for v in out.data_vars
-    }
-    logger.info(out)
-    write_xarray_to_file(out, output, encoding=encoding)
+    logger.info(f"regrid with {method} interpolation")
+    out = regrid_xarray(
+        dsi,
+        in_lon,
+        in_lat,
+        lonL2,
+        latL2,
+        method,
+        var=var,
+        weights=weights,
+        cache_dir=cache_dir,
+    )
+    logger.info("%s", LazySummary(out))
+    write_xarray_to_file(out, output, access=nc_access, codec=nc_codec)
     logger.info(f"Wrote {output}")
 
 
-def regrid(input, mask, output, l2=None, method="nearest", var=None):
-    """Regrid file(s) to an L2 grid."""
+def regrid(
+    input,
+    mask,
+    output,
+    l2=None,
+    method="nearest",
+    var=None,
+    n_jobs=1,
+    cache_dir=None,
+    nc_access=None,
+    nc_codec="default",
+):
+    """Regrid file(s) to an L2 grid.
+
+    The target grid and the interpolation tables of the first file are
+    computed once and shared by all files, which are processed by ``n_jobs``
+    worker processes.
+    """
     input = Path(input)
+    output = Path(output)
     if input.is_dir():
         input_dir = input
-        files = input.rglob("*.nc")
+        files = sorted(input.rglob("*.nc"))
     elif input.is_file():
         input_dir = input.parent
         files = [input]
@@ -180,6 +801,28 @@ def regrid(input, mask, output, l2=None, method="nearest", var=None):
         msg = "Input is neither file nor dir."
         with ErrorLogger(logger):
             raise ValueError(msg)
+    if not files:
+        logger.warning(f"No NetCDF files found in {input}.")
+        return
+    target = _l2_target_coords(mask, l2)
+    interp_method = _weights_method(method)
+    ds_first = get_xarray_ds_from_file(files[0])
+    try:
+        first_lon = get_coord_key(ds_first, lon=True)
+        first_lat = get_coord_key(ds_first, lat=True)
+    except Exception:
+        first_lon, first_lat = target[0], target[1]
+    weights = get_regrid_weights(
+        ds_first[first_lon].values,
+        ds_first[first_lat].values,
+        target[2],
+        target[3],
+        interp_method,
+        cache_dir,
+    )
+    ds_first.close()
+
+    jobs = []
     for file_input in files:
         output_name = file_input.name
         output_path = output
@@ -190,4 +833,22 @@ def regrid(input, mask, output, l2=None, method="nearest", var=None):
             output_path / file_input.parent.relative_to(input_dir) / output_name
         )
         logger.info(f"{file_input} -> {file_output}")
-        regrid_file(file_input, mask, file_output, l2, method, var)
+        jobs.append((file_input, file_output))
+    n_jobs = max(1, min(int(n_jobs), len(jobs)))
+    logger.info(f"Regridding {len(jobs)} files on {n_jobs} jobs.")
+    Parallel(n_jobs=n_jobs, backend="loky")(
+        delayed(regrid_file)(
+            file_input,
+            mask,
+            file_output,
+            l2,
+            method,
+            var,
+            target=target,
+            weights=weights,
+            cache_dir=cache_dir,
+            nc_access=nc_access,
+            nc_codec=nc_codec,
+        )
+        for file_input, file_output in jobs
+    )
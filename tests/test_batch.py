@@ -0,0 +1,170 @@
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+import xarray as xr
+from click.testing import CliRunner
+
+from mhm_tools._cli._main import cli
+from mhm_tools.common import netcdf
+from mhm_tools.common.batch import BatchJob, load_batch_manifest, run_batch
+from mhm_tools.common.file_handler import write_xarray_to_netcdf
+
+
+def test_load_batch_manifest(tmp_path):
+    manifest = tmp_path / "batch.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "max_workers": 2,
+                "jobs": [
+                    {"name": "a", "command": "setup-creation latlon", "args": []},
+                    {
+                        "command": ["latlon"],
+                        "args": {"level0": "dem.asc", "add_bounds": True, "x": None},
+                        "depends_on": "a",
+                    },
+                    {"name": "c", "command": "latlon", "args": "--available-mem 2"},
+                    {"name": "d", "command": "evaluation gridded-data-evaluation"},
+                    {"name": "e", "command": "latlon", "serial": True},
+                ],
+            }
+        )
+    )
+    jobs, settings = load_batch_manifest(manifest)
+    assert settings == {"max_workers": 2}
+    assert jobs[0].command == ["setup-creation", "latlon"]
+    assert jobs[1].name == "1-latlon"
+    assert jobs[1].args == ["--level0", "dem.asc", "--add-bounds"]
+    assert jobs[1].depends_on == ["a"]
+    assert jobs[2].mem_gib == 2.0
+    assert [job.serial for job in jobs] == [False, False, False, True, True]
+
+    yaml = pytest.importorskip("yaml")
+    manifest = tmp_path / "batch.yml"
+    manifest.write_text(
+        yaml.safe_dump(
+            [
+                {"name": "a", "command": "latlon", "depends_on": ["b"]},
+                {"name": "b", "command": "latlon", "depends_on": ["a"]},
+            ]
+        )
+    )
+    with pytest.raises(ValueError, match="cyclic"):
+        load_batch_manifest(manifest)
+    manifest.write_text(yaml.safe_dump([{"command": "latlon", "depends_on": "x"}]))
+    with pytest.raises(ValueError, match="unknown jobs"):
+        load_batch_manifest(manifest)
+
+
+def test_run_batch_dependencies_and_memory_budget():
+    lock = threading.Lock()
+    running, peak = [], {"mem": 0.0}
+
+    def run_job(job):
+        with lock:
+            running.append(job)
+            peak["mem"] = max(peak["mem"], sum(j.mem_gib for j in running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(job)
+        if job.name == "bad":
+            msg = "broken input"
+            raise RuntimeError(msg)
+
+    jobs = [
+        BatchJob("bad", ["x"], mem_gib=1),
+        BatchJob("big", ["x"], mem_gib=3),
+        BatchJob("small", ["x"], mem_gib=1),
+        BatchJob("after-bad", ["x"], depends_on=["bad"]),
+        BatchJob("after-small", ["x"], depends_on=["small"]),
+    ]
+    results = run_batch(jobs, run_job, max_workers=3, available_mem_gib=4)
+    status = {result.name: result.status for result in results}
+    assert status == {
+        "bad": "failed",
+        "big": "ok",
+        "small": "ok",
+        "after-bad": "skipped",
+        "after-small": "ok",
+    }
+    assert results[0].error == "RuntimeError: broken input"
+    assert peak["mem"] <= 4
+
+    results = run_batch(jobs[:3], run_job, stop_on_error=True)
+    assert [result.status for result in results] == ["failed", "skipped", "skipped"]
+
+
+def test_run_batch_serializes_serial_jobs():
+    lock = threading.Lock()
+    running, overlaps = [], set()
+
+    def run_job(job):
+        with lock:
+            running.append(job)
+            overlaps.update(
+                frozenset((job.name, other.name)) for other in running if other != job
+            )
+        time.sleep(0.05)
+        with lock:
+            running.remove(job)
+
+    jobs = [
+        BatchJob("plot-a", ["2d-map"], serial=True),
+        BatchJob("plot-b", ["metric-plots"], serial=True),
+        BatchJob("other", ["latlon"]),
+    ]
+    results = run_batch(jobs, run_job, max_workers=3)
+    assert all(result.status == "ok" for result in results)
+    assert frozenset(("plot-a", "plot-b")) not in overlaps
+    assert frozenset(("plot-a", "other")) in overlaps
+
+
+def test_dataset_cache_reuses_and_reopens_files(tmp_path):
+    path = tmp_path / "data.nc"
+    xr.Dataset({"a": ("x", np.arange(3.0))}).to_netcdf(path)
+    with netcdf.dataset_cache(size=2):
+        first = netcdf.read_dataset(path)
+        first["a"].values[:] = -1
+        first.close()
+        second = netcdf.read_dataset(path)
+        np.testing.assert_array_equal(second["a"], [0.0, 1.0, 2.0])
+        assert len(netcdf._DATASET_CACHE["entries"]) == 1
+        second.close()
+
+        # writers close the cached file before overwriting it
+        write_xarray_to_netcdf(xr.Dataset({"a": ("x", np.arange(4.0))}), path)
+        assert not netcdf._DATASET_CACHE["entries"]
+        assert netcdf.read_dataset(path)["a"].size == 4
+        assert len(netcdf._DATASET_CACHE["entries"]) == 1
+    assert not netcdf._DATASET_CACHE["entries"]
+
+
+def test_batch_cli(tmp_path, monkeypatch):
+    header = tmp_path / "header_l0.asc"
+    header.write_text(
+        "ncols 64\nnrows 32\nxllcorner 6.0\nyllcorner 50.0\n"
+        "cellsize 0.0625\nnodata_value -9999\n"
+    )
+    manifest = tmp_path / "batch.json"
+    jobs = [
+        {
+            "name": "latlon",
+            "command": "setup-creation latlon",
+            "args": {"level0": str(header), "level1": 0.25, "out-file": "ll.nc"},
+        },
+        {"name": "typo", "command": "latlon", "args": ["--no-such-option"]},
+        {"name": "after-typo", "command": "latlon", "depends_on": ["typo"]},
+    ]
+    manifest.write_text(json.dumps(jobs))
+    report = tmp_path / "report.json"
+    monkeypatch.chdir(tmp_path)
+    result = CliRunner().invoke(
+        cli, ["utilities", "batch", "-i", str(manifest), "--report", str(report)]
+    )
+    assert (tmp_path / "ll.nc").is_file()
+    assert result.exit_code != 0
+    status = {job["name"]: job["status"] for job in json.loads(report.read_text())}
+    assert status == {"latlon": "ok", "typo": "failed", "after-typo": "skipped"}
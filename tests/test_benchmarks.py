@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from benchmarks import runner, synthetic
+
+
+def test_synthetic_inputs_are_deterministic(tmp_path):
+    first = synthetic.forcing("S", missing_fraction=0.1)
+    second = synthetic.forcing("S", missing_fraction=0.1)
+    assert first["tavg"].shape == synthetic.FORCING_SIZES["S"]
+    assert first["tavg"].dtype == np.float32
+    np.testing.assert_array_equal(first["tavg"], second["tavg"])
+    # returned data can be modified without touching the cached values
+    first["tavg"][:] = 0
+    assert np.nanmax(synthetic.forcing("S", missing_fraction=0.1)["tavg"]) > 0
+
+    fdir = synthetic.flow_direction("S")["fdir"]
+    assert fdir.shape == (synthetic.GRID_SIZES["S"],) * 2
+    assert set(np.unique(fdir)) <= {0, 1, 2, 4, 8, 16, 32, 64, 128}
+
+    files, bounds = synthetic.restart_files("S", tmp_path)
+    n_tiles, n_cells = synthetic.RESTART_TILES["S"]
+    assert len(files) == n_tiles**2
+    assert bounds[1] == n_tiles * n_cells * bounds[-1]
+
+    with pytest.raises(ValueError, match="Unknown benchmark size"):
+        synthetic.dem("XL")
+
+
+def test_run_and_compare_benchmarks():
+    result = runner.run_benchmarks(pattern="HydrographObjectives", repeat=2)
+    assert set(result["results"]) == {
+        "HydrographObjectives.peakmem_calc_objectives[S]",
+        "HydrographObjectives.time_calc_objectives[S]",
+    }
+    timing = result["results"]["HydrographObjectives.time_calc_objectives[S]"]
+    assert len(timing["samples"]) == 2
+    assert timing["value"] == min(timing["samples"])
+
+    base = {
+        "results": {
+            "A.time_a[S]": {"kind": "time", "value": 1.0},
+            "A.time_b[S]": {"kind": "time", "value": 1.0},
+            "A.peakmem_a[S]": {"kind": "peakmem", "value": 100},
+            "A.time_gone[S]": {"kind": "time", "value": 1.0},
+        }
+    }
+    head = {
+        "results": {
+            "A.time_a[S]": {"kind": "time", "value": 1.5},
+            "A.time_b[S]": {"kind": "time", "value": 0.5},
+            "A.peakmem_a[S]": {"kind": "peakmem", "value": 110},
+        }
+    }
+    rows = {row["name"]: row for row in runner.compare_results(base, head, 1.2)}
+    assert rows["A.time_a[S]"]["status"] == "regression"
+    assert rows["A.time_b[S]"]["status"] == "improvement"
+    assert rows["A.peakmem_a[S]"]["status"] == "unchanged"
+    assert rows["A.time_gone[S]"]["status"] == "missing"
+    assert "A.time_a[S]" in runner.format_comparison(list(rows.values()))
+
+
+def test_failing_benchmarks_are_missing(monkeypatch):
+    def _old_api(self, size):  # noqa: ARG001
+        msg = "got an unexpected keyword argument 'streaming'"
+        raise TypeError(msg)
+
+    monkeypatch.setattr(
+        runner.cases.HydrographObjectives, "time_calc_objectives", _old_api
+    )
+    result = runner.run_benchmarks(pattern="HydrographObjectives", repeat=1)
+    failed = "HydrographObjectives.time_calc_objectives[S]"
+    assert set(result["results"]) == {"HydrographObjectives.peakmem_calc_objectives[S]"}
+    assert result["errors"][failed]["error"].startswith("TypeError")
+
+    head = {"results": {failed: {"kind": "time", "value": 1.0}}}
+    rows = {row["name"]: row for row in runner.compare_results(result, head)}
+    assert rows[failed]["status"] == "missing"
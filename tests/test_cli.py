@@ -1,4 +1,8 @@
 import argparse
+import json
+import os
+import subprocess
+import sys
 
 import click
 import numpy as np
@@ -6,7 +10,7 @@ import xarray as xr
 from click.testing import CliRunner
 
 import mhm_tools.common.file_handler as fh
-from mhm_tools._cli import _file_converter, _gridded_data_evaluation
+from mhm_tools._cli import _file_converter, _gridded_data_evaluation, _main
 from mhm_tools._cli._main import _build_click_command
 
 
@@ -103,3 +107,66 @@ def test_converter_nc_ascii_only_header_writes_requested_new_file(
 
     assert result.exit_code == 0
     assert output_path.is_file()
+
+
+def test_lazy_commands_match_full_commands(tmp_path):
+    manifest = _main.load_cli_manifest(tmp_path / "manifest.json")
+    assert (tmp_path / "manifest.json").is_file()
+    assert _main.load_cli_manifest(tmp_path / "manifest.json") == json.loads(
+        json.dumps(manifest)
+    )
+    for key, entry in manifest["commands"].items():
+        group_name, command_name = key.split("/")
+        prog = f"mhm-tools {group_name} {command_name}"
+        lazy = _main._build_lazy_command(command_name, prog, entry)
+        full = lazy.load()
+        with click.Context(lazy, info_name=prog) as ctx_lazy, click.Context(
+            full, info_name=prog
+        ) as ctx_full:
+            assert lazy.get_help(ctx_lazy) == full.get_help(ctx_full)
+
+
+def test_lazy_command_imports_module_when_run(tmp_path, monkeypatch):
+    ds = xr.Dataset(
+        {"var": (("lat", "lon"), np.zeros((2, 2), dtype=np.float32))},
+        coords={"lat": [51.0, 50.0], "lon": [10.0, 11.0]},
+    )
+    ds.to_netcdf(tmp_path / "in.nc")
+    entry = _main.load_cli_manifest(tmp_path / "manifest.json")["commands"][
+        "setup-creation/create-header"
+    ]
+    command = _main._build_lazy_command("create-header", "create-header", entry)
+    loaded = []
+    load = _main.LazyCommand.load
+
+    def _load(self):
+        loaded.append(self.module_path)
+        return load(self)
+
+    monkeypatch.setattr(_main.LazyCommand, "load", _load)
+    result = CliRunner().invoke(command, ["--help"])
+    assert result.exit_code == 0
+    assert "--input-file" in result.output
+    assert not loaded
+
+    result = CliRunner().invoke(
+        command, ["-i", str(tmp_path / "in.nc"), "-o", str(tmp_path)]
+    )
+    assert result.exit_code == 0, result.output
+    assert loaded == ["mhm_tools._cli._create_header"]
+    assert (tmp_path / "header.txt").is_file()
+
+
+def test_cli_help_does_not_import_command_modules(tmp_path):
+    code = (
+        "import sys; from mhm_tools._cli._main import main; "
+        "main(['evaluation', 'hydrograph', '--help']); "
+        "print('xarray' in sys.modules)"
+    )
+    env = {**os.environ, "MHM_TOOLS_CACHE_DIR": str(tmp_path)}
+    # the first call builds the manifest
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, check=True, capture_output=True
+    )
+    assert out.stdout.decode().strip().splitlines()[-1] == "False"
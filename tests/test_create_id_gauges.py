@@ -0,0 +1,24 @@
+import numpy as np
+import xarray as xr
+
+from mhm_tools.common.constants import NO_DATA
+from mhm_tools.common.file_handler import read_ascii_to_xarray, write_xarray_to_ascii
+from mhm_tools.pre.create_id_gauges import create_id_gauges
+
+
+def test_create_id_gauges_from_ascii(tmp_path):
+    lat = np.arange(52.75, 49.75, -0.5)
+    lon = np.arange(10.25, 12.25, 0.5)
+    ds = xr.Dataset(
+        {"facc": (("lat", "lon"), np.arange(lat.size * lon.size).reshape(6, 4))},
+        coords={"lat": lat, "lon": lon},
+    )
+    in_file = tmp_path / "facc.asc"
+    write_xarray_to_ascii(ds, in_file, data_var="facc")
+    out_file = tmp_path / "idgauges.asc"
+    create_id_gauges(7, lon=11.3, lat=51.2, file=in_file, out_path=out_file)
+
+    out = read_ascii_to_xarray(out_file, var_name="facc")["facc"]
+    expected = np.full((6, 4), int(NO_DATA))
+    expected[3, 2] = 7
+    np.testing.assert_array_equal(out.values, expected)
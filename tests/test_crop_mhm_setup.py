@@ -6,7 +6,7 @@ import xarray as xr
 from mhm_tools.common.esri_grid import read_header
 from mhm_tools.common.resolution_handler import Resolution
 from mhm_tools.common.xarray_utils import get_ds_extend
-from mhm_tools.pre.crop_mhm_setup import crop_file, regrid_mask
+from mhm_tools.pre.crop_mhm_setup import _is_setup_file, crop_file, regrid_mask
 
 
 def test_regrid_mask_snaps_same_resolution_shifted_coordinates():
@@ -291,3 +291,11 @@ def test_crop_file_crops_dimension_only_netcdf_using_header(tmp_path):
     assert output_header["xllcorner"] == 110.0
     assert output_header["yllcorner"] == 210.0
     assert output_header["cellsize"] == 10.0
+
+
+def test_setup_files_skip_hidden_and_sidecar_files(tmp_path):
+    root = tmp_path / "setup"
+    assert _is_setup_file(root / "morph" / "dem.asc", root)
+    assert not _is_setup_file(root / "morph" / ".dem.asc.1-2.rows.npy", root)
+    assert not _is_setup_file(root / ".cache" / "dem.nc", root)
+    assert not _is_setup_file(root / "morph" / "dem.asc.rows.npy", root)
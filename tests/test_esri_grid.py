@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+import pytest
+
+from mhm_tools.common import esri_grid
+from mhm_tools.common.esri_grid import (
+    index_grid_rows,
+    read_grid,
+    read_grid_rows,
+    read_header,
+    write_grid,
+)
+
+HEADER = {
+    "ncols": 5,
+    "nrows": 4,
+    "xllcorner": 10.0,
+    "yllcorner": 50.0,
+    "cellsize": 0.5,
+    "nodata_value": -9999.0,
+}
+
+
+@pytest.mark.parametrize("dtype", ["i4", "f8"])
+def test_write_grid_matches_savetxt(tmp_path, dtype, monkeypatch):
+    monkeypatch.setattr(esri_grid, "ASCII_BLOCK_BYTES", 64)
+    data = (np.arange(20).reshape(4, 5) * 1.25 - 3).astype(dtype)
+    header_str = write_grid(tmp_path / "grid.asc", HEADER, data, dtype=dtype)
+    with (tmp_path / "ref.asc").open("w") as f:
+        f.write(header_str)
+        np.savetxt(f, data, fmt="%i" if dtype == "i4" else "%f")
+    assert (tmp_path / "grid.asc").read_text() == (tmp_path / "ref.asc").read_text()
+
+    header, back = read_grid(tmp_path / "grid.asc", dtype=dtype)
+    assert header["ncols"] == 5
+    assert back.dtype == np.dtype(dtype)
+    np.testing.assert_array_equal(back, data)
+
+
+def test_read_grid_in_blocks(tmp_path, monkeypatch):
+    data = np.random.default_rng(1).random((40, 7))
+    write_grid(tmp_path / "grid.asc", {**HEADER, "ncols": 7, "nrows": 40}, data)
+    monkeypatch.setattr(esri_grid, "ASCII_BLOCK_BYTES", 100)
+    _, back = read_grid(tmp_path / "grid.asc")
+    np.testing.assert_allclose(back, data, atol=1e-6)
+
+
+def test_read_grid_header_variants(tmp_path):
+    path = tmp_path / "grid.asc"
+    # no nodata line, centre coordinates, upper case keys and no final newline
+    path.write_text(
+        "NCOLS 3\nNROWS 2\nXLLCENTER 1.5\nYLLCENTER 2.5\nCELLSIZE 1\n1.0 2 3\n4 5 6"
+    )
+    header, data = read_grid(path, dtype="i4")
+    assert header["xllcorner"] == 1.0
+    assert header["nodata_value"] == -9999.0
+    np.testing.assert_array_equal(data, [[1, 2, 3], [4, 5, 6]])
+    path.write_text(
+        "ncols 2\nnrows 1\nxllcorner 0\nyllcorner 0\ncellsize 1\n"
+        "NODATA_value -1\n1 2\n"
+    )
+    assert read_header(path)["nodata_value"] == -1.0
+
+
+def test_read_grid_size_mismatch(tmp_path):
+    path = tmp_path / "grid.asc"
+    write_grid(path, HEADER, np.zeros((4, 5)))
+    with path.open("a") as f:
+        f.write("1 2 3 4 5\n")
+    with pytest.raises(ValueError, match="not matching given header"):
+        read_grid(path)
+    # same number of values, but transposed
+    header_str = write_grid(path, HEADER)
+    with path.open("w") as f:
+        f.write(header_str)
+        np.savetxt(f, np.zeros((5, 4)))
+    with pytest.raises(ValueError, match=r"shape \(5, 4\)"):
+        read_grid(path)
+
+
+def test_read_grid_cache(tmp_path, monkeypatch):
+    path = tmp_path / "grid.asc"
+    data = np.arange(20.0).reshape(4, 5)
+    write_grid(path, HEADER, data)
+    _, first = read_grid(path, cache=True)
+    (sidecar,) = tmp_path.glob(".grid.asc.*.npy")
+
+    def fail(*_args, **_kwargs):
+        msg = "cached grid was parsed again"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(esri_grid, "_read_grid_body", fail)
+    _, cached = read_grid(path, cache=True)
+    np.testing.assert_array_equal(cached, first)
+    monkeypatch.undo()
+
+    # rewriting the grid invalidates the sidecar
+    write_grid(path, HEADER, data + 1)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    _, fresh = read_grid(path, cache=True)
+    np.testing.assert_array_equal(fresh, data + 1)
+    assert not sidecar.exists()
+    assert len(list(tmp_path.glob(".grid.asc.*.npy"))) == 1
+
+
+def test_index_grid_rows(tmp_path, monkeypatch):
+    path = tmp_path / "grid.asc"
+    data = np.arange(20).reshape(4, 5)
+    write_grid(path, HEADER, data, dtype="i4")
+    with path.open("a") as f:
+        f.write("\n  \n")
+    monkeypatch.setattr(esri_grid, "ASCII_BLOCK_BYTES", 16)
+    header, offsets = index_grid_rows(path)
+    assert not list(tmp_path.glob(".grid.asc.*"))
+    header, offsets = index_grid_rows(path, cache=True)
+    assert offsets.size == header["nrows"] + 1
+    np.testing.assert_array_equal(read_grid_rows(path, offsets, 1, 3, "i4"), data[1:3])
+    (sidecar,) = tmp_path.glob(".grid.asc.*.rows.npy")
+    np.testing.assert_array_equal(np.load(sidecar), offsets)
+
+    path.write_text("ncols 2\nnrows 2\nxllcorner 0\nyllcorner 0\ncellsize 1\n1 2 3 4\n")
+    with pytest.raises(ValueError, match="found 1 data lines"):
+        index_grid_rows(path, cache=False)
@@ -1,3 +1,4 @@
+import importlib.util
 import tempfile
 import unittest
 from pathlib import Path
@@ -150,33 +151,51 @@ class TestChunkHelpers(unittest.TestCase, BaseDatasetMixin):
                 self.assertTrue(1 <= chunks["lat"] <= ds.sizes["lat"])
                 self.assertTrue(1 <= chunks["lon"] <= ds.sizes["lon"])
 
-    def test_chunk_dataset_switches_on_enum(self):
+    def test_chunk_dataset_uses_planner(self):
         ds = self.make_ds_with_time()
-        flags = {"space": False, "space_time": False}
+        calls = []
 
-        def _space_only(_ds, _mem, *_args):
-            flags["space"] = True
-            return {"lat": 2, "lon": 2, "time": -1}
-
-        def _space_time(_ds, _mem, *_args):
-            flags["space_time"] = True
+        def _plan(_ds, _mem, chunk_type, **_kwargs):
+            calls.append(chunk_type)
             return {"lat": 1, "lon": 2, "time": 1}
 
-        with patch.object(
-            fh, "chunk_dataset_space_only", side_effect=_space_only
-        ), patch.object(fh, "chunk_dataset_space_and_time", side_effect=_space_time):
-
+        with patch.object(fh, "plan_chunks", side_effect=_plan):
             out_space = fh.chunk_dataset(ds, fh.ChunkType.SPACE, 1.0)
-            self.assertTrue(flags["space"])
-            self.assertFalse(flags["space_time"])
-            self.assertIn("lat", out_space.chunks)
-            self.assertIn("time", out_space.chunks)
-
-            flags = {"space": False, "space_time": False}
             out_time = fh.chunk_dataset(ds, fh.ChunkType.TIME, 1.0)
-            self.assertTrue(flags["space_time"])
-            self.assertFalse(flags["space"])
-            self.assertIn("time", out_time.chunks)
+        self.assertEqual(calls, [fh.ChunkType.SPACE, fh.ChunkType.TIME])
+        self.assertIn("lat", out_space.chunks)
+        self.assertEqual(out_time.chunks["lon"], (2, 2))
+
+    def test_plan_chunks_aligns_to_disk_chunks(self):
+        data = np.zeros((20, 30, 40), dtype=np.float32)
+        ds = xr.Dataset(
+            {
+                "pre": (("time", "lat", "lon"), data),
+                "tavg": (("time", "lat", "lon"), data.astype(np.float64)),
+            },
+            coords={
+                "time": np.arange(20),
+                "lat": np.arange(30.0),
+                "lon": np.arange(40.0),
+            },
+        )
+        ds["pre"].encoding["chunksizes"] = (5, 7, 6)
+        budget_cells = 600
+        # 0.5 * mem / 2 workers / 12 bytes per cell
+        mem_gib = budget_cells * 12 * 2 * 2 / 1024**3
+        with patch.object(fh, "_MIN_BYTES_PER_CHUNK", 1):
+            for access in ["time-series", "map", "full-scan"]:
+                with self.subTest(access=access):
+                    chunks = fh.plan_chunks(ds, mem_gib, access, n_workers=2)
+                    for dim, base in zip(("time", "lat", "lon"), (5, 7, 6)):
+                        size = chunks[dim]
+                        self.assertTrue(size % base == 0 or size == ds.sizes[dim])
+                    cells = chunks["time"] * chunks["lat"] * chunks["lon"]
+                    self.assertLessEqual(cells, max(budget_cells, 5 * 7 * 6))
+            self.assertEqual(fh.plan_chunks(ds, mem_gib, "time-series")["time"], 20)
+            self.assertEqual(fh.plan_chunks(ds, 1.0, "map")["lat"], 30)
+            with self.assertRaises(ValueError):
+                fh.plan_chunks(ds, 1.0, "diagonal")
 
 
 class TestAsciiReadWrite(unittest.TestCase, BaseDatasetMixin):
@@ -243,6 +262,58 @@ class TestAsciiReadWrite(unittest.TestCase, BaseDatasetMixin):
                 f"Expected float dtype, got {float_out['var'].dtype}",
             )
 
+    def test_lazy_ascii_reads_only_window_rows(self):
+        lat = np.arange(59.5, 39.5, -1.0)
+        lon = np.arange(0.5, 15.5, 1.0)
+        data = np.arange(lat.size * lon.size, dtype=np.float64).reshape(
+            lat.size, lon.size
+        )
+        ds = xr.Dataset(
+            {"var": (("lat", "lon"), data)}, coords={"lat": lat, "lon": lon}
+        )
+        with tempfile.TemporaryDirectory() as td:
+            asc_path = Path(td) / "dem.asc"
+            fh.write_xarray_to_ascii(ds, asc_path, data_var="var")
+            read_rows = []
+            original = fh.read_grid_rows
+
+            def counting_read(file, offsets, start, stop, dtype=None):
+                read_rows.append((start, stop))
+                return original(file, offsets, start, stop, dtype)
+
+            with patch.object(fh, "read_grid_rows", counting_read):
+                lazy = fh.get_xarray_ds_from_file(
+                    asc_path, var_name="var", lazy_ascii=True
+                )
+                self.assertEqual(read_rows, [])
+                window = lazy.sel(lat=slice(52, 49), lon=slice(3, 7))
+                np.testing.assert_array_equal(
+                    window["var"].values,
+                    ds["var"].sel(lat=slice(52, 49), lon=slice(3, 7)).values,
+                )
+            self.assertEqual(read_rows, [(8, 11)])
+            # no row index sidecar next to the input by default
+            self.assertEqual(list(Path(td).glob(".dem.asc.*")), [])
+
+            eager = fh.read_ascii_to_xarray(asc_path, var_name="var")
+            xr.testing.assert_identical(lazy.load(), eager)
+            landcover = fh.get_xarray_ds_from_file(
+                asc_path,
+                var_name="var",
+                landcover=True,
+                landcover_year_start=1990,
+                lazy_ascii=True,
+            )
+            self.assertEqual(landcover["var"].dims, ("time", "lat", "lon"))
+            np.testing.assert_array_equal(
+                landcover["var"].isel(time=0, lat=3).values, data[3]
+            )
+            # the row index is only cached on request
+            fh.get_xarray_ds_from_file(
+                asc_path, var_name="var", lazy_ascii=True, ascii_cache=True
+            )
+            self.assertEqual(len(list(Path(td).glob(".dem.asc.*.rows.npy"))), 1)
+
     def test_write_xarray_to_ascii_multiple_vars_without_data_var_returns_none(self):
         lat = np.array([1, 0])
         lon = np.array([0, 1, 2])
@@ -572,5 +643,36 @@ class TestCropAndCoords(unittest.TestCase, BaseDatasetMixin):
         np.testing.assert_allclose(lons, ds["lon"].values)
 
 
+class TestZarr(unittest.TestCase, BaseDatasetMixin):
+    def test_missing_zarr_raises_import_error(self):
+        if importlib.util.find_spec("zarr") is not None:
+            self.skipTest("zarr is installed.")
+        with tempfile.TemporaryDirectory() as td:
+            with self.assertRaises(ImportError):
+                fh.write_xarray_to_file(self.make_simple_ds(), Path(td) / "out.zarr")
+
+    @unittest.skipIf(importlib.util.find_spec("zarr") is None, "zarr not installed")
+    def test_zarr_roundtrip_and_region_writes(self):
+        ds = self.make_ds_with_time()
+        with tempfile.TemporaryDirectory() as td:
+            store = Path(td) / "out.zarr"
+            fh.write_xarray_to_file(
+                ds, store, encoding={"var": {"zlib": True, "_FillValue": -1.0}}
+            )
+            back = fh.get_dataset_from_path(store)
+            np.testing.assert_array_equal(back["var"].values, ds["var"].values)
+
+            tiled = Path(td) / "tiled.zarr"
+            fh.init_zarr_store(ds, tiled, chunks={"time": 1, "lat": 3, "lon": 2})
+            for start in (2, 0):
+                region = {"lon": slice(start, start + 2)}
+                fh.write_zarr_region(ds.isel(region), tiled, region)
+            with self.assertRaises(ValueError):
+                region = {"lon": slice(1, 3)}
+                fh.write_zarr_region(ds.isel(region), tiled, region)
+            back = fh.get_xarray_ds_from_file(tiled)
+            np.testing.assert_array_equal(back["var"].values, ds["var"].values)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -238,6 +238,34 @@ def test_regridd_to_higher_spatial_resolution_uses_coarse_tolerance():
     assert np.allclose(out2["v"].values, 2.0)
 
 
+def test_regridd_to_higher_spatial_resolution_conservative():
+    lat_fine = np.array([0.875, 0.625, 0.375, 0.125])
+    lon_fine = np.array([0.125, 0.375, 0.625, 0.875])
+    lat_coarse = np.array([0.75, 0.25])
+    lon_coarse = np.array([0.25, 0.75])
+    values = np.arange(16.0).reshape(4, 4)
+    values[0, 0] = np.nan
+    ds_fine = xr.Dataset(
+        {"mean": (("lat", "lon"), values)},
+        coords={"lat": lat_fine, "lon": lon_fine},
+    )
+    ds_coarse = xr.Dataset(
+        {"mean": (("lat", "lon"), np.zeros((2, 2)))},
+        coords={"lat": lat_coarse, "lon": lon_coarse},
+    )
+
+    out_coarse, out_fine = regridd_to_higher_spatial_resolution(
+        ds_coarse, ds_fine, method="conservative"
+    )
+
+    assert out_coarse is ds_coarse
+    np.testing.assert_allclose(out_fine["lat"].values, lat_coarse)
+    # area weights vary with latitude only, so the NaN-free blocks are close to
+    # plain block means and the first block averages its three valid cells
+    expected = np.array([[(1 + 4 + 5) / 3, 4.5], [10.5, 12.5]])
+    np.testing.assert_allclose(out_fine["mean"].values, expected, rtol=1e-3)
+
+
 def test_crop_datasets_to_spatial_overlap_preserves_overlap_and_regrids(caplog):
     lat_input = np.array([0.2, 0.4, 0.6])
     lon_input = np.array([0.2, 0.4, 0.6])
@@ -310,7 +338,7 @@ def test_compare_input_with_ref_keeps_rel_fields_as_dataarrays(monkeypatch, tmp_
     )
     monkeypatch.setattr(
         "mhm_tools.post.gridded_data_evaluation.regridd_to_higher_spatial_resolution",
-        lambda ds_input, ds_ref: (ds_input, ds_ref),
+        lambda ds_input, ds_ref, **_kwargs: (ds_input, ds_ref),
     )
     monkeypatch.setattr(
         "mhm_tools.post.gridded_data_evaluation.write_xarray_to_file",
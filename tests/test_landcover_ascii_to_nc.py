@@ -1,5 +1,6 @@
 """Tests for landcover_ascii_to_nc module."""
 
+import functools
 import shutil
 from pathlib import Path
 
@@ -7,6 +8,8 @@ import numpy as np
 import pytest
 import xarray as xr
 
+from mhm_tools.common import netcdf
+from mhm_tools.pre import landcover_ascii_to_nc
 from mhm_tools.pre.landcover_ascii_to_nc import (
     add_time_bounds_cf,
     convert_lc_ascii_to_nc,
@@ -251,3 +254,84 @@ LCoverYearEnd(2)   = 2000
     assert ds.land_cover.shape[0] == 2
 
     ds.close()
+
+
+def _write_lc_namelist(tmp_path: Path) -> Path:
+    luse_dir = tmp_path / "luse"
+    luse_dir.mkdir()
+    test_files_dir = Path(__file__).parent / "files"
+    for name in ("lc_1981.asc", "lc_1991.asc"):
+        shutil.copy(test_files_dir / name, luse_dir / name)
+    # periods listed out of chronological order on purpose
+    nml_file = tmp_path / "test.nml"
+    nml_file.write_text(
+        f"""
+&directories_general
+dir_LCover(1) = "{luse_dir!s}/"
+/
+
+&LCover
+LCoverfName(1) = 'lc_1991.asc'
+LCoverfName(2) = 'lc_1981.asc'
+LCoverYearStart(1) = 1991
+LCoverYearEnd(1)   = 2000
+LCoverYearStart(2) = 1981
+LCoverYearEnd(2)   = 1990
+/
+"""
+    )
+    return nml_file
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_convert_lc_ascii_to_nc_streaming_matches_eager(tmp_path: Path, n_jobs):
+    """Streaming conversion writes the same file content as the eager path."""
+    nml_file = _write_lc_namelist(tmp_path)
+    convert_lc_ascii_to_nc(input_nml=nml_file, output=tmp_path / "eager.nc")
+    convert_lc_ascii_to_nc(
+        input_nml=nml_file,
+        output=tmp_path / "stream.nc",
+        streaming=True,
+        n_jobs=n_jobs,
+    )
+    with xr.open_dataset(
+        tmp_path / "eager.nc", decode_cf=False
+    ) as eager, xr.open_dataset(tmp_path / "stream.nc", decode_cf=False) as stream:
+        assert set(eager.variables) == set(stream.variables)
+        for name in eager.variables:
+            np.testing.assert_array_equal(stream[name].values, eager[name].values)
+            assert stream[name].attrs == eager[name].attrs
+        assert stream.land_cover.encoding["chunksizes"][0] == 1
+        assert stream.land_cover.values[0, 0, 0] == 1
+
+
+def test_convert_lc_ascii_to_nc_streaming_tiles_large_maps(tmp_path: Path, monkeypatch):
+    """Maps above the chunk target are stored in tiles of single periods."""
+    nml_file = _write_lc_namelist(tmp_path)
+    monkeypatch.setattr(
+        landcover_ascii_to_nc,
+        "plan_nc_chunksizes",
+        functools.partial(netcdf.plan_nc_chunksizes, target_bytes=16),
+    )
+    convert_lc_ascii_to_nc(input_nml=nml_file, output=tmp_path / "eager.nc")
+    convert_lc_ascii_to_nc(
+        input_nml=nml_file, output=tmp_path / "stream.nc", streaming=True, n_jobs=2
+    )
+    with xr.open_dataset(tmp_path / "eager.nc") as eager, xr.open_dataset(
+        tmp_path / "stream.nc"
+    ) as stream:
+        chunksizes = stream.land_cover.encoding["chunksizes"]
+        assert chunksizes[0] == 1
+        assert np.prod(chunksizes) < np.prod(stream.land_cover.shape[1:])
+        np.testing.assert_array_equal(stream.land_cover, eager.land_cover)
+
+
+def test_convert_lc_ascii_to_nc_streaming_rejects_grid_mismatch(tmp_path: Path):
+    """All periods need to share the grid of the first one."""
+    nml_file = _write_lc_namelist(tmp_path)
+    path = tmp_path / "luse" / "lc_1991.asc"
+    path.write_text(path.read_text().replace("xllcorner     100.0", "xllcorner 90"))
+    with pytest.raises(ValueError, match="differs from"):
+        convert_lc_ascii_to_nc(
+            input_nml=nml_file, output=tmp_path / "stream.nc", streaming=True
+        )
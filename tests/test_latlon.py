@@ -1,5 +1,6 @@
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 import mhm_tools as mt
@@ -61,3 +62,66 @@ class TestLatLon:
         assert len(ds["yc_l11"]) == 36
         assert len(ds["xc_l11"]) == 24
         ds.close()
+
+
+def test_latlon_grid_fast_path_and_cache(monkeypatch):
+    from pyproj import Proj
+
+    from mhm_tools.pre import latlon
+
+    header = {
+        "ncols": 7,
+        "nrows": 5,
+        "xllcorner": 5.0,
+        "yllcorner": 45.0,
+        "cellsize": 0.25,
+        "nodata_value": -9999,
+    }
+    x, y, lons, lats = latlon._create_grid(header, "epsg:4326", dtype="f8")
+    x_grid, y_grid = np.meshgrid(x, y)
+    np.testing.assert_array_equal(lons, x_grid)
+    np.testing.assert_array_equal(lats, y_grid)
+    assert y[0] > y[-1]
+
+    monkeypatch.setattr(latlon, "_GRID_CACHE", latlon.OrderedDict())
+    monkeypatch.setattr(latlon, "TRANSFORM_CHUNK_CELLS", 50)
+    l0 = {**header, "ncols": 40, "nrows": 30, "xllcorner": 4e6, "yllcorner": 3e6}
+    l0["cellsize"] = 500
+    x, y, lons, lats = latlon._create_grid(l0, "epsg:3035", "f8", n_jobs=2)
+    ref_lons, ref_lats = Proj("epsg:3035")(*np.meshgrid(x, y), inverse=True)
+    np.testing.assert_array_equal(lons, ref_lons)
+    np.testing.assert_array_equal(lats, ref_lats)
+
+    def fail(*_args, **_kwargs):
+        msg = "cropped grid was transformed again"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(latlon, "_transform_grid", fail)
+    crop = {**l0, "ncols": 10, "nrows": 8, "xllcorner": 4e6 + 2500}
+    crop["yllcorner"] = 3e6 + 1000
+    _, _, crop_lons, crop_lats = latlon._create_grid(crop, "epsg:3035", "f8")
+    # crop starts 5 columns east and (30 - 2 - 8) rows below the top edge
+    np.testing.assert_array_equal(crop_lons, ref_lons[20:28, 5:15])
+    np.testing.assert_array_equal(crop_lats, ref_lats[20:28, 5:15])
+
+
+def test_grid_cache_is_thread_safe(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from mhm_tools.pre import latlon
+
+    monkeypatch.setattr(latlon, "_GRID_CACHE", latlon.OrderedDict())
+    # room for two grids, so concurrent stores keep evicting
+    monkeypatch.setattr(latlon, "LATLON_CACHE_BYTES", 2 * 2 * 64 * 8)
+    header = {"ncols": 8, "nrows": 8, "xllcorner": 0.0, "yllcorner": 0.0}
+    header["cellsize"] = 1.0
+
+    def _work(i):
+        for j in range(200):
+            key = (i, j % 5)
+            if latlon._cached_window(header, key) is None:
+                latlon._store_in_cache(header, key, np.zeros((8, 8)), np.ones((8, 8)))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(_work, range(8)))
+    assert sum(map(len, latlon._GRID_CACHE.values())) <= 2
@@ -0,0 +1,152 @@
+import json
+import logging
+import shutil
+
+import numpy as np
+import pytest
+import xarray as xr
+from joblib import Parallel, delayed
+from joblib.externals.loky import get_reusable_executor
+
+from mhm_tools.common import logger as mt_logger
+from mhm_tools.common.logger import (
+    LazySummary,
+    collect_profile_spans,
+    log_arguments,
+    log_errors,
+    profile_span,
+    summarize,
+    write_profile_report,
+)
+
+
+class _NoRepr:
+    def __str__(self):
+        raise AssertionError("argument was formatted")
+
+    def __mul__(self, other):
+        return 0
+
+
+def test_summarize_is_bounded():
+    ds = xr.Dataset(
+        {f"v{i}": (("time", "lat"), np.zeros((4, 3), "f4")) for i in range(12)}
+    ).chunk({"time": 2})
+    text = summarize(ds)
+    assert text.startswith("<Dataset (time: 4, lat: 3)")
+    assert "v0: float32 (time, lat) chunks=(2, 3)" in text
+    assert "... 2 more" in text
+    assert (
+        summarize(ds["v1"])
+        == "<DataArray 'v1' float32 (time: 4, lat: 3) chunks=(2, 3)>"
+    )
+    assert summarize(np.zeros((2, 5))) == "<ndarray float64 (2, 5)>"
+    assert len(summarize("x" * 1000)) == mt_logger.SUMMARY_MAX_CHARS
+    assert str(LazySummary(ds["v1"].values)) == "<ndarray float32 (4, 3)>"
+
+
+def test_log_arguments_only_formats_enabled_levels(caplog):
+    @log_arguments()
+    def scale(data, factor=2, unused=None):
+        return data * factor
+
+    with caplog.at_level(logging.INFO, logger=__name__):
+        # arguments are not formatted while DEBUG is disabled
+        assert scale(_NoRepr(), factor=0) == 0
+    assert not caplog.records
+
+    with caplog.at_level(logging.DEBUG, logger=__name__):
+        scale(np.ones((2, 2)), factor=3)
+    (record,) = caplog.records
+    assert "data: <ndarray float64 (2, 2)>" in record.getMessage()
+    assert "factor: 3" in record.getMessage()
+    assert "unused" not in record.getMessage()
+
+
+def test_log_errors_formats_arguments_on_failure(caplog):
+    @log_errors(raise_exceptions=False)
+    def fail(value):
+        raise ValueError(value)
+
+    with caplog.at_level(logging.ERROR, logger=__name__):
+        assert fail("boom") is None
+    assert "value: boom" in caplog.records[0].getMessage()
+
+    @log_errors()
+    def fail_raise(value):
+        raise ValueError(value)
+
+    with pytest.raises(ValueError, match="boom"):
+        fail_raise("boom")
+
+
+@profile_span()
+def _profiled_square(value):
+    return value**2
+
+
+@pytest.fixture
+def profile_spool(tmp_path, monkeypatch):
+    for key in mt_logger._PROFILE_STATE:
+        monkeypatch.setitem(mt_logger._PROFILE_STATE, key, None)
+    monkeypatch.setenv(mt_logger.PROFILE_DIR_ENV, "")
+    mt_logger.enable_profiling(tmp_path / "report.json")
+    spool = mt_logger._PROFILE_STATE["dir"]
+    yield spool
+    shutil.rmtree(spool)
+    # do not leave workers behind that spool to the removed directory
+    get_reusable_executor().shutdown(wait=True)
+
+
+def test_profile_span_disabled(monkeypatch):
+    monkeypatch.setitem(mt_logger._PROFILE_STATE, "dir", None)
+    monkeypatch.delenv(mt_logger.PROFILE_DIR_ENV, raising=False)
+    with profile_span("noop") as span:
+        pass
+    assert span._start is None
+    assert _profiled_square(3) == 9
+    assert collect_profile_spans() == []
+
+
+def test_profile_report(profile_spool, tmp_path):
+    with profile_span("outer"):
+        assert _profiled_square(3) == 9
+    with pytest.raises(ValueError), profile_span("failing"):
+        raise ValueError
+    spans = collect_profile_spans()
+    names = [span["name"] for span in spans]
+    assert names == ["outer", f"{__name__}._profiled_square", "failing"]
+    assert spans[-1]["failed"]
+    assert all(span["wall"] >= 0 and span["process_peak_rss"] > 0 for span in spans)
+
+    write_profile_report(tmp_path / "report.json")
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert {event["ph"] for event in report["traceEvents"]} == {"X"}
+    assert report["stages"]["outer"]["calls"] == 1
+    assert report["stages"]["outer"]["wall"] >= report["stages"][names[1]]["wall"]
+
+
+def test_profile_span_rss_delta(profile_spool):
+    with profile_span("allocate"):
+        data = np.ones(2**24)  # 128 MiB
+    (span,) = collect_profile_spans()
+    assert span["rss_delta"] >= data.nbytes // 2
+    assert span["process_peak_rss"] >= data.nbytes
+
+
+def test_shutdown_loky_workers_without_executor(monkeypatch):
+    from joblib.externals.loky import reusable_executor
+
+    monkeypatch.setattr(reusable_executor, "_executor", None)
+    mt_logger.shutdown_loky_workers()
+    assert reusable_executor._executor is None
+
+
+def test_profile_span_in_workers(profile_spool):
+    results = Parallel(n_jobs=2, backend="loky")(
+        delayed(_profiled_square)(i) for i in range(4)
+    )
+    assert results == [0, 1, 4, 9]
+    spans = collect_profile_spans()
+    assert len(spans) == 4
+    assert {span["name"] for span in spans} == {f"{__name__}._profiled_square"}
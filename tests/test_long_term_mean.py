@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from mhm_tools.post import long_term_mean as ltm
+
+
+def _make_files(tmp_path, freq="D", periods=90, n_files=3):
+    """Write a time series of random fields split into several files."""
+    rng = np.random.default_rng(42)
+    time = pd.date_range("2000-01-01", periods=periods, freq=freq)
+    data = rng.uniform(-1.0, 5.0, size=(periods, 4, 5)).astype(np.float32)
+    data[3, 1, 1] = np.nan
+    ds = xr.Dataset(
+        {"pre": (("time", "lat", "lon"), data)},
+        coords={
+            "time": time,
+            "lat": [53.0, 52.0, 51.0, 50.0],
+            "lon": [10.0, 11.0, 12.0, 13.0, 14.0],
+        },
+    )
+    in_dir = tmp_path / "in"
+    in_dir.mkdir()
+    for i, idx in enumerate(np.array_split(np.arange(periods), n_files)):
+        ds.isel(time=idx).to_netcdf(in_dir / f"pre_{i}.nc")
+    return in_dir, ds
+
+
+def test_streaming_long_term_mean_without_aggregation(tmp_path):
+    """Average all time steps of all files."""
+    in_dir, ds = _make_files(tmp_path)
+
+    ltm.cal_long_term_mean(
+        in_dir=in_dir, in_file="pre_*.nc", out_dir=tmp_path, engine="streaming"
+    )
+
+    with xr.open_dataset(tmp_path / "long_term_mean.nc") as out:
+        assert out.sizes["time"] == 1
+        np.testing.assert_allclose(
+            out["pre"].values[0], ds["pre"].mean("time").values, rtol=1e-6
+        )
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["in", "long_term_mean.nc"]
+
+
+@pytest.mark.parametrize(
+    ("period", "freq", "aggregation_type"),
+    [
+        ("monthly", "MS", "intensive"),
+        ("monthly", "MS", "extensive"),
+        ("seasonal", "QS-DEC", "extensive"),
+    ],
+)
+def test_streaming_long_term_mean_with_aggregation(
+    tmp_path, period, freq, aggregation_type
+):
+    """Aggregate periods across file borders before averaging them."""
+    in_dir, ds = _make_files(tmp_path, periods=200, n_files=7)
+
+    ltm.cal_long_term_mean(
+        in_dir=in_dir,
+        in_file="pre_*.nc",
+        out_dir=tmp_path,
+        aggregate=True,
+        long_term_mean_type=period,
+        aggregation_type=aggregation_type,
+        engine="streaming",
+    )
+
+    resampled = ds["pre"].resample(time=freq)
+    if aggregation_type == "intensive":
+        expected = resampled.mean()
+    else:
+        expected = resampled.sum(min_count=1)
+    with xr.open_dataset(tmp_path / "long_term_mean.nc") as out:
+        np.testing.assert_allclose(
+            out["pre"].values[0], expected.mean("time").values, rtol=1e-5
+        )
+
+
+def test_streaming_long_term_mean_threshold_and_crop(tmp_path):
+    """Crop by index window and ignore values below the threshold."""
+    in_dir, ds = _make_files(tmp_path)
+
+    ltm.cal_long_term_mean(
+        in_dir=in_dir,
+        in_file="pre_*.nc",
+        out_dir=tmp_path,
+        out_file="cropped.nc",
+        crop=True,
+        lon_min=11.0,
+        lon_max=12.5,
+        lat_min=50.5,
+        lat_max=52.0,
+        lower_threshold=1.0,
+        engine="streaming",
+    )
+
+    expected = ds["pre"].sel(lon=slice(11.0, 12.5), lat=slice(52.0, 50.5))
+    expected = expected.where(expected > 1.0).mean("time")
+    with xr.open_dataset(tmp_path / "cropped.nc") as out:
+        assert out["pre"].shape == (1, 2, 2)
+        np.testing.assert_allclose(out["pre"].values[0], expected.values, rtol=1e-6)
+
+
+def test_period_labels_count_december_to_next_season():
+    """Group December with January and February of the following year."""
+    time = xr.DataArray(
+        pd.to_datetime(["2000-11-30", "2000-12-01", "2001-02-28", "2001-03-01"]),
+        dims="time",
+    )
+
+    labels = ltm._period_labels(time, "seasonal")
+
+    assert labels[0] != labels[1]
+    assert labels[1] == labels[2]
+    assert labels[2] != labels[3]
+
+
+def _fake_aggregate(input_file, output_path, aggregation_type, long_term_mean_type):
+    if "bad" in input_file.name:
+        msg = "broken input"
+        raise RuntimeError(msg)
+    out_file = output_path / f"monmean_{input_file.name}"
+    out_file.write_text(input_file.read_text())
+    return out_file
+
+
+def test_prepare_files_keeps_order_and_collects_errors(tmp_path, monkeypatch):
+    """Keep input order in the worker pool and report every failing file."""
+    monkeypatch.setattr(ltm, "aggregate_files", _fake_aggregate)
+    files = []
+    for name in ["c.nc", "bad_1.nc", "a.nc", "bad_2.nc"]:
+        files.append(tmp_path / name)
+        files[-1].write_text(name)
+    agg_dir = tmp_path / "agg"
+    agg_dir.mkdir()
+    kwargs = {
+        "in_dir": tmp_path,
+        "crop_dir": None,
+        "aggregation_dir": agg_dir,
+        "lonslice": None,
+        "latslice": None,
+        "aggregation_type": "intensive",
+        "long_term_mean_type": "monthly",
+        "keep_temporal_files": False,
+    }
+
+    with pytest.raises(RuntimeError, match="2 of 4 files") as err:
+        ltm._prepare_files(files, n_jobs=3, **kwargs)
+    assert "bad_1.nc" in str(err.value)
+    assert "bad_2.nc" in str(err.value)
+
+    result = ltm._prepare_files([files[0], files[2]], n_jobs=2, **kwargs)
+    assert [p.name for p in result] == ["monmean_c.nc", "monmean_a.nc"]
+
+
+def test_prepare_files_removes_cropped_file_after_aggregation(tmp_path, monkeypatch):
+    """Delete each cropped file once its aggregate was written."""
+    monkeypatch.setattr(ltm, "aggregate_files", _fake_aggregate)
+
+    def _fake_crop(input_file, output_path, input_path, **_kwargs):
+        (output_path / input_file.relative_to(input_path)).write_text("cropped")
+
+    monkeypatch.setattr(ltm, "crop_file", _fake_crop)
+    in_dir = tmp_path / "in"
+    in_dir.mkdir()
+    (in_dir / "a.nc").write_text("a")
+    crop_dir = tmp_path / "crop"
+    agg_dir = tmp_path / "agg"
+    crop_dir.mkdir()
+    agg_dir.mkdir()
+
+    result = ltm._prepare_files(
+        [in_dir / "a.nc"],
+        n_jobs=1,
+        in_dir=in_dir,
+        crop_dir=crop_dir,
+        aggregation_dir=agg_dir,
+        lonslice=slice(0, 1),
+        latslice=slice(1, 0),
+        aggregation_type="intensive",
+        long_term_mean_type="monthly",
+        keep_temporal_files=False,
+    )
+
+    assert result == [agg_dir / "monmean_a.nc"]
+    assert result[0].read_text() == "cropped"
+    assert list(crop_dir.iterdir()) == []
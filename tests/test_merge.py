@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from mhm_tools.pre import merge
+
+
+def _write_daily(path, start, periods, chunks=None, value_offset=0.0):
+    time = pd.date_range(start, periods=periods, freq="D")
+    data = np.arange(periods * 3 * 4, dtype=np.float32).reshape(periods, 3, 4)
+    ds = xr.Dataset(
+        {"pre": (("time", "lat", "lon"), data + value_offset)},
+        coords={
+            "time": time,
+            "lat": [52.0, 51.0, 50.0],
+            "lon": [10.0, 11.0, 12.0, 13.0],
+        },
+    )
+    encoding = {"pre": {"zlib": True, "complevel": 4, "shuffle": True}}
+    if chunks is not None:
+        encoding["pre"]["chunksizes"] = chunks
+    encoding["time"] = {"units": "days since 2000-01-01", "dtype": "int32"}
+    ds.to_netcdf(path, encoding=encoding, unlimited_dims=["time"])
+    return ds
+
+
+def test_merge_files_native_matches_concatenation(tmp_path):
+    """Merge files natively, in time order and independent of file order."""
+    parts = [
+        _write_daily(tmp_path / "b.nc", "2000-01-05", 4, value_offset=100),
+        _write_daily(tmp_path / "a.nc", "2000-01-01", 4),
+        _write_daily(tmp_path / "c.nc", "2000-01-09", 3, value_offset=200),
+    ]
+    out_file = tmp_path / "merged.nc"
+
+    merge.merge_files_native(
+        [tmp_path / "b.nc", tmp_path / "a.nc", tmp_path / "c.nc"], out_file
+    )
+
+    expected = xr.concat([parts[1], parts[0], parts[2]], dim="time")
+    with xr.open_dataset(out_file) as merged:
+        xr.testing.assert_allclose(merged["pre"], expected["pre"])
+    assert not (tmp_path / ".merged.nc.part").exists()
+
+
+def test_merge_files_native_copies_aligned_chunks_raw(tmp_path, monkeypatch):
+    """Use raw chunk copies for chunk-aligned inputs with matching compression."""
+    _write_daily(tmp_path / "a.nc", "2000-01-01", 4, chunks=(2, 3, 4))
+    _write_daily(tmp_path / "b.nc", "2000-01-05", 3, chunks=(2, 3, 4))
+    decoded = []
+    original = merge._copy_decoded
+    monkeypatch.setattr(
+        merge,
+        "_copy_decoded",
+        lambda *args: decoded.append(args[0].name) or original(*args),
+    )
+    out_file = tmp_path / "merged.nc"
+
+    merge.merge_files_native([tmp_path / "a.nc", tmp_path / "b.nc"], out_file)
+
+    assert decoded == []
+    with xr.open_dataset(out_file) as merged:
+        assert merged.sizes["time"] == 7
+        np.testing.assert_array_equal(
+            merged["time"].values,
+            pd.date_range("2000-01-01", periods=7, freq="D").values,
+        )
+        np.testing.assert_array_equal(
+            merged["pre"].values[4], np.arange(12).reshape(3, 4)
+        )
+
+
+def test_merge_files_native_converts_time_units(tmp_path):
+    """Convert the time axis of every file to the units of the first file."""
+    _write_daily(tmp_path / "a.nc", "2000-01-01", 2)
+    ds = _write_daily(tmp_path / "tmp.nc", "2000-01-03", 2)
+    ds.to_netcdf(
+        tmp_path / "b.nc",
+        encoding={"time": {"units": "hours since 1990-01-01", "dtype": "int64"}},
+    )
+
+    merge.merge_files_native([tmp_path / "a.nc", tmp_path / "b.nc"], tmp_path / "m.nc")
+
+    with xr.open_dataset(tmp_path / "m.nc") as merged:
+        np.testing.assert_array_equal(
+            merged["time"].values,
+            pd.date_range("2000-01-01", periods=4, freq="D").values,
+        )
+
+
+def test_merge_files_native_rejects_overlap(tmp_path):
+    """Reject inputs with overlapping time axes."""
+    _write_daily(tmp_path / "a.nc", "2000-01-01", 4)
+    _write_daily(tmp_path / "b.nc", "2000-01-04", 4)
+
+    with pytest.raises(ValueError, match="overlap"):
+        merge.merge_files_native(
+            [tmp_path / "a.nc", tmp_path / "b.nc"], tmp_path / "m.nc"
+        )
+
+
+def test_merge_files_native_removes_partial_file(tmp_path, monkeypatch):
+    """Remove the temporary file if merging fails."""
+    _write_daily(tmp_path / "a.nc", "2000-01-01", 2)
+    _write_daily(tmp_path / "b.nc", "2000-01-03", 2)
+
+    def _fail(*args, **kwargs):
+        msg = "No space left on device"
+        raise OSError(msg)
+
+    monkeypatch.setattr(merge, "_copy_decoded", _fail)
+    monkeypatch.setattr(merge, "_copy_raw_chunks", _fail)
+    with pytest.raises(OSError, match="No space left"):
+        merge.merge_files_native(
+            [tmp_path / "a.nc", tmp_path / "b.nc"], tmp_path / "m.nc"
+        )
+    assert not (tmp_path / ".m.nc.part").exists()
+    assert not (tmp_path / "m.nc").exists()
+
+
+def test_merge_files_native_rejects_grid_mismatch(tmp_path):
+    """Reject inputs on different grids."""
+    _write_daily(tmp_path / "a.nc", "2000-01-01", 2)
+    ds = _write_daily(tmp_path / "tmp.nc", "2000-01-03", 2)
+    ds.assign_coords(lon=ds["lon"] + 0.5).to_netcdf(tmp_path / "b.nc")
+
+    with pytest.raises(ValueError, match="grid"):
+        merge.merge_files_native(
+            [tmp_path / "a.nc", tmp_path / "b.nc"], tmp_path / "m.nc"
+        )
+
+
+def test_merge_files_with_native_engine(tmp_path):
+    """Merge a folder with the native engine through ``merge_files``."""
+    in_dir = tmp_path / "in"
+    in_dir.mkdir()
+    _write_daily(in_dir / "pre_1.nc", "2000-01-01", 3)
+    _write_daily(in_dir / "pre_2.nc", "2000-01-04", 3)
+    output = tmp_path / "out" / "pre.nc"
+
+    merge.merge_files(in_dir, "pre_*.nc", output, n_cpus=1, engine="native")
+
+    with xr.open_dataset(output) as merged:
+        assert merged.sizes["time"] == 6
@@ -9,10 +9,13 @@ from mhm_tools.common.netcdf import (
     apply_cf_baseline_metadata,
     get_netcdf_metadata_data_vars,
     move_reserved_attrs_to_encoding,
+    plan_nc_chunksizes,
+    plan_nc_encoding,
     prepare_dataset_for_netcdf_write,
     prepare_time_bounds_encoding,
     sanitize_coordinate_encoding,
     sanitize_nc_encoding,
+    select_codec_profile,
     set_netcdf_encoding,
 )
 from mhm_tools.common.provenance import CREATED_ATTR, HISTORY_ATTR
@@ -225,6 +228,71 @@ def test_sanitize_nc_encoding_casts_fillvalue_and_preserves_missing_value():
     assert "missing_value" in ds["v"].attrs
 
 
+def test_sanitize_nc_encoding_keeps_fitting_chunksizes(tmp_path):
+    ds = _make_ds(dtype=np.float32)
+    shape = ds["v"].shape
+    out = sanitize_nc_encoding(ds, {"v": {"chunksizes": (1, 10**6), "foo": 1}})
+    assert out["v"]["chunksizes"] == (1, shape[1])
+    assert "foo" not in out["v"]
+    assert (
+        "chunksizes" not in sanitize_nc_encoding(ds, {"v": {"chunksizes": (1,)}})["v"]
+    )
+    write_xarray_to_netcdf(
+        ds, tmp_path / "out.nc", encoding={"v": {"zlib": True, "chunksizes": (1, 2)}}
+    )
+    with xr.open_dataset(tmp_path / "out.nc") as back:
+        assert back["v"].encoding["chunksizes"] == (1, 2)
+
+
+def test_plan_nc_chunksizes_follows_access_pattern():
+    da = xr.DataArray(
+        np.zeros((365, 200, 300), dtype=np.float32), dims=("time", "lat", "lon")
+    )
+    target = 4 * 10**4 * 4
+    series = plan_nc_chunksizes(da, "time-series", "time", target)
+    assert series[0] == 365
+    maps = plan_nc_chunksizes(da, "map", "time", target)
+    assert maps[0] == 1
+    assert maps[1] * maps[2] <= 4 * 10**4 < maps[1] * (maps[2] + 1) * 2
+    scan = plan_nc_chunksizes(da, "full-scan", "time", target)
+    assert 1 < scan[0] < 365
+    for chunks in (series, maps, scan):
+        assert np.prod(chunks) <= 4 * 10**4
+    assert plan_nc_chunksizes(da.isel(time=0), "time-series", "time", target) == (
+        200,
+        200,
+    )
+    with pytest.raises(ValueError, match="Unknown access pattern"):
+        plan_nc_chunksizes(da, "random", "time")
+
+
+def test_plan_nc_encoding_profiles(tmp_path):
+    ds = _make_time_ds(
+        np.arange(4.0), np.stack([np.arange(4.0), np.arange(1.0, 5.0)], axis=1)
+    )
+    ds["v"] = ds["v"] * 1000
+    encoding = plan_nc_encoding(ds, ["v"])
+    assert encoding["v"]["complevel"] == 4
+    assert "chunksizes" not in encoding["v"]
+    with pytest.raises(ValueError, match="Unknown codec profile"):
+        plan_nc_encoding(ds, ["v"], profile="xz")
+    # random data gains little from higher zlib levels
+    assert select_codec_profile(ds["v"]) == "fast"
+
+    write_xarray_to_file(
+        ds[["v"]],
+        tmp_path / "out.nc",
+        access="time-series",
+        codec="fast",
+        significant_digits=3,
+    )
+    with xr.open_dataset(tmp_path / "out.nc") as back:
+        assert back["v"].encoding["chunksizes"] == (4, 2, 2)
+        assert back["v"].encoding["complevel"] == 1
+        assert back["v"].attrs["_QuantizeBitGroomNumberOfSignificantDigits"] == 3
+        np.testing.assert_allclose(back["v"], ds["v"], rtol=1e-3)
+
+
 def test_set_netcdf_encoding_creates_bounds_and_sets_encodings():
     ds = _make_ds(dtype=np.float32)
     set_netcdf_encoding(ds)
@@ -1,6 +1,6 @@
 import tempfile
 import unittest
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import numpy as np
@@ -8,6 +8,8 @@ import xarray as xr
 from pyproj import CRS, Transformer
 
 from mhm_tools.pre.pet_calc import (
+    DayOfYearTable,
+    _daylength_hours,
     calculate_pet,
     e_rad_calculator,
     pet_calculator,
@@ -158,6 +160,54 @@ class TestPetCalculatorMethods(unittest.TestCase):
         )
         np.testing.assert_allclose(result, expected, rtol=1e-6, atol=0.0)
 
+    def test_hamon_uses_daylength_in_degrees(self):
+        tavg = np.array([[[10.0, 12.0], [8.0, 9.0]]])
+        day_length = _daylength_hours(np.degrees(self.lat), self.time)
+        # mid-January day length in central Europe is about 8 hours
+        np.testing.assert_allclose(day_length, 8.3, atol=0.3)
+        es = 0.6108 * np.exp((17.27 * tavg) / (tavg + 237.3))
+        expected = 0.165 * 216.7 * (day_length / 12.0) * (es / (tavg + 273.3))
+        result = pet_calculator(
+            tavg=tavg,
+            lat=self.lat,
+            time=self.time,
+            stat_freq="daily",
+            method="hamon",
+        )
+        np.testing.assert_allclose(result, expected, rtol=1e-6, atol=0.0)
+
+
+class TestDayOfYearTable(unittest.TestCase):
+    def setUp(self):
+        self.lat_deg = np.array([[50.0, 50.0, 50.0], [51.5, 51.5, 51.5]])
+
+    def _expected(self, doy):
+        time = datetime(2020, 1, 1, tzinfo=timezone.utc) + timedelta(days=int(doy) - 1)
+        return (
+            e_rad_calculator(time, np.radians(self.lat_deg)),
+            _daylength_hours(self.lat_deg, time),
+        )
+
+    def test_lookup_matches_direct_evaluation(self):
+        for max_bytes in (None, 0):
+            table = DayOfYearTable(self.lat_deg, max_bytes=max_bytes)
+            self.assertEqual(table.e_rad_table is None, max_bytes == 0)
+            doys = np.array([1, 1, 45, 200, 366])
+            e_rad, day_length = table.lookup(doys)
+            self.assertEqual(e_rad.shape, (5, 2, 3))
+            for idx, doy in enumerate(doys):
+                exp_e_rad, exp_day_length = self._expected(doy)
+                np.testing.assert_allclose(e_rad[idx], exp_e_rad, rtol=1e-12)
+                np.testing.assert_allclose(day_length[idx], exp_day_length, rtol=1e-12)
+            e_rad, day_length = table.lookup(200)
+            self.assertEqual(e_rad.shape, (2, 3))
+            np.testing.assert_allclose(e_rad, self._expected(200)[0], rtol=1e-12)
+
+    def test_table_has_one_column_per_unique_latitude(self):
+        table = DayOfYearTable(self.lat_deg)
+        self.assertEqual(table.e_rad_table.shape, (366, 2))
+        self.assertEqual(table.daylength_table.shape, (366, 2))
+
 
 class TestPetCalcValidation(unittest.TestCase):
     def test_tmin_tmax_raises_when_tmin_exceeds_tmax(self):
@@ -332,3 +382,110 @@ class TestPetCalcFromFiles(unittest.TestCase):
                     tavg_file=str(tavg_file),
                     method="oudin",
                 )
+
+
+class TestPetCalcStreaming(unittest.TestCase):
+    def _write_series(self, tmp_dir: Path, name: str, var_name: str, data):
+        time = np.arange("2020-12-20", "2021-01-29", dtype="datetime64[D]")
+        ds = xr.Dataset(
+            {var_name: (("time", "lat", "lon"), data.astype(np.float32))},
+            coords={
+                "time": time.astype("datetime64[ns]"),
+                "lat": np.array([50.0, 51.0, 52.0]),
+                "lon": np.array([10.0, 11.0]),
+            },
+        )
+        path = tmp_dir / name
+        ds.to_netcdf(path)
+        return path
+
+    def _run_both(self, method, **files):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_dir = Path(tmp)
+            rng = np.random.default_rng(42)
+            tavg = rng.uniform(-10.0, 25.0, size=(40, 3, 2))
+            tavg[3, 0, 0] = np.nan
+            data = {"tavg": tavg, "tmin": tavg - 4.0, "tmax": tavg + 6.0}
+            paths = {
+                f"{key}_file": str(self._write_series(tmp_dir, f"{key}.nc", key, val))
+                for key, val in data.items()
+                if key in files
+            }
+            calculate_pet(out_file=str(tmp_dir / "ref.nc"), method=method, **paths)
+            # a tiny budget forces blocks of 7 time steps
+            calculate_pet(
+                out_file=str(tmp_dir / "stream.nc"),
+                method=method,
+                streaming=True,
+                available_mem_gib=7 * 6 * 8 * 7 / 1024**3,
+                **paths,
+            )
+            with xr.open_dataset(tmp_dir / "ref.nc") as ref, xr.open_dataset(
+                tmp_dir / "stream.nc"
+            ) as stream:
+                np.testing.assert_array_equal(ref.time.data, stream.time.data)
+                np.testing.assert_allclose(
+                    stream.pet.data, ref.pet.data, rtol=1e-6, equal_nan=True
+                )
+                self.assertEqual(stream.pet.attrs["units"], "mm")
+                self.assertEqual(stream.pet.encoding["_FillValue"], -9999.0)
+                self.assertTrue(np.isnan(stream.pet.data[3, 0, 0]))
+
+    def test_streaming_oudin_matches_parallel(self):
+        self._run_both("oudin", tavg=True)
+
+    def test_streaming_hamon_matches_parallel(self):
+        self._run_both("hamon", tavg=True)
+
+    def test_streaming_hargreaves_samani_matches_parallel(self):
+        self._run_both("hargreaves_samani", tavg=True, tmin=True, tmax=True)
+
+    def test_streaming_validates_tmin_tmax_per_block(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_dir = Path(tmp)
+            tavg = np.full((40, 3, 2), 5.0)
+            tmin = tavg.copy()
+            tmin[30] = 20.0
+            paths = {
+                "tavg_file": self._write_series(tmp_dir, "tavg.nc", "tavg", tavg),
+                "tmin_file": self._write_series(tmp_dir, "tmin.nc", "tmin", tmin),
+                "tmax_file": self._write_series(tmp_dir, "tmax.nc", "tmax", tavg),
+            }
+            with self.assertRaisesRegex(ValueError, "Tmin"):
+                calculate_pet(
+                    out_file=str(tmp_dir / "pet.nc"),
+                    method="hargreaves_samani",
+                    streaming=True,
+                    available_mem_gib=7 * 6 * 8 * 7 / 1024**3,
+                    **paths,
+                )
+
+    def test_parallel_blocks_match_per_timestep_terms(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_dir = Path(tmp)
+            rng = np.random.default_rng(7)
+            tavg = rng.uniform(-10.0, 25.0, size=(40, 3, 2))
+            path = self._write_series(tmp_dir, "tavg.nc", "tavg", tavg)
+            # 3 workers split the 40 days across the new year into 12 blocks
+            calculate_pet(
+                out_file=str(tmp_dir / "pet.nc"),
+                tavg_file=str(path),
+                method="oudin",
+                max_workers=3,
+            )
+            with xr.open_dataset(path) as ds, xr.open_dataset(
+                tmp_dir / "pet.nc"
+            ) as out:
+                lat = np.radians(np.broadcast_to(ds.lat.data[:, None], (3, 2)))
+                expected = np.stack(
+                    [
+                        pet_calculator(
+                            lat=lat,
+                            time=t.astype("datetime64[ms]").item(),
+                            stat_freq="daily",
+                            tavg=ds.tavg.data[i],
+                        )
+                        for i, t in enumerate(ds.time.data)
+                    ]
+                )
+                np.testing.assert_allclose(out.pet.data, expected, rtol=1e-5)
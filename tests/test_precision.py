@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+import xarray as xr
+from click.testing import CliRunner
+
+import mhm_tools.common.file_handler as fh
+from mhm_tools._cli._main import cli
+from mhm_tools.common import precision
+from mhm_tools.post.hydrograph import Hydrograph
+from mhm_tools.pre.pet_calc import DayOfYearTable
+from mhm_tools.pre.regrid import ConservativeWeights, get_regrid_weights
+
+
+@pytest.fixture(autouse=True)
+def _default_policy():
+    precision.set_compute_dtype(None)
+    yield
+    # also replaces loky workers started under another policy
+    precision.set_compute_dtype(None)
+
+
+@pytest.fixture()
+def _float32_policy(monkeypatch):
+    monkeypatch.setenv(precision.COMPUTE_DTYPE_ENV, "float32")
+
+
+def test_compute_dtype_policy():
+    assert precision.get_compute_dtype() == np.float64
+    data = np.ones(3, dtype=np.float32)
+    # the default policy does not promote
+    assert precision.cast_to_compute_dtype(data).dtype == np.float32
+    assert precision.cast_to_compute_dtype(np.ones(3)).dtype == np.float64
+
+    precision.set_compute_dtype("float32")
+    assert precision.get_compute_dtype() == np.float32
+    assert precision.compute_dtype_of("f8") == np.float32
+    assert precision.compute_dtype_of("i8") == np.int64
+    precision.set_compute_dtype(None)
+    assert precision.get_compute_dtype() == np.float64
+    with pytest.raises(ValueError, match="Unknown compute dtype"):
+        precision.set_compute_dtype("float16")
+
+
+@pytest.mark.usefixtures("_float32_policy")
+def test_readers_planner_and_writers(tmp_path, monkeypatch):
+    path = tmp_path / "in.nc"
+    values = np.random.default_rng(0).random((4, 3, 5))
+    xr.Dataset(
+        {
+            "tavg": (("time", "lat", "lon"), values),
+            "mask": (("lat", "lon"), np.ones((3, 5), int)),
+        },
+        coords={"time": np.arange(4), "lat": np.arange(3.0), "lon": np.arange(5.0)},
+    ).to_netcdf(path)
+    with fh.get_xarray_ds_from_file(path) as ds:
+        # cast lazily, the file is only read on access
+        assert not ds["tavg"].variable._in_memory
+        assert ds["tavg"].dtype == np.float32
+        assert ds["mask"].dtype == np.int64
+        assert ds["lat"].dtype == np.float64
+        np.testing.assert_allclose(ds["tavg"].values, values, rtol=1e-7)
+        fh.write_xarray_to_file(ds, tmp_path / "out.nc")
+    with xr.open_dataset(tmp_path / "out.nc") as out:
+        assert out["tavg"].dtype == np.float32
+        assert out["tavg"].encoding["dtype"] == np.float32
+
+    ds = xr.Dataset(
+        {"tavg": (("lat", "lon"), np.zeros((300, 400)))},
+        coords={"lat": np.arange(300.0), "lon": np.arange(400.0)},
+    )
+    monkeypatch.setattr(fh, "_MIN_BYTES_PER_CHUNK", 1)
+    chunks_f32 = fh.plan_chunks(ds, 1e-4, "map", memory_fraction=1)
+    precision.set_compute_dtype(None)
+    chunks_f64 = fh.plan_chunks(ds, 1e-4, "map", memory_fraction=1)
+    cells = [chunks["lat"] * chunks["lon"] for chunks in (chunks_f32, chunks_f64)]
+    assert cells[0] > 1.5 * cells[1]
+
+
+@pytest.mark.usefixtures("_float32_policy")
+def test_float32_computations():
+    table = DayOfYearTable(np.linspace(40.0, 50.0, 6).reshape(2, 3))
+    e_rad, day_length = table.lookup(np.arange(1, 11))
+    assert e_rad.dtype == day_length.dtype == np.float32
+
+    lon, lat = np.arange(0.5, 8.0), np.arange(0.5, 6.0)
+    da = xr.DataArray(
+        np.random.default_rng(1).random((2, 6, 8)).astype(np.float32),
+        dims=("time", "lat", "lon"),
+        coords={"lat": lat, "lon": lon},
+    )
+    weights = get_regrid_weights(lon, lat, lon[:-1] + 0.5, lat[:-1] + 0.5, "linear")
+    assert weights.apply(da, "lon", "lat").dtype == np.float32
+    conservative = ConservativeWeights.from_coords(
+        lon, lat, np.arange(1.0, 8.0, 2), np.arange(1.0, 6.0, 2)
+    )
+    remapped = conservative.apply(da, "lon", "lat")
+    assert remapped.dtype == np.float32
+
+    rng = np.random.default_rng(2)
+    obs = rng.lognormal(3.0, 0.5, 5000)
+    sim = obs * rng.normal(1.0, 0.1, obs.size)
+    hydrograph = Hydrograph()
+    hydrograph.calc_objectives(obs, sim)
+    assert hydrograph.obs_discharge_data_clean.dtype == np.float32
+    kge32, nse32 = hydrograph.objectives.kge, hydrograph.objectives.nse
+    precision.set_compute_dtype(None)
+    hydrograph.calc_objectives(obs, sim)
+    assert hydrograph.obs_discharge_data_clean.dtype == np.float64
+    remapped_f64 = conservative.apply(da, "lon", "lat")
+    assert remapped_f64.dtype == np.float64
+    np.testing.assert_allclose(remapped, remapped_f64, rtol=1e-6)
+    assert kge32 == pytest.approx(hydrograph.objectives.kge, abs=1e-5)
+    assert nse32 == pytest.approx(hydrograph.objectives.nse, abs=1e-5)
+
+
+def test_compute_dtype_cli_option():
+    result = CliRunner().invoke(
+        cli, ["--compute-dtype", "float32", "utilities", "batch", "-h"]
+    )
+    assert result.exit_code == 0
+    assert precision.get_compute_dtype() == np.float32
+    result = CliRunner().invoke(cli, ["--compute-dtype", "float16", "utilities"])
+    assert result.exit_code != 0
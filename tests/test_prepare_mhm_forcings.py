@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from mhm_tools.pre.prepare_mhm_forcings import prepare_forcings
+
+
+def _write_hourly_tas(path, start, seed):
+    time = pd.date_range(start, periods=72, freq="h")
+    lat = np.linspace(45.0, 55.0, 11)
+    lon = np.linspace(5.0, 15.0, 11)
+    rng = np.random.default_rng(seed)
+    data = 270.0 + 20.0 * rng.random((time.size, lat.size, lon.size))
+    ds = xr.Dataset(
+        {"t2m": (("time", "lat", "lon"), data.astype(np.float32), {"units": "K"})},
+        coords={"time": time, "lat": lat, "lon": lon},
+    )
+    ds.to_netcdf(path)
+
+
+@pytest.fixture
+def forcing_dir(tmp_path):
+    in_dir = tmp_path / "in"
+    in_dir.mkdir()
+    _write_hourly_tas(in_dir / "tas_2020.nc", "2020-01-01", 1)
+    _write_hourly_tas(in_dir / "tas_2021.nc", "2021-01-01", 2)
+    return in_dir
+
+
+def _run(in_dir, out_dir, **kwargs):
+    prepare_forcings(
+        in_dir=str(in_dir),
+        in_file="tas_*.nc",
+        out_dir=str(out_dir),
+        out_file="*",
+        crop=True,
+        lon_min=7.0,
+        lon_max=11.0,
+        lat_min=48.0,
+        lat_max=52.0,
+        target_frequency="daily",
+        out_var="tavg",
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_pipelined_matches_serial(forcing_dir, tmp_path, n_jobs):
+    _run(forcing_dir, tmp_path / "serial")
+    _run(
+        forcing_dir,
+        tmp_path / "pipelined",
+        pipelined=True,
+        n_jobs=n_jobs,
+        available_mem_gib=0.001,
+    )
+    for name in ("tas_2020.nc", "tas_2021.nc"):
+        with xr.open_dataset(tmp_path / "serial" / name) as ref, xr.open_dataset(
+            tmp_path / "pipelined" / name
+        ) as out:
+            assert out.tavg.shape == (3, 5, 5)
+            assert out.tavg.attrs["units"] == "degC"
+            np.testing.assert_array_equal(out.time.values, ref.time.values)
+            np.testing.assert_array_equal(out.lat.values, ref.lat.values)
+            np.testing.assert_allclose(out.tavg.values, ref.tavg.values, rtol=1e-6)
+            assert out.lat.values[0] > out.lat.values[-1]
+
+
+def test_pipelined_rejects_shared_output_name(forcing_dir, tmp_path):
+    with pytest.raises(ValueError, match="same output file"):
+        prepare_forcings(
+            in_dir=str(forcing_dir),
+            in_file="tas_*.nc",
+            out_dir=str(tmp_path / "out"),
+            out_file="tas.nc",
+            pipelined=True,
+        )
+
+
+def test_pipelined_collects_errors(forcing_dir, tmp_path):
+    with xr.open_dataset(forcing_dir / "tas_2021.nc") as ds:
+        ds = ds.load()
+    ds.t2m.attrs["units"] = "furlong"
+    ds.to_netcdf(forcing_dir / "tas_2021.nc")
+    with pytest.raises(RuntimeError, match="1 of 2 files"):
+        _run(forcing_dir, tmp_path / "out", pipelined=True)
+    assert (tmp_path / "out" / "tas_2020.nc").is_file()
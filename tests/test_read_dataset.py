@@ -0,0 +1,90 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from mhm_tools.common import netcdf
+
+
+def _write_months(tmp_path, lon=np.arange(4.0)):
+    tmp_path.mkdir(exist_ok=True)
+    paths = []
+    rng = np.random.default_rng(0)
+    for month in (1, 2, 3):
+        time = pd.date_range(f"2000-{month:02d}-01", periods=3, freq="D")
+        ds = xr.Dataset(
+            {
+                "pre": (("time", "lat", "lon"), rng.random((3, 2, lon.size))),
+                "mask": (("lat", "lon"), np.ones((2, lon.size), dtype=int)),
+            },
+            coords={"time": time, "lat": [50.0, 51.0], "lon": lon},
+            attrs={"month": month},
+        )
+        path = tmp_path / f"pre_{month}.nc"
+        ds.to_netcdf(path)
+        paths.append(str(path))
+    return paths
+
+
+def test_read_dataset_concatenates_in_time_order(tmp_path):
+    paths = _write_months(tmp_path)
+    shuffled = [paths[2], paths[0], paths[1]]
+    ds = netcdf.read_dataset(shuffled)
+    # the data is read lazily, one chunk per file
+    assert ds["pre"].chunks == ((3, 3, 3), (2,), (4,))
+    expected = xr.combine_by_coords(
+        [xr.open_dataset(p) for p in shuffled],
+        combine_attrs="override",
+        compat="override",
+        coords="minimal",
+    )
+    xr.testing.assert_identical(ds, expected)
+    assert ds.indexes["time"].is_monotonic_increasing
+    assert ds.attrs["month"] == 1
+    assert ds["time"].encoding["units"] == expected["time"].encoding["units"]
+    assert not (tmp_path / netcdf.NC_INDEX_NAME).exists()
+
+
+def test_read_dataset_falls_back_to_combine_by_coords(tmp_path):
+    west = _write_months(tmp_path / "west", lon=np.arange(4.0))[:1]
+    east = _write_months(tmp_path / "east", lon=np.arange(4.0, 8.0))[:1]
+    entries = [netcdf._read_header(p, "netcdf4") for p in west + east]
+    assert netcdf._combine_order(entries) is None
+    ds = netcdf.read_dataset(east + west)
+    assert ds.sizes == {"time": 3, "lat": 2, "lon": 8}
+    np.testing.assert_array_equal(ds.lon, np.arange(8.0))
+
+
+def test_read_dataset_index_is_reused_until_stale(tmp_path, monkeypatch):
+    paths = _write_months(tmp_path)
+    first = netcdf.read_dataset(paths, cache_index=True)
+    index = json.loads((tmp_path / netcdf.NC_INDEX_NAME).read_text())["files"]
+    assert sorted(index) == ["pre_1.nc", "pre_2.nc", "pre_3.nc"]
+    assert index["pre_1.nc"]["time_dim"] == "time"
+
+    def _fail(path, engine):
+        msg = f"header of {path} read again"
+        raise AssertionError(msg)
+
+    opened = []
+
+    def _open(open_func, **kwargs):
+        opened.append(kwargs["filename_or_obj"])
+        return open_func(**kwargs)
+
+    monkeypatch.setattr(netcdf, "_read_header", _fail)
+    monkeypatch.setattr(netcdf, "_fallback_open", _open)
+    # the dataset is built from the index, the files are opened on access only
+    second = netcdf.read_dataset(paths, cache_index=True)
+    assert not opened
+    xr.testing.assert_identical(second.isel(time=slice(4, 5)), first.isel(time=[4]))
+    assert set(opened) == {paths[1]}
+    xr.testing.assert_identical(second, first)
+
+    stat = os.stat(paths[1])
+    os.utime(paths[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    with pytest.raises(AssertionError, match="pre_2.nc read again"):
+        netcdf.read_dataset(paths, cache_index=True)
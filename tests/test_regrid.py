@@ -1,14 +1,36 @@
 import numpy as np
+import pytest
 import xarray as xr
 
+import mhm_tools.pre.regrid as regrid_module
 from mhm_tools.pre.regrid import (
+    ConservativeWeights,
+    RegridWeights,
     _build_aligned_coords,
     _check_integer_multiple,
     _parse_res,
+    get_regrid_weights,
+    regrid,
+    regrid_like,
     regrid_xarray,
 )
 
 
+def _random_field(lat_descending=True):
+    lat = np.linspace(54.0, 47.0, 8) if lat_descending else np.linspace(47, 54, 8)
+    lon = np.linspace(5.0, 15.0, 11)
+    rng = np.random.default_rng(3)
+    data = rng.random((4, lat.size, lon.size))
+    data[1, 2, 3] = np.nan
+    return xr.DataArray(
+        data,
+        dims=("time", "lat", "lon"),
+        coords={"time": np.arange(4), "lat": lat, "lon": lon},
+        name="v",
+        attrs={"units": "mm"},
+    )
+
+
 def test_parse_res_single_and_pair():
     assert _parse_res("0.1") == (0.1, 0.1)
     assert _parse_res("0.1x0.2") == (0.1, 0.2)
@@ -45,3 +67,163 @@ def test_regrid_xarray_preserves_attrs_and_names():
     assert out.attrs["source"] == "test"
     assert np.allclose(out["lon"].values, lon_t)
     assert np.allclose(out["lat"].values, lat_t)
+
+
+@pytest.mark.parametrize("method", ["linear", "nearest"])
+@pytest.mark.parametrize("chunked", [False, True])
+def test_regrid_weights_match_xarray_interp(method, chunked):
+    da = _random_field()
+    lon_t = np.array([4.0, 5.0, 5.5, 7.25, 10.0, 14.9, 15.0])
+    lat_t = np.array([54.0, 53.3, 50.5, 50.0, 47.2, 46.0])
+    weights = RegridWeights.from_coords(da.lon, da.lat, lon_t, lat_t, method)
+    obj = da.chunk({"time": 1}) if chunked else da
+    out = weights.apply(obj, "lon", "lat")
+    expected = da.interp(lon=lon_t, lat=lat_t, method=method)
+    assert out.dims == da.dims
+    assert out.attrs == da.attrs
+    np.testing.assert_allclose(out.values, expected.values, equal_nan=True)
+    np.testing.assert_allclose(out.lon.values, lon_t)
+
+
+def test_regrid_weights_disk_cache(tmp_path, monkeypatch):
+    da = _random_field(lat_descending=False)
+    lon_t, lat_t = np.linspace(6, 14, 5), np.linspace(48, 53, 4)
+    monkeypatch.setattr(regrid_module, "_WEIGHTS_CACHE", regrid_module.OrderedDict())
+    first = get_regrid_weights(da.lon, da.lat, lon_t, lat_t, "linear", tmp_path)
+    assert get_regrid_weights(da.lon, da.lat, lon_t, lat_t, "linear") is first
+    (cache_file,) = tmp_path.glob("regrid_weights_*.npz")
+    monkeypatch.setattr(regrid_module, "_WEIGHTS_CACHE", regrid_module.OrderedDict())
+    loaded = get_regrid_weights(da.lon, da.lat, lon_t, lat_t, "linear", tmp_path)
+    assert loaded is not first
+    assert loaded.method == "linear"
+    np.testing.assert_array_equal(loaded.lat_index, first.lat_index)
+    np.testing.assert_array_equal(loaded.lon_weight, first.lon_weight)
+    other = get_regrid_weights(da.lon, da.lat, lon_t, lat_t, "nearest", tmp_path)
+    assert other.lon_index.shape == (1, lon_t.size)
+    assert len(list(tmp_path.glob("regrid_weights_*.npz"))) == 2
+
+
+def test_regrid_weights_memory_cache_is_bounded(monkeypatch):
+    da = _random_field(lat_descending=False)
+    monkeypatch.setattr(regrid_module, "_WEIGHTS_CACHE", regrid_module.OrderedDict())
+    monkeypatch.setattr(regrid_module, "WEIGHTS_CACHE_SIZE", 2)
+    targets = [np.linspace(6, 14, n) for n in (3, 4, 5)]
+    first = get_regrid_weights(da.lon, da.lat, targets[0], da.lat, "linear")
+    second = get_regrid_weights(da.lon, da.lat, targets[1], da.lat, "linear")
+    # reusing the first table keeps it, the least recently used one is evicted
+    assert get_regrid_weights(da.lon, da.lat, targets[0], da.lat, "linear") is first
+    get_regrid_weights(da.lon, da.lat, targets[2], da.lat, "linear")
+    assert len(regrid_module._WEIGHTS_CACHE) == 2
+    assert get_regrid_weights(da.lon, da.lat, targets[0], da.lat, "linear") is first
+    recomputed = get_regrid_weights(da.lon, da.lat, targets[1], da.lat, "linear")
+    assert recomputed is not second
+
+
+def test_regrid_like_matches_interp_like():
+    da = _random_field().isel(time=0)
+    like = xr.DataArray(
+        np.zeros((3, 4)),
+        dims=("lat", "lon"),
+        coords={"lat": [53.0, 50.0, 48.0], "lon": [6.0, 8.0, 10.0, 12.0]},
+    )
+    np.testing.assert_allclose(
+        regrid_like(da, like).values, da.interp_like(like).values, equal_nan=True
+    )
+
+
+def test_regrid_folder_in_parallel(tmp_path):
+    in_dir = tmp_path / "in"
+    (in_dir / "sub").mkdir(parents=True)
+    lat0 = np.arange(53.95, 47.0, -0.1)
+    lon0 = np.arange(5.05, 15.0, 0.1)
+    xr.Dataset(
+        {"mask": (("lat", "lon"), np.ones((lat0.size, lon0.size), dtype=np.int8))},
+        coords={"lat": lat0, "lon": lon0},
+    ).to_netcdf(tmp_path / "mask.nc")
+    da = _random_field()
+    da.to_dataset().to_netcdf(in_dir / "a.nc")
+    (da * 2).to_dataset().to_netcdf(in_dir / "sub" / "b.nc")
+    out_dir = tmp_path / "out"
+    regrid(in_dir, tmp_path / "mask.nc", out_dir, l2=0.5, method="linear", n_jobs=2)
+    with xr.open_dataset(out_dir / "a.nc") as out_a, xr.open_dataset(
+        out_dir / "sub" / "b.nc"
+    ) as out_b:
+        expected = da.interp(lon=out_a.lon, lat=out_a.lat)
+        np.testing.assert_allclose(out_a.v.values, expected.values, equal_nan=True)
+        np.testing.assert_allclose(
+            out_b.v.values, 2 * expected.values, rtol=1e-6, equal_nan=True
+        )
+
+
+def _conservative_reference(da, lon_t, lat_t):
+    """Brute-force area-weighted means from explicit cell edges."""
+    from mhm_tools.pre.catchment import create_cell_area
+
+    def edges(coord):
+        mid = 0.5 * (coord[:-1] + coord[1:])
+        full = np.concatenate([[2 * coord[0] - mid[0]], mid, [2 * coord[-1] - mid[-1]]])
+        return np.minimum(full[:-1], full[1:]), np.maximum(full[:-1], full[1:])
+
+    def fractions(src, tgt):
+        s_lo, s_hi = edges(src)
+        t_lo, t_hi = edges(tgt)
+        overlap = np.minimum(t_hi[:, None], s_hi) - np.maximum(t_lo[:, None], s_lo)
+        return np.clip(overlap, 0, None) / (s_hi - s_lo)
+
+    f_lat = fractions(da.lat.values, lat_t)
+    f_lon = fractions(da.lon.values, lon_t)
+    area = create_cell_area(da).values
+    valid = np.isfinite(da.values)
+    total = np.einsum(
+        "ia,jb,tab->tij", f_lat, f_lon, np.where(valid, da.values, 0) * area
+    )
+    cover = np.einsum("ia,jb,tab->tij", f_lat, f_lon, valid * area)
+    with np.errstate(invalid="ignore"):
+        return np.where(cover > 0, total / cover, np.nan)
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_conservative_block_aggregation(chunked):
+    da = _random_field()
+    lat_t = np.array([53.5, 51.5, 49.5, 47.5])
+    lon_t = np.linspace(5.0, 15.0, 11)[:-1:2] + 0.5
+    weights = ConservativeWeights.from_coords(da.lon, da.lat, lon_t, lat_t)
+    np.testing.assert_array_equal(weights.lat_block, [0, 2])
+    np.testing.assert_array_equal(weights.lon_block, [0, 2])
+    obj = da.chunk({"time": 1}) if chunked else da
+    out = weights.apply(obj, "lon", "lat")
+    assert out.dims == da.dims
+    np.testing.assert_allclose(
+        out.values, _conservative_reference(da, lon_t, lat_t), equal_nan=True
+    )
+    assert np.isfinite(out.values).all()
+
+
+def test_conservative_sparse_overlaps_and_cache(tmp_path, monkeypatch):
+    da = _random_field()
+    lat_t = np.array([46.5, 48.2, 50.0, 51.8, 53.6])
+    lon_t = np.array([4.2, 7.0, 9.8, 12.6, 15.4, 18.0])
+    monkeypatch.setattr(regrid_module, "_WEIGHTS_CACHE", regrid_module.OrderedDict())
+    weights = get_regrid_weights(da.lon, da.lat, lon_t, lat_t, "conservative", tmp_path)
+    assert weights.lat_block[1] == -1
+    expected = _conservative_reference(da, lon_t, lat_t)
+    out = weights.apply(da, "lon", "lat")
+    np.testing.assert_allclose(out.values, expected, equal_nan=True)
+    assert np.isnan(out.values[..., -1]).all()
+    monkeypatch.setattr(regrid_module, "_WEIGHTS_CACHE", regrid_module.OrderedDict())
+    loaded = get_regrid_weights(da.lon, da.lat, lon_t, lat_t, "conservative", tmp_path)
+    assert isinstance(loaded, ConservativeWeights)
+    np.testing.assert_allclose(
+        loaded.apply(da, "lon", "lat").values, expected, equal_nan=True
+    )
+
+
+def test_conservative_extensive_preserves_totals():
+    da = _random_field().fillna(0.0)
+    lat_t = np.array([53.5, 51.5, 49.5, 47.5])
+    lon_t = np.array([5.5, 7.5, 9.5, 11.5, 13.5])
+    weights = ConservativeWeights.from_coords(da.lon, da.lat, lon_t, lat_t)
+    out = weights.apply(da, "lon", "lat", extensive=True)
+    np.testing.assert_allclose(
+        out.sum(["lat", "lon"]).values, da.isel(lon=slice(0, 10)).sum(["lat", "lon"])
+    )
@@ -4,8 +4,10 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from mhm_tools.common.metrics import metrics_handler, tsm
+from mhm_tools.common.metrics import kernels, metrics_handler, tsm
+from mhm_tools.common.metrics.esp import ESP
 from mhm_tools.common.metrics.mspaef import MSPAEF
+from mhm_tools.common.metrics.spaef import SPAEF, spaef_kernel
 from mhm_tools.common.metrics.waspaef import WASPAEF
 
 
@@ -224,3 +226,143 @@ def test_create_results_csv_rejects_unknown_metric(tmp_path):
             tmp_path / "results.csv",
             metric="unknown",
         )
+
+
+@pytest.mark.parametrize("func", [SPAEF, ESP, WASPAEF, MSPAEF])
+def test_metric_kernels_match_per_timestep_metrics(func, monkeypatch):
+    """Time-batched kernels reproduce the per-timestep metrics."""
+    rng = np.random.default_rng(4)
+    observed = rng.gamma(2.0, 1.0, (12, 9, 11))
+    simulated = observed * rng.normal(1.0, 0.3, observed.shape)
+    simulated[rng.random(observed.shape) < 0.1] = np.nan
+    observed[rng.random(observed.shape) < 0.1] = np.nan
+    # tied values and a timestep without data
+    simulated[3] = np.round(simulated[3])
+    observed[3] = np.round(observed[3])
+    observed[5] = np.nan
+
+    with np.errstate(all="ignore"):
+        steps = [step for step in range(len(observed)) if step != 5]
+        expected = [func(simulated[step], observed[step]) for step in steps]
+        kernel = metrics_handler.METRIC_KERNELS[func]
+        per_timestep = kernel(kernels.TimestepStats(simulated, observed))
+    np.testing.assert_allclose(per_timestep[steps], expected, rtol=1e-10)
+    assert np.isnan(per_timestep[5]).all()
+
+    # blocks of a few timesteps give the same average
+    monkeypatch.setattr(kernels, "TIME_BLOCK_BYTES", 3 * 99 * 8 * 12)
+    assert kernels.time_block_size(observed.shape) == 3
+    average = metrics_handler.calculate_metric_per_timestep_and_average(
+        simulated, observed, func
+    )
+    np.testing.assert_allclose(average, np.nanmean(expected, axis=0), rtol=1e-10)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_spaef_kernel_matches_on_quantized_data(dtype):
+    """Integer-valued maps with NaNs keep the bins of the per-timestep SPAEF."""
+    rng = np.random.default_rng(8)
+    observed = np.round(rng.gamma(2.0, 3.0, (40, 13, 17)))
+    simulated = np.round(observed * rng.normal(1.0, 0.3, observed.shape))
+    simulated[rng.random(observed.shape) < 0.15] = np.nan
+    observed[rng.random(observed.shape) < 0.15] = np.nan
+    simulated, observed = simulated.astype(dtype), observed.astype(dtype)
+
+    with np.errstate(all="ignore"):
+        expected = np.array([SPAEF(s, o) for s, o in zip(simulated, observed)])
+    per_timestep = spaef_kernel(kernels.TimestepStats(simulated, observed))
+    # gamma counts histogram bins, it has to match exactly
+    np.testing.assert_array_equal(per_timestep[:, 3], expected[:, 3])
+    np.testing.assert_allclose(per_timestep, expected, rtol=1e-6)
+
+
+def test_row_percentile_and_histogram_match_numpy():
+    """Row-wise percentiles and histograms follow numpy."""
+    rng = np.random.default_rng(5)
+    values = rng.normal(size=(6, 40))
+    values[1, :3] = values[1, 3]
+    n = np.array([40, 40, 25, 1, 2, 0])
+    valid = np.arange(40) < n[:, None]
+    sorted_values = np.sort(np.where(valid, values, np.inf), axis=1)
+    bins = np.rint(np.sqrt(n)).astype(int)
+    counts = kernels._histogram_counts(values, valid, bins)
+    for q in (25, 75):
+        percentiles = kernels.row_percentile(sorted_values, n, q)
+        for row in range(5):
+            assert percentiles[row] == np.percentile(values[row, : n[row]], q)
+        assert np.isnan(percentiles[5])
+    for row in range(5):
+        expected, _ = np.histogram(values[row, : n[row]], bins[row])
+        np.testing.assert_array_equal(counts[row, : bins[row]], expected)
+    assert counts[5].sum() == 0
+
+
+def test_evaluate_results_metrics_in_one_pass(tmp_path, monkeypatch):
+    """The fused evaluation matches the single metrics, also for dask cubes."""
+    da = pytest.importorskip("dask.array")
+    rng = np.random.default_rng(6)
+    m1 = rng.gamma(2.0, 1.0, (10, 6, 7))
+    m2 = m1 * rng.normal(1.0, 0.2, m1.shape)
+    m1[rng.random(m1.shape) < 0.1] = np.nan
+    m2[:, 0, 0] = np.nan
+
+    expected = {
+        "TSM": tsm.calculate_tsm_for_gridded_data(m1, m2, "a", "b"),
+        "SPAEF": metrics_handler.calculate_spaef_for_gridded_data(m1, m2, "a", "b"),
+        "MSPAEF": metrics_handler.calculate_mspaef_for_gridded_data(m1, m2, "a", "b"),
+    }
+    monkeypatch.setattr(kernels, "TIME_BLOCK_BYTES", 4 * 42 * 8 * 12)
+    lazy1 = da.from_array(m1, chunks=(3, 6, 7))
+    lazy2 = da.from_array(m2, chunks=(5, 3, 7))
+    results = metrics_handler.evaluate_results_metrics(
+        lazy1, lazy2, "a", "b", metrics=["tsm", "spaef", "mspaef"]
+    )
+    assert list(results) == list(expected)
+    for metric, result in results.items():
+        assert list(result) == list(expected[metric])
+        assert result["name"] == "a-b"
+        for key, value in result.items():
+            if key != "name":
+                assert value == pytest.approx(expected[metric][key], rel=1e-12)
+
+    metrics_handler.create_results_csv(
+        lazy1, lazy2, "a", "b", out_dir=tmp_path, out_name="run", metric="all"
+    )
+    written = sorted(path.name for path in tmp_path.glob("run_*.csv"))
+    assert written == [
+        "run_esp.csv",
+        "run_mspaef.csv",
+        "run_spaef.csv",
+        "run_tsm.csv",
+        "run_waspaef.csv",
+    ]
+    df = pd.read_csv(tmp_path / "run_tsm.csv", index_col=0)
+    assert df.loc[0, "comb"] == pytest.approx(expected["TSM"]["comb"], rel=1e-12)
+
+
+def test_deseasonalized_area_mean_uses_calendar_day_codes():
+    """Calendar-day climatology matches grouping by month and day."""
+    time_index = pd.date_range("1999-12-30", "2002-01-02 18:00", freq="6h")
+    rng = np.random.default_rng(7)
+    data = rng.random((len(time_index), 2, 3))
+    data[:40, 0, 0] = np.nan
+    data[100:104] = np.nan
+
+    climatology = tsm.desesonalized_nan_area_mean(data, time_index)
+
+    area_mean = np.nanmean(data, axis=(1, 2))
+    expected = (
+        pd.Series(area_mean)
+        .groupby(np.asarray(time_index.strftime("%m-%d")))
+        .mean()
+        .reindex(pd.date_range("2000-01-01", "2000-12-31").strftime("%m-%d"))
+    )
+    expected["02-29"] = np.nanmean([expected["02-28"], expected["03-01"]])
+    assert climatology.shape == (366,)
+    np.testing.assert_allclose(climatology, expected.to_numpy(), rtol=1e-12)
+
+    codes = tsm.calendar_day_codes(time_index)
+    assert codes[0] == 364
+    assert tsm.calendar_day_codes(time_index.copy()) is codes
+    with pytest.raises(ValueError, match="Length mismatch"):
+        tsm.desesonalized_nan_area_mean(data[1:], time_index)
@@ -1,6 +1,7 @@
 import unittest
 
 import numpy as np
+import pandas as pd
 import xarray as xr
 
 from mhm_tools.common.time_utils import resample_to_daily_or_hourly_adaptive
@@ -20,3 +21,68 @@ class TestResampleSingleTimestamp(unittest.TestCase):
         out = resample_to_daily_or_hourly_adaptive(ds, "daily", var="foo")
         self.assertIsInstance(out, xr.Dataset)
         xr.testing.assert_equal(out, ds)
+
+
+def _series(freq, periods, start="2020-01-01", units="K", seed=0):
+    time = pd.date_range(start, periods=periods, freq=freq)
+    rng = np.random.default_rng(seed)
+    data = rng.random((2, periods, 3))
+    data[0, min(5, periods - 1), 1] = np.nan
+    return xr.DataArray(
+        data,
+        dims=("lat", "time", "lon"),
+        coords={"lat": [50.0, 51.0], "time": time, "lon": [10.0, 11.0, 12.0]},
+        name="v",
+        attrs={"units": units},
+    )
+
+
+class TestResampleRegularFastPath(unittest.TestCase):
+    def _check(self, da, target, expected, **kwargs):
+        for obj in (da, da.chunk({"time": 7, "lat": 1})):
+            out = resample_to_daily_or_hourly_adaptive(obj, target, **kwargs)
+            self.assertEqual(out.dims, da.dims)
+            self.assertEqual(out.attrs, da.attrs)
+            xr.testing.assert_allclose(out.compute(), expected)
+
+    def test_hourly_to_daily_mean_with_partial_days(self):
+        da = _series("h", 60, start="2020-01-01 05:00")
+        da[:, 30:54] = np.nan  # one all-missing day
+        self._check(da, "daily", da.resample(time="D").mean())
+
+    def test_hourly_to_daily_sum(self):
+        da = _series("h", 72, units="mm")
+        self._check(da, "daily", da.resample(time="D").sum())
+
+    def test_three_hourly_to_hourly_intensive(self):
+        da = _series("3h", 16)
+        filled = da.fillna(0.5)
+        self._check(filled, "hourly", filled.resample(time="1h").interpolate("linear"))
+        # source steps are kept next to missing values
+        out = resample_to_daily_or_hourly_adaptive(da, "hourly")
+        xr.testing.assert_identical(out.isel(time=slice(None, None, 3)), da)
+        self._check(
+            da,
+            "hourly",
+            da.resample(time="1h").ffill(),
+            upsample_for_intensive="ffill",
+        )
+
+    def test_daily_to_hourly_extensive_is_sum_preserving(self):
+        da = _series("D", 5, units="mm")
+        expected = (da / 24).resample(time="1h").ffill()
+        self._check(da, "hourly", expected)
+        out = resample_to_daily_or_hourly_adaptive(da, "hourly")
+        np.testing.assert_allclose(
+            out.isel(time=slice(0, 24)).sum("time"), da.isel(time=0)
+        )
+
+    def test_irregular_axis_falls_back_to_xarray(self):
+        da = _series("h", 72).drop_isel(time=[10, 11])
+        self._check(da, "daily", da.resample(time="D").mean())
+
+    def test_dataset(self):
+        ds = xr.Dataset({"v": _series("h", 48), "p": _series("h", 48, units="mm")})
+        out = resample_to_daily_or_hourly_adaptive(ds, "daily")
+        xr.testing.assert_allclose(out["v"], ds["v"].resample(time="D").mean())
+        xr.testing.assert_allclose(out["p"], ds["p"].resample(time="D").sum())
@@ -10,6 +10,7 @@ import mhm_tools.common.xarray_utils as utils
 from mhm_tools.common.xarray_utils import (
     crop_ds,
     get_coord_key,
+    get_crop_window,
     get_overlapping_time_slice,
     get_single_data_var,
     induce_data_var_from_file_name,
@@ -341,6 +342,24 @@ class TestCropDs(XarrayUtilsBase):
         self.assertSetEqual(set(np.round(out.Y.values, 6)), {11.0, 12.0})
 
 
+class TestGetCropWindow(XarrayUtilsBase):
+    def test_matches_crop_ds(self):
+        for ds in (self.make_sample_ds(), self.make_descending_ds()):
+            window = get_crop_window(ds, (103, 101), (10.5, 12.0))
+            out = ds.isel(window)
+            ref = crop_ds(ds, lon_min=101, lon_max=103, lat_min=10.5, lat_max=12.0)
+            xr.testing.assert_identical(out, ref)
+
+    def test_missing_bounds_keep_axis(self):
+        ds = self.make_sample_ds()
+        self.assertEqual(get_crop_window(ds, None, (11.0, 11.0)), {"lat": slice(1, 2)})
+
+    def test_empty_window_raises(self):
+        ds = self.make_sample_ds()
+        with self.assertRaises(ValueError):
+            get_crop_window(ds, (0.0, 1.0), None)
+
+
 if __name__ == "__main__":
     # Allows running directly: python -m unittest tests/test_xarray_utils_unittest.py
     unittest.main()